@@ -1,11 +1,13 @@
 """
 Файл окружения Alembic для генерации и применения миграций.
 """
+import asyncio
 import os
 from logging.config import fileConfig
 
 from alembic import context
-from sqlalchemy import engine_from_config, pool
+from sqlalchemy import pool
+from sqlalchemy.ext.asyncio import async_engine_from_config
 
 # Добавляем модели для обнаружения изменений схемы
 from src.frameworks_and_drivers.db.database import Base
@@ -62,29 +64,45 @@ def run_migrations_offline():
         context.run_migrations()
 
 
-def run_migrations_online():
+def do_run_migrations(connection):
     """
-    Run migrations in 'online' mode.
+    Применяет миграции на синхронном соединении.
+    """
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+    )
 
-    In this scenario we need to create an Engine
-    and associate a connection with the context.
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def run_async_migrations():
+    """
+    Создает асинхронный движок (URL использует драйвер asyncpg) и применяет миграции.
     """
     configuration = config.get_section(config.config_ini_section)
     configuration["sqlalchemy.url"] = get_url()
-    connectable = engine_from_config(
+    connectable = async_engine_from_config(
         configuration,
         prefix="sqlalchemy.",
         poolclass=pool.NullPool,
     )
 
-    with connectable.connect() as connection:
-        context.configure(
-            connection=connection,
-            target_metadata=target_metadata,
-        )
+    async with connectable.connect() as connection:
+        await connection.run_sync(do_run_migrations)
+
+    await connectable.dispose()
 
-        with context.begin_transaction():
-            context.run_migrations()
+
+def run_migrations_online():
+    """
+    Run migrations in 'online' mode.
+
+    In this scenario we need to create an Engine
+    and associate a connection with the context.
+    """
+    asyncio.run(run_async_migrations())
 
 
 if context.is_offline_mode():
@@ -0,0 +1,27 @@
+"""Время последнего изменения признания для условных HTTP-запросов
+
+Revision ID: a7d3b9e2c6f1
+Revises: f2a9c6d1e8b4
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "a7d3b9e2c6f1"
+down_revision: Union[str, None] = "f2a9c6d1e8b4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("confessions", sa.Column("updated_at", sa.DateTime(), nullable=True))
+    # Для существующих признаний точное время изменения неизвестно; берем время создания
+    op.execute("UPDATE confessions SET updated_at = created_at")
+
+
+def downgrade() -> None:
+    op.drop_column("confessions", "updated_at")
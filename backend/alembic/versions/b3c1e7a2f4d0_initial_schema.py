@@ -0,0 +1,245 @@
+"""Начальная схема: признания, опросы, очереди модерации и публикации, индексы под ленты
+
+Revision ID: b3c1e7a2f4d0
+Revises:
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "b3c1e7a2f4d0"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Значения перечислений зафиксированы на момент миграции, а не импортируются из кода
+ENUMS = {
+    "confessionstatus": ("PENDING", "APPROVED", "REJECTED", "PUBLISHED"),
+    "attachmenttype": ("IMAGE", "VIDEO", "AUDIO", "MUSIC", "DOCUMENT", "OTHER"),
+    "moderationjobstatus": ("QUEUED", "RUNNING", "DONE", "FAILED"),
+    "publicationstatus": ("QUEUED", "SENDING", "SENT", "FAILED"),
+}
+
+
+def enum_type(name: str) -> postgresql.ENUM:
+    """Ссылка на уже созданный тип перечисления (create_table не создает его повторно)."""
+    return postgresql.ENUM(*ENUMS[name], name=name, create_type=False)
+
+
+def upgrade() -> None:
+    for name, values in ENUMS.items():
+        postgresql.ENUM(*values, name=name).create(op.get_bind(), checkfirst=True)
+
+    op.create_table(
+        "confessions",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("status", enum_type("confessionstatus"), nullable=True),
+        sa.Column("version", sa.Integer(), server_default="0", nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    # Лента по статусу (keyset по created_at, id) и выборка одобренных признаний для публикации
+    op.create_index("ix_confessions_status_created_at", "confessions", ["status", "created_at", "id"])
+    # Публичная лента: частичный индекс только по опубликованным признаниям
+    op.create_index(
+        "ix_confessions_published_feed",
+        "confessions",
+        ["created_at", "id"],
+        postgresql_where=sa.text("status = 'PUBLISHED'"),
+    )
+
+    op.create_table(
+        "tags",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=50), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_tags_name", "tags", ["name"], unique=True)
+
+    op.create_table(
+        "moderation_cache",
+        sa.Column("content_hash", sa.String(length=64), nullable=False),
+        sa.Column("decision", enum_type("confessionstatus"), nullable=False),
+        sa.Column("reason", sa.Text(), nullable=True),
+        sa.Column("category_scores", sa.JSON(), nullable=True),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("content_hash"),
+    )
+
+    op.create_table(
+        "telegram_files",
+        sa.Column("url", sa.String(length=255), nullable=False),
+        sa.Column("file_id", sa.String(length=255), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("url"),
+    )
+
+    op.create_table(
+        "attachments",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("confession_id", sa.Integer(), nullable=True),
+        sa.Column("url", sa.String(length=255), nullable=False),
+        sa.Column("type", enum_type("attachmenttype"), nullable=True),
+        sa.Column("uploaded_at", sa.DateTime(), nullable=True),
+        sa.Column("caption", sa.String(length=255), nullable=True),
+        sa.ForeignKeyConstraint(["confession_id"], ["confessions.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_attachments_confession_id", "attachments", ["confession_id"])
+
+    op.create_table(
+        "polls",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("confession_id", sa.Integer(), nullable=True),
+        sa.Column("question", sa.String(length=255), nullable=False),
+        sa.Column("allows_multiple_answers", sa.Boolean(), nullable=True),
+        sa.Column("type", sa.String(length=50), nullable=True),
+        sa.Column("correct_option_id", sa.Integer(), nullable=True),
+        sa.Column("explanation", sa.String(length=255), nullable=True),
+        sa.Column("open_period", sa.Integer(), nullable=True),
+        sa.Column("poll_message_id", sa.String(length=50), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["confession_id"], ["confessions.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("confession_id"),
+    )
+
+    op.create_table(
+        "poll_options",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("poll_id", sa.Integer(), nullable=True),
+        sa.Column("text", sa.String(length=255), nullable=False),
+        sa.Column("vote_count", sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(["poll_id"], ["polls.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_poll_options_poll_id", "poll_options", ["poll_id"])
+
+    op.create_table(
+        "confession_tag",
+        sa.Column("confession_id", sa.Integer(), nullable=False),
+        sa.Column("tag_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["confession_id"], ["confessions.id"]),
+        sa.ForeignKeyConstraint(["tag_id"], ["tags.id"]),
+        sa.PrimaryKeyConstraint("confession_id", "tag_id"),
+    )
+    op.create_index("ix_confession_tag_tag_id", "confession_tag", ["tag_id", "confession_id"])
+
+    op.create_table(
+        "moderation_logs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("confession_id", sa.Integer(), nullable=True),
+        sa.Column("decision", enum_type("confessionstatus"), nullable=True),
+        sa.Column("moderator", sa.String(length=100), nullable=False),
+        sa.Column("reason", sa.Text(), nullable=True),
+        sa.Column("timestamp", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["confession_id"], ["confessions.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_moderation_logs_confession_id", "moderation_logs", ["confession_id"])
+
+    op.create_table(
+        "moderation_jobs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("confession_id", sa.Integer(), nullable=False),
+        sa.Column("status", enum_type("moderationjobstatus"), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("available_at", sa.DateTime(), nullable=False),
+        sa.Column("locked_at", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["confession_id"], ["confessions.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_moderation_jobs_pending",
+        "moderation_jobs",
+        ["available_at", "id"],
+        postgresql_where=sa.text("status IN ('QUEUED', 'RUNNING')"),
+    )
+    op.create_index(
+        "uq_moderation_jobs_active_confession",
+        "moderation_jobs",
+        ["confession_id"],
+        unique=True,
+        postgresql_where=sa.text("status IN ('QUEUED', 'RUNNING')"),
+    )
+
+    op.create_table(
+        "publication_outbox",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("confession_id", sa.Integer(), nullable=False),
+        sa.Column("channel_id", sa.String(length=100), nullable=False),
+        sa.Column("status", enum_type("publicationstatus"), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("telegram_message_id", sa.String(length=50), nullable=True),
+        sa.Column("poll_message_id", sa.String(length=50), nullable=True),
+        sa.Column("media_message_ids", sa.JSON(), nullable=True),
+        sa.Column("available_at", sa.DateTime(), nullable=False),
+        sa.Column("locked_at", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("sent_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["confession_id"], ["confessions.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("confession_id", "channel_id", name="uq_publication_outbox_confession_channel"),
+    )
+    op.create_index(
+        "ix_publication_outbox_pending",
+        "publication_outbox",
+        ["available_at", "id"],
+        postgresql_where=sa.text("status IN ('QUEUED', 'SENDING')"),
+    )
+
+    op.create_table(
+        "published_records",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("confession_id", sa.Integer(), nullable=True),
+        sa.Column("telegram_message_id", sa.String(length=50), nullable=False),
+        sa.Column("channel_id", sa.String(length=100), nullable=False),
+        sa.Column("published_at", sa.DateTime(), nullable=True),
+        sa.Column("discussion_thread_id", sa.String(length=50), nullable=True),
+        sa.ForeignKeyConstraint(["confession_id"], ["confessions.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("confession_id"),
+    )
+
+    op.create_table(
+        "comments",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("confession_id", sa.Integer(), nullable=True),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("reply_to", sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(["confession_id"], ["confessions.id"]),
+        sa.ForeignKeyConstraint(["reply_to"], ["comments.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_comments_confession_id", "comments", ["confession_id"])
+
+
+def downgrade() -> None:
+    op.drop_table("comments")
+    op.drop_table("published_records")
+    op.drop_table("publication_outbox")
+    op.drop_table("moderation_jobs")
+    op.drop_table("moderation_logs")
+    op.drop_table("confession_tag")
+    op.drop_table("poll_options")
+    op.drop_table("polls")
+    op.drop_table("attachments")
+    op.drop_table("telegram_files")
+    op.drop_table("moderation_cache")
+    op.drop_table("tags")
+    op.drop_table("confessions")
+
+    for name in ENUMS:
+        postgresql.ENUM(name=name).drop(op.get_bind(), checkfirst=True)
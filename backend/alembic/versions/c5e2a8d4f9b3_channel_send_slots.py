@@ -0,0 +1,31 @@
+"""Общий для всех процессов лимит частоты отправки в каналы Telegram
+
+Revision ID: c5e2a8d4f9b3
+Revises: a7d3b9e2c6f1
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "c5e2a8d4f9b3"
+down_revision: Union[str, None] = "a7d3b9e2c6f1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "channel_send_slots",
+        sa.Column("channel_id", sa.String(length=100), nullable=False),
+        sa.Column("theoretical_at", sa.DateTime(), nullable=False),
+        sa.Column("paused_until", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("channel_id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("channel_send_slots")
@@ -0,0 +1,38 @@
+"""Полнотекстовый поиск по признаниям: вычисляемая колонка tsvector и GIN-индекс
+
+Revision ID: d4e8f1a3c5b7
+Revises: b3c1e7a2f4d0
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "d4e8f1a3c5b7"
+down_revision: Union[str, None] = "b3c1e7a2f4d0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Выражение зафиксировано на момент миграции (совпадает с CONFESSION_SEARCH_VECTOR в моделях)
+SEARCH_VECTOR = (
+    "to_tsvector('russian'::regconfig, coalesce(content, '')) || "
+    "to_tsvector('english'::regconfig, coalesce(content, ''))"
+)
+
+
+def upgrade() -> None:
+    # Добавление STORED-колонки переписывает таблицу: на большой базе выполнять в окно обслуживания
+    op.add_column(
+        "confessions",
+        sa.Column("search_vector", postgresql.TSVECTOR(), sa.Computed(SEARCH_VECTOR, persisted=True), nullable=True),
+    )
+    op.create_index("ix_confessions_search_vector", "confessions", ["search_vector"], postgresql_using="gin")
+
+
+def downgrade() -> None:
+    op.drop_index("ix_confessions_search_vector", table_name="confessions")
+    op.drop_column("confessions", "search_vector")
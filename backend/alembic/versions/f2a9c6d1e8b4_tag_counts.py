@@ -0,0 +1,44 @@
+"""Счетчики опубликованных признаний по тегам для списка популярных тегов
+
+Revision ID: f2a9c6d1e8b4
+Revises: d4e8f1a3c5b7
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "f2a9c6d1e8b4"
+down_revision: Union[str, None] = "d4e8f1a3c5b7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "tag_counts",
+        sa.Column("tag_id", sa.Integer(), nullable=False),
+        sa.Column("published_count", sa.Integer(), server_default="0", nullable=False),
+        sa.ForeignKeyConstraint(["tag_id"], ["tags.id"]),
+        sa.PrimaryKeyConstraint("tag_id"),
+    )
+    op.create_index("ix_tag_counts_published_count", "tag_counts", ["published_count", "tag_id"])
+
+    # Начальные значения по уже опубликованным признаниям; дальше счетчики ведет репозиторий
+    op.execute(
+        """
+        INSERT INTO tag_counts (tag_id, published_count)
+        SELECT confession_tag.tag_id, count(*)
+        FROM confession_tag
+        JOIN confessions ON confessions.id = confession_tag.confession_id
+        WHERE confessions.status = 'PUBLISHED'
+        GROUP BY confession_tag.tag_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("tag_counts")
@@ -3,9 +3,55 @@
 """
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
 
-from src.entities.enums import AttachmentType, ConfessionStatus
+from src.entities.enums import AttachmentType, ConfessionStatus, ModerationJobStatus, PublicationStatus
+
+
+class StatusTransitionError(ValueError):
+    """Статус признания нельзя сменить: переход запрещен или статус уже изменил кто-то другой."""
+
+    def __init__(self, confession_id: int, current: ConfessionStatus, target: ConfessionStatus) -> None:
+        """
+        Инициализация ошибки.
+
+        Args:
+            confession_id: ID признания
+            current: Текущий статус признания в хранилище
+            target: Статус, который не удалось установить
+        """
+        super().__init__(f"Cannot change status of confession {confession_id} from {current.value} to {target.value}")
+        self.confession_id = confession_id
+        self.current = current
+        self.target = target
+
+
+class DirectPublicationError(ValueError):
+    """Признание нельзя опубликовать сменой статуса: публикация идет через очередь отправки в Telegram."""
+
+    def __init__(self, confession_id: int) -> None:
+        """
+        Инициализация ошибки.
+
+        Args:
+            confession_id: ID признания
+        """
+        super().__init__(f"Confession {confession_id} cannot be published by a status update")
+        self.confession_id = confession_id
+
+
+class ModerationPendingError(Exception):
+    """Система модерации не вынесла решения (недоступна или разомкнута цепь); модерацию нужно повторить позже."""
+
+    def __init__(self, confession_id: int) -> None:
+        """
+        Инициализация ошибки.
+
+        Args:
+            confession_id: ID признания, оставшегося без решения
+        """
+        super().__init__(f"Moderation of confession {confession_id} returned no decision")
+        self.confession_id = confession_id
 
 
 @dataclass
@@ -52,6 +98,26 @@ class Tag:
     name: str = ""
 
 
+@dataclass
+class TagCount:
+    """Тег и количество опубликованных признаний с ним."""
+
+    tag: Tag
+    count: int = 0
+
+
+@dataclass
+class ConfessionRevision:
+    """Версия признания, по которой проверяется актуальность его копии без загрузки агрегата."""
+
+    id: int
+    status: ConfessionStatus
+    version: int = 0
+    updated_at: Optional[datetime] = None
+    # Сумма голосов опроса (None - опроса нет); голоса только добавляются, поэтому сумма меняется с каждым
+    poll_votes: Optional[int] = None
+
+
 @dataclass
 class ModerationLog:
     """Запись о модерации признания."""
@@ -64,6 +130,61 @@ class ModerationLog:
     timestamp: datetime = field(default_factory=datetime.now)
 
 
+@dataclass
+class ModerationResult:
+    """Результат модерации текста признания внешней системой."""
+
+    status: ConfessionStatus = ConfessionStatus.PENDING
+    reason: Optional[str] = None  # Причина отклонения
+    category_scores: Dict[str, float] = field(default_factory=dict)
+    latency: float = 0.0  # Время ответа системы модерации, секунды
+
+
+@dataclass
+class ModerationJob:
+    """Задача фоновой модерации признания."""
+
+    id: Optional[int] = None
+    confession_id: Optional[int] = None
+    status: ModerationJobStatus = ModerationJobStatus.QUEUED
+    attempts: int = 0
+    last_error: Optional[str] = None
+    available_at: datetime = field(default_factory=datetime.now)
+    # Время, когда задачу забрал воркер: по нему воркер доказывает, что аренда еще его
+    locked_at: Optional[datetime] = None
+    created_at: datetime = field(default_factory=datetime.now)
+    updated_at: datetime = field(default_factory=datetime.now)
+
+
+@dataclass
+class Publication:
+    """Сообщение исходящей очереди (outbox) на отправку признания в Telegram-канал."""
+
+    id: Optional[int] = None
+    confession_id: Optional[int] = None
+    channel_id: str = ""
+    status: PublicationStatus = PublicationStatus.QUEUED
+    attempts: int = 0
+    last_error: Optional[str] = None
+    # Уже отправленные части: при повторной попытке они не отправляются снова
+    telegram_message_id: Optional[str] = None
+    poll_message_id: Optional[str] = None
+    media_message_ids: Optional[List[str]] = None
+    available_at: datetime = field(default_factory=datetime.now)
+    created_at: datetime = field(default_factory=datetime.now)
+    sent_at: Optional[datetime] = None
+
+
+@dataclass
+class PublicationQueueStats:
+    """Состояние исходящей очереди публикаций."""
+
+    # Сообщения, ожидающие отправки или отправляемые сейчас
+    depth: int = 0
+    # Время готовности самого старого неотправленного сообщения
+    oldest_available_at: Optional[datetime] = None
+
+
 @dataclass
 class PublishedRecord:
     """Информация о публикации признания в Telegram."""
@@ -95,9 +216,19 @@ class Confession:
     content: str = ""
     created_at: datetime = field(default_factory=datetime.now)
     status: ConfessionStatus = ConfessionStatus.PENDING
+    version: int = 0  # Растет при каждой смене статуса
     attachments: List[Attachment] = field(default_factory=list)
     tags: List[Tag] = field(default_factory=list)
     poll: Optional[Poll] = None
     moderation_logs: List[ModerationLog] = field(default_factory=list)
     published_record: Optional[PublishedRecord] = None
-    comments: List[Comment] = field(default_factory=list) 
\ No newline at end of file
+    comments: List[Comment] = field(default_factory=list)
+
+
+@dataclass
+class ConfessionSearchHit:
+    """Признание, найденное полнотекстовым поиском."""
+
+    confession: Confession
+    rank: float = 0.0
+    snippet: str = ""  # Фрагмент текста с совпадениями, выделенными тегами <mark>
@@ -2,6 +2,7 @@
 Перечисления, используемые в доменных сущностях.
 """
 from enum import Enum, auto
+from typing import Dict, FrozenSet
 
 
 class ConfessionStatus(str, Enum):
@@ -10,7 +11,54 @@ class ConfessionStatus(str, Enum):
     PENDING = "PENDING"  # Ожидает модерации
     APPROVED = "APPROVED"  # Одобрено, но еще не опубликовано
     REJECTED = "REJECTED"  # Отклонено модерацией
-    PUBLISHED = "PUBLISHED"  # Опубликовано в Telegram
+    PUBLISHED = "PUBLISHED"  # Опубликовано в Telegram (или стоит в очереди отправки)
+
+    def can_transition_to(self, target: "ConfessionStatus") -> bool:
+        """Проверяет, разрешен ли переход из этого статуса в target."""
+        return target in CONFESSION_TRANSITIONS[self]
+
+    @classmethod
+    def sources_of(cls, target: "ConfessionStatus") -> FrozenSet["ConfessionStatus"]:
+        """Возвращает статусы, из которых разрешен переход в target."""
+        return frozenset(source for source, targets in CONFESSION_TRANSITIONS.items() if target in targets)
+
+
+# Разрешенные переходы статусов признания. Опубликованное признание уже
+# ушло в Telegram, поэтому PUBLISHED - конечный статус
+CONFESSION_TRANSITIONS: Dict[ConfessionStatus, FrozenSet[ConfessionStatus]] = {
+    ConfessionStatus.PENDING: frozenset({ConfessionStatus.APPROVED, ConfessionStatus.REJECTED}),
+    ConfessionStatus.APPROVED: frozenset(
+        {ConfessionStatus.PUBLISHED, ConfessionStatus.REJECTED, ConfessionStatus.PENDING}
+    ),
+    ConfessionStatus.REJECTED: frozenset({ConfessionStatus.APPROVED, ConfessionStatus.PENDING}),
+    ConfessionStatus.PUBLISHED: frozenset(),
+}
+
+
+class ConfessionProjection(str, Enum):
+    """Уровень детализации, с которым признание читается из хранилища."""
+
+    SUMMARY = "summary"  # Текст, статус, дата и теги - для лент
+    PUBLIC = "public"  # Все, что видит читатель: вложения, опрос, запись о публикации
+    FULL = "full"  # Агрегат целиком, включая журнал модерации и комментарии - для админки
+
+
+class ModerationJobStatus(str, Enum):
+    """Статус задачи фоновой модерации."""
+
+    QUEUED = "QUEUED"  # Ожидает свободного воркера
+    RUNNING = "RUNNING"  # Взята воркером
+    DONE = "DONE"  # Модерация выполнена
+    FAILED = "FAILED"  # Исчерпаны попытки
+
+
+class PublicationStatus(str, Enum):
+    """Статус отправки признания в Telegram-канал."""
+
+    QUEUED = "QUEUED"  # Ожидает отправителя
+    SENDING = "SENDING"  # Взята отправителем
+    SENT = "SENT"  # Доставлена в канал
+    FAILED = "FAILED"  # Не доставлена, нужна ручная проверка
 
 
 class AttachmentType(str, Enum):
@@ -0,0 +1,57 @@
+"""
+Настройки приложения из переменных окружения.
+"""
+
+from src.frameworks_and_drivers.config.settings import (
+    DatabaseSettings,
+    FeedCacheSettings,
+    HttpCacheSettings,
+    ModerationBatchSettings,
+    ModerationCacheSettings,
+    ModerationGatewaySettings,
+    ModerationWorkerSettings,
+    PollResultsCacheSettings,
+    PollStreamSettings,
+    PollVoteSettings,
+    PublicationSchedulerSettings,
+    PublicationSettings,
+    get_database_settings,
+    get_feed_cache_settings,
+    get_http_cache_settings,
+    get_moderation_batch_settings,
+    get_moderation_cache_settings,
+    get_moderation_gateway_settings,
+    get_moderation_worker_settings,
+    get_poll_results_cache_settings,
+    get_poll_stream_settings,
+    get_poll_vote_settings,
+    get_publication_scheduler_settings,
+    get_publication_settings,
+)
+
+__all__ = [
+    "DatabaseSettings",
+    "FeedCacheSettings",
+    "HttpCacheSettings",
+    "ModerationBatchSettings",
+    "ModerationCacheSettings",
+    "ModerationGatewaySettings",
+    "ModerationWorkerSettings",
+    "PollResultsCacheSettings",
+    "PollStreamSettings",
+    "PollVoteSettings",
+    "PublicationSchedulerSettings",
+    "PublicationSettings",
+    "get_database_settings",
+    "get_feed_cache_settings",
+    "get_http_cache_settings",
+    "get_moderation_batch_settings",
+    "get_moderation_cache_settings",
+    "get_moderation_gateway_settings",
+    "get_moderation_worker_settings",
+    "get_poll_results_cache_settings",
+    "get_poll_stream_settings",
+    "get_poll_vote_settings",
+    "get_publication_scheduler_settings",
+    "get_publication_settings",
+]
@@ -1,23 +1,49 @@
 """
 Зависимости для FastAPI.
 """
-from typing import Optional
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
 
-from fastapi import Depends
+from fastapi import Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.frameworks_and_drivers.db.database import get_db
+from src.frameworks_and_drivers.config import get_moderation_batch_settings, get_publication_settings
+from src.frameworks_and_drivers.db.database import AsyncSessionLocal, get_db
 from src.frameworks_and_drivers.gateways.llm_moderation_gateway import LLMModerationGateway
 from src.frameworks_and_drivers.gateways.telegram_bot_gateway import TelegramBotGateway
 from src.frameworks_and_drivers.repositories.sqlalchemy_confession_repository import (
     SqlAlchemyConfessionRepository,
 )
-from src.interface_adapters.controllers import ConfessionController, PollController
+from src.frameworks_and_drivers.repositories.sqlalchemy_moderation_job_repository import (
+    SqlAlchemyModerationJobRepository,
+)
+from src.frameworks_and_drivers.repositories.sqlalchemy_poll_repository import SqlAlchemyPollRepository
+from src.frameworks_and_drivers.repositories.sqlalchemy_tag_repository import SqlAlchemyTagRepository
+from src.frameworks_and_drivers.rest_api.http_cache import ReadThroughCache, ResponseCache
+from src.frameworks_and_drivers.workers.poll_broadcaster import PollResultsBroadcaster
+from src.frameworks_and_drivers.workers.vote_buffer import VoteBuffer
+from src.interface_adapters.controllers import (
+    ConfessionController,
+    ModerationController,
+    PollController,
+    TagController,
+)
 from src.use_cases.confession_use_cases import (
     CreateConfessionUseCase,
+    GetConfessionUseCase,
+    ListConfessionsUseCase,
     ModerateConfessionUseCase,
     PublishConfessionUseCase,
+    SearchConfessionsUseCase,
+    UpdateConfessionStatusUseCase,
 )
+from src.use_cases.moderation_use_cases import (
+    BatchModerateConfessionsUseCase,
+    GetModerationJobUseCase,
+    RequestModerationUseCase,
+)
+from src.use_cases.poll_use_cases import GetPollResultsUseCase, VoteInPollUseCase
+from src.use_cases.tag_use_cases import ListPopularTagsUseCase, ListTagConfessionsUseCase
 
 
 async def get_confession_repository(
@@ -29,27 +55,82 @@ async def get_confession_repository(
     return SqlAlchemyConfessionRepository(session)
 
 
-async def get_telegram_gateway() -> TelegramBotGateway:
+async def get_moderation_job_repository(
+    session: AsyncSession = Depends(get_db),
+) -> SqlAlchemyModerationJobRepository:
+    """
+    Возвращает репозиторий очереди задач модерации.
+    """
+    return SqlAlchemyModerationJobRepository(session)
+
+
+async def get_poll_repository(
+    session: AsyncSession = Depends(get_db),
+) -> SqlAlchemyPollRepository:
+    """
+    Возвращает репозиторий для работы с опросами.
+    """
+    return SqlAlchemyPollRepository(session)
+
+
+async def get_tag_repository(
+    session: AsyncSession = Depends(get_db),
+) -> SqlAlchemyTagRepository:
+    """
+    Возвращает репозиторий для работы с тегами.
+    """
+    return SqlAlchemyTagRepository(session)
+
+
+async def get_vote_buffer(request: Request) -> Optional[VoteBuffer]:
+    """
+    Возвращает буфер голосов, созданный при старте приложения (None, если буфер выключен).
+    """
+    return request.app.state.vote_buffer
+
+
+async def get_poll_results_cache(request: Request) -> Optional[ResponseCache]:
+    """
+    Возвращает общий для процесса кэш результатов опросов (None, если кэш выключен).
+    """
+    return request.app.state.poll_results_cache
+
+
+async def get_feed_cache(request: Request) -> Optional[ReadThroughCache]:
     """
-    Возвращает гейтвей для работы с Telegram.
+    Возвращает общий для процесса кэш публичной ленты (None, если кэш выключен).
     """
-    return TelegramBotGateway()
+    return getattr(request.app.state, "feed_cache", None)
 
 
-async def get_moderation_gateway() -> LLMModerationGateway:
+async def get_poll_broadcaster(request: Request) -> PollResultsBroadcaster:
     """
-    Возвращает гейтвей для работы с системой модерации.
+    Возвращает рассыльщик результатов опросов, созданный при старте приложения.
     """
-    return LLMModerationGateway()
+    return request.app.state.poll_broadcaster
+
+
+async def get_telegram_gateway(request: Request) -> TelegramBotGateway:
+    """
+    Возвращает гейтвей для работы с Telegram, созданный при старте приложения.
+    """
+    return request.app.state.telegram_gateway
+
+
+async def get_moderation_gateway(request: Request) -> LLMModerationGateway:
+    """
+    Возвращает гейтвей для работы с системой модерации, созданный при старте приложения.
+    """
+    return request.app.state.moderation_gateway
 
 
 async def get_create_confession_use_case(
     confession_repository: SqlAlchemyConfessionRepository = Depends(get_confession_repository),
 ) -> CreateConfessionUseCase:
     """
-    Возвращает UseCase для создания признания.
+    Возвращает UseCase для создания признания (с постановкой в очередь модерации).
     """
-    return CreateConfessionUseCase(confession_repository)
+    return CreateConfessionUseCase(confession_repository, enqueue_moderation=True)
 
 
 async def get_moderate_confession_use_case(
@@ -62,20 +143,117 @@ async def get_moderate_confession_use_case(
     return ModerateConfessionUseCase(moderation_gateway, confession_repository)
 
 
+async def get_request_moderation_use_case(
+    confession_repository: SqlAlchemyConfessionRepository = Depends(get_confession_repository),
+    moderation_job_repository: SqlAlchemyModerationJobRepository = Depends(get_moderation_job_repository),
+) -> RequestModerationUseCase:
+    """
+    Возвращает UseCase для постановки признания в очередь модерации.
+    """
+    return RequestModerationUseCase(confession_repository, moderation_job_repository)
+
+
+async def get_moderation_job_use_case(
+    moderation_job_repository: SqlAlchemyModerationJobRepository = Depends(get_moderation_job_repository),
+) -> GetModerationJobUseCase:
+    """
+    Возвращает UseCase для получения состояния задачи модерации.
+    """
+    return GetModerationJobUseCase(moderation_job_repository)
+
+
+async def get_batch_moderate_confessions_use_case(
+    moderation_gateway: LLMModerationGateway = Depends(get_moderation_gateway),
+    confession_repository: SqlAlchemyConfessionRepository = Depends(get_confession_repository),
+) -> BatchModerateConfessionsUseCase:
+    """
+    Возвращает UseCase для пакетной модерации признаний.
+    """
+    settings = get_moderation_batch_settings()
+    return BatchModerateConfessionsUseCase(
+        moderation_gateway,
+        confession_repository,
+        batch_size=settings.batch_size,
+        concurrency=settings.concurrency,
+    )
+
+
 async def get_publish_confession_use_case(
-    telegram_gateway: TelegramBotGateway = Depends(get_telegram_gateway),
     confession_repository: SqlAlchemyConfessionRepository = Depends(get_confession_repository),
+    feed_cache: Optional[ReadThroughCache] = Depends(get_feed_cache),
 ) -> PublishConfessionUseCase:
     """
-    Возвращает UseCase для публикации признания.
+    Возвращает UseCase для публикации признания (постановки в исходящую очередь).
     """
-    return PublishConfessionUseCase(telegram_gateway, confession_repository)
+    return PublishConfessionUseCase(
+        confession_repository,
+        channel_ids=get_publication_settings().channel_ids,
+        feed_cache=feed_cache,
+    )
+
+
+async def get_list_confessions_use_case(
+    confession_repository: SqlAlchemyConfessionRepository = Depends(get_confession_repository),
+) -> ListConfessionsUseCase:
+    """
+    Возвращает UseCase для получения списка признаний.
+    """
+    return ListConfessionsUseCase(confession_repository)
+
+
+async def get_get_confession_use_case(
+    confession_repository: SqlAlchemyConfessionRepository = Depends(get_confession_repository),
+) -> GetConfessionUseCase:
+    """
+    Возвращает UseCase для получения признания по ID.
+    """
+    return GetConfessionUseCase(confession_repository)
+
+
+async def get_update_confession_status_use_case(
+    confession_repository: SqlAlchemyConfessionRepository = Depends(get_confession_repository),
+) -> UpdateConfessionStatusUseCase:
+    """
+    Возвращает UseCase для смены статуса признания.
+    """
+    return UpdateConfessionStatusUseCase(confession_repository)
+
+
+async def get_search_confessions_use_case(
+    confession_repository: SqlAlchemyConfessionRepository = Depends(get_confession_repository),
+) -> SearchConfessionsUseCase:
+    """
+    Возвращает UseCase для полнотекстового поиска признаний.
+    """
+    return SearchConfessionsUseCase(confession_repository)
+
+
+@asynccontextmanager
+async def streaming_list_confessions_use_case() -> AsyncIterator[ListConfessionsUseCase]:
+    """
+    Возвращает UseCase для потоковой выдачи признаний на собственной сессии.
+    
+    Зависимости с yield закрываются до отправки тела ответа, поэтому
+    StreamingResponse не может пользоваться сессией из get_db: сессия
+    должна жить ровно столько, сколько генератор ответа. По той же причине
+    на собственной сессии загружается кэш ленты: фоновое обновление
+    переживает запрос, который его запустил.
+    """
+    async with AsyncSessionLocal() as session:
+        yield ListConfessionsUseCase(SqlAlchemyConfessionRepository(session))
 
 
 async def get_confession_controller(
     create_confession_use_case: CreateConfessionUseCase = Depends(get_create_confession_use_case),
     moderate_confession_use_case: ModerateConfessionUseCase = Depends(get_moderate_confession_use_case),
     publish_confession_use_case: PublishConfessionUseCase = Depends(get_publish_confession_use_case),
+    list_confessions_use_case: ListConfessionsUseCase = Depends(get_list_confessions_use_case),
+    request_moderation_use_case: RequestModerationUseCase = Depends(get_request_moderation_use_case),
+    get_confession_use_case: GetConfessionUseCase = Depends(get_get_confession_use_case),
+    update_confession_status_use_case: UpdateConfessionStatusUseCase = Depends(
+        get_update_confession_status_use_case
+    ),
+    search_confessions_use_case: SearchConfessionsUseCase = Depends(get_search_confessions_use_case),
 ) -> ConfessionController:
     """
     Возвращает контроллер для работы с признаниями.
@@ -84,13 +262,82 @@ async def get_confession_controller(
         create_confession_use_case,
         moderate_confession_use_case,
         publish_confession_use_case,
+        list_confessions_use_case,
+        request_moderation_use_case,
+        get_confession_use_case,
+        update_confession_status_use_case,
+        search_confessions_use_case,
     )
 
 
+async def get_moderation_controller(
+    get_moderation_job_use_case: GetModerationJobUseCase = Depends(get_moderation_job_use_case),
+    batch_moderate_confessions_use_case: BatchModerateConfessionsUseCase = Depends(
+        get_batch_moderate_confessions_use_case
+    ),
+) -> ModerationController:
+    """
+    Возвращает контроллер для фоновой и пакетной модерации.
+    """
+    return ModerationController(get_moderation_job_use_case, batch_moderate_confessions_use_case)
+
+
+async def get_vote_in_poll_use_case(
+    poll_repository: SqlAlchemyPollRepository = Depends(get_poll_repository),
+    vote_buffer: Optional[VoteBuffer] = Depends(get_vote_buffer),
+    results_cache: Optional[ResponseCache] = Depends(get_poll_results_cache),
+    poll_broadcaster: PollResultsBroadcaster = Depends(get_poll_broadcaster),
+) -> VoteInPollUseCase:
+    """
+    Возвращает UseCase для голосования в опросе.
+    """
+    return VoteInPollUseCase(poll_repository, vote_buffer, results_cache, poll_broadcaster)
+
+
+async def get_poll_results_use_case(
+    poll_repository: SqlAlchemyPollRepository = Depends(get_poll_repository),
+    vote_buffer: Optional[VoteBuffer] = Depends(get_vote_buffer),
+) -> GetPollResultsUseCase:
+    """
+    Возвращает UseCase для получения результатов опроса.
+    """
+    return GetPollResultsUseCase(poll_repository, vote_buffer)
+
+
 async def get_poll_controller(
     create_confession_use_case: CreateConfessionUseCase = Depends(get_create_confession_use_case),
+    vote_in_poll_use_case: VoteInPollUseCase = Depends(get_vote_in_poll_use_case),
+    get_poll_results_use_case: GetPollResultsUseCase = Depends(get_poll_results_use_case),
 ) -> PollController:
     """
     Возвращает контроллер для работы с опросами.
     """
-    return PollController(create_confession_use_case) 
\ No newline at end of file
+    return PollController(create_confession_use_case, vote_in_poll_use_case, get_poll_results_use_case)
+
+
+async def get_list_popular_tags_use_case(
+    tag_repository: SqlAlchemyTagRepository = Depends(get_tag_repository),
+) -> ListPopularTagsUseCase:
+    """
+    Возвращает UseCase для получения популярных тегов.
+    """
+    return ListPopularTagsUseCase(tag_repository)
+
+
+async def get_list_tag_confessions_use_case(
+    confession_repository: SqlAlchemyConfessionRepository = Depends(get_confession_repository),
+) -> ListTagConfessionsUseCase:
+    """
+    Возвращает UseCase для ленты признаний по тегу.
+    """
+    return ListTagConfessionsUseCase(confession_repository)
+
+
+async def get_tag_controller(
+    list_popular_tags_use_case: ListPopularTagsUseCase = Depends(get_list_popular_tags_use_case),
+    list_tag_confessions_use_case: ListTagConfessionsUseCase = Depends(get_list_tag_confessions_use_case),
+) -> TagController:
+    """
+    Возвращает контроллер для работы с тегами.
+    """
+    return TagController(list_popular_tags_use_case, list_tag_confessions_use_case)
@@ -0,0 +1,80 @@
+"""
+Автоматический выключатель (circuit breaker) для вызовов внешних API.
+"""
+import time
+from typing import Callable, Optional
+
+
+class CircuitBreaker:
+    """
+    Размыкает цепь после серии неудачных вызовов.
+
+    Пока цепь разомкнута, вызовы не выполняются вовсе, и внешний сервис
+    получает время восстановиться. По истечении reset_timeout пропускается
+    один пробный вызов: успех замыкает цепь, неудача размыкает ее снова.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        reset_timeout: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Инициализация выключателя.
+
+        Args:
+            failure_threshold: Сколько неудач подряд размыкают цепь
+            reset_timeout: Сколько секунд цепь остается разомкнутой
+            clock: Источник времени в секундах
+        """
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probe_in_flight = False
+
+    @property
+    def is_open(self) -> bool:
+        """Разомкнута ли цепь (в том числе в ожидании пробного вызова)."""
+        return self._opened_at is not None
+
+    def allow(self) -> bool:
+        """
+        Проверяет, можно ли выполнить вызов.
+
+        Returns:
+            bool: True, если цепь замкнута или настало время пробного вызова
+        """
+        if self._opened_at is None:
+            return True
+
+        if self._probe_in_flight or self._clock() - self._opened_at < self._reset_timeout:
+            return False
+
+        self._probe_in_flight = True
+        return True
+
+    def record_success(self) -> None:
+        """Учитывает успешный вызов и замыкает цепь."""
+        self._failures = 0
+        self._opened_at = None
+        self._probe_in_flight = False
+
+    def release(self) -> None:
+        """
+        Завершает вызов без вердикта о доступности сервиса.
+
+        Нужен, когда вызов оборвался по причине, не связанной с состоянием
+        сервиса (ошибка запроса, разбора ответа, отмена): пробный вызов
+        снимается, и следующий allow() может пропустить новый.
+        """
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        """Учитывает неудачный вызов; при достижении порога размыкает цепь."""
+        self._failures += 1
+        self._probe_in_flight = False
+        if self._opened_at is not None or self._failures >= self._failure_threshold:
+            self._opened_at = self._clock()
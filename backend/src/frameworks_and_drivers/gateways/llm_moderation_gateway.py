@@ -1,32 +1,91 @@
 """
 Гейтвей для работы с системой модерации на базе LLM.
 """
+import asyncio
 import os
-from typing import Optional
+import random
+import time
+from dataclasses import replace
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, List, Optional
 
 import httpx
 from loguru import logger
 
-from src.entities.confession import Confession
+from src.entities.confession import Confession, ModerationResult
 from src.entities.enums import ConfessionStatus
+from src.frameworks_and_drivers.config import ModerationGatewaySettings
+from src.frameworks_and_drivers.gateways.circuit_breaker import CircuitBreaker
+from src.frameworks_and_drivers.gateways.moderation_cache import ModerationCache, content_hash
+from src.frameworks_and_drivers.metrics import metrics
 from src.interface_adapters.gateway_protocols import ModerationGatewayProtocol
 
+# Ограничения пула соединений к API модерации
+HTTP_POOL_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=30.0)
+HTTP_TIMEOUT = httpx.Timeout(10.0, connect=5.0)
+
+# Ответы, после которых запрос имеет смысл повторить
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+moderation_retries = metrics.counter("moderation_api_retries_total", "Повторные запросы к API модерации")
+moderation_short_circuits = metrics.counter(
+    "moderation_api_short_circuits_total",
+    "Вызовы API модерации, отклоненные разомкнутой цепью",
+)
+
+
+class ModerationUnavailableError(Exception):
+    """API модерации не ответило после всех попыток."""
+
 
 class LLMModerationGateway(ModerationGatewayProtocol):
     """Реализация гейтвея для работы с системой модерации на базе LLM."""
     
-    def __init__(self) -> None:
-        """Инициализация клиента для API модерации."""
+    def __init__(
+        self,
+        http_client: Optional[httpx.AsyncClient] = None,
+        cache: Optional[ModerationCache] = None,
+        settings: Optional[ModerationGatewaySettings] = None,
+    ) -> None:
+        """
+        Инициализация клиента для API модерации.
+        
+        Гейтвей рассчитан на одно создание на все приложение: HTTP-клиент
+        держит пул keep-alive соединений, поэтому TLS-рукопожатие
+        не повторяется на каждый запрос. Состояния между вызовами гейтвей
+        не хранит: причина отклонения возвращается в ModerationResult.
+        
+        Медленный или перегруженный API не должен копить зависшие запросы:
+        каждая попытка ограничена по времени, число одновременных запросов
+        ограничено семафором, а после серии неудач цепь размыкается
+        и признания сразу остаются PENDING.
+        
+        Args:
+            http_client: HTTP-клиент; если не передан, создается собственный
+            cache: Кэш решений по хэшу текста; без него каждый текст уходит в API
+            settings: Таймауты, повторы, лимит параллельности и параметры выключателя
+        """
         self._api_key = os.getenv("MODERATION_API_KEY")
         self._api_url = os.getenv("MODERATION_API_URL", "https://api.openai.com/v1/moderations")
+        self._client = http_client or httpx.AsyncClient(limits=HTTP_POOL_LIMITS, timeout=HTTP_TIMEOUT)
+        self._cache = cache
+        self._settings = settings or ModerationGatewaySettings()
+        self._semaphore = asyncio.Semaphore(self._settings.max_concurrency)
+        self._breaker = CircuitBreaker(
+            self._settings.breaker_failure_threshold,
+            self._settings.breaker_reset_timeout,
+        )
+        metrics.gauge(
+            "moderation_circuit_open",
+            "Разомкнута ли цепь вызовов API модерации (1 - да)",
+            lambda: float(self._breaker.is_open),
+        )
         
         if not self._api_key:
             logger.warning("MODERATION_API_KEY not set, using mock implementation")
-        
-        # Сохраняем причины отклонения для последующего получения
-        self._rejection_reasons = {}
     
-    async def moderate(self, confession: Confession) -> ConfessionStatus:
+    async def moderate(self, confession: Confession) -> ModerationResult:
         """
         Проводит модерацию признания с помощью LLM.
         
@@ -34,73 +93,229 @@ class LLMModerationGateway(ModerationGatewayProtocol):
             confession: Доменная сущность признания
             
         Returns:
-            ConfessionStatus: Статус признания после модерации (APPROVED/REJECTED)
+            ModerationResult: Статус признания после модерации (APPROVED/REJECTED),
+                причина отклонения, оценки по категориям и время ответа
         """
+        results = await self.moderate_many([confession])
+        return results[0]
+    
+    async def moderate_many(self, confessions: List[Confession]) -> List[ModerationResult]:
+        """
+        Проводит модерацию нескольких признаний одним запросом к API.
+        
+        API модерации принимает массив в поле input и возвращает результаты
+        в том же порядке, поэтому накладные расходы на запрос делятся
+        на всю пачку. Если задан кэш, в API уходят только тексты,
+        решения по которым еще не известны.
+        
+        Args:
+            confessions: Доменные сущности признаний
+            
+        Returns:
+            List[ModerationResult]: Результаты в порядке признаний
+        """
+        if not confessions:
+            return []
+        
         if not self._api_key:
             # Mock-реализация для тестирования
-            logger.info(f"Mock: Moderating confession: {confession.content[:50]}...")
-            
-            # Простая заглушка: отклоняем, если содержит ключевые слова
-            forbidden_words = ["bad", "offensive", "inappropriate", "hate"]
-            
-            for word in forbidden_words:
-                if word in confession.content.lower():
-                    self._rejection_reasons[confession.id] = f"Content contains forbidden word: '{word}'"
-                    return ConfessionStatus.REJECTED
-            
-            return ConfessionStatus.APPROVED
+            return [self._mock_moderate(confession) for confession in confessions]
         
+        if self._cache is None:
+            return await self._request_moderation(confessions)
+        
+        # Одинаковые (после нормализации) тексты проверяются один раз
+        keys = [content_hash(confession.content) for confession in confessions]
+        results: Dict[str, ModerationResult] = {}
+        misses: Dict[str, Confession] = {}
+        
+        for key, confession in zip(keys, confessions):
+            if key in results or key in misses:
+                continue
+            cached = await self._cache.get(key)
+            if cached is not None:
+                # Ответ из кэша не стоит запроса к API
+                results[key] = replace(cached, latency=0.0)
+            else:
+                misses[key] = confession
+        
+        if misses:
+            fresh = await self._request_moderation(list(misses.values()))
+            for key, result in zip(misses, fresh):
+                results[key] = result
+                if result.status != ConfessionStatus.PENDING:
+                    # Ошибка API - не решение, кэшировать нечего
+                    await self._cache.set(key, result)
+        
+        return [results[key] for key in keys]
+    
+    async def _request_moderation(self, confessions: List[Confession]) -> List[ModerationResult]:
+        """Отправляет тексты признаний в API модерации одним запросом."""
+        if not self._breaker.allow():
+            # Провайдер недоступен - не ждем, признания остаются на ручной модерации
+            moderation_short_circuits.inc()
+            logger.warning(f"Moderation circuit is open, leaving {len(confessions)} confessions pending")
+            return [ModerationResult(status=ConfessionStatus.PENDING) for _ in confessions]
+        
+        started_at = time.perf_counter()
+        # Пробный вызов полуоткрытой цепи снимается на любом исходе, включая отмену
+        verdict_recorded = False
         try:
-            # Формируем запрос к API модерации
-            headers = {
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {self._api_key}",
-            }
-            
             data = {
-                "input": confession.content,
+                "input": [confession.content for confession in confessions],
             }
             
-            # Отправляем запрос
-            async with httpx.AsyncClient() as client:
-                response = await client.post(self._api_url, headers=headers, json=data)
-                response.raise_for_status()
-                result = response.json()
+            response = await self._post_with_retries(data)
+            results = response.json()["results"]
+            latency = time.perf_counter() - started_at
             
-            # Анализируем результат
-            if result["results"][0]["flagged"]:
-                # Сохраняем категории нарушений
-                categories = result["results"][0]["categories"]
-                flagged_categories = [
-                    category for category, flagged in categories.items() if flagged
-                ]
-                
-                self._rejection_reasons[confession.id] = (
-                    f"Content flagged for: {', '.join(flagged_categories)}"
-                )
-                
-                logger.info(f"Confession {confession.id} rejected: {self._rejection_reasons[confession.id]}")
-                return ConfessionStatus.REJECTED
+            if len(results) != len(confessions):
+                raise ValueError(f"Expected {len(confessions)} moderation results, got {len(results)}")
             
-            logger.info(f"Confession {confession.id} approved by moderation system")
-            return ConfessionStatus.APPROVED
+            self._breaker.record_success()
+            verdict_recorded = True
+            
+            # Анализируем результаты
+            return [
+                self._to_result(confession, result, latency)
+                for confession, result in zip(confessions, results)
+            ]
         
+        except ModerationUnavailableError as e:
+            self._breaker.record_failure()
+            verdict_recorded = True
+            logger.error(f"Moderation API unavailable: {str(e)}")
         except Exception as e:
             logger.error(f"Error during moderation: {str(e)}")
-            # В случае ошибки лучше отправить на ручную модерацию
-            return ConfessionStatus.PENDING
+        finally:
+            if not verdict_recorded:
+                self._breaker.release()
+        
+        # В случае ошибки лучше отправить на ручную модерацию
+        latency = time.perf_counter() - started_at
+        return [ModerationResult(status=ConfessionStatus.PENDING, latency=latency) for _ in confessions]
     
-    async def get_moderation_reason(self, confession: Confession) -> Optional[str]:
+    async def _post_with_retries(self, data: Dict[str, Any]) -> httpx.Response:
         """
-        Получает причину отклонения признания при модерации.
+        Отправляет запрос, повторяя его при 429/5xx, таймаутах и сетевых ошибках.
         
-        Args:
-            confession: Доменная сущность признания
-            
-        Returns:
-            Optional[str]: Причина отклонения или None, если признание одобрено
+        Между попытками выдерживается экспоненциальная задержка со случайным
+        разбросом или пауза из заголовка Retry-After. Если сервер просит
+        ждать дольше backoff_max, повторов больше не будет.
+        
+        Raises:
+            ModerationUnavailableError: Если все попытки исчерпаны
+            httpx.HTTPStatusError: При ответе с неповторяемой ошибкой (например, 400)
         """
-        if confession.id in self._rejection_reasons:
-            return self._rejection_reasons[confession.id]
+        headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {self._api_key}",
+        }
+        
+        for attempt in range(self._settings.max_retries + 1):
+            retry_after = None
+            try:
+                async with self._semaphore:
+                    response = await asyncio.wait_for(
+                        self._client.post(self._api_url, headers=headers, json=data),
+                        timeout=self._settings.call_timeout,
+                    )
+            except (httpx.TransportError, asyncio.TimeoutError) as e:
+                error = f"{type(e).__name__}: {e}"
+            else:
+                if response.status_code not in RETRYABLE_STATUS_CODES:
+                    response.raise_for_status()
+                    return response
+                error = f"HTTP {response.status_code}"
+                retry_after = self._parse_retry_after(response.headers.get("Retry-After"))
+            
+            if attempt == self._settings.max_retries:
+                break
+            
+            delay = self._backoff_delay(attempt, retry_after)
+            if delay is None:
+                error = f"{error}, Retry-After {retry_after:.0f}s exceeds backoff limit"
+                break
+            
+            moderation_retries.inc()
+            logger.warning(f"Moderation API attempt {attempt + 1} failed ({error}), retrying in {delay:.2f}s")
+            await asyncio.sleep(delay)
+        
+        raise ModerationUnavailableError(error)
+    
+    def _backoff_delay(self, attempt: int, retry_after: Optional[float]) -> Optional[float]:
+        """Задержка перед повторной попыткой или None, если ждать дольше разрешенного."""
+        if retry_after is not None:
+            return retry_after if retry_after <= self._settings.backoff_max else None
         
-        return None 
\ No newline at end of file
+        # Экспоненциальная задержка с полным случайным разбросом
+        ceiling = min(self._settings.backoff_max, self._settings.backoff_base * 2 ** attempt)
+        return random.uniform(0, ceiling)
+    
+    @staticmethod
+    def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """Разбирает Retry-After: число секунд или HTTP-дата."""
+        if not value:
+            return None
+        
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    
+    @staticmethod
+    def _mock_moderate(confession: Confession) -> ModerationResult:
+        """Заглушка модерации: отклоняет признания с ключевыми словами."""
+        logger.info(f"Mock: Moderating confession: {confession.content[:50]}...")
+        
+        # Простая заглушка: отклоняем, если содержит ключевые слова
+        forbidden_words = ["bad", "offensive", "inappropriate", "hate"]
+        
+        for word in forbidden_words:
+            if word in confession.content.lower():
+                return ModerationResult(
+                    status=ConfessionStatus.REJECTED,
+                    reason=f"Content contains forbidden word: '{word}'",
+                )
+        
+        return ModerationResult(status=ConfessionStatus.APPROVED)
+    
+    @staticmethod
+    def _to_result(confession: Confession, result: Dict[str, Any], latency: float) -> ModerationResult:
+        """Преобразует ответ API для одного признания в результат модерации."""
+        category_scores = result.get("category_scores", {})
+        
+        if result["flagged"]:
+            # Перечисляем категории нарушений
+            categories = result["categories"]
+            flagged_categories = [
+                category for category, flagged in categories.items() if flagged
+            ]
+            reason = f"Content flagged for: {', '.join(flagged_categories)}"
+            
+            logger.info(f"Confession {confession.id} rejected: {reason}")
+            return ModerationResult(
+                status=ConfessionStatus.REJECTED,
+                reason=reason,
+                category_scores=category_scores,
+                latency=latency,
+            )
+        
+        logger.info(f"Confession {confession.id} approved by moderation system")
+        return ModerationResult(
+            status=ConfessionStatus.APPROVED,
+            category_scores=category_scores,
+            latency=latency,
+        )
+    
+    async def close(self) -> None:
+        """Закрывает пул HTTP-соединений."""
+        await self._client.aclose()
@@ -0,0 +1,222 @@
+"""
+Кэш решений модерации по хэшу нормализованного текста.
+"""
+import hashlib
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Callable, Optional, Tuple
+
+from loguru import logger
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.entities.confession import ModerationResult
+from src.frameworks_and_drivers.config import ModerationCacheSettings
+from src.frameworks_and_drivers.metrics import metrics
+from src.frameworks_and_drivers.models.confession import ModerationCacheModel
+
+# Все, кроме букв и цифр, при нормализации считается разделителем
+NON_WORD_PATTERN = re.compile(r"[\W_]+")
+
+cache_hits = {
+    tier: metrics.counter("moderation_cache_hits_total", "Решения модерации, найденные в кэше", tier=tier)
+    for tier in ("memory", "postgres")
+}
+cache_misses = metrics.counter("moderation_cache_misses_total", "Решения модерации, не найденные в кэше")
+
+
+def normalize_content(content: str) -> str:
+    """
+    Приводит текст к виду, в котором почти одинаковые тексты совпадают.
+
+    Регистр, юникод-варианты символов, пунктуация и пробелы не влияют
+    на результат: "Привет,  МИР!" и "привет мир" нормализуются одинаково.
+    """
+    content = unicodedata.normalize("NFKC", content).casefold()
+    return NON_WORD_PATTERN.sub(" ", content).strip()
+
+
+def content_hash(content: str) -> str:
+    """Возвращает SHA-256 нормализованного текста (ключ кэша)."""
+    return hashlib.sha256(normalize_content(content).encode()).hexdigest()
+
+
+class PostgresModerationCacheStore:
+    """
+    Общий уровень кэша в таблице moderation_cache.
+
+    Гейтвей живет все время работы процесса, поэтому хранилище
+    открывает короткую сессию на каждое обращение.
+    """
+
+    def __init__(self, session_factory: Callable[[], AsyncSession]) -> None:
+        """
+        Инициализация хранилища.
+
+        Args:
+            session_factory: Фабрика сессий SQLAlchemy
+        """
+        self._session_factory = session_factory
+
+    async def get(self, key: str) -> Optional[Tuple[ModerationResult, float]]:
+        """Возвращает неистекшее решение по ключу и сколько секунд оно еще действительно, или None."""
+        now = datetime.now()
+        async with self._session_factory() as session:
+            result = await session.execute(
+                select(
+                    ModerationCacheModel.decision,
+                    ModerationCacheModel.reason,
+                    ModerationCacheModel.category_scores,
+                    ModerationCacheModel.expires_at,
+                ).where(
+                    ModerationCacheModel.content_hash == key,
+                    ModerationCacheModel.expires_at > now,
+                )
+            )
+            row = result.first()
+
+        if row is None:
+            return None
+        decision = ModerationResult(status=row.decision, reason=row.reason, category_scores=row.category_scores or {})
+        return decision, (row.expires_at - now).total_seconds()
+
+    async def set(self, key: str, decision: ModerationResult, ttl_seconds: float) -> None:
+        """Сохраняет решение, перезаписывая прежнее для того же ключа."""
+        now = datetime.now()
+        values = dict(
+            decision=decision.status,
+            reason=decision.reason,
+            category_scores=decision.category_scores,
+            expires_at=now + timedelta(seconds=ttl_seconds),
+            created_at=now,
+        )
+
+        async with self._session_factory() as session:
+            await session.execute(
+                pg_insert(ModerationCacheModel)
+                .values(content_hash=key, **values)
+                .on_conflict_do_update(index_elements=[ModerationCacheModel.content_hash], set_=values)
+            )
+            await session.commit()
+
+
+class ModerationCache:
+    """
+    Двухуровневый кэш решений модерации.
+
+    Первый уровень - LRU-словарь в памяти процесса с TTL, второй
+    (необязательный) - таблица PostgreSQL, общая для всех воркеров.
+    Ошибки второго уровня не прерывают модерацию: кэш просто
+    считается промахнувшимся.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        max_entries: int,
+        store: Optional[PostgresModerationCacheStore] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Инициализация кэша.
+
+        Args:
+            ttl_seconds: Сколько секунд решение считается действительным
+            max_entries: Максимум записей в памяти
+            store: Общее хранилище второго уровня
+            clock: Источник времени в секундах
+        """
+        self._ttl_seconds = ttl_seconds
+        self._max_entries = max_entries
+        self._store = store
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, ModerationResult]]" = OrderedDict()
+        metrics.gauge("moderation_cache_entries", "Записи во внутрипроцессном кэше модерации", lambda: len(self))
+
+    def __len__(self) -> int:
+        """Возвращает количество записей в памяти."""
+        return len(self._entries)
+
+    async def get(self, key: str) -> Optional[ModerationResult]:
+        """
+        Ищет решение сначала в памяти, затем в общем хранилище.
+
+        Args:
+            key: Хэш нормализованного текста
+
+        Returns:
+            Optional[ModerationResult]: Решение или None при промахе
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, decision = entry
+            if expires_at > self._clock():
+                self._entries.move_to_end(key)
+                cache_hits["memory"].inc()
+                return decision
+            del self._entries[key]
+
+        if self._store is not None:
+            try:
+                found = await self._store.get(key)
+            except Exception as e:
+                logger.warning(f"Moderation cache store read failed: {str(e)}")
+                found = None
+
+            if found is not None:
+                # В памяти решение живет не дольше, чем в общем хранилище
+                decision, ttl_seconds = found
+                self._remember(key, decision, min(ttl_seconds, self._ttl_seconds))
+                cache_hits["postgres"].inc()
+                return decision
+
+        cache_misses.inc()
+        return None
+
+    async def set(self, key: str, decision: ModerationResult) -> None:
+        """
+        Сохраняет решение на обоих уровнях.
+
+        Args:
+            key: Хэш нормализованного текста
+            decision: Решение модерации
+        """
+        self._remember(key, decision, self._ttl_seconds)
+
+        if self._store is not None:
+            try:
+                await self._store.set(key, decision, self._ttl_seconds)
+            except Exception as e:
+                logger.warning(f"Moderation cache store write failed: {str(e)}")
+
+    def _remember(self, key: str, decision: ModerationResult, ttl_seconds: float) -> None:
+        """Кладет решение в память на ttl_seconds, вытесняя самые давно использованные записи."""
+        self._entries[key] = (self._clock() + ttl_seconds, decision)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+
+def create_moderation_cache(
+    settings: ModerationCacheSettings,
+    session_factory: Callable[[], AsyncSession],
+) -> Optional[ModerationCache]:
+    """
+    Создает кэш модерации по настройкам.
+
+    Args:
+        settings: Настройки кэша
+        session_factory: Фабрика сессий для общего уровня
+
+    Returns:
+        Optional[ModerationCache]: Кэш или None, если он выключен
+    """
+    if not settings.enabled:
+        return None
+
+    store = PostgresModerationCacheStore(session_factory) if settings.shared else None
+    return ModerationCache(settings.ttl_seconds, settings.max_entries, store)
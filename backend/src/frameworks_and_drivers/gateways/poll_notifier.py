@@ -0,0 +1,93 @@
+"""
+Уведомления об изменении результатов опросов между процессами через PostgreSQL LISTEN/NOTIFY.
+"""
+import uuid
+from typing import Callable, Iterable, List, Optional
+
+import asyncpg
+from loguru import logger
+
+# Разделитель отправителя и списка опросов в payload уведомления
+PAYLOAD_SEPARATOR = ":"
+
+
+class PostgresPollNotifier:
+    """
+    Обмен ID измененных опросов между воркерами uvicorn.
+
+    Держит одно отдельное от пула соединение asyncpg: на нем выполняется
+    LISTEN и через него же отправляются уведомления. Одно уведомление
+    несет все опросы, измененные за период рассылки, а собственные
+    уведомления процесса игнорируются.
+    """
+
+    def __init__(self, dsn: str, channel: str = "poll_results") -> None:
+        """
+        Инициализация канала уведомлений.
+
+        Args:
+            dsn: URL базы данных (допускается формат SQLAlchemy postgresql+asyncpg://)
+            channel: Имя канала LISTEN/NOTIFY
+        """
+        self._dsn = dsn.replace("postgresql+asyncpg://", "postgresql://", 1)
+        self._channel = channel
+        self._origin = uuid.uuid4().hex
+        self._callbacks: List[Callable[[int], None]] = []
+        self._connection: Optional[asyncpg.Connection] = None
+
+    def add_callback(self, callback: Callable[[int], None]) -> None:
+        """
+        Добавляет обработчик уведомлений других процессов.
+
+        Args:
+            callback: Вызывается с ID каждого опроса, измененного в другом процессе
+        """
+        self._callbacks.append(callback)
+
+    async def listen(self) -> None:
+        """Открывает соединение и подписывается на канал."""
+        await self._connect()
+
+    async def notify(self, poll_ids: Iterable[int]) -> None:
+        """
+        Сообщает другим процессам об изменении опросов.
+
+        Вызывается на каждой рассылке, даже без изменений: так разорванное
+        соединение восстанавливается и LISTEN выполняется заново.
+
+        Args:
+            poll_ids: ID измененных опросов
+        """
+        connection = await self._connect()
+        poll_ids = list(poll_ids)
+        if not poll_ids:
+            return
+
+        payload = self._origin + PAYLOAD_SEPARATOR + ",".join(str(poll_id) for poll_id in sorted(poll_ids))
+        await connection.execute("SELECT pg_notify($1, $2)", self._channel, payload)
+
+    async def close(self) -> None:
+        """Закрывает соединение."""
+        if self._connection is not None and not self._connection.is_closed():
+            await self._connection.close()
+        self._connection = None
+
+    async def _connect(self) -> asyncpg.Connection:
+        """Возвращает соединение с выполненным LISTEN, переподключаясь после разрыва."""
+        if self._connection is None or self._connection.is_closed():
+            self._connection = await asyncpg.connect(self._dsn)
+            await self._connection.add_listener(self._channel, self._on_notification)
+            logger.info(f"Listening for poll updates on channel {self._channel}")
+        return self._connection
+
+    def _on_notification(self, connection: asyncpg.Connection, pid: int, channel: str, payload: str) -> None:
+        """Разбирает уведомление и передает ID опросов подписчикам."""
+        origin, _, poll_ids = payload.partition(PAYLOAD_SEPARATOR)
+        if origin == self._origin:
+            return
+
+        for poll_id in poll_ids.split(","):
+            if not poll_id.isdigit():
+                continue
+            for callback in self._callbacks:
+                callback(int(poll_id))
@@ -0,0 +1,231 @@
+"""
+Ограничение частоты отправки сообщений по каналам.
+"""
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, Optional, Protocol
+
+from loguru import logger
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.frameworks_and_drivers.models.confession import ChannelSendSlotModel
+from src.interface_adapters.gateway_protocols import PublicationTemporaryError
+
+
+class RateLimiter(Protocol):
+    """Ограничитель частоты отправки сообщений по каналам."""
+
+    async def acquire(self, channel_id: str, messages: int = 1) -> None:
+        """Дожидается разрешения на отправку messages сообщений в канал."""
+        ...
+
+    async def pause(self, channel_id: str, seconds: float) -> None:
+        """Приостанавливает отправку в канал (Telegram вернул RetryAfter)."""
+        ...
+
+
+class TokenBucket:
+    """
+    Корзина токенов: не больше burst отправок подряд и rate_per_minute в среднем.
+    """
+
+    def __init__(self, rate_per_minute: float, burst: int, now: float) -> None:
+        """
+        Инициализация корзины.
+
+        Args:
+            rate_per_minute: Скорость пополнения, токенов в минуту
+            burst: Емкость корзины
+            now: Текущее время в секундах
+        """
+        self._rate = rate_per_minute / 60.0
+        self._capacity = float(burst)
+        self._tokens = float(burst)
+        self._updated_at = now
+        self._paused_until = now
+
+    def reserve(self, now: float, tokens: int = 1) -> float:
+        """
+        Резервирует токены.
+
+        Args:
+            now: Текущее время в секундах
+            tokens: Сколько токенов взять (по одному на сообщение)
+
+        Returns:
+            float: Сколько секунд ждать до отправки (0 - можно отправлять сразу)
+        """
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated_at) * self._rate)
+        self._updated_at = now
+        self._tokens -= tokens
+
+        wait = 0.0 if self._tokens >= 0 else -self._tokens / self._rate
+        return max(wait, self._paused_until - now)
+
+    def pause(self, until: float) -> None:
+        """Запрещает отправку до указанного момента (например, после RetryAfter)."""
+        self._paused_until = max(self._paused_until, until)
+
+
+class ChannelRateLimiter:
+    """
+    Набор корзин токенов, по одной на каждый канал.
+
+    Лимиты Telegram действуют на отдельный чат, поэтому медленный
+    канал не задерживает отправку в остальные. Корзины живут в памяти
+    процесса: при нескольких процессах лимит складывается, для них
+    есть PostgresChannelRateLimiter.
+    """
+
+    def __init__(
+        self,
+        rate_per_minute: float,
+        burst: int,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ) -> None:
+        """
+        Инициализация ограничителя.
+
+        Args:
+            rate_per_minute: Сообщений в минуту на канал
+            burst: Сколько сообщений можно отправить подряд без ожидания
+            clock: Источник времени в секундах
+            sleep: Функция ожидания
+        """
+        self._rate_per_minute = rate_per_minute
+        self._burst = burst
+        self._clock = clock
+        self._sleep = sleep
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    async def acquire(self, channel_id: str, messages: int = 1) -> None:
+        """
+        Дожидается разрешения на отправку сообщений в канал.
+
+        Args:
+            channel_id: ID канала
+            messages: Сколько сообщений будет отправлено (альбом - по сообщению на файл)
+        """
+        wait = self._bucket(channel_id).reserve(self._clock(), messages)
+        if wait > 0:
+            await self._sleep(wait)
+
+    async def pause(self, channel_id: str, seconds: float) -> None:
+        """
+        Приостанавливает отправку в канал (Telegram вернул RetryAfter).
+
+        Args:
+            channel_id: ID канала
+            seconds: Длительность паузы
+        """
+        self._bucket(channel_id).pause(self._clock() + seconds)
+
+    def _bucket(self, channel_id: str) -> TokenBucket:
+        """Возвращает корзину канала, создавая ее при первом обращении."""
+        bucket = self._buckets.get(channel_id)
+        if bucket is None:
+            bucket = self._buckets[channel_id] = TokenBucket(self._rate_per_minute, self._burst, self._clock())
+        return bucket
+
+
+class PostgresChannelRateLimiter:
+    """
+    Лимит частоты отправки в канал, общий для всех процессов.
+
+    Каждый воркер uvicorn запускает своего отправителя, и корзины в памяти
+    пропускали бы в канал в N раз больше сообщений, чем настроено.
+    Здесь состояние канала - одна строка channel_send_slots, а место
+    в очереди отправки резервируется одним атомарным запросом по алгоритму
+    GCRA (эквивалент token bucket): теоретическое время следующей отправки
+    сдвигается на интервал за каждое сообщение, отправлять можно не раньше
+    чем за burst интервалов до него. Время берется из часов PostgreSQL,
+    поэтому расхождение часов процессов не влияет на лимит.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        rate_per_minute: float,
+        burst: int,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ) -> None:
+        """
+        Инициализация ограничителя.
+
+        Args:
+            session_factory: Фабрика сессий SQLAlchemy
+            rate_per_minute: Сообщений в минуту на канал
+            burst: Сколько сообщений можно отправить подряд без ожидания
+            sleep: Функция ожидания
+        """
+        self._session_factory = session_factory
+        self._interval = timedelta(minutes=1) / rate_per_minute
+        self._burst = burst
+        self._sleep = sleep
+
+    async def acquire(self, channel_id: str, messages: int = 1) -> None:
+        """
+        Резервирует отправку messages сообщений в канал и дожидается своей очереди.
+
+        Args:
+            channel_id: ID канала
+            messages: Сколько сообщений будет отправлено (альбом - по сообщению на файл)
+
+        Raises:
+            PublicationTemporaryError: Если хранилище лимита недоступно (сообщение не отправлено)
+        """
+        now = func.localtimestamp()
+        stmt = pg_insert(ChannelSendSlotModel).values(
+            channel_id=channel_id, theoretical_at=now + self._interval * messages
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ChannelSendSlotModel.channel_id],
+            set_=dict(
+                theoretical_at=func.greatest(ChannelSendSlotModel.theoretical_at, now) + self._interval * messages
+            ),
+        ).returning(ChannelSendSlotModel.theoretical_at, ChannelSendSlotModel.paused_until, now)
+        try:
+            async with self._session_factory() as session:
+                theoretical_at, paused_until, current = (await session.execute(stmt)).one()
+                await session.commit()
+        except SQLAlchemyError as e:
+            raise PublicationTemporaryError(f"Rate limit storage is unavailable: {e}") from e
+
+        wait = self._wait(theoretical_at, paused_until, current)
+        if wait > 0:
+            await self._sleep(wait)
+
+    async def pause(self, channel_id: str, seconds: float) -> None:
+        """
+        Приостанавливает отправку в канал для всех процессов (Telegram вернул RetryAfter).
+
+        Args:
+            channel_id: ID канала
+            seconds: Длительность паузы
+        """
+        now = func.localtimestamp()
+        until = now + timedelta(seconds=seconds)
+        stmt = pg_insert(ChannelSendSlotModel).values(channel_id=channel_id, theoretical_at=now, paused_until=until)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ChannelSendSlotModel.channel_id],
+            set_=dict(paused_until=func.greatest(ChannelSendSlotModel.paused_until, until)),
+        )
+        try:
+            async with self._session_factory() as session:
+                await session.execute(stmt)
+                await session.commit()
+        except SQLAlchemyError as e:
+            # Пауза - подсказка: сообщение и так вернется в очередь через retry_after
+            logger.warning(f"Failed to pause channel {channel_id}: {e}")
+
+    def _wait(self, theoretical_at: datetime, paused_until: Optional[datetime], now: datetime) -> float:
+        """Сколько секунд ждать до отправки по зарезервированному месту и паузе канала."""
+        wait = (theoretical_at - self._burst * self._interval - now).total_seconds()
+        if paused_until is not None:
+            wait = max(wait, (paused_until - now).total_seconds())
+        return max(wait, 0.0)
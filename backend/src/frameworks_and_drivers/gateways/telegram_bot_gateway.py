@@ -2,22 +2,71 @@
 Гейтвей для работы с Telegram-ботом.
 """
 import os
-from typing import Optional
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Type
 
 import aiogram
 from aiogram import Bot, Dispatcher
 from aiogram.enums import ParseMode
+from aiogram.exceptions import TelegramRetryAfter, TelegramServerError
+from aiogram.types import (
+    InputMediaAudio,
+    InputMediaDocument,
+    InputMediaPhoto,
+    InputMediaVideo,
+    Message,
+)
 from loguru import logger
 
-from src.entities.confession import Confession, Poll
-from src.interface_adapters.gateway_protocols import TelegramGatewayProtocol
+from src.entities.confession import Attachment, Confession, Poll
+from src.entities.enums import AttachmentType
+from src.frameworks_and_drivers.gateways.rate_limiter import RateLimiter
+from src.frameworks_and_drivers.gateways.telegram_file_cache import TelegramFileCache
+from src.interface_adapters.gateway_protocols import (
+    PublicationRateLimitedError,
+    PublicationTemporaryError,
+    TelegramGatewayProtocol,
+)
+
+# Максимум файлов в одном альбоме Telegram
+MEDIA_GROUP_LIMIT = 10
+
+# Тип медиа Telegram для каждого типа вложения
+INPUT_MEDIA_TYPES: Dict[AttachmentType, Type] = {
+    AttachmentType.IMAGE: InputMediaPhoto,
+    AttachmentType.VIDEO: InputMediaVideo,
+    AttachmentType.AUDIO: InputMediaAudio,
+    AttachmentType.MUSIC: InputMediaAudio,
+    AttachmentType.DOCUMENT: InputMediaDocument,
+    AttachmentType.OTHER: InputMediaDocument,
+}
+
+# Альбом может содержать фото вместе с видео, но аудио и документы - только отдельно
+ALBUM_KINDS = {
+    InputMediaPhoto: "visual",
+    InputMediaVideo: "visual",
+    InputMediaAudio: "audio",
+    InputMediaDocument: "document",
+}
 
 
 class TelegramBotGateway(TelegramGatewayProtocol):
     """Реализация гейтвея для работы с Telegram-ботом."""
     
-    def __init__(self) -> None:
-        """Инициализация бота и диспетчера."""
+    def __init__(
+        self,
+        rate_limiter: Optional[RateLimiter] = None,
+        file_cache: Optional[TelegramFileCache] = None,
+    ) -> None:
+        """
+        Инициализация бота и диспетчера.
+        
+        Args:
+            rate_limiter: Ограничитель частоты отправки по каналам
+            file_cache: Кэш file_id уже загруженных в Telegram вложений
+        """
+        self._rate_limiter = rate_limiter
+        self._file_cache = file_cache or TelegramFileCache()
+        
         # Получаем токен бота из переменных окружения
         token = os.getenv("TELEGRAM_BOT_TOKEN")
         if not token:
@@ -28,12 +77,13 @@ class TelegramBotGateway(TelegramGatewayProtocol):
             self._bot = Bot(token=token)
             self._channel_id = os.getenv("TELEGRAM_CHANNEL_ID", "@falt_conf")
     
-    async def send_confession(self, confession: Confession) -> str:
+    async def send_confession(self, confession: Confession, channel_id: Optional[str] = None) -> str:
         """
         Отправляет признание в Telegram-канал.
         
         Args:
             confession: Доменная сущность признания
+            channel_id: ID канала; по умолчанию - TELEGRAM_CHANNEL_ID
             
         Returns:
             str: ID сообщения в Telegram
@@ -51,32 +101,83 @@ class TelegramBotGateway(TelegramGatewayProtocol):
             tags_text = " ".join([f"#{tag.name}" for tag in confession.tags])
             message_text += f"\n\n{tags_text}"
         
+        chat_id = channel_id or self._channel_id
         try:
             # Отправляем текст признания
+            await self._throttle(chat_id)
             message = await self._bot.send_message(
-                chat_id=self._channel_id,
+                chat_id=chat_id,
                 text=message_text,
                 parse_mode=ParseMode.HTML,
             )
             
-            # Если есть вложения, отправляем их
-            if confession.attachments:
-                # В реальном приложении здесь будет логика отправки медиа
-                # В зависимости от типа вложения (фото, видео и т.д.)
-                logger.info(f"Attachments found, but not implemented yet")
-            
             logger.info(f"Confession {confession.id} sent to Telegram with message_id {message.message_id}")
             return str(message.message_id)
         except Exception as e:
             logger.error(f"Error sending confession to Telegram: {str(e)}")
-            raise
+            await self._raise_translated(e, chat_id)
     
-    async def send_poll(self, poll: Poll) -> str:
+    async def send_attachments(
+        self,
+        confession: Confession,
+        channel_id: Optional[str] = None,
+        sent_message_ids: Sequence[str] = (),
+        on_album_sent: Optional[Callable[[List[str]], Awaitable[None]]] = None,
+    ) -> List[str]:
+        """
+        Отправляет вложения признания альбомами.
+        
+        Вложения группируются по совместимым типам (фото и видео, аудио,
+        документы) и отправляются альбомами по MEDIA_GROUP_LIMIT файлов,
+        то есть одним запросом на альбом вместо запроса на файл. Уже
+        загруженные файлы отправляются по file_id без повторной загрузки.
+        
+        Альбом из N файлов - это N сообщений, поэтому альбомы, чьи сообщения
+        уже есть в sent_message_ids, при повторной попытке пропускаются,
+        а после каждого альбома вызывается on_album_sent, чтобы прогресс
+        сохранился до отправки следующего.
+        
+        Args:
+            confession: Доменная сущность признания
+            channel_id: ID канала; по умолчанию - TELEGRAM_CHANNEL_ID
+            sent_message_ids: ID сообщений, отправленных прошлыми попытками
+            on_album_sent: Вызывается после каждого альбома со всеми ID, отправленными на этот момент
+            
+        Returns:
+            List[str]: ID всех сообщений с вложениями, включая отправленные раньше
+        """
+        message_ids = list(sent_message_ids)
+        if not confession.attachments:
+            return message_ids
+        
+        if not self._bot:
+            # Mock-реализация для тестирования
+            logger.info(f"Mock: Sending {len(confession.attachments)} attachments to Telegram")
+            message_ids = [f"mock_media_id_{number}" for number in range(len(confession.attachments))]
+            if on_album_sent:
+                await on_album_sent(list(message_ids))
+            return message_ids
+        
+        chat_id = channel_id or self._channel_id
+        try:
+            for album in self._pending_albums(confession.attachments, len(sent_message_ids)):
+                message_ids.extend(await self._send_album(chat_id, album))
+                if on_album_sent:
+                    await on_album_sent(list(message_ids))
+            
+            logger.info(f"Attachments of confession {confession.id} sent to Telegram: {len(message_ids)} messages")
+            return message_ids
+        except Exception as e:
+            logger.error(f"Error sending attachments to Telegram: {str(e)}")
+            await self._raise_translated(e, chat_id)
+    
+    async def send_poll(self, poll: Poll, channel_id: Optional[str] = None) -> str:
         """
         Отправляет опрос в Telegram-канал.
         
         Args:
             poll: Доменная сущность опроса
+            channel_id: ID канала; по умолчанию - TELEGRAM_CHANNEL_ID
             
         Returns:
             str: ID сообщения с опросом в Telegram
@@ -86,13 +187,15 @@ class TelegramBotGateway(TelegramGatewayProtocol):
             logger.info(f"Mock: Sending poll to Telegram: {poll.question}")
             return "mock_poll_id"
         
+        chat_id = channel_id or self._channel_id
         try:
             # Получаем варианты ответов
             options = [option.text for option in poll.options]
             
             # Отправляем опрос
+            await self._throttle(chat_id)
             message = await self._bot.send_poll(
-                chat_id=self._channel_id,
+                chat_id=chat_id,
                 question=poll.question,
                 options=options,
                 is_anonymous=True,
@@ -107,4 +210,95 @@ class TelegramBotGateway(TelegramGatewayProtocol):
             return str(message.message_id)
         except Exception as e:
             logger.error(f"Error sending poll to Telegram: {str(e)}")
-            raise 
\ No newline at end of file
+            await self._raise_translated(e, chat_id)
+    
+    @staticmethod
+    def _albums(attachments: Sequence[Attachment]) -> List[List[Attachment]]:
+        """Разбивает вложения на альбомы совместимых типов не длиннее MEDIA_GROUP_LIMIT."""
+        groups: Dict[str, List[Attachment]] = {}
+        for attachment in attachments:
+            groups.setdefault(ALBUM_KINDS[INPUT_MEDIA_TYPES[attachment.type]], []).append(attachment)
+        
+        return [
+            group[start:start + MEDIA_GROUP_LIMIT]
+            for group in groups.values()
+            for start in range(0, len(group), MEDIA_GROUP_LIMIT)
+        ]
+    
+    @classmethod
+    def _pending_albums(cls, attachments: Sequence[Attachment], sent_messages: int) -> List[List[Attachment]]:
+        """Возвращает альбомы, не дошедшие до канала: первые sent_messages сообщений отправлены прошлыми попытками."""
+        pending = []
+        skipped = 0
+        for album in cls._albums(attachments):
+            if skipped + len(album) <= sent_messages:
+                skipped += len(album)
+            else:
+                pending.append(album)
+        return pending
+    
+    async def _send_album(self, chat_id: str, album: Sequence[Attachment]) -> List[str]:
+        """Отправляет один альбом (одиночный файл - отдельным сообщением) и запоминает file_id загруженных файлов."""
+        media = [await self._input_media(attachment) for attachment in album]
+        await self._throttle(chat_id, len(media))
+        if len(media) == 1:
+            messages = [await self._send_single_media(chat_id, media[0])]
+        else:
+            messages = await self._bot.send_media_group(chat_id=chat_id, media=media)
+        
+        for attachment, message in zip(album, messages):
+            file_id = self._file_id(message)
+            if file_id:
+                await self._file_cache.set(attachment.url, file_id)
+        return [str(message.message_id) for message in messages]
+    
+    async def _input_media(self, attachment: Attachment):
+        """Строит медиа Telegram для вложения: по file_id, если файл уже загружался, иначе по URL."""
+        file_id = await self._file_cache.get(attachment.url)
+        return INPUT_MEDIA_TYPES[attachment.type](media=file_id or attachment.url, caption=attachment.caption)
+    
+    async def _send_single_media(self, chat_id: str, media) -> Message:
+        """Отправляет одиночный файл: альбом Telegram должен содержать минимум два файла."""
+        if isinstance(media, InputMediaPhoto):
+            return await self._bot.send_photo(chat_id=chat_id, photo=media.media, caption=media.caption)
+        if isinstance(media, InputMediaVideo):
+            return await self._bot.send_video(chat_id=chat_id, video=media.media, caption=media.caption)
+        if isinstance(media, InputMediaAudio):
+            return await self._bot.send_audio(chat_id=chat_id, audio=media.media, caption=media.caption)
+        return await self._bot.send_document(chat_id=chat_id, document=media.media, caption=media.caption)
+    
+    @staticmethod
+    def _file_id(message: Message) -> Optional[str]:
+        """Достает file_id отправленного файла из сообщения (для фото - самого большого размера)."""
+        if message.photo:
+            return message.photo[-1].file_id
+        for media in (message.video, message.audio, message.document):
+            if media:
+                return media.file_id
+        return None
+    
+    async def _throttle(self, chat_id: str, messages: int = 1) -> None:
+        """Дожидается разрешения ограничителя на отправку messages сообщений в канал."""
+        if self._rate_limiter:
+            await self._rate_limiter.acquire(chat_id, messages)
+    
+    async def _raise_translated(self, error: Exception, chat_id: str) -> None:
+        """
+        Переводит ошибки aiogram в ошибки протокола гейтвея.
+        
+        RetryAfter и ошибки сервера Telegram означают, что сообщение
+        не отправлено и попытку можно повторить. Сетевая ошибка
+        повторяемой не считается: сообщение могло дойти до канала.
+        """
+        if isinstance(error, TelegramRetryAfter):
+            if self._rate_limiter:
+                await self._rate_limiter.pause(chat_id, error.retry_after)
+            raise PublicationRateLimitedError(error.retry_after) from error
+        if isinstance(error, TelegramServerError):
+            raise PublicationTemporaryError(str(error)) from error
+        raise error
+    
+    async def close(self) -> None:
+        """Закрывает HTTP-сессию бота."""
+        if self._bot:
+            await self._bot.session.close()
@@ -0,0 +1,125 @@
+"""
+Кэш file_id медиафайлов, уже загруженных в Telegram, по URL вложения.
+"""
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from loguru import logger
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.frameworks_and_drivers.metrics import metrics
+from src.frameworks_and_drivers.models.confession import TelegramFileModel
+
+file_id_hits = metrics.counter("telegram_file_id_hits_total", "Вложения, отправленные по сохраненному file_id")
+file_id_misses = metrics.counter("telegram_file_id_misses_total", "Вложения, загруженные в Telegram по URL")
+
+
+class PostgresTelegramFileStore:
+    """
+    Общее хранилище file_id в таблице telegram_files.
+    
+    Гейтвей живет все время работы процесса, поэтому хранилище
+    открывает короткую сессию на каждое обращение.
+    """
+    
+    def __init__(self, session_factory: Callable[[], AsyncSession]) -> None:
+        """
+        Инициализация хранилища.
+        
+        Args:
+            session_factory: Фабрика сессий SQLAlchemy
+        """
+        self._session_factory = session_factory
+    
+    async def get(self, url: str) -> Optional[str]:
+        """Возвращает file_id по URL вложения или None."""
+        async with self._session_factory() as session:
+            result = await session.execute(select(TelegramFileModel.file_id).where(TelegramFileModel.url == url))
+            return result.scalar_one_or_none()
+    
+    async def set(self, url: str, file_id: str) -> None:
+        """Сохраняет file_id, перезаписывая прежний для того же URL."""
+        async with self._session_factory() as session:
+            await session.execute(
+                pg_insert(TelegramFileModel)
+                .values(url=url, file_id=file_id)
+                .on_conflict_do_update(index_elements=[TelegramFileModel.url], set_=dict(file_id=file_id))
+            )
+            await session.commit()
+
+
+class TelegramFileCache:
+    """
+    Двухуровневый кэш file_id: LRU-словарь в памяти процесса
+    и (необязательно) таблица PostgreSQL, общая для всех процессов.
+    
+    file_id действует для бота во всех чатах, поэтому повторная
+    публикация и публикация в другой канал не загружают файл заново.
+    Ошибки хранилища не прерывают отправку: файл просто загружается по URL.
+    """
+    
+    def __init__(self, max_entries: int = 10000, store: Optional[PostgresTelegramFileStore] = None) -> None:
+        """
+        Инициализация кэша.
+        
+        Args:
+            max_entries: Максимум записей в памяти
+            store: Общее хранилище второго уровня
+        """
+        self._max_entries = max_entries
+        self._store = store
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+    
+    async def get(self, url: str) -> Optional[str]:
+        """
+        Ищет file_id сначала в памяти, затем в общем хранилище.
+        
+        Args:
+            url: URL вложения
+            
+        Returns:
+            Optional[str]: file_id или None, если файл еще не загружался
+        """
+        file_id = self._entries.get(url)
+        if file_id is None and self._store is not None:
+            try:
+                file_id = await self._store.get(url)
+            except Exception as e:
+                logger.warning(f"Telegram file store read failed: {str(e)}")
+            if file_id is not None:
+                self._remember(url, file_id)
+        
+        if file_id is None:
+            file_id_misses.inc()
+            return None
+        
+        self._entries.move_to_end(url)
+        file_id_hits.inc()
+        return file_id
+    
+    async def set(self, url: str, file_id: str) -> None:
+        """
+        Сохраняет file_id на обоих уровнях.
+        
+        Args:
+            url: URL вложения
+            file_id: ID файла в Telegram
+        """
+        if self._entries.get(url) == file_id:
+            return
+        
+        self._remember(url, file_id)
+        if self._store is not None:
+            try:
+                await self._store.set(url, file_id)
+            except Exception as e:
+                logger.warning(f"Telegram file store write failed: {str(e)}")
+    
+    def _remember(self, url: str, file_id: str) -> None:
+        """Кладет file_id в память, вытесняя самые давно использованные записи."""
+        self._entries[url] = file_id
+        self._entries.move_to_end(url)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
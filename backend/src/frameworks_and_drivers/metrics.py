@@ -0,0 +1,135 @@
+"""
+Внутрипроцессные метрики в текстовом формате Prometheus.
+"""
+from threading import Lock
+from typing import Callable, Dict, List, Tuple
+
+# Ключ метрики: имя и отсортированные пары меток
+MetricKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+def _key(name: str, labels: Dict[str, str]) -> MetricKey:
+    """Строит ключ метрики из имени и меток."""
+    return name, tuple(sorted(labels.items()))
+
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+    """Форматирует метки в синтаксисе Prometheus."""
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{value}"' for name, value in labels) + "}"
+
+
+class Counter:
+    """Монотонно растущий счетчик."""
+    
+    def __init__(self) -> None:
+        """Инициализация счетчика."""
+        self.value = 0.0
+    
+    def inc(self, amount: float = 1.0) -> None:
+        """Увеличивает счетчик."""
+        self.value += amount
+
+
+class Summary:
+    """Количество и сумма наблюдений (например, времени ожидания)."""
+    
+    def __init__(self) -> None:
+        """Инициализация сводки."""
+        self.count = 0
+        self.sum = 0.0
+    
+    def observe(self, value: float) -> None:
+        """Добавляет наблюдение."""
+        self.count += 1
+        self.sum += value
+
+
+class MetricsRegistry:
+    """Реестр метрик процесса."""
+    
+    def __init__(self) -> None:
+        """Инициализация пустого реестра."""
+        self._lock = Lock()
+        self._help: Dict[str, Tuple[str, str]] = {}
+        self._counters: Dict[MetricKey, Counter] = {}
+        self._summaries: Dict[MetricKey, Summary] = {}
+        self._gauges: Dict[MetricKey, Callable[[], float]] = {}
+    
+    def counter(self, name: str, help: str, **labels: str) -> Counter:
+        """
+        Возвращает счетчик, создавая его при первом обращении.
+        
+        Args:
+            name: Имя метрики
+            help: Описание метрики
+            **labels: Метки
+            
+        Returns:
+            Counter: Счетчик
+        """
+        with self._lock:
+            self._help.setdefault(name, ("counter", help))
+            return self._counters.setdefault(_key(name, labels), Counter())
+    
+    def summary(self, name: str, help: str, **labels: str) -> Summary:
+        """
+        Возвращает сводку наблюдений, создавая ее при первом обращении.
+        
+        Args:
+            name: Имя метрики
+            help: Описание метрики
+            **labels: Метки
+            
+        Returns:
+            Summary: Сводка
+        """
+        with self._lock:
+            self._help.setdefault(name, ("summary", help))
+            return self._summaries.setdefault(_key(name, labels), Summary())
+    
+    def gauge(self, name: str, help: str, callback: Callable[[], float], **labels: str) -> None:
+        """
+        Регистрирует показатель, значение которого вычисляется при выгрузке метрик.
+        
+        Args:
+            name: Имя метрики
+            help: Описание метрики
+            callback: Функция, возвращающая текущее значение
+            **labels: Метки
+        """
+        with self._lock:
+            self._help.setdefault(name, ("gauge", help))
+            self._gauges[_key(name, labels)] = callback
+    
+    def render(self) -> str:
+        """
+        Выгружает все метрики в текстовом формате Prometheus.
+        
+        Returns:
+            str: Текст для эндпоинта /metrics
+        """
+        samples: Dict[str, List[str]] = {name: [] for name in self._help}
+        
+        with self._lock:
+            for (name, labels), counter in self._counters.items():
+                samples[name].append(f"{name}{_format_labels(labels)} {counter.value}")
+            for (name, labels), summary in self._summaries.items():
+                samples[name].append(f"{name}_count{_format_labels(labels)} {summary.count}")
+                samples[name].append(f"{name}_sum{_format_labels(labels)} {summary.sum}")
+            gauges = list(self._gauges.items())
+        
+        for (name, labels), callback in gauges:
+            samples[name].append(f"{name}{_format_labels(labels)} {float(callback())}")
+        
+        lines = []
+        for name, (kind, help) in self._help.items():
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(samples[name])
+        return "\n".join(lines) + "\n"
+
+
+# Реестр метрик процесса
+metrics = MetricsRegistry()
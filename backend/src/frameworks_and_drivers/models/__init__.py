@@ -4,13 +4,19 @@ ORM-модели для SQLAlchemy.
 
 from src.frameworks_and_drivers.models.confession import (
     AttachmentModel,
+    ChannelSendSlotModel,
     CommentModel,
     ConfessionModel,
+    ModerationCacheModel,
+    ModerationJobModel,
     ModerationLogModel,
     PollModel,
     PollOptionModel,
+    PublicationModel,
     PublishedRecordModel,
+    TagCountModel,
     TagModel,
+    TelegramFileModel,
 )
 
 __all__ = [
@@ -19,7 +25,13 @@ __all__ = [
     "PollModel",
     "PollOptionModel",
     "TagModel",
+    "TagCountModel",
     "CommentModel",
     "ModerationLogModel",
+    "ModerationJobModel",
+    "ModerationCacheModel",
+    "PublicationModel",
     "PublishedRecordModel",
+    "TelegramFileModel",
+    "ChannelSendSlotModel",
 ] 
\ No newline at end of file
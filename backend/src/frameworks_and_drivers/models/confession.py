@@ -8,26 +8,40 @@ from typing import List, Optional
 from sqlalchemy import (
     Boolean,
     Column,
+    Computed,
     DateTime,
     Enum,
     ForeignKey,
+    Index,
     Integer,
+    JSON,
     String,
     Table,
     Text,
+    UniqueConstraint,
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 
-from src.entities.enums import AttachmentType, ConfessionStatus
+from src.entities.enums import AttachmentType, ConfessionStatus, ModerationJobStatus, PublicationStatus
 from src.frameworks_and_drivers.db.database import Base
 
 
+# Полнотекстовый индекс текста признания: русская морфология плюс английская
+CONFESSION_SEARCH_VECTOR = (
+    "to_tsvector('russian'::regconfig, coalesce(content, '')) || "
+    "to_tsvector('english'::regconfig, coalesce(content, ''))"
+)
+
+
 # Таблица связи между признаниями и тегами
 confession_tag = Table(
     "confession_tag",
     Base.metadata,
     Column("confession_id", Integer, ForeignKey("confessions.id"), primary_key=True),
     Column("tag_id", Integer, ForeignKey("tags.id"), primary_key=True),
+    # Первичный ключ начинается с confession_id; для выборки признаний по тегу нужен обратный индекс
+    Index("ix_confession_tag_tag_id", "tag_id", "confession_id"),
 )
 
 
@@ -36,10 +50,16 @@ class ConfessionModel(Base):
 
     __tablename__ = "confessions"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     content = Column(Text, nullable=False)
     created_at = Column(DateTime, default=datetime.now)
     status = Column(Enum(ConfessionStatus), default=ConfessionStatus.PENDING)
+    # Номер версии строки: увеличивается каждой сменой статуса (compare-and-set)
+    version = Column(Integer, nullable=False, default=0, server_default="0")
+    # Время последнего UPDATE строки (для Last-Modified); голоса опроса его не меняют
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+    # Вычисляется PostgreSQL при записи content; не загружается вместе с признанием
+    search_vector = deferred(Column(TSVECTOR, Computed(CONFESSION_SEARCH_VECTOR, persisted=True)))
 
     # Отношения
     attachments = relationship("AttachmentModel", back_populates="confession", cascade="all, delete-orphan")
@@ -51,14 +71,29 @@ class ConfessionModel(Base):
     )
     comments = relationship("CommentModel", back_populates="confession", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # Лента по статусу с keyset-пагинацией (status = :status ORDER BY created_at DESC, id DESC)
+        # и выборка самых старых одобренных признаний для публикации
+        Index("ix_confessions_status_created_at", "status", "created_at", "id"),
+        # Публичная лента: самый частый запрос, частичный индекс меньше и дольше живет в кэше
+        Index(
+            "ix_confessions_published_feed",
+            "created_at",
+            "id",
+            postgresql_where=status == ConfessionStatus.PUBLISHED,
+        ),
+        # Полнотекстовый поиск (search_vector @@ tsquery)
+        Index("ix_confessions_search_vector", "search_vector", postgresql_using="gin"),
+    )
+
 
 class AttachmentModel(Base):
     """ORM-модель для вложения."""
 
     __tablename__ = "attachments"
 
-    id = Column(Integer, primary_key=True, index=True)
-    confession_id = Column(Integer, ForeignKey("confessions.id"))
+    id = Column(Integer, primary_key=True)
+    confession_id = Column(Integer, ForeignKey("confessions.id"), index=True)
     url = Column(String(255), nullable=False)
     type = Column(Enum(AttachmentType), default=AttachmentType.OTHER)
     uploaded_at = Column(DateTime, default=datetime.now)
@@ -73,8 +108,8 @@ class PollOptionModel(Base):
 
     __tablename__ = "poll_options"
 
-    id = Column(Integer, primary_key=True, index=True)
-    poll_id = Column(Integer, ForeignKey("polls.id"))
+    id = Column(Integer, primary_key=True)
+    poll_id = Column(Integer, ForeignKey("polls.id"), index=True)
     text = Column(String(255), nullable=False)
     vote_count = Column(Integer, default=0)
 
@@ -87,7 +122,7 @@ class PollModel(Base):
 
     __tablename__ = "polls"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     confession_id = Column(Integer, ForeignKey("confessions.id"), unique=True)
     question = Column(String(255), nullable=False)
     allows_multiple_answers = Column(Boolean, default=False)
@@ -108,20 +143,39 @@ class TagModel(Base):
 
     __tablename__ = "tags"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     name = Column(String(50), unique=True, index=True, nullable=False)
 
     # Отношения
     confessions = relationship("ConfessionModel", secondary=confession_tag, back_populates="tags")
 
 
+class TagCountModel(Base):
+    """
+    ORM-модель счетчика опубликованных признаний с тегом.
+
+    Счетчик меняется в той же транзакции, что и публикация признания
+    или правка тегов опубликованного признания, поэтому популярные теги
+    читаются по индексу без COUNT(*) по всей истории.
+    """
+
+    __tablename__ = "tag_counts"
+    __table_args__ = (
+        # Топ тегов: обратный проход по индексу вместо сортировки таблицы
+        Index("ix_tag_counts_published_count", "published_count", "tag_id"),
+    )
+
+    tag_id = Column(Integer, ForeignKey("tags.id"), primary_key=True)
+    published_count = Column(Integer, nullable=False, default=0, server_default="0")
+
+
 class ModerationLogModel(Base):
     """ORM-модель для записи о модерации."""
 
     __tablename__ = "moderation_logs"
 
-    id = Column(Integer, primary_key=True, index=True)
-    confession_id = Column(Integer, ForeignKey("confessions.id"))
+    id = Column(Integer, primary_key=True)
+    confession_id = Column(Integer, ForeignKey("confessions.id"), index=True)
     decision = Column(Enum(ConfessionStatus), default=ConfessionStatus.PENDING)
     moderator = Column(String(100), nullable=False)  # "LLM" или имя модератора
     reason = Column(Text, nullable=True)
@@ -131,12 +185,113 @@ class ModerationLogModel(Base):
     confession = relationship("ConfessionModel", back_populates="moderation_logs")
 
 
+class ModerationJobModel(Base):
+    """ORM-модель для задачи фоновой модерации."""
+
+    __tablename__ = "moderation_jobs"
+
+    id = Column(Integer, primary_key=True)
+    confession_id = Column(Integer, ForeignKey("confessions.id"), nullable=False)
+    status = Column(Enum(ModerationJobStatus), default=ModerationJobStatus.QUEUED, nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    last_error = Column(Text, nullable=True)
+    available_at = Column(DateTime, default=datetime.now, nullable=False)
+    locked_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=datetime.now)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+
+    __table_args__ = (
+        # Очередь выборки воркерами: только незавершенные задачи в порядке готовности
+        Index(
+            "ix_moderation_jobs_pending",
+            "available_at",
+            "id",
+            postgresql_where=status.in_([ModerationJobStatus.QUEUED, ModerationJobStatus.RUNNING]),
+        ),
+        # Не больше одной незавершенной задачи на признание
+        Index(
+            "uq_moderation_jobs_active_confession",
+            "confession_id",
+            unique=True,
+            postgresql_where=status.in_([ModerationJobStatus.QUEUED, ModerationJobStatus.RUNNING]),
+        ),
+    )
+
+
+class ModerationCacheModel(Base):
+    """ORM-модель для общего кэша решений модерации по хэшу текста."""
+
+    __tablename__ = "moderation_cache"
+
+    content_hash = Column(String(64), primary_key=True)
+    decision = Column(Enum(ConfessionStatus), nullable=False)
+    reason = Column(Text, nullable=True)
+    category_scores = Column(JSON, nullable=True)
+    expires_at = Column(DateTime, nullable=False)
+    created_at = Column(DateTime, default=datetime.now)
+
+
+class TelegramFileModel(Base):
+    """ORM-модель для file_id медиафайлов, уже загруженных в Telegram."""
+
+    __tablename__ = "telegram_files"
+
+    url = Column(String(255), primary_key=True)
+    file_id = Column(String(255), nullable=False)
+    created_at = Column(DateTime, default=datetime.now)
+
+
+class ChannelSendSlotModel(Base):
+    """ORM-модель для общего на все процессы лимита частоты отправки в канал Telegram."""
+
+    __tablename__ = "channel_send_slots"
+
+    channel_id = Column(String(100), primary_key=True)
+    # Теоретическое время следующей отправки (GCRA): отправка разрешена за burst интервалов до него
+    theoretical_at = Column(DateTime, nullable=False)
+    # Telegram попросил не отправлять в канал до этого момента
+    paused_until = Column(DateTime, nullable=True)
+
+
+class PublicationModel(Base):
+    """ORM-модель для исходящей очереди (outbox) публикаций в Telegram."""
+
+    __tablename__ = "publication_outbox"
+
+    id = Column(Integer, primary_key=True)
+    confession_id = Column(Integer, ForeignKey("confessions.id"), nullable=False)
+    channel_id = Column(String(100), nullable=False)
+    status = Column(Enum(PublicationStatus), default=PublicationStatus.QUEUED, nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    last_error = Column(Text, nullable=True)
+    telegram_message_id = Column(String(50), nullable=True)
+    poll_message_id = Column(String(50), nullable=True)
+    # ID сообщений с вложениями (альбомов); NULL - вложения еще не отправлены
+    media_message_ids = Column(JSON, nullable=True)
+    available_at = Column(DateTime, default=datetime.now, nullable=False)
+    locked_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=datetime.now)
+    sent_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        # Признание попадает в канал не больше одного раза
+        UniqueConstraint("confession_id", "channel_id", name="uq_publication_outbox_confession_channel"),
+        # Выборка отправителем: только неотправленные сообщения в порядке готовности
+        Index(
+            "ix_publication_outbox_pending",
+            "available_at",
+            "id",
+            postgresql_where=status.in_([PublicationStatus.QUEUED, PublicationStatus.SENDING]),
+        ),
+    )
+
+
 class PublishedRecordModel(Base):
     """ORM-модель для информации о публикации."""
 
     __tablename__ = "published_records"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     confession_id = Column(Integer, ForeignKey("confessions.id"), unique=True)
     telegram_message_id = Column(String(50), nullable=False)
     channel_id = Column(String(100), nullable=False)
@@ -152,8 +307,8 @@ class CommentModel(Base):
 
     __tablename__ = "comments"
 
-    id = Column(Integer, primary_key=True, index=True)
-    confession_id = Column(Integer, ForeignKey("confessions.id"))
+    id = Column(Integer, primary_key=True)
+    confession_id = Column(Integer, ForeignKey("confessions.id"), index=True)
     content = Column(Text, nullable=False)
     created_at = Column(DateTime, default=datetime.now)
     reply_to = Column(Integer, ForeignKey("comments.id"), nullable=True)
@@ -1,36 +1,91 @@
 """
 SQLAlchemy-реализация репозитория для признаний.
 """
-from typing import List, Optional
+import copy
+import html
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
 
 from loguru import logger
-from sqlalchemy import select
+from sqlalchemy import delete, func, inspect, literal, literal_column, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.sql import Select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.orm import joinedload, load_only, raiseload, selectinload
 
 from src.entities.confession import (
     Attachment,
     Comment,
     Confession,
+    ConfessionRevision,
+    ConfessionSearchHit,
+    ModerationJob,
     ModerationLog,
     Poll,
     PollOption,
+    Publication,
     PublishedRecord,
+    StatusTransitionError,
     Tag,
 )
-from src.entities.enums import ConfessionStatus
+from src.entities.enums import ConfessionProjection, ConfessionStatus, ModerationJobStatus
 from src.frameworks_and_drivers.models.confession import (
     AttachmentModel,
     CommentModel,
     ConfessionModel,
+    ModerationJobModel,
     ModerationLogModel,
     PollModel,
     PollOptionModel,
+    PublicationModel,
     PublishedRecordModel,
+    TagCountModel,
     TagModel,
+    confession_tag,
 )
+from src.interface_adapters.pagination import Page, PageCursor, SearchCursor
 from src.interface_adapters.repository_protocols import ConfessionRepositoryProtocol
 
+# Сколько строк забирать из серверного курсора за один сетевой запрос
+STREAM_BATCH_SIZE = 100
+
+# Сколько самых новых совпадений ранжируется при поиске: ограничивает работу
+# на частых словах, которые встречаются в большой доле признаний
+SEARCH_MAX_CANDIDATES = 1000
+
+# Маркеры совпадений в ts_headline (символы из области частного использования Unicode
+# не встречаются в обычном тексте); после экранирования HTML заменяются на <mark>
+HIGHLIGHT_START = "\ue000"
+HIGHLIGHT_STOP = "\ue001"
+HEADLINE_OPTIONS = (
+    f"StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_STOP}, MaxWords=35, MinWords=15, MaxFragments=2"
+)
+
+# Поля доменных сущностей, которые хранятся в соответствующих таблицах
+CONFESSION_FIELDS = ("content", "status", "created_at")
+ATTACHMENT_FIELDS = ("url", "type", "uploaded_at", "caption")
+POLL_FIELDS = (
+    "question",
+    "allows_multiple_answers",
+    "type",
+    "correct_option_id",
+    "explanation",
+    "open_period",
+    "poll_message_id",
+    "created_at",
+)
+POLL_OPTION_FIELDS = ("text", "vote_count")
+MODERATION_LOG_FIELDS = ("decision", "moderator", "reason", "timestamp")
+PUBLISHED_RECORD_FIELDS = ("telegram_message_id", "channel_id", "published_at", "discussion_thread_id")
+PUBLICATION_FIELDS = ("channel_id", "status", "attempts", "available_at", "created_at")
+MODERATION_JOB_FIELDS = ("status", "attempts", "available_at", "created_at", "updated_at")
+
+# Связанные сущности, загружаемые для каждого уровня детализации
+PROJECTION_RELATIONS = {
+    ConfessionProjection.SUMMARY: ("tags",),
+    ConfessionProjection.PUBLIC: ("tags", "attachments", "poll", "published_record"),
+    ConfessionProjection.FULL: ("tags", "attachments", "poll", "published_record", "moderation_logs", "comments"),
+}
+
 
 class SqlAlchemyConfessionRepository(ConfessionRepositoryProtocol):
     """SQLAlchemy-реализация репозитория для признаний."""
@@ -43,174 +98,480 @@ class SqlAlchemyConfessionRepository(ConfessionRepositoryProtocol):
             session: Активная сессия SQLAlchemy
         """
         self._session = session
+        
+        # Состояние признаний на момент чтения из БД, с которым save() сравнивает изменения
+        self._snapshots: Dict[int, Confession] = {}
     
-    async def save(self, confession: Confession) -> Confession:
+    async def save(
+        self,
+        confession: Confession,
+        refresh: bool = False,
+        outbox: Sequence[Publication] = (),
+        moderation_job: Optional[ModerationJob] = None,
+    ) -> Confession:
         """
         Сохраняет признание в базе данных.
         
+        Для уже существующего признания сохраняется только разница с его
+        состоянием на момент чтения из БД: изменившиеся поля обновляются
+        точечными UPDATE, новые строки вставляются, удаленные - удаляются.
+        Например, модерация превращается в один UPDATE статуса и один
+        INSERT записи о модерации.
+        
+        Признание не перечитывается из БД: сгенерированные ID берутся
+        из flush (INSERT ... RETURNING) и проставляются прямо в переданную
+        доменную сущность.
+        
+        Сообщения outbox (публикации в Telegram) вставляются в той же
+        транзакции: отправитель увидит их только вместе со сменой статуса.
+        Так же ставится и задача модерации: признание не может оказаться
+        в БД без задачи, если процесс упадет между двумя коммитами.
+        
+        Смена статуса выполняется как compare-and-set относительно статуса
+        на момент чтения: если его успел изменить другой воркер или
+        модератор, транзакция откатывается. Поэтому существующее признание
+        должно быть прочитано этим репозиторием целиком (FULL) - через
+        get_by_id, list_by_status или страницу ленты.
+        
         Args:
             confession: Доменная сущность признания
+            refresh: Перечитать признание из БД после коммита (нужно, если
+                важны значения, вычисленные на стороне сервера)
+            outbox: Сообщения исходящей очереди, связанные с этим изменением
+            moderation_job: Задача фоновой модерации признания
             
         Returns:
             Confession: Сохраненное признание с обновленными ID
+            
+        Raises:
+            StatusTransitionError: Переход статуса запрещен или статус уже изменен конкурентом
+            ValueError: Если признание есть в БД, но этот репозиторий не читал его целиком
         """
-        # Проверяем, существует ли уже признание с таким ID
+        # Пары (доменная сущность, новая ORM-модель), которым после flush нужно проставить ID
+        created: List[Tuple[Any, Any]] = []
+        
+        # Состояние признания в БД, с которым сравниваются изменения
+        snapshot = None
         if confession.id:
-            # Обновляем существующее признание
-            stmt = select(ConfessionModel).where(ConfessionModel.id == confession.id)
-            result = await self._session.execute(stmt)
-            confession_model = result.scalars().first()
-            
-            if not confession_model:
+            snapshot = await self._get_snapshot(confession.id)
+            if not snapshot:
                 logger.warning(f"Confession with ID {confession.id} not found, creating new")
-                confession_model = ConfessionModel()
+        
+        if snapshot:
+            await self._update_confession(snapshot, confession)
         else:
-            # Создаем новое признание
-            confession_model = ConfessionModel()
+            # Вставляем строку признания сразу, чтобы получить ID для связанных сущностей
+            confession_model = ConfessionModel(**self._fields(confession, CONFESSION_FIELDS))
+            self._session.add(confession_model)
+            await self._session.flush()
+            confession.id = confession_model.id
+            snapshot = Confession(id=confession.id)
         
-        # Обновляем основные поля
-        confession_model.content = confession.content
-        confession_model.status = confession.status
-        confession_model.created_at = confession.created_at
+        await self._sync_rows(
+            AttachmentModel,
+            ATTACHMENT_FIELDS,
+            confession.attachments,
+            snapshot.attachments,
+            created,
+            confession_id=confession.id,
+        )
         
-        # Сохраняем модель в БД для получения ID
-        self._session.add(confession_model)
+        # Теги сравниваются по именам: ID тегов определяются при сохранении
+        tags_changed = [tag.name for tag in confession.tags] != [tag.name for tag in snapshot.tags]
+        
+        # Счетчики тегов учитывают только опубликованные признания: снимаем старые связи до правки тегов
+        # и добавляем новые после нее
+        was_published = snapshot.status == ConfessionStatus.PUBLISHED
+        is_published = confession.status == ConfessionStatus.PUBLISHED
+        if was_published and (tags_changed or not is_published):
+            await self._count_tags([confession.id], -1)
+        if tags_changed:
+            await self._save_tags(confession.id, confession.tags, replace=bool(snapshot.tags))
+        if is_published and (tags_changed or not was_published):
+            await self._count_tags([confession.id], 1)
+        
+        await self._sync_poll(confession, snapshot, created)
+        
+        # Записи о модерации только добавляются
+        for log in confession.moderation_logs:
+            if not log.id:
+                log.confession_id = confession.id
+                log_model = ModerationLogModel(confession_id=confession.id, **self._fields(log, MODERATION_LOG_FIELDS))
+                self._track(log, log_model, created)
+        
+        if confession.published_record:
+            confession.published_record.confession_id = confession.id
+        await self._sync_rows(
+            PublishedRecordModel,
+            PUBLISHED_RECORD_FIELDS,
+            [confession.published_record] if confession.published_record else [],
+            [snapshot.published_record] if snapshot.published_record else [],
+            created,
+            confession_id=confession.id,
+        )
+        
+        # Получаем ID новых строк и переносим их в доменную сущность
         await self._session.flush()
+        for entity, model in created:
+            entity.id = model.id
         
-        # Обновляем ID в доменной сущности
-        confession.id = confession_model.id
+        await self._enqueue_publications(confession.id, outbox)
+        if moderation_job:
+            await self._enqueue_moderation(confession.id, moderation_job)
         
-        # Обрабатываем вложения
-        if confession.attachments:
-            # Удаляем старые вложения, если это обновление
-            if confession_model.attachments:
-                for attachment_model in confession_model.attachments:
-                    await self._session.delete(attachment_model)
-                await self._session.flush()
-            
-            # Добавляем новые вложения
-            for attachment in confession.attachments:
-                attachment_model = AttachmentModel(
-                    confession_id=confession_model.id,
-                    url=attachment.url,
-                    type=attachment.type,
-                    uploaded_at=attachment.uploaded_at,
-                    caption=attachment.caption,
-                )
-                self._session.add(attachment_model)
+        # Применяем все изменения
+        await self._session.commit()
         
-        # Обрабатываем теги
-        if confession.tags:
-            # Очищаем старые связи тегов
-            confession_model.tags = []
-            await self._session.flush()
+        # Сохраненное состояние становится новой точкой отсчета для следующих изменений
+        self._remember(confession)
+        
+        if refresh:
+            # Точечные UPDATE/DELETE не синхронизируют загруженные в сессию модели
+            self._session.expire_all()
+            return await self.get_by_id(confession.id)
+        
+        return confession
+    
+    async def _enqueue_publications(self, confession_id: int, outbox: Sequence[Publication]) -> None:
+        """
+        Вставляет сообщения исходящей очереди.
+        
+        Повторная публикация в тот же канал не создает второго сообщения
+        (уникальность по признанию и каналу), поэтому признание
+        не будет отправлено дважды.
+        
+        Args:
+            confession_id: ID признания
+            outbox: Сообщения для вставки
+        """
+        if not outbox:
+            return
+        
+        for publication in outbox:
+            publication.confession_id = confession_id
+        
+        await self._session.execute(
+            pg_insert(PublicationModel)
+            .values([
+                dict(confession_id=confession_id, **self._fields(publication, PUBLICATION_FIELDS))
+                for publication in outbox
+            ])
+            .on_conflict_do_nothing(index_elements=[PublicationModel.confession_id, PublicationModel.channel_id])
+        )
+    
+    async def _enqueue_moderation(self, confession_id: int, job: ModerationJob) -> None:
+        """
+        Вставляет задачу модерации.
+        
+        Если у признания уже есть незавершенная задача, новая не создается
+        (частичный уникальный индекс + ON CONFLICT DO NOTHING), и ID задачи
+        остается пустым.
+        
+        Args:
+            confession_id: ID признания
+            job: Задача для вставки
+        """
+        job.confession_id = confession_id
+        result = await self._session.execute(
+            pg_insert(ModerationJobModel)
+            .values(confession_id=confession_id, **self._fields(job, MODERATION_JOB_FIELDS))
+            .on_conflict_do_nothing(
+                index_elements=[ModerationJobModel.confession_id],
+                index_where=ModerationJobModel.status.in_([ModerationJobStatus.QUEUED, ModerationJobStatus.RUNNING]),
+            )
+            .returning(ModerationJobModel.id)
+        )
+        job.id = result.scalar_one_or_none()
+    
+    async def _get_snapshot(self, id: int) -> Optional[Confession]:
+        """
+        Возвращает состояние признания на момент его чтения этим репозиторием.
+        
+        Снимок не перечитывается из БД: прочитанный сейчас статус мог уже
+        смениться после того, как вызывающий код получил признание, и
+        compare-and-set превратился бы в "последний записавший прав".
+        
+        Args:
+            id: ID признания
             
-            # Добавляем новые теги
-            for tag in confession.tags:
-                # Ищем существующий тег или создаем новый
-                stmt = select(TagModel).where(TagModel.name == tag.name)
-                result = await self._session.execute(stmt)
-                tag_model = result.scalars().first()
-                
-                if not tag_model:
-                    tag_model = TagModel(name=tag.name)
-                    self._session.add(tag_model)
-                    await self._session.flush()
-                    
-                # Связываем тег с признанием
-                confession_model.tags.append(tag_model)
-        
-        # Обрабатываем опрос, если он есть
-        if confession.poll:
-            # Если есть существующий опрос, удаляем его
-            if confession_model.poll:
-                await self._session.delete(confession_model.poll)
-                await self._session.flush()
+        Returns:
+            Optional[Confession]: Снимок признания или None, если его нет в БД
             
-            # Создаем новый опрос
-            poll_model = PollModel(
-                confession_id=confession_model.id,
-                question=confession.poll.question,
-                allows_multiple_answers=confession.poll.allows_multiple_answers,
-                type=confession.poll.type,
-                correct_option_id=confession.poll.correct_option_id,
-                explanation=confession.poll.explanation,
-                open_period=confession.poll.open_period,
-                poll_message_id=confession.poll.poll_message_id,
-                created_at=confession.poll.created_at,
+        Raises:
+            ValueError: Если признание есть в БД, но снимка нет
+        """
+        snapshot = self._snapshots.get(id)
+        if snapshot is None and await self._current_status(id) is not None:
+            raise ValueError(f"Confession {id} must be read in full by this repository before it is saved")
+        return snapshot
+    
+    def _remember(self, confession: Confession) -> None:
+        """Запоминает копию признания в том виде, в каком оно сохранено в БД."""
+        self._snapshots[confession.id] = copy.deepcopy(confession)
+    
+    async def _sync_poll(self, confession: Confession, snapshot: Confession, created: List[Tuple[Any, Any]]) -> None:
+        """
+        Сохраняет изменения опроса признания.
+        
+        Args:
+            confession: Текущее состояние признания
+            snapshot: Состояние признания в БД
+            created: Список новых моделей, которым после flush нужно проставить ID
+        """
+        poll, previous = confession.poll, snapshot.poll
+        
+        # Опрос удален или заменен другим
+        if previous and (not poll or poll.id != previous.id):
+            await self._session.execute(
+                delete(PollOptionModel)
+                .where(PollOptionModel.poll_id == previous.id)
+                .execution_options(synchronize_session=False)
             )
-            self._session.add(poll_model)
-            await self._session.flush()
-            
-            # Добавляем варианты опроса
-            for option in confession.poll.options:
-                option_model = PollOptionModel(
-                    poll_id=poll_model.id,
-                    text=option.text,
-                    vote_count=option.vote_count,
-                )
-                self._session.add(option_model)
-        
-        # Обрабатываем записи о модерации
-        if confession.moderation_logs:
-            # Добавляем только новые записи
-            for log in confession.moderation_logs:
-                if not log.id:  # Новая запись
-                    log_model = ModerationLogModel(
-                        confession_id=confession_model.id,
-                        decision=log.decision,
-                        moderator=log.moderator,
-                        reason=log.reason,
-                        timestamp=log.timestamp,
-                    )
-                    self._session.add(log_model)
-        
-        # Обрабатываем запись о публикации
-        if confession.published_record:
-            # Если есть существующая запись, удаляем её
-            if confession_model.published_record:
-                await self._session.delete(confession_model.published_record)
-                await self._session.flush()
+            await self._session.execute(
+                delete(PollModel).where(PollModel.id == previous.id).execution_options(synchronize_session=False)
+            )
+            previous = None
+        
+        if not poll:
+            return
+        
+        if not previous:
+            poll_model = PollModel(confession_id=confession.id, **self._fields(poll, POLL_FIELDS))
+            self._track(poll, poll_model, created)
+            for option in poll.options:
+                option_model = PollOptionModel(poll=poll_model, **self._fields(option, POLL_OPTION_FIELDS))
+                self._track(option, option_model, created)
+            return
+        
+        await self._update_columns(PollModel, poll.id, previous, poll, POLL_FIELDS)
+        await self._sync_rows(
+            PollOptionModel,
+            POLL_OPTION_FIELDS,
+            poll.options,
+            previous.options,
+            created,
+            poll_id=poll.id,
+        )
+    
+    async def _sync_rows(
+        self,
+        model_class: Any,
+        fields: Tuple[str, ...],
+        current: List[Any],
+        previous: List[Any],
+        created: List[Tuple[Any, Any]],
+        **parent: int,
+    ) -> None:
+        """
+        Сохраняет разницу между текущим и прежним набором дочерних сущностей.
+        
+        Сущности сопоставляются по ID: сущности без ID вставляются, пропавшие
+        удаляются одним DELETE, у остальных обновляются только изменившиеся поля.
+        
+        Args:
+            model_class: ORM-модель дочерней таблицы
+            fields: Поля, которые хранятся в таблице
+            current: Текущие доменные сущности
+            previous: Доменные сущности в том виде, в каком они сохранены в БД
+            created: Список новых моделей, которым после flush нужно проставить ID
+            **parent: Внешний ключ на родительскую строку
+        """
+        previous_by_id = {entity.id: entity for entity in previous if entity.id}
+        current_ids = {entity.id for entity in current if entity.id}
+        
+        removed_ids = [id for id in previous_by_id if id not in current_ids]
+        if removed_ids:
+            await self._session.execute(
+                delete(model_class)
+                .where(model_class.id.in_(removed_ids))
+                .execution_options(synchronize_session=False)
+            )
+        
+        for entity in current:
+            old = previous_by_id.get(entity.id)
+            if old:
+                await self._update_columns(model_class, entity.id, old, entity, fields)
+            else:
+                self._track(entity, model_class(**parent, **self._fields(entity, fields)), created)
+    
+    async def _update_confession(self, snapshot: Confession, confession: Confession) -> None:
+        """
+        Обновляет изменившиеся колонки признания.
+        
+        Новый статус записывается только поверх статуса из снимка
+        (UPDATE ... WHERE status = :expected RETURNING version), поэтому
+        два конкурирующих решения не перезатирают друг друга без блокировок.
+        
+        Args:
+            snapshot: Состояние признания на момент чтения
+            confession: Сохраняемое признание; получает новую версию
+        """
+        values = {
+            name: getattr(confession, name)
+            for name in CONFESSION_FIELDS
+            if getattr(confession, name) != getattr(snapshot, name)
+        }
+        if "status" not in values:
+            await self._update_columns(ConfessionModel, confession.id, snapshot, confession, CONFESSION_FIELDS)
+            return
+        
+        if not snapshot.status.can_transition_to(confession.status):
+            raise StatusTransitionError(confession.id, snapshot.status, confession.status)
+        
+        result = await self._session.execute(
+            update(ConfessionModel)
+            .where(ConfessionModel.id == confession.id, ConfessionModel.status == snapshot.status)
+            .values(**values, version=ConfessionModel.version + 1)
+            .returning(ConfessionModel.version)
+            .execution_options(synchronize_session=False)
+        )
+        version = result.scalar_one_or_none()
+        if version is None:
+            # Статус уже сменил конкурент: откатываем все изменения и забываем устаревший снимок
+            await self._session.rollback()
+            self._snapshots.pop(confession.id, None)
+            current = await self._current_status(confession.id)
+            raise StatusTransitionError(confession.id, current or snapshot.status, confession.status)
+        confession.version = version
+    
+    async def _current_status(self, id: int) -> Optional[ConfessionStatus]:
+        """Читает текущий статус признания или None, если его нет."""
+        result = await self._session.execute(select(ConfessionModel.status).where(ConfessionModel.id == id))
+        return result.scalar_one_or_none()
+    
+    async def _update_columns(self, model_class: Any, id: int, old: Any, new: Any, fields: Tuple[str, ...]) -> None:
+        """Выполняет UPDATE только изменившихся полей строки, если такие есть."""
+        values = {name: getattr(new, name) for name in fields if getattr(new, name) != getattr(old, name)}
+        if values:
+            await self._session.execute(
+                update(model_class)
+                .where(model_class.id == id)
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+    
+    def _track(self, entity: Any, model: Any, created: List[Tuple[Any, Any]]) -> None:
+        """Добавляет новую модель в сессию и запоминает, какой сущности передать ее ID."""
+        self._session.add(model)
+        created.append((entity, model))
+    
+    @staticmethod
+    def _fields(entity: Any, fields: Tuple[str, ...]) -> Dict[str, Any]:
+        """Возвращает значения полей доменной сущности, хранящихся в таблице."""
+        return {name: getattr(entity, name) for name in fields}
+    
+    async def _save_tags(self, confession_id: int, tags: List[Tag], replace: bool) -> None:
+        """
+        Привязывает теги к признанию набором запросов, не зависящим от числа тегов.
+        
+        Не более четырех обращений к БД: удаление старых связей (только при
+        обновлении), поиск существующих тегов, вставка недостающих
+        и одна пакетная вставка связей в confession_tag.
+        
+        Args:
+            confession_id: ID признания
+            tags: Теги признания; им проставляются ID из БД
+            replace: Удалить ли прежние связи признания с тегами
+        """
+        names = list(dict.fromkeys(tag.name for tag in tags))
+        
+        if replace:
+            await self._session.execute(
+                delete(confession_tag).where(confession_tag.c.confession_id == confession_id)
+            )
+        
+        if not names:
+            return
+        
+        tag_ids = await self._resolve_tag_ids(names)
+        
+        await self._session.execute(
+            pg_insert(confession_tag)
+            .values([{"confession_id": confession_id, "tag_id": tag_ids[name]} for name in names])
+            .on_conflict_do_nothing()
+        )
+        
+        for tag in tags:
+            tag.id = tag_ids[tag.name]
+    
+    async def _count_tags(self, confession_ids: Sequence[int], delta: int) -> None:
+        """
+        Прибавляет delta к счетчикам опубликованных признаний всех тегов этих признаний.
+        
+        Один INSERT ... SELECT ... ON CONFLICT DO UPDATE в текущей транзакции;
+        строки счетчиков обновляются в порядке tag_id, поэтому параллельные
+        публикации не блокируют друг друга крест-накрест.
+        
+        Args:
+            confession_ids: ID признаний
+            delta: 1 при публикации или добавлении связей, -1 при их удалении
+        """
+        counts = (
+            select(confession_tag.c.tag_id, (func.count() * delta).label("published_count"))
+            .where(confession_tag.c.confession_id.in_(confession_ids))
+            .group_by(confession_tag.c.tag_id)
+            .order_by(confession_tag.c.tag_id)
+        )
+        stmt = pg_insert(TagCountModel).from_select(["tag_id", "published_count"], counts)
+        await self._session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[TagCountModel.tag_id],
+                set_={"published_count": TagCountModel.published_count + stmt.excluded.published_count},
+            )
+        )
+    
+    async def _resolve_tag_ids(self, names: List[str]) -> Dict[str, int]:
+        """
+        Находит ID тегов по именам, создавая недостающие.
+        
+        Вставка идет через ON CONFLICT DO NOTHING, поэтому параллельное
+        создание одного и того же тега не падает на уникальном индексе:
+        теги, вставленные конкурентом, дочитываются отдельным запросом.
+        
+        Args:
+            names: Уникальные имена тегов
             
-            # Создаем новую запись
-            published_record_model = PublishedRecordModel(
-                confession_id=confession_model.id,
-                telegram_message_id=confession.published_record.telegram_message_id,
-                channel_id=confession.published_record.channel_id,
-                published_at=confession.published_record.published_at,
-                discussion_thread_id=confession.published_record.discussion_thread_id,
+        Returns:
+            Dict[str, int]: Отображение имени тега в его ID
+        """
+        result = await self._session.execute(select(TagModel.name, TagModel.id).where(TagModel.name.in_(names)))
+        tag_ids = dict(result.all())
+        
+        missing = [name for name in names if name not in tag_ids]
+        if missing:
+            result = await self._session.execute(
+                pg_insert(TagModel)
+                .values([{"name": name} for name in missing])
+                .on_conflict_do_nothing(index_elements=[TagModel.name])
+                .returning(TagModel.name, TagModel.id)
             )
-            self._session.add(published_record_model)
+            tag_ids.update(result.all())
         
-        # Применяем все изменения
-        await self._session.commit()
+        raced = [name for name in missing if name not in tag_ids]
+        if raced:
+            result = await self._session.execute(select(TagModel.name, TagModel.id).where(TagModel.name.in_(raced)))
+            tag_ids.update(result.all())
         
-        # Возвращаем обновленную доменную сущность
-        return await self.get_by_id(confession_model.id)
+        return tag_ids
     
-    async def get_by_id(self, id: int) -> Optional[Confession]:
+    async def get_by_id(
+        self,
+        id: int,
+        projection: ConfessionProjection = ConfessionProjection.FULL,
+    ) -> Optional[Confession]:
         """
         Получает признание по ID.
         
         Args:
             id: ID признания
+            projection: Уровень детализации; save() можно вызывать только
+                для признаний, прочитанных целиком (FULL)
             
         Returns:
             Optional[Confession]: Найденное признание или None
         """
         # Формируем запрос с предзагрузкой связанных сущностей
-        stmt = (
-            select(ConfessionModel)
-            .where(ConfessionModel.id == id)
-            .options(
-                selectinload(ConfessionModel.attachments),
-                selectinload(ConfessionModel.tags),
-                selectinload(ConfessionModel.poll).selectinload(PollModel.options),
-                selectinload(ConfessionModel.moderation_logs),
-                selectinload(ConfessionModel.published_record),
-                selectinload(ConfessionModel.comments),
-            )
-        )
+        stmt = self._with_relations(select(ConfessionModel).where(ConfessionModel.id == id), projection)
         
         result = await self._session.execute(stmt)
         confession_model = result.scalars().first()
@@ -218,72 +579,494 @@ class SqlAlchemyConfessionRepository(ConfessionRepositoryProtocol):
         if not confession_model:
             return None
         
-        # Преобразуем в доменную сущность
-        return self._map_to_domain(confession_model)
+        # Преобразуем в доменную сущность и запоминаем ее состояние для save()
+        confession = self._map_to_domain(confession_model)
+        if projection == ConfessionProjection.FULL:
+            self._remember(confession)
+        return confession
     
-    async def list_by_status(self, status: ConfessionStatus) -> List[Confession]:
+    async def get_revision(self, id: int) -> Optional[ConfessionRevision]:
+        """
+        Получает версию признания без загрузки агрегата.
+        
+        Один запрос по первичному ключу; сумма голосов опроса считается
+        подзапросом по индексам polls.confession_id и poll_options.poll_id.
+        
+        Args:
+            id: ID признания
+            
+        Returns:
+            Optional[ConfessionRevision]: Версия признания или None, если оно не найдено
+        """
+        # Без опроса сумма по пустому множеству - NULL
+        poll_votes = (
+            select(func.sum(func.coalesce(PollOptionModel.vote_count, 0)))
+            .join(PollModel, PollModel.id == PollOptionModel.poll_id)
+            .where(PollModel.confession_id == ConfessionModel.id)
+            .scalar_subquery()
+        )
+        result = await self._session.execute(
+            select(
+                ConfessionModel.status,
+                ConfessionModel.version,
+                ConfessionModel.updated_at,
+                poll_votes,
+            ).where(ConfessionModel.id == id)
+        )
+        row = result.first()
+        if row is None:
+            return None
+        
+        status, version, updated_at, votes = row
+        return ConfessionRevision(
+            id=id,
+            status=status,
+            version=version,
+            updated_at=updated_at,
+            poll_votes=None if votes is None else int(votes),
+        )
+    
+    async def list_by_status(
+        self,
+        status: Optional[ConfessionStatus],
+        projection: ConfessionProjection = ConfessionProjection.FULL,
+    ) -> List[Confession]:
         """
         Получает список признаний по статусу.
         
         Args:
-            status: Статус признаний
+            status: Статус признаний или None для всех
+            projection: Уровень детализации
             
         Returns:
-            List[Confession]: Список признаний
+            List[Confession]: Список признаний (новые сверху)
         """
         # Формируем запрос с предзагрузкой связанных сущностей
-        stmt = (
-            select(ConfessionModel)
-            .where(ConfessionModel.status == status)
-            .options(
-                selectinload(ConfessionModel.attachments),
-                selectinload(ConfessionModel.tags),
-                selectinload(ConfessionModel.poll).selectinload(PollModel.options),
-                selectinload(ConfessionModel.moderation_logs),
-                selectinload(ConfessionModel.published_record),
-                selectinload(ConfessionModel.comments),
-            )
-        )
+        stmt = self._with_relations(self._keyset(select(ConfessionModel), status, None), projection)
         
         result = await self._session.execute(stmt)
         confession_models = result.scalars().all()
         
         # Преобразуем каждую модель в доменную сущность
-        return [self._map_to_domain(model) for model in confession_models]
+        return self._map_all(confession_models, projection)
+    
+    async def list_page(
+        self,
+        status: Optional[ConfessionStatus],
+        limit: int,
+        cursor: Optional[PageCursor] = None,
+        projection: ConfessionProjection = ConfessionProjection.FULL,
+    ) -> Page[Confession]:
+        """
+        Получает страницу признаний, упорядоченных от новых к старым.
+        
+        Используется keyset-пагинация по (created_at, id): стоимость запроса
+        не зависит от того, насколько далеко клиент пролистал ленту.
+        
+        Args:
+            status: Статус признаний или None для всех
+            limit: Максимальное количество признаний на странице
+            cursor: Курсор, после которого начинается страница
+            projection: Уровень детализации
+            
+        Returns:
+            Page[Confession]: Страница признаний и курсор следующей страницы
+        """
+        stmt = self._keyset(select(ConfessionModel), status, cursor).limit(limit + 1)
+        return await self._page(stmt, limit, projection)
+    
+    async def list_page_by_tag(
+        self,
+        tag_name: str,
+        limit: int,
+        cursor: Optional[PageCursor] = None,
+        projection: ConfessionProjection = ConfessionProjection.SUMMARY,
+    ) -> Page[Confession]:
+        """
+        Получает страницу опубликованных признаний с тегом, от новых к старым.
+        
+        Для редкого тега планировщик берет его признания по индексу
+        confession_tag (tag_id, confession_id), для частого - идет по индексу
+        публичной ленты и проверяет связь по первичному ключу confession_tag;
+        в обоих случаях история целиком не соединяется.
+        
+        Args:
+            tag_name: Имя тега
+            limit: Максимальное количество признаний на странице
+            cursor: Курсор, после которого начинается страница
+            projection: Уровень детализации
+            
+        Returns:
+            Page[Confession]: Страница признаний (пустая, если тега нет) и курсор следующей страницы
+        """
+        stmt = self._keyset(
+            select(ConfessionModel)
+            .join(confession_tag, confession_tag.c.confession_id == ConfessionModel.id)
+            .join(TagModel, TagModel.id == confession_tag.c.tag_id)
+            .where(TagModel.name == tag_name),
+            ConfessionStatus.PUBLISHED,
+            cursor,
+        ).limit(limit + 1)
+        return await self._page(stmt, limit, projection)
+    
+    async def _page(self, stmt: Select, limit: int, projection: ConfessionProjection) -> Page[Confession]:
+        """Выполняет запрос ленты на limit + 1 строк и собирает страницу с курсором следующей."""
+        result = await self._session.execute(self._with_relations(stmt, projection))
+        confession_models = result.scalars().all()
+        
+        # Лишняя строка говорит только о том, что есть следующая страница
+        has_more = len(confession_models) > limit
+        items = self._map_all(confession_models[:limit], projection)
+        
+        next_cursor = None
+        if has_more and items:
+            next_cursor = PageCursor(created_at=items[-1].created_at, id=items[-1].id)
+        
+        return Page(items=items, next_cursor=next_cursor)
+    
+    async def stream_by_status(
+        self,
+        status: Optional[ConfessionStatus],
+        projection: ConfessionProjection = ConfessionProjection.FULL,
+    ) -> AsyncIterator[Confession]:
+        """
+        Потоково отдает признания через серверный курсор.
+        
+        Строки читаются пачками по STREAM_BATCH_SIZE, связанные сущности
+        подгружаются для каждой пачки отдельно, поэтому в памяти никогда
+        не находится весь результат целиком. По той же причине снимки
+        не запоминаются: признания из потока только для чтения, save()
+        для них отклоняется.
+        
+        Args:
+            status: Статус признаний или None для всех
+            projection: Уровень детализации
+            
+        Yields:
+            Confession: Очередное признание
+        """
+        stmt = self._with_relations(self._keyset(select(ConfessionModel), status, None), projection)
+        stmt = stmt.execution_options(yield_per=STREAM_BATCH_SIZE)
+        
+        result = await self._session.stream(stmt)
+        async for confession_model in result.scalars():
+            yield self._map_to_domain(confession_model)
+    
+    async def search(
+        self,
+        query: str,
+        status: Optional[ConfessionStatus] = None,
+        cursor: Optional[SearchCursor] = None,
+        limit: int = 20,
+    ) -> Page[ConfessionSearchHit]:
+        """
+        Ищет признания по тексту.
+        
+        Запрос разбирается websearch_to_tsquery (слова, "фразы", OR, -исключение)
+        в русской и английской конфигурациях и сопоставляется с колонкой
+        search_vector по GIN-индексу. Из SEARCH_MAX_CANDIDATES самых новых
+        совпадений выбирается страница по убыванию ts_rank_cd; фрагменты
+        с подсветкой (ts_headline) строятся только для строк страницы.
+        
+        Args:
+            query: Поисковый запрос
+            status: Статус признаний или None для всех
+            cursor: Курсор, после которого начинается страница
+            limit: Максимальное количество результатов на странице
+            
+        Returns:
+            Page[ConfessionSearchHit]: Найденные признания (краткая проекция) и курсор следующей страницы
+        """
+        ts_query = func.websearch_to_tsquery(literal_column("'russian'::regconfig"), query).op("||")(
+            func.websearch_to_tsquery(literal_column("'english'::regconfig"), query)
+        )
+        
+        candidates = (
+            select(
+                ConfessionModel.id.label("id"),
+                func.ts_rank_cd(ConfessionModel.search_vector, ts_query).label("rank"),
+            )
+            .where(ConfessionModel.search_vector.op("@@")(ts_query))
+            .order_by(ConfessionModel.created_at.desc(), ConfessionModel.id.desc())
+            .limit(SEARCH_MAX_CANDIDATES)
+        )
+        if status is not None:
+            candidates = candidates.where(ConfessionModel.status == status)
+        candidates = candidates.subquery("candidates")
+        
+        page = select(candidates)
+        if cursor is not None:
+            page = page.where(tuple_(candidates.c.rank, candidates.c.id) < tuple_(cursor.rank, cursor.id))
+        page = page.order_by(candidates.c.rank.desc(), candidates.c.id.desc()).limit(limit + 1).subquery("page")
+        
+        stmt = (
+            select(
+                ConfessionModel,
+                page.c.rank,
+                func.ts_headline(
+                    literal_column("'russian'::regconfig"),
+                    ConfessionModel.content,
+                    ts_query,
+                    literal(HEADLINE_OPTIONS),
+                ).label("snippet"),
+            )
+            .join(page, page.c.id == ConfessionModel.id)
+            .order_by(page.c.rank.desc(), page.c.id.desc())
+        )
+        result = await self._session.execute(self._with_relations(stmt, ConfessionProjection.SUMMARY))
+        rows = result.all()
+        
+        has_more = len(rows) > limit
+        items = [
+            ConfessionSearchHit(
+                confession=self._map_to_domain(model),
+                rank=rank,
+                snippet=self._format_snippet(snippet),
+            )
+            for model, rank, snippet in rows[:limit]
+        ]
+        
+        next_cursor = None
+        if has_more and items:
+            next_cursor = SearchCursor(rank=items[-1].rank, id=items[-1].confession.id)
+        
+        return Page(items=items, next_cursor=next_cursor)
     
-    async def update_status(self, id: int, status: ConfessionStatus) -> None:
+    @staticmethod
+    def _format_snippet(snippet: str) -> str:
+        """Экранирует HTML во фрагменте текста и превращает маркеры совпадений в теги <mark>."""
+        return html.escape(snippet).replace(HIGHLIGHT_START, "<mark>").replace(HIGHLIGHT_STOP, "</mark>")
+    
+    async def update_status(
+        self,
+        id: int,
+        status: ConfessionStatus,
+        expected: Optional[ConfessionStatus] = None,
+        log: Optional[ModerationLog] = None,
+    ) -> bool:
         """
-        Обновляет статус признания.
+        Меняет статус признания одним запросом compare-and-set.
+        
+        UPDATE ... WHERE id = :id AND status = :expected RETURNING version
+        выполняется без предварительного SELECT и без блокировок: если
+        статус успел сменить другой воркер или модератор, строка не
+        обновится. Без expected допустим любой статус, из которого
+        разрешен переход в новый.
+        
+        Запись о модерации, если передана, вставляется в той же транзакции
+        и только при успешной смене статуса.
         
         Args:
             id: ID признания
             status: Новый статус
+            expected: Статус, который признание должно иметь сейчас
+            log: Запись о модерации, объясняющая смену статуса; получает ID
+            
+        Returns:
+            bool: False, если признание не найдено
+            
+        Raises:
+            StatusTransitionError: Переход запрещен или статус уже изменен конкурентом
         """
-        # Находим признание по ID
-        stmt = select(ConfessionModel).where(ConfessionModel.id == id)
-        result = await self._session.execute(stmt)
-        confession_model = result.scalars().first()
+        if expected is not None and not expected.can_transition_to(status):
+            raise StatusTransitionError(id, expected, status)
         
-        if not confession_model:
-            logger.error(f"Confession with ID {id} not found")
-            return
+        allowed = [expected] if expected is not None else sorted(ConfessionStatus.sources_of(status))
+        result = await self._session.execute(
+            update(ConfessionModel)
+            .where(ConfessionModel.id == id, ConfessionModel.status.in_(allowed))
+            .values(status=status, version=ConfessionModel.version + 1)
+            .returning(ConfessionModel.version)
+            .execution_options(synchronize_session=False)
+        )
+        version = result.scalar_one_or_none()
+        
+        if version is None:
+            # Строка не обновилась - разбираемся почему (только на этом редком пути нужен второй запрос)
+            current = await self._current_status(id)
+            await self._session.rollback()
+            if current is None:
+                logger.error(f"Confession with ID {id} not found")
+                return False
+            if current == status and expected is None:
+                # Повторный запрос той же смены статуса
+                return True
+            raise StatusTransitionError(id, current, status)
+        
+        if status == ConfessionStatus.PUBLISHED:
+            await self._count_tags([id], 1)
+        
+        if log is not None:
+            log.confession_id = id
+            log_model = ModerationLogModel(confession_id=id, **self._fields(log, MODERATION_LOG_FIELDS))
+            self._session.add(log_model)
+            await self._session.flush()
+            log.id = log_model.id
+        
+        await self._session.commit()
+        self._snapshots.pop(id, None)
+        return True
+    
+    async def record_publication(self, record: PublishedRecord, poll_message_id: Optional[str] = None) -> bool:
+        """
+        Фиксирует публикацию признания, если она еще не зафиксирована.
+        
+        Признание публикуется в несколько каналов, а запись о публикации
+        у него одна: ее оставляет канал, доставленный первым
+        (INSERT ... ON CONFLICT DO NOTHING), поэтому параллельные
+        отправители не упираются в уникальность confession_id. ID опроса
+        в Telegram записывается вместе с ней, из того же канала. ID сообщений
+        в остальных каналах хранятся в исходящей очереди.
+        
+        Args:
+            record: Запись о публикации
+            poll_message_id: ID сообщения с опросом в том же канале
+            
+        Returns:
+            bool: True, если запись вставлена этим вызовом
+        """
+        result = await self._session.execute(
+            pg_insert(PublishedRecordModel)
+            .values(confession_id=record.confession_id, **self._fields(record, PUBLISHED_RECORD_FIELDS))
+            .on_conflict_do_nothing(index_elements=[PublishedRecordModel.confession_id])
+            .returning(PublishedRecordModel.id)
+        )
+        record.id = result.scalar_one_or_none()
+        if record.id is None:
+            await self._session.rollback()
+            return False
+        
+        if poll_message_id is not None:
+            await self._session.execute(
+                update(PollModel)
+                .where(PollModel.confession_id == record.confession_id, PollModel.poll_message_id.is_(None))
+                .values(poll_message_id=poll_message_id)
+                .execution_options(synchronize_session=False)
+            )
+        
+        await self._session.commit()
+        self._snapshots.pop(record.confession_id, None)
+        return True
+    
+    async def publish_approved(self, limit: int, channel_ids: Sequence[str]) -> List[int]:
+        """
+        Переводит самые старые одобренные признания в PUBLISHED и ставит их в очередь отправки.
         
-        # Обновляем статус
-        confession_model.status = status
+        Выбор, смена статуса и вставка сообщений в очередь выполняются
+        в одной транзакции: признания выбираются через FOR UPDATE SKIP LOCKED,
+        поэтому параллельный планировщик или ручная публикация
+        не поставят одно признание в очередь дважды.
+        
+        Args:
+            limit: Максимум признаний
+            channel_ids: Каналы, в которые публикуется каждое признание
+            
+        Returns:
+            List[int]: ID поставленных в очередь признаний
+        """
+        candidates = (
+            select(ConfessionModel.id)
+            .where(ConfessionModel.status == ConfessionStatus.APPROVED)
+            .order_by(ConfessionModel.created_at, ConfessionModel.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self._session.execute(
+            update(ConfessionModel)
+            .where(ConfessionModel.id.in_(candidates))
+            .values(status=ConfessionStatus.PUBLISHED, version=ConfessionModel.version + 1)
+            .returning(ConfessionModel.id)
+            .execution_options(synchronize_session=False)
+        )
+        confession_ids = sorted(result.scalars().all())
+        if confession_ids:
+            await self._count_tags(confession_ids, 1)
+        
+        for confession_id in confession_ids:
+            await self._enqueue_publications(
+                confession_id, [Publication(channel_id=channel_id) for channel_id in channel_ids]
+            )
         
-        # Сохраняем изменения
         await self._session.commit()
+        return confession_ids
+    
+    async def count_by_status(self, status: ConfessionStatus) -> int:
+        """
+        Считает признания с указанным статусом.
+        
+        Args:
+            status: Статус признаний
+            
+        Returns:
+            int: Количество признаний
+        """
+        result = await self._session.execute(
+            select(func.count()).select_from(ConfessionModel).where(ConfessionModel.status == status)
+        )
+        return result.scalar_one()
+    
+    @staticmethod
+    def _with_relations(stmt: Select, projection: ConfessionProjection = ConfessionProjection.FULL) -> Select:
+        """
+        Добавляет к запросу предзагрузку связанных сущностей нужного уровня детализации.
+        
+        Каждая загружаемая связь - один дополнительный SELECT ... WHERE IN
+        на весь результат; остальные связи не загружаются вовсе (raiseload
+        защищает от незаметной ленивой загрузки по запросу на строку).
+        """
+        relations = PROJECTION_RELATIONS[projection]
+        options = [
+            selectinload(ConfessionModel.poll).selectinload(PollModel.options)
+            if relation == "poll"
+            else selectinload(getattr(ConfessionModel, relation))
+            for relation in relations
+        ]
+        if projection != ConfessionProjection.FULL:
+            options.append(
+                load_only(
+                    ConfessionModel.id,
+                    ConfessionModel.content,
+                    ConfessionModel.status,
+                    ConfessionModel.version,
+                    ConfessionModel.created_at,
+                )
+            )
+        return stmt.options(*options, raiseload("*"))
+    
+    @staticmethod
+    def _keyset(stmt: Select, status: Optional[ConfessionStatus], cursor: Optional[PageCursor]) -> Select:
+        """Добавляет к запросу фильтр по статусу, условие курсора и порядок ленты."""
+        if status is not None:
+            stmt = stmt.where(ConfessionModel.status == status)
+        if cursor is not None:
+            stmt = stmt.where(
+                tuple_(ConfessionModel.created_at, ConfessionModel.id) < tuple_(cursor.created_at, cursor.id)
+            )
+        return stmt.order_by(ConfessionModel.created_at.desc(), ConfessionModel.id.desc())
+    
+    def _map_all(self, models: Sequence[ConfessionModel], projection: ConfessionProjection) -> List[Confession]:
+        """Преобразует модели в доменные сущности; прочитанные целиком запоминаются для save()."""
+        confessions = [self._map_to_domain(model) for model in models]
+        if projection == ConfessionProjection.FULL:
+            for confession in confessions:
+                self._remember(confession)
+        return confessions
     
     def _map_to_domain(self, model: ConfessionModel) -> Confession:
         """
         Преобразует ORM-модель в доменную сущность.
         
+        Связи, не загруженные для выбранного уровня детализации,
+        остаются пустыми.
+        
         Args:
             model: ORM-модель признания
             
         Returns:
             Confession: Доменная сущность
         """
+        unloaded = inspect(model).unloaded
+        
         # Преобразуем вложения
         attachments = [
             Attachment(
@@ -293,15 +1076,15 @@ class SqlAlchemyConfessionRepository(ConfessionRepositoryProtocol):
                 uploaded_at=attachment.uploaded_at,
                 caption=attachment.caption,
             )
-            for attachment in model.attachments
+            for attachment in self._loaded(model, "attachments", unloaded)
         ]
         
         # Преобразуем теги
-        tags = [Tag(id=tag.id, name=tag.name) for tag in model.tags]
+        tags = [Tag(id=tag.id, name=tag.name) for tag in self._loaded(model, "tags", unloaded)]
         
         # Преобразуем опрос, если есть
         poll = None
-        if model.poll:
+        if "poll" not in unloaded and model.poll:
             poll_options = [
                 PollOption(
                     id=option.id,
@@ -334,12 +1117,12 @@ class SqlAlchemyConfessionRepository(ConfessionRepositoryProtocol):
                 reason=log.reason,
                 timestamp=log.timestamp,
             )
-            for log in model.moderation_logs
+            for log in self._loaded(model, "moderation_logs", unloaded)
         ]
         
         # Преобразуем запись о публикации, если есть
         published_record = None
-        if model.published_record:
+        if "published_record" not in unloaded and model.published_record:
             published_record = PublishedRecord(
                 id=model.published_record.id,
                 confession_id=model.published_record.confession_id,
@@ -358,7 +1141,7 @@ class SqlAlchemyConfessionRepository(ConfessionRepositoryProtocol):
                 created_at=comment.created_at,
                 reply_to=comment.reply_to,
             )
-            for comment in model.comments
+            for comment in self._loaded(model, "comments", unloaded)
         ]
         
         # Создаем доменную сущность
@@ -367,10 +1150,16 @@ class SqlAlchemyConfessionRepository(ConfessionRepositoryProtocol):
             content=model.content,
             created_at=model.created_at,
             status=model.status,
+            version=model.version,
             attachments=attachments,
             tags=tags,
             poll=poll,
             moderation_logs=moderation_logs,
             published_record=published_record,
             comments=comments,
-        ) 
\ No newline at end of file
+        ) 
+    
+    @staticmethod
+    def _loaded(model: ConfessionModel, relation: str, unloaded: Any) -> List[Any]:
+        """Возвращает загруженную коллекцию связанных моделей или пустой список, если она не загружалась."""
+        return [] if relation in unloaded else getattr(model, relation)
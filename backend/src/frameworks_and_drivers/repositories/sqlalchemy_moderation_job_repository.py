@@ -0,0 +1,239 @@
+"""
+SQLAlchemy-реализация очереди задач фоновой модерации.
+"""
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.entities.confession import ModerationJob
+from src.entities.enums import ModerationJobStatus
+from src.frameworks_and_drivers.models.confession import ModerationJobModel
+from src.interface_adapters.repository_protocols import ModerationJobRepositoryProtocol
+
+# Статусы незавершенных задач (на них действует уникальность по признанию)
+ACTIVE_STATUSES = [ModerationJobStatus.QUEUED, ModerationJobStatus.RUNNING]
+
+# Колонки задачи, которые читаются и возвращаются через RETURNING
+JOB_COLUMNS = ModerationJobModel.__table__.c
+
+
+class SqlAlchemyModerationJobRepository(ModerationJobRepositoryProtocol):
+    """
+    Очередь задач модерации в таблице PostgreSQL.
+    
+    Воркеры забирают задачи через SELECT ... FOR UPDATE SKIP LOCKED,
+    поэтому любое их количество (в том числе в разных процессах)
+    разбирает очередь без взаимных блокировок и двойной обработки.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        """
+        Инициализация репозитория.
+        
+        Args:
+            session: Активная сессия SQLAlchemy
+        """
+        self._session = session
+    
+    async def enqueue(self, confession_id: int) -> ModerationJob:
+        """
+        Ставит признание в очередь модерации.
+        
+        Если у признания уже есть незавершенная задача, новая не создается
+        (частичный уникальный индекс + ON CONFLICT DO NOTHING).
+        
+        Args:
+            confession_id: ID признания
+            
+        Returns:
+            ModerationJob: Новая или уже стоящая в очереди задача
+        """
+        now = datetime.now()
+        result = await self._session.execute(
+            pg_insert(ModerationJobModel)
+            .values(
+                confession_id=confession_id,
+                status=ModerationJobStatus.QUEUED,
+                attempts=0,
+                available_at=now,
+                created_at=now,
+                updated_at=now,
+            )
+            .on_conflict_do_nothing(
+                index_elements=[ModerationJobModel.confession_id],
+                index_where=ModerationJobModel.status.in_(ACTIVE_STATUSES),
+            )
+            .returning(*JOB_COLUMNS)
+        )
+        row = result.first()
+        
+        if row is None:
+            result = await self._session.execute(
+                select(*JOB_COLUMNS).where(
+                    ModerationJobModel.confession_id == confession_id,
+                    ModerationJobModel.status.in_(ACTIVE_STATUSES),
+                )
+            )
+            row = result.first()
+        
+        await self._session.commit()
+        return self._map_to_domain(row)
+    
+    async def claim(self, lease_seconds: float) -> Optional[ModerationJob]:
+        """
+        Забирает самую старую готовую задачу одним запросом.
+        
+        Кроме задач в очереди забираются и задачи, взятые воркером, который
+        не отчитался за lease_seconds (например, процесс был убит).
+        
+        Args:
+            lease_seconds: Сколько секунд задача считается занятой воркером
+            
+        Returns:
+            Optional[ModerationJob]: Задача или None, если очередь пуста
+        """
+        now = datetime.now()
+        candidate = (
+            select(ModerationJobModel.id)
+            .where(
+                or_(
+                    and_(
+                        ModerationJobModel.status == ModerationJobStatus.QUEUED,
+                        ModerationJobModel.available_at <= now,
+                    ),
+                    and_(
+                        ModerationJobModel.status == ModerationJobStatus.RUNNING,
+                        ModerationJobModel.locked_at < now - timedelta(seconds=lease_seconds),
+                    ),
+                )
+            )
+            .order_by(ModerationJobModel.available_at, ModerationJobModel.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        
+        result = await self._session.execute(
+            update(ModerationJobModel)
+            .where(ModerationJobModel.id == candidate)
+            .values(
+                status=ModerationJobStatus.RUNNING,
+                attempts=ModerationJobModel.attempts + 1,
+                locked_at=now,
+                updated_at=now,
+            )
+            .returning(*JOB_COLUMNS)
+            .execution_options(synchronize_session=False)
+        )
+        row = result.first()
+        await self._session.commit()
+        
+        return self._map_to_domain(row) if row else None
+    
+    async def complete(self, job: ModerationJob) -> bool:
+        """
+        Отмечает задачу выполненной.
+        
+        Args:
+            job: Задача, полученная из claim()
+            
+        Returns:
+            bool: False, если аренда истекла и задачу уже забрал другой воркер
+        """
+        return await self._set_status(job, ModerationJobStatus.DONE, locked_at=None)
+    
+    async def retry(self, job: ModerationJob, error: str, available_at: datetime) -> bool:
+        """
+        Возвращает задачу в очередь.
+        
+        Args:
+            job: Задача, полученная из claim()
+            error: Описание ошибки последней попытки
+            available_at: Время, раньше которого задачу не брать
+            
+        Returns:
+            bool: False, если аренда истекла и задачу уже забрал другой воркер
+        """
+        return await self._set_status(
+            job,
+            ModerationJobStatus.QUEUED,
+            last_error=error,
+            available_at=available_at,
+            locked_at=None,
+        )
+    
+    async def fail(self, job: ModerationJob, error: str) -> bool:
+        """
+        Отмечает задачу окончательно проваленной.
+        
+        Args:
+            job: Задача, полученная из claim()
+            error: Описание ошибки последней попытки
+            
+        Returns:
+            bool: False, если аренда истекла и задачу уже забрал другой воркер
+        """
+        return await self._set_status(job, ModerationJobStatus.FAILED, last_error=error, locked_at=None)
+    
+    async def get_by_id(self, id: int) -> Optional[ModerationJob]:
+        """
+        Получает задачу по ID.
+        
+        Args:
+            id: ID задачи
+            
+        Returns:
+            Optional[ModerationJob]: Задача или None
+        """
+        result = await self._session.execute(select(*JOB_COLUMNS).where(ModerationJobModel.id == id))
+        row = result.first()
+        return self._map_to_domain(row) if row else None
+    
+    async def _set_status(self, job: ModerationJob, status: ModerationJobStatus, **values: object) -> bool:
+        """
+        Обновляет статус задачи, если воркер все еще владеет ее арендой, и фиксирует транзакцию.
+        
+        Аренду подтверждает locked_at из claim(): задачу с истекшей арендой
+        забирает другой воркер с новым locked_at, и запоздавший отчет
+        прежнего воркера не перезапишет результат нового.
+        """
+        result = await self._session.execute(
+            update(ModerationJobModel)
+            .where(
+                ModerationJobModel.id == job.id,
+                ModerationJobModel.status == ModerationJobStatus.RUNNING,
+                ModerationJobModel.locked_at == job.locked_at,
+            )
+            .values(status=status, updated_at=datetime.now(), **values)
+            .returning(ModerationJobModel.id)
+            .execution_options(synchronize_session=False)
+        )
+        updated = result.first() is not None
+        await self._session.commit()
+        return updated
+    
+    @staticmethod
+    def _map_to_domain(row) -> ModerationJob:
+        """
+        Преобразует строку результата в доменную сущность.
+        
+        Args:
+            row: Строка со всеми колонками moderation_jobs
+            
+        Returns:
+            ModerationJob: Доменная сущность
+        """
+        return ModerationJob(
+            id=row.id,
+            confession_id=row.confession_id,
+            status=row.status,
+            attempts=row.attempts,
+            last_error=row.last_error,
+            available_at=row.available_at,
+            locked_at=row.locked_at,
+            created_at=row.created_at,
+            updated_at=row.updated_at,
+        )
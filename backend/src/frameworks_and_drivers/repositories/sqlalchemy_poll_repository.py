@@ -0,0 +1,103 @@
+"""
+SQLAlchemy-реализация репозитория для опросов.
+"""
+from typing import Mapping, Optional
+
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from src.entities.confession import Poll, PollOption
+from src.frameworks_and_drivers.models.confession import PollModel, PollOptionModel
+from src.interface_adapters.repository_protocols import PollRepositoryProtocol
+
+# Таблица вариантов ответа: голоса пишутся в нее без загрузки ORM-объектов
+POLL_OPTIONS = PollOptionModel.__table__
+
+
+class SqlAlchemyPollRepository(PollRepositoryProtocol):
+    """
+    Репозиторий опросов.
+    
+    Голоса применяются атомарным UPDATE ... SET vote_count = vote_count + :n,
+    а не чтением, изменением и записью счетчика: параллельные голоса
+    не теряются, а блокировка строки держится только на время одного UPDATE.
+    """
+    
+    def __init__(self, session: AsyncSession) -> None:
+        """
+        Инициализация репозитория.
+        
+        Args:
+            session: Активная сессия SQLAlchemy
+        """
+        self._session = session
+    
+    async def get_by_id(self, id: int) -> Optional[Poll]:
+        """
+        Получает опрос с вариантами ответа по ID.
+        
+        Args:
+            id: ID опроса
+            
+        Returns:
+            Optional[Poll]: Найденный опрос или None
+        """
+        result = await self._session.execute(
+            select(PollModel).options(selectinload(PollModel.options)).where(PollModel.id == id)
+        )
+        poll_model = result.scalars().first()
+        return self._map_to_domain(poll_model) if poll_model else None
+    
+    async def add_votes(self, increments: Mapping[int, int]) -> None:
+        """
+        Атомарно прибавляет голоса к вариантам ответа и фиксирует транзакцию.
+        
+        Все варианты обновляются одним executemany в порядке ID, поэтому
+        два параллельных сброса буфера не блокируют друг друга крест-накрест.
+        
+        Args:
+            increments: Количество новых голосов по ID варианта ответа
+        """
+        params = [
+            {"option_id": option_id, "increment": increment}
+            for option_id, increment in sorted(increments.items())
+            if increment
+        ]
+        if not params:
+            return
+        
+        await self._session.execute(
+            update(POLL_OPTIONS)
+            .where(POLL_OPTIONS.c.id == bindparam("option_id"))
+            .values(vote_count=POLL_OPTIONS.c.vote_count + bindparam("increment")),
+            params,
+        )
+        await self._session.commit()
+    
+    @staticmethod
+    def _map_to_domain(model: PollModel) -> Poll:
+        """
+        Преобразует ORM-модель опроса в доменную сущность.
+        
+        Args:
+            model: ORM-модель опроса
+            
+        Returns:
+            Poll: Доменная сущность
+        """
+        return Poll(
+            id=model.id,
+            question=model.question,
+            options=[
+                PollOption(id=option.id, text=option.text, vote_count=option.vote_count or 0)
+                for option in sorted(model.options, key=lambda option: option.id)
+            ],
+            allows_multiple_answers=model.allows_multiple_answers,
+            type=model.type,
+            correct_option_id=model.correct_option_id,
+            explanation=model.explanation,
+            open_period=model.open_period,
+            poll_message_id=model.poll_message_id,
+            created_at=model.created_at,
+        )
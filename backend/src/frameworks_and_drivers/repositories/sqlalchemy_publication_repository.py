@@ -0,0 +1,220 @@
+"""
+SQLAlchemy-реализация исходящей очереди публикаций в Telegram.
+"""
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.entities.confession import Publication, PublicationQueueStats
+from src.entities.enums import PublicationStatus
+from src.frameworks_and_drivers.metrics import metrics
+from src.frameworks_and_drivers.models.confession import PublicationModel
+from src.interface_adapters.repository_protocols import PublicationRepositoryProtocol
+
+# Колонки сообщения, которые возвращаются через RETURNING
+PUBLICATION_COLUMNS = PublicationModel.__table__.c
+
+# Статусы сообщений, которые еще не отправлены
+PENDING_STATUSES = (PublicationStatus.QUEUED, PublicationStatus.SENDING)
+
+publish_lag = metrics.summary(
+    "publication_lag_seconds", "Время от постановки публикации в очередь до доставки в Telegram"
+)
+
+
+class SqlAlchemyPublicationRepository(PublicationRepositoryProtocol):
+    """
+    Исходящая очередь (outbox) публикаций в таблице PostgreSQL.
+
+    Сообщения попадают в очередь в одной транзакции со сменой статуса
+    признания, а отправители забирают их через SELECT ... FOR UPDATE
+    SKIP LOCKED, поэтому одно сообщение не отправляется параллельно
+    двумя отправителями.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        """
+        Инициализация репозитория.
+
+        Args:
+            session: Активная сессия SQLAlchemy
+        """
+        self._session = session
+
+    async def claim(self, lease_seconds: float) -> Optional[Publication]:
+        """
+        Забирает самое старое готовое к отправке сообщение одним запросом.
+
+        Кроме сообщений в очереди забираются и сообщения отправителя,
+        который не отчитался за lease_seconds (например, процесс был убит).
+
+        Args:
+            lease_seconds: Сколько секунд сообщение считается занятым отправителем
+
+        Returns:
+            Optional[Publication]: Сообщение или None, если очередь пуста
+        """
+        now = datetime.now()
+        candidate = (
+            select(PublicationModel.id)
+            .where(
+                or_(
+                    and_(
+                        PublicationModel.status == PublicationStatus.QUEUED,
+                        PublicationModel.available_at <= now,
+                    ),
+                    and_(
+                        PublicationModel.status == PublicationStatus.SENDING,
+                        PublicationModel.locked_at < now - timedelta(seconds=lease_seconds),
+                    ),
+                )
+            )
+            .order_by(PublicationModel.available_at, PublicationModel.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+
+        result = await self._session.execute(
+            update(PublicationModel)
+            .where(PublicationModel.id == candidate)
+            .values(
+                status=PublicationStatus.SENDING,
+                attempts=PublicationModel.attempts + 1,
+                locked_at=now,
+            )
+            .returning(*PUBLICATION_COLUMNS)
+            .execution_options(synchronize_session=False)
+        )
+        row = result.first()
+        await self._session.commit()
+
+        return self._map_to_domain(row) if row else None
+
+    async def record_progress(
+        self,
+        publication_id: int,
+        telegram_message_id: Optional[str] = None,
+        poll_message_id: Optional[str] = None,
+        media_message_ids: Optional[List[str]] = None,
+    ) -> None:
+        """
+        Запоминает уже отправленные части сообщения.
+
+        Args:
+            publication_id: ID сообщения очереди
+            telegram_message_id: ID отправленного сообщения с признанием
+            poll_message_id: ID отправленного сообщения с опросом
+            media_message_ids: ID отправленных сообщений с вложениями
+        """
+        values = {}
+        if telegram_message_id is not None:
+            values["telegram_message_id"] = telegram_message_id
+        if poll_message_id is not None:
+            values["poll_message_id"] = poll_message_id
+        if media_message_ids is not None:
+            values["media_message_ids"] = media_message_ids
+        if not values:
+            return
+
+        await self._update(publication_id, **values)
+
+    async def complete(self, publication_id: int) -> None:
+        """
+        Отмечает сообщение доставленным.
+
+        Args:
+            publication_id: ID сообщения очереди
+        """
+        sent_at = datetime.now()
+        result = await self._session.execute(
+            update(PublicationModel)
+            .where(PublicationModel.id == publication_id)
+            .values(status=PublicationStatus.SENT, sent_at=sent_at, locked_at=None)
+            .returning(PublicationModel.created_at)
+            .execution_options(synchronize_session=False)
+        )
+        created_at = result.scalar_one_or_none()
+        await self._session.commit()
+
+        if created_at is not None:
+            publish_lag.observe((sent_at - created_at).total_seconds())
+
+    async def retry(self, publication_id: int, error: str, available_at: datetime) -> None:
+        """
+        Возвращает сообщение в очередь.
+
+        Args:
+            publication_id: ID сообщения очереди
+            error: Описание ошибки последней попытки
+            available_at: Время, раньше которого сообщение не отправлять
+        """
+        await self._update(
+            publication_id,
+            status=PublicationStatus.QUEUED,
+            last_error=error,
+            available_at=available_at,
+            locked_at=None,
+        )
+
+    async def fail(self, publication_id: int, error: str) -> None:
+        """
+        Отмечает сообщение недоставленным.
+
+        Args:
+            publication_id: ID сообщения очереди
+            error: Описание ошибки последней попытки
+        """
+        await self._update(publication_id, status=PublicationStatus.FAILED, last_error=error, locked_at=None)
+
+    async def queue_stats(self) -> PublicationQueueStats:
+        """
+        Возвращает состояние очереди одним запросом по частичному индексу неотправленных сообщений.
+
+        Returns:
+            PublicationQueueStats: Глубина очереди и время готовности самого старого сообщения
+        """
+        result = await self._session.execute(
+            select(func.count(), func.min(PublicationModel.available_at))
+            .where(PublicationModel.status.in_(PENDING_STATUSES))
+        )
+        depth, oldest_available_at = result.one()
+        return PublicationQueueStats(depth=depth, oldest_available_at=oldest_available_at)
+
+    async def _update(self, publication_id: int, **values: object) -> None:
+        """Обновляет колонки сообщения и фиксирует транзакцию."""
+        await self._session.execute(
+            update(PublicationModel)
+            .where(PublicationModel.id == publication_id)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        await self._session.commit()
+
+    @staticmethod
+    def _map_to_domain(row) -> Publication:
+        """
+        Преобразует строку результата в доменную сущность.
+
+        Args:
+            row: Строка со всеми колонками publication_outbox
+
+        Returns:
+            Publication: Доменная сущность
+        """
+        return Publication(
+            id=row.id,
+            confession_id=row.confession_id,
+            channel_id=row.channel_id,
+            status=row.status,
+            attempts=row.attempts,
+            last_error=row.last_error,
+            telegram_message_id=row.telegram_message_id,
+            poll_message_id=row.poll_message_id,
+            media_message_ids=row.media_message_ids,
+            available_at=row.available_at,
+            created_at=row.created_at,
+            sent_at=row.sent_at,
+        )
@@ -0,0 +1,95 @@
+"""
+SQLAlchemy-реализация репозитория для тегов.
+"""
+from typing import List
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.entities.confession import Tag, TagCount
+from src.frameworks_and_drivers.models.confession import TagCountModel, TagModel
+from src.interface_adapters.repository_protocols import TagRepositoryProtocol
+
+
+class SqlAlchemyTagRepository(TagRepositoryProtocol):
+    """
+    Репозиторий тегов.
+    
+    Популярность тегов читается из таблицы счетчиков tag_counts, которую
+    репозиторий признаний обновляет при публикации, а не считается
+    COUNT(*) по confession_tag и confessions на каждый запрос.
+    """
+    
+    def __init__(self, session: AsyncSession) -> None:
+        """
+        Инициализация репозитория.
+        
+        Args:
+            session: Активная сессия SQLAlchemy
+        """
+        self._session = session
+    
+    async def get_or_create(self, name: str) -> Tag:
+        """
+        Получает существующий тег или создает новый.
+        
+        Вставка идет через ON CONFLICT DO NOTHING: если тег одновременно
+        создал другой запрос, он дочитывается.
+        
+        Args:
+            name: Имя тега
+        
+        Returns:
+            Tag: Тег с ID
+        """
+        result = await self._session.execute(
+            pg_insert(TagModel)
+            .values(name=name)
+            .on_conflict_do_nothing(index_elements=[TagModel.name])
+            .returning(TagModel.id)
+        )
+        tag_id = result.scalar_one_or_none()
+        if tag_id is None:
+            result = await self._session.execute(select(TagModel.id).where(TagModel.name == name))
+            tag_id = result.scalar_one()
+        await self._session.commit()
+        return Tag(id=tag_id, name=name)
+    
+    async def get_by_names(self, names: List[str]) -> List[Tag]:
+        """
+        Получает существующие теги по их именам.
+        
+        Args:
+            names: Имена тегов
+        
+        Returns:
+            List[Tag]: Найденные теги
+        """
+        if not names:
+            return []
+        
+        result = await self._session.execute(select(TagModel.id, TagModel.name).where(TagModel.name.in_(names)))
+        return [Tag(id=id, name=name) for id, name in result.all()]
+    
+    async def list_popular(self, limit: int) -> List[TagCount]:
+        """
+        Получает теги с наибольшим числом опубликованных признаний.
+        
+        Читается не больше limit строк по индексу (published_count, tag_id)
+        и столько же тегов по первичному ключу.
+        
+        Args:
+            limit: Максимальное количество тегов
+        
+        Returns:
+            List[TagCount]: Теги и количество опубликованных признаний с ними, самые популярные сверху
+        """
+        result = await self._session.execute(
+            select(TagModel.id, TagModel.name, TagCountModel.published_count)
+            .join(TagModel, TagModel.id == TagCountModel.tag_id)
+            .where(TagCountModel.published_count > 0)
+            .order_by(TagCountModel.published_count.desc(), TagCountModel.tag_id.desc())
+            .limit(limit)
+        )
+        return [TagCount(tag=Tag(id=id, name=name), count=count) for id, name, count in result.all()]
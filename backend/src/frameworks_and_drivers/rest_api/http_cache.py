@@ -0,0 +1,351 @@
+"""
+Кэш готовых HTTP-ответов и условные запросы (ETag / If-None-Match, Last-Modified / If-Modified-Since).
+"""
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Awaitable, Callable, Dict, Hashable, Mapping, Optional, Tuple
+
+from fastapi import Response, status
+from loguru import logger
+
+from src.frameworks_and_drivers.metrics import metrics
+
+
+def compute_etag(body: bytes) -> str:
+    """Возвращает сильный ETag тела ответа: одинаковые тела в любом процессе получают одинаковый ETag."""
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Проверяет заголовок If-None-Match.
+
+    Для If-None-Match теги сравниваются слабо (префикс W/ не учитывается),
+    значение "*" совпадает с любым тегом.
+
+    Args:
+        if_none_match: Значение заголовка If-None-Match
+        etag: Текущий ETag ресурса
+
+    Returns:
+        bool: True, если у клиента актуальная версия
+    """
+    if not if_none_match:
+        return False
+
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def http_date(value: datetime) -> str:
+    """Форматирует время для Last-Modified; время без часового пояса считается локальным (как datetime.now)."""
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def is_not_modified(
+    if_none_match: Optional[str],
+    if_modified_since: Optional[str],
+    etag: str,
+    last_modified: Optional[datetime] = None,
+) -> bool:
+    """
+    Проверяет условный GET: актуальна ли копия клиента.
+
+    Если передан If-None-Match, If-Modified-Since не проверяется (RFC 9110,
+    раздел 13.2.2). Время сравнивается с точностью до секунды, как его
+    передает Last-Modified; неразборчивая дата игнорируется.
+
+    Args:
+        if_none_match: Значение заголовка If-None-Match
+        if_modified_since: Значение заголовка If-Modified-Since
+        etag: Текущий ETag ресурса
+        last_modified: Время последнего изменения ресурса (None - Last-Modified не отдается)
+
+    Returns:
+        bool: True, если можно ответить 304 Not Modified
+    """
+    if if_none_match is not None:
+        return etag_matches(if_none_match, etag)
+    if not if_modified_since or last_modified is None:
+        return False
+
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return last_modified.astimezone(timezone.utc).replace(microsecond=0) <= since
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """Сериализованное тело ответа и его ETag."""
+
+    body: bytes
+    etag: str
+    # Заголовки, которые хранятся вместе с телом (например, курсор следующей страницы)
+    headers: Mapping[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def from_body(cls, body: bytes, headers: Optional[Mapping[str, str]] = None) -> "CachedResponse":
+        """Создает запись, вычисляя ETag по телу."""
+        return cls(body=body, etag=compute_etag(body), headers=dict(headers or {}))
+
+    def to_response(
+        self,
+        if_none_match: Optional[str] = None,
+        headers: Optional[Dict[str, str]] = None,
+        media_type: str = "application/json",
+    ) -> Response:
+        """
+        Собирает HTTP-ответ: 304 без тела, если у клиента та же версия, иначе 200 с телом.
+
+        Args:
+            if_none_match: Значение заголовка If-None-Match запроса
+            headers: Дополнительные заголовки (например, Cache-Control)
+            media_type: Тип содержимого
+
+        Returns:
+            Response: Готовый ответ
+        """
+        headers = {"ETag": self.etag, **self.headers, **(headers or {})}
+        if etag_matches(if_none_match, self.etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(content=self.body, media_type=media_type, headers=headers)
+
+
+class ResponseCache:
+    """
+    LRU-кэш сериализованных ответов в памяти процесса с TTL.
+
+    Запись удаляется методом invalidate, как только меняются данные.
+    Чтобы ответ, прочитанный из БД до изменения, не попал в кэш после
+    invalidate, запись принимается только с номером snapshot(), взятым
+    до чтения. Другие процессы о локальных изменениях не узнают, поэтому
+    их записи живут не дольше ttl_seconds.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        ttl_seconds: float,
+        max_entries: int,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Инициализация кэша.
+
+        Args:
+            name: Имя кэша в метриках
+            ttl_seconds: Сколько секунд запись считается действительной
+            max_entries: Максимум записей
+            clock: Источник времени в секундах
+        """
+        self._ttl_seconds = ttl_seconds
+        self._max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, CachedResponse]]" = OrderedDict()
+        # Номер последней инвалидации по ключу (хранится для max_entries последних ключей)
+        self._invalidated: "OrderedDict[Hashable, int]" = OrderedDict()
+        self._sequence = 0
+        self._hits = metrics.counter("response_cache_hits_total", "Ответы, отданные из кэша", cache=name)
+        self._misses = metrics.counter("response_cache_misses_total", "Ответы, не найденные в кэше", cache=name)
+        metrics.gauge("response_cache_entries", "Записи в кэше ответов", lambda: len(self), cache=name)
+
+    def __len__(self) -> int:
+        """Возвращает количество записей."""
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        """
+        Возвращает неистекшую запись или None.
+
+        Args:
+            key: Ключ ресурса
+
+        Returns:
+            Optional[CachedResponse]: Запись или None при промахе
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, response = entry
+            if expires_at > self._clock():
+                self._entries.move_to_end(key)
+                self._hits.inc()
+                return response
+            del self._entries[key]
+
+        self._misses.inc()
+        return None
+
+    def snapshot(self) -> int:
+        """Возвращает номер, который нужно взять до чтения данных и передать в set."""
+        return self._sequence
+
+    def set(self, key: Hashable, response: CachedResponse, snapshot: int) -> None:
+        """
+        Сохраняет ответ, если данные не менялись с момента snapshot.
+
+        Args:
+            key: Ключ ресурса
+            response: Сериализованный ответ
+            snapshot: Значение snapshot(), взятое до чтения данных
+        """
+        if self._invalidated.get(key, 0) > snapshot:
+            return
+
+        self._entries[key] = (self._clock() + self._ttl_seconds, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        """
+        Удаляет запись после изменения данных.
+
+        Args:
+            key: Ключ ресурса
+        """
+        self._sequence += 1
+        self._entries.pop(key, None)
+        self._invalidated[key] = self._sequence
+        self._invalidated.move_to_end(key)
+        while len(self._invalidated) > self._max_entries:
+            self._invalidated.popitem(last=False)
+
+
+class ReadThroughCache:
+    """
+    Read-through кэш сериализованных ответов с защитой от лавины промахов.
+
+    Свежая запись (моложе ttl_seconds) отдается сразу. Устаревшая, но не
+    старше ttl_seconds + stale_seconds, тоже отдается сразу, а обновляется
+    одной фоновой загрузкой (stale-while-revalidate). При промахе все
+    конкурентные запросы одного ключа ждут одну загрузку (single-flight),
+    а не идут в БД каждый.
+
+    invalidate() удаляет все записи и отвязывает начатые загрузки: их
+    результат получат уже ждущие запросы, но в кэш он не попадет.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        ttl_seconds: float,
+        stale_seconds: float,
+        max_entries: int,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Инициализация кэша.
+
+        Args:
+            name: Имя кэша в метриках
+            ttl_seconds: Сколько секунд запись считается свежей
+            stale_seconds: Сколько секунд после ttl_seconds устаревшая запись отдается, пока обновляется
+            max_entries: Максимум записей
+            clock: Источник времени в секундах
+        """
+        self._ttl_seconds = ttl_seconds
+        self._stale_seconds = stale_seconds
+        self._max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, CachedResponse]]" = OrderedDict()
+        self._loads: Dict[Hashable, "asyncio.Task[CachedResponse]"] = {}
+        # Номер инвалидации: загрузка, начатая до очередного invalidate, не сохраняет результат
+        self._generation = 0
+        self._hits = metrics.counter("response_cache_hits_total", "Ответы, отданные из кэша", cache=name)
+        self._stale_hits = metrics.counter(
+            "response_cache_stale_hits_total", "Устаревшие ответы, отданные из кэша во время обновления", cache=name
+        )
+        self._misses = metrics.counter("response_cache_misses_total", "Ответы, не найденные в кэше", cache=name)
+        self._loaded = metrics.counter("response_cache_loads_total", "Загрузки ответов в кэш", cache=name)
+        metrics.gauge("response_cache_entries", "Записи в кэше ответов", lambda: len(self), cache=name)
+
+    def __len__(self) -> int:
+        """Возвращает количество записей."""
+        return len(self._entries)
+
+    async def get(self, key: Hashable, loader: Callable[[], Awaitable[CachedResponse]]) -> CachedResponse:
+        """
+        Возвращает ответ из кэша, при необходимости загружая его.
+
+        Args:
+            key: Ключ ресурса
+            loader: Загружает и сериализует ответ; вызывается не более одного раза на ключ одновременно
+
+        Returns:
+            CachedResponse: Свежий или еще допустимый устаревший ответ
+
+        Raises:
+            Exception: Ошибка loader, если ответа в кэше нет
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            loaded_at, response = entry
+            age = self._clock() - loaded_at
+            if age < self._ttl_seconds:
+                self._entries.move_to_end(key)
+                self._hits.inc()
+                return response
+            if age < self._ttl_seconds + self._stale_seconds:
+                self._entries.move_to_end(key)
+                self._stale_hits.inc()
+                if key not in self._loads:
+                    self._start_load(key, loader)
+                return response
+            del self._entries[key]
+
+        self._misses.inc()
+        load = self._loads.get(key) or self._start_load(key, loader)
+        # Отмена одного запроса (клиент отключился) не отменяет загрузку, которую ждут остальные
+        return await asyncio.shield(load)
+
+    def invalidate(self) -> None:
+        """Удаляет все записи после изменения данных."""
+        self._generation += 1
+        self._entries.clear()
+        self._loads.clear()
+
+    def _start_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[CachedResponse]],
+    ) -> "asyncio.Task[CachedResponse]":
+        """Запускает загрузку ключа, которую разделят все запросы до ее завершения."""
+        task = asyncio.get_running_loop().create_task(self._load(key, loader, self._generation))
+        self._loads[key] = task
+        task.add_done_callback(lambda done: self._finish_load(key, done))
+        return task
+
+    async def _load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[CachedResponse]],
+        generation: int,
+    ) -> CachedResponse:
+        """Загружает ответ и сохраняет его, если с начала загрузки не было инвалидации."""
+        self._loaded.inc()
+        response = await loader()
+        if generation == self._generation:
+            self._entries[key] = (self._clock(), response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return response
+
+    def _finish_load(self, key: Hashable, task: "asyncio.Task[CachedResponse]") -> None:
+        """Снимает завершенную загрузку и журналирует ошибку фонового обновления."""
+        if self._loads.get(key) is task:
+            del self._loads[key]
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Failed to load cache entry {key!r}: {str(task.exception())}")
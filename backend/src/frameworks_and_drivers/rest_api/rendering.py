@@ -0,0 +1,100 @@
+"""
+Сериализация DTO в тело JSON-ответа без повторной валидации.
+"""
+from typing import Any, Dict, Generic, Iterable, List, Optional, Tuple, Type, TypeVar, Union, get_args, get_origin
+
+from fastapi import Response, status
+from pydantic import BaseModel, TypeAdapter
+
+T = TypeVar("T", bound=BaseModel)
+
+
+def _nested_model(annotation: Any) -> Tuple[Optional[Type[BaseModel]], bool]:
+    """Возвращает вложенную модель поля (через Optional и List) и признак списка."""
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation, False
+
+    origin = get_origin(annotation)
+    if origin is Union:
+        for arg in get_args(annotation):
+            if arg is not type(None):
+                return _nested_model(arg)
+    elif origin in (list, List):
+        model, _ = _nested_model(get_args(annotation)[0])
+        return model, True
+    return None, False
+
+
+def _include_fields(response_model: Type[BaseModel], source_model: Type[BaseModel]) -> Dict[str, Any]:
+    """
+    Строит include для dump_json: только поля схемы ответа, включая вложенные модели.
+
+    Raises:
+        TypeError: Если в DTO нет поля, которое есть в схеме ответа
+    """
+    include: Dict[str, Any] = {}
+    for name, field in response_model.model_fields.items():
+        source_field = source_model.model_fields.get(name)
+        if source_field is None:
+            raise TypeError(f"{source_model.__name__} has no field {name!r} of {response_model.__name__}")
+
+        response_nested, is_list = _nested_model(field.annotation)
+        source_nested, _ = _nested_model(source_field.annotation)
+        if response_nested is None or source_nested is None:
+            include[name] = True
+            continue
+
+        nested = _include_fields(response_nested, source_nested)
+        include[name] = {"__all__": nested} if is_list else nested
+    return include
+
+
+class JsonRenderer(Generic[T]):
+    """
+    Готовый сериализатор DTO в JSON по схеме ответа.
+
+    Ответ, собранный как Schema.model_validate(dto.model_dump()), проходит
+    pydantic трижды: dump в словарь, валидацию схемы и повторную валидацию
+    FastAPI по response_model перед jsonable_encoder и json.dumps.
+    Здесь DTO сразу сериализуется в байты в pydantic-core, и в ответ
+    попадают только поля схемы. Схема остается в response_model роутера
+    и по-прежнему описывает ответ в OpenAPI.
+    """
+
+    def __init__(self, response_model: Type[BaseModel], source_model: Type[T]) -> None:
+        """
+        Инициализация сериализатора.
+
+        Args:
+            response_model: Схема ответа API
+            source_model: DTO, которое отдает контроллер
+
+        Raises:
+            TypeError: Если в DTO нет какого-то поля схемы ответа
+        """
+        self._include = _include_fields(response_model, source_model)
+        self._one = TypeAdapter(source_model)
+        self._many = TypeAdapter(List[source_model])
+
+    def render(self, value: T) -> bytes:
+        """Сериализует один объект."""
+        return self._one.dump_json(value, include=self._include)
+
+    def render_many(self, values: Iterable[T]) -> bytes:
+        """Сериализует список объектов одним вызовом."""
+        return self._many.dump_json(list(values), include={"__all__": self._include})
+
+    def response(
+        self,
+        value: T,
+        status_code: int = status.HTTP_200_OK,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Response:
+        """Собирает JSON-ответ с одним объектом; FastAPI не сериализует его повторно."""
+        return Response(
+            content=self.render(value), status_code=status_code, media_type="application/json", headers=headers
+        )
+
+    def response_many(self, values: Iterable[T], headers: Optional[Dict[str, str]] = None) -> Response:
+        """Собирает JSON-ответ со списком объектов."""
+        return Response(content=self.render_many(values), media_type="application/json", headers=headers)
@@ -3,6 +3,8 @@
 """
 
 from src.frameworks_and_drivers.rest_api.routers.confession import router as confession_router
+from src.frameworks_and_drivers.rest_api.routers.moderation import router as moderation_router
 from src.frameworks_and_drivers.rest_api.routers.poll import router as poll_router
+from src.frameworks_and_drivers.rest_api.routers.tag import router as tag_router
 
-__all__ = ["confession_router", "poll_router"] 
\ No newline at end of file
+__all__ = ["confession_router", "moderation_router", "poll_router", "tag_router"] 
\ No newline at end of file
@@ -1,24 +1,52 @@
 """
 Роутер для работы с признаниями.
 """
-from typing import List, Optional
+from functools import partial
+from typing import AsyncIterator, Dict, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.entities.enums import ConfessionStatus
+from src.entities.confession import DirectPublicationError, StatusTransitionError
+from src.entities.enums import ConfessionProjection, ConfessionStatus
+from src.frameworks_and_drivers.config import HttpCacheSettings, get_http_cache_settings
 from src.frameworks_and_drivers.db.database import get_db
-from src.frameworks_and_drivers.dependencies import get_confession_controller
+from src.frameworks_and_drivers.dependencies import (
+    get_confession_controller,
+    get_feed_cache,
+    get_moderation_controller,
+    streaming_list_confessions_use_case,
+)
+from src.frameworks_and_drivers.rest_api.http_cache import (
+    CachedResponse,
+    ReadThroughCache,
+    compute_etag,
+    http_date,
+    is_not_modified,
+)
+from src.frameworks_and_drivers.rest_api.rendering import JsonRenderer
 from src.frameworks_and_drivers.rest_api.schemas import (
+    BatchModerationResponse,
+    ConfessionDetailResponse,
     ConfessionRequest,
     ConfessionResponse,
+    ConfessionSearchHitResponse,
+    ConfessionSummaryResponse,
+    ModerationJobResponse,
     StatusUpdateRequest,
 )
-from src.interface_adapters.controllers import ConfessionController
+from src.interface_adapters.controllers import ConfessionController, ModerationController
 from src.interface_adapters.dto import (
     AttachmentDTO,
+    ConfessionDetailDTO,
     ConfessionDTO,
+    ConfessionListQueryDTO,
+    ConfessionPageDTO,
+    ConfessionRevisionDTO,
+    ConfessionSearchHitDTO,
+    ConfessionSearchQueryDTO,
     PollDTO,
     PollOptionDTO,
     TagDTO,
@@ -26,12 +54,76 @@ from src.interface_adapters.dto import (
 
 router = APIRouter(prefix="/confessions", tags=["confessions"])
 
+# Формат построчного JSON для потоковой выдачи списка
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Заголовок с курсором следующей страницы
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Сериализаторы DTO в JSON по схемам ответов
+CONFESSION_RENDERER = JsonRenderer(ConfessionResponse, ConfessionDTO)
+DETAIL_RENDERER = JsonRenderer(ConfessionDetailResponse, ConfessionDetailDTO)
+SUMMARY_RENDERER = JsonRenderer(ConfessionSummaryResponse, ConfessionDTO)
+SEARCH_HIT_RENDERER = JsonRenderer(ConfessionSearchHitResponse, ConfessionSearchHitDTO)
+
+
+def _cache_control(status_filter: Optional[ConfessionStatus], settings: HttpCacheSettings, live: bool) -> str:
+    """
+    Политика Cache-Control по статусу.
+    
+    Опубликованное может храниться в общих кэшах (nginx), причем
+    признание без опроса - долго, а лента и опросы - несколько секунд.
+    Остальные статусы видны только модераторам и меняются при модерации:
+    клиент хранит их только у себя и сверяет перед каждым показом.
+    """
+    if status_filter != ConfessionStatus.PUBLISHED:
+        return "private, no-cache"
+    max_age = settings.live_max_age_seconds if live else settings.published_max_age_seconds
+    return f"public, max-age={max_age}, stale-while-revalidate={settings.stale_while_revalidate_seconds}"
+
+
+def _revision_headers(revision: ConfessionRevisionDTO, settings: HttpCacheSettings) -> Dict[str, str]:
+    """Заголовки кэширования признания, вычисленные по его версии без загрузки агрегата."""
+    has_poll = revision.poll_votes is not None
+    headers = {
+        "ETag": compute_etag(f"confession:{revision.id}:{revision.version}:{revision.poll_votes}".encode()),
+        "Cache-Control": _cache_control(revision.status, settings, live=has_poll),
+    }
+    # Голоса меняют ответ, не меняя updated_at: признание с опросом сверяется только по ETag
+    if revision.updated_at is not None and not has_poll:
+        headers["Last-Modified"] = http_date(revision.updated_at)
+    return headers
+
+
+def _serialize_page(page: ConfessionPageDTO) -> CachedResponse:
+    """Сериализует страницу ленты вместе с курсором следующей страницы."""
+    return CachedResponse.from_body(
+        SUMMARY_RENDERER.render_many(page.items),
+        {NEXT_CURSOR_HEADER: page.next_cursor} if page.next_cursor else None,
+    )
+
+
+async def _confessions_ndjson(status_filter: Optional[ConfessionStatus]) -> AsyncIterator[bytes]:
+    """Отдает признания по одному JSON-объекту на строку по мере чтения из БД."""
+    async with streaming_list_confessions_use_case() as list_confessions_use_case:
+        async for confession_dto in list_confessions_use_case.stream(status_filter):
+            yield SUMMARY_RENDERER.render(confession_dto) + b"\n"
+
+
+async def _load_published_feed(limit: int) -> CachedResponse:
+    """Читает первую страницу публичной ленты на собственной сессии и сериализует ее для кэша."""
+    async with streaming_list_confessions_use_case() as list_confessions_use_case:
+        page = await list_confessions_use_case.execute(
+            ConfessionListQueryDTO(status=ConfessionStatus.PUBLISHED, limit=limit)
+        )
+    return _serialize_page(page)
+
 
 @router.post("/", response_model=ConfessionResponse, status_code=status.HTTP_201_CREATED)
 async def post_confession(
     request: ConfessionRequest,
     confession_controller: ConfessionController = Depends(get_confession_controller),
-) -> ConfessionResponse:
+) -> Response:
     """
     Создает новое признание.
     """
@@ -69,7 +161,7 @@ async def post_confession(
     # Создаем признание через контроллер
     try:
         result_dto = await confession_controller.create_confession(confession_dto)
-        return ConfessionResponse.model_validate(result_dto.model_dump())
+        return CONFESSION_RENDERER.response(result_dto, status_code=status.HTTP_201_CREATED)
     except Exception as e:
         logger.error(f"Error creating confession: {str(e)}")
         raise HTTPException(
@@ -78,13 +170,66 @@ async def post_confession(
         )
 
 
-@router.get("/{confession_id}", response_model=ConfessionResponse)
+# Объявлен до /{confession_id}, иначе "search" разбирался бы как ID признания
+@router.get("/search", response_model=List[ConfessionSearchHitResponse])
+async def search_confessions(
+    q: str = Query(..., min_length=1, max_length=200, description="Поисковый запрос: слова, \"фраза\", or, -слово"),
+    status_filter: Optional[ConfessionStatus] = Query(None, alias="status", description="Фильтр по статусу признания"),
+    limit: int = Query(20, ge=1, le=100, description="Размер страницы"),
+    cursor: Optional[str] = Query(None, description="Курсор из заголовка X-Next-Cursor предыдущей страницы"),
+    confession_controller: ConfessionController = Depends(get_confession_controller),
+) -> Response:
+    """
+    Ищет признания по тексту на русском и английском, самые релевантные сверху.
+    
+    Каждый результат содержит rank и snippet - фрагмент текста, в котором
+    совпадения обернуты в <mark> (остальной HTML экранирован).
+    Курсор следующей страницы возвращается в заголовке X-Next-Cursor.
+    """
+    logger.info(f"Searching confessions with status {status_filter}, limit {limit}")
+    
+    try:
+        page = await confession_controller.search(
+            ConfessionSearchQueryDTO(query=q, status=status_filter, limit=limit, cursor=cursor)
+        )
+        return SEARCH_HIT_RENDERER.response_many(
+            page.items, headers={NEXT_CURSOR_HEADER: page.next_cursor} if page.next_cursor else None
+        )
+    except ValueError as e:
+        # Ошибка валидации (пустой запрос или поврежденный курсор)
+        logger.error(f"Validation error when searching confessions: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    except Exception as e:
+        logger.error(f"Error searching confessions: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error searching confessions: {str(e)}",
+        )
+
+
+@router.get(
+    "/{confession_id}",
+    response_model=ConfessionResponse,
+    responses={status.HTTP_304_NOT_MODIFIED: {"description": "Признание не изменилось с версии клиента"}},
+)
 async def get_confession(
     confession_id: int,
+    if_none_match: Optional[str] = Header(default=None),
+    if_modified_since: Optional[str] = Header(default=None),
     confession_controller: ConfessionController = Depends(get_confession_controller),
-) -> ConfessionResponse:
+    cache_settings: HttpCacheSettings = Depends(get_http_cache_settings),
+):
     """
     Получает признание по ID.
+    
+    ETag вычисляется по версии строки и сумме голосов опроса, Last-Modified -
+    по времени изменения строки. Условный запрос (If-None-Match или
+    If-Modified-Since) проверяется по ним одним запросом по первичному
+    ключу, и при совпадении ответ 304 отдается без загрузки вложений,
+    тегов и опроса. Cache-Control зависит от статуса признания.
     """
     logger.info(f"Getting confession with ID {confession_id}")
     
@@ -96,13 +241,26 @@ async def get_confession(
     
     # Пытаемся получить признание через контроллер
     try:
+        revision = await confession_controller.get_revision(confession_id)
+        if not revision:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Confession with ID {confession_id} not found",
+            )
+        
+        headers = _revision_headers(revision, cache_settings)
+        if is_not_modified(if_none_match, if_modified_since, headers["ETag"], revision.updated_at):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        
         result_dto = await confession_controller.get_confession(confession_dto)
         if not result_dto:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Confession with ID {confession_id} not found",
             )
-        return ConfessionResponse.model_validate(result_dto.model_dump())
+        # Если признание изменилось после чтения версии, ETag старше тела:
+        # следующий условный запрос просто получит новую версию целиком
+        return CONFESSION_RENDERER.response(result_dto, headers=headers)
     except HTTPException:
         raise
     except Exception as e:
@@ -113,20 +271,107 @@ async def get_confession(
         )
 
 
-@router.get("/", response_model=List[ConfessionResponse])
+@router.get("/{confession_id}/details", response_model=ConfessionDetailResponse)
+async def get_confession_details(
+    confession_id: int,
+    confession_controller: ConfessionController = Depends(get_confession_controller),
+) -> Response:
+    """
+    Получает признание целиком: с журналом модерации, записью о публикации и комментариями.
+    
+    Предназначено для админки; читателям достаточно GET /confessions/{confession_id}.
+    """
+    logger.info(f"Getting details of confession with ID {confession_id}")
+    
+    try:
+        result_dto = await confession_controller.get_confession(confession_id, ConfessionProjection.FULL)
+        if not result_dto:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Confession with ID {confession_id} not found",
+            )
+        return DETAIL_RENDERER.response(result_dto)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting confession details: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error getting confession details: {str(e)}",
+        )
+
+
+@router.get(
+    "/",
+    response_model=List[ConfessionSummaryResponse],
+    responses={status.HTTP_304_NOT_MODIFIED: {"description": "Страница не изменилась с версии из If-None-Match"}},
+)
 async def list_confessions(
+    request: Request,
     status_filter: Optional[ConfessionStatus] = Query(None, alias="status", description="Фильтр по статусу признания"),
+    limit: int = Query(50, ge=1, le=200, description="Размер страницы"),
+    cursor: Optional[str] = Query(None, description="Курсор из заголовка X-Next-Cursor предыдущей страницы"),
+    if_none_match: Optional[str] = Header(default=None),
     confession_controller: ConfessionController = Depends(get_confession_controller),
-) -> List[ConfessionResponse]:
+    feed_cache: Optional[ReadThroughCache] = Depends(get_feed_cache),
+    cache_settings: HttpCacheSettings = Depends(get_http_cache_settings),
+):
     """
-    Получает список признаний, опционально отфильтрованный по статусу.
+    Получает страницу признаний (новые сверху), опционально отфильтрованных по статусу.
+    
+    Лента отдает краткую проекцию (текст, статус, дата и теги), вложения
+    и опрос признания доступны по GET /confessions/{confession_id}.
+    Курсор следующей страницы возвращается в заголовке X-Next-Cursor.
+    С заголовком `Accept: application/x-ndjson` возвращает все признания
+    потоком, по одному JSON-объекту на строку; поток не разбивается
+    на страницы, поэтому limit и cursor с ним отклоняются (400).
+    
+    Первая страница публичной ленты (status=PUBLISHED без курсора)
+    отдается из кэша: одновременные промахи ждут один запрос к БД,
+    а устаревшая страница отдается, пока обновляется в фоне.
+    
+    ETag вычисляется по телу страницы, поэтому совпадает у кэшированной
+    и прочитанной из БД страницы и во всех процессах; при совпадении
+    с If-None-Match возвращается 304 без тела.
     """
-    logger.info(f"Listing confessions with status {status_filter}")
+    logger.info(f"Listing confessions with status {status_filter}, limit {limit}")
     
-    # Пытаемся получить список признаний
+    if NDJSON_MEDIA_TYPE in request.headers.get("accept", ""):
+        paging = [name for name in ("limit", "cursor") if name in request.query_params]
+        if paging:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"{', '.join(paging)} cannot be used with {NDJSON_MEDIA_TYPE}: "
+                "the stream returns all confessions",
+            )
+        return StreamingResponse(_confessions_ndjson(status_filter), media_type=NDJSON_MEDIA_TYPE)
+    
+    headers = {"Cache-Control": _cache_control(status_filter, cache_settings, live=True)}
+    
+    if feed_cache is not None and status_filter == ConfessionStatus.PUBLISHED and cursor is None:
+        try:
+            cached = await feed_cache.get(limit, partial(_load_published_feed, limit))
+        except Exception as e:
+            logger.error(f"Error loading published feed: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error listing confessions: {str(e)}",
+            )
+        return cached.to_response(if_none_match, headers)
+    
+    # Пытаемся получить страницу признаний
     try:
-        confession_dtos = await confession_controller.list_by_status(status_filter)
-        return [ConfessionResponse.model_validate(confession) for confession in confession_dtos]
+        page = await confession_controller.list_page(
+            ConfessionListQueryDTO(status=status_filter, limit=limit, cursor=cursor)
+        )
+        return _serialize_page(page).to_response(if_none_match, headers)
+    except ValueError as e:
+        # Ошибка валидации (например, поврежденный курсор)
+        logger.error(f"Validation error when listing confessions: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
     except Exception as e:
         logger.error(f"Error listing confessions: {str(e)}")
         raise HTTPException(
@@ -135,13 +380,44 @@ async def list_confessions(
         )
 
 
-@router.post("/{confession_id}/moderate", response_model=ConfessionResponse)
+@router.post("/moderate:batch", response_model=BatchModerationResponse)
+async def moderate_pending_confessions(
+    moderation_controller: ModerationController = Depends(get_moderation_controller),
+) -> BatchModerationResponse:
+    """
+    Модерирует все признания в статусе PENDING пачками.
+    
+    Несколько признаний отправляются в систему модерации одним запросом;
+    размер пачки и число параллельных запросов задаются настройками
+    MODERATION_BATCH_*.
+    """
+    logger.info("Moderating pending confessions in batches")
+    
+    try:
+        result = await moderation_controller.moderate_pending()
+        return BatchModerationResponse.model_validate(result.model_dump())
+    except Exception as e:
+        logger.error(f"Error moderating confessions in batches: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error moderating confessions in batches: {str(e)}",
+        )
+
+
+@router.post(
+    "/{confession_id}/moderate",
+    response_model=ModerationJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
 async def moderate_confession(
     confession_id: int,
+    response: Response,
     confession_controller: ConfessionController = Depends(get_confession_controller),
-) -> ConfessionResponse:
+) -> ModerationJobResponse:
     """
-    Отправляет признание на модерацию.
+    Ставит признание в очередь фоновой модерации.
+    
+    Возвращает задачу модерации; ее состояние доступно по адресу из заголовка Location.
     """
     logger.info(f"Moderating confession with ID {confession_id}")
     
@@ -151,21 +427,17 @@ async def moderate_confession(
         content="",  # Будет заполнено при получении из репозитория
     )
     
-    # Пытаемся модерировать признание
+    # Пытаемся поставить признание в очередь модерации
     try:
-        # Модерируем признание
-        moderation_result = await confession_controller.moderate_confession(confession_dto)
-        
-        # Получаем обновленные данные признания
-        updated_dto = await confession_controller.get_confession(confession_dto)
-        
-        if not updated_dto:
+        job_dto = await confession_controller.request_moderation(confession_dto)
+        if not job_dto:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Confession with ID {confession_id} not found after moderation",
+                detail=f"Confession with ID {confession_id} not found",
             )
         
-        return ConfessionResponse.model_validate(updated_dto.model_dump())
+        response.headers["Location"] = f"/api/moderation-jobs/{job_dto.id}"
+        return ModerationJobResponse.model_validate(job_dto.model_dump())
     except HTTPException:
         raise
     except Exception as e:
@@ -176,13 +448,16 @@ async def moderate_confession(
         )
 
 
-@router.post("/{confession_id}/publish", response_model=ConfessionResponse)
+@router.post("/{confession_id}/publish", response_model=ConfessionResponse, status_code=status.HTTP_202_ACCEPTED)
 async def publish_confession(
     confession_id: int,
     confession_controller: ConfessionController = Depends(get_confession_controller),
-) -> ConfessionResponse:
+) -> Response:
     """
     Публикует одобренное признание в Telegram.
+    
+    Признание сразу получает статус PUBLISHED, а сообщение в канал
+    отправляется фоновым отправителем, поэтому ответ - 202 Accepted.
     """
     logger.info(f"Publishing confession with ID {confession_id}")
     
@@ -195,7 +470,14 @@ async def publish_confession(
     # Пытаемся опубликовать признание
     try:
         result_dto = await confession_controller.publish_confession(confession_dto)
-        return ConfessionResponse.model_validate(result_dto.model_dump())
+        return CONFESSION_RENDERER.response(result_dto, status_code=status.HTTP_202_ACCEPTED)
+    except StatusTransitionError as e:
+        # Статус признания сменили параллельно с публикацией
+        logger.warning(f"Conflict when publishing confession: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e),
+        )
     except ValueError as e:
         # Ошибка валидации (например, признание не одобрено)
         logger.error(f"Validation error when publishing confession: {str(e)}")
@@ -216,23 +498,47 @@ async def update_confession_status(
     confession_id: int,
     status_update: StatusUpdateRequest,
     confession_controller: ConfessionController = Depends(get_confession_controller),
-) -> ConfessionResponse:
+) -> Response:
     """
     Обновляет статус признания.
+    
+    Запрещенный переход (например, из PUBLISHED) или несовпадение
+    с expected_status возвращает 409 Conflict. Статус PUBLISHED здесь
+    не принимается (422): публикация идет через POST /{confession_id}/publish.
     """
     logger.info(f"Updating status for confession with ID {confession_id} to {status_update.status}")
     
     # Обновляем статус
     try:
-        result_dto = await confession_controller.update_status(confession_id, status_update.status)
+        result_dto = await confession_controller.update_status(
+            confession_id, status_update.status, status_update.expected_status
+        )
         if not result_dto:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Confession with ID {confession_id} not found",
             )
-        return ConfessionResponse.model_validate(result_dto)
+        return CONFESSION_RENDERER.response(result_dto)
     except HTTPException:
         raise
+    except StatusTransitionError as e:
+        logger.warning(f"Conflict when updating confession status: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e),
+        )
+    except DirectPublicationError as e:
+        logger.warning(f"Rejected confession status update: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"{e}, use POST /api/confessions/{confession_id}/publish",
+        )
+    except ValueError as e:
+        logger.warning(f"Rejected confession status update: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e),
+        )
     except Exception as e:
         logger.error(f"Error updating confession status: {str(e)}")
         raise HTTPException(
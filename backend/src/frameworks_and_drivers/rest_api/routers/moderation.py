@@ -0,0 +1,39 @@
+"""
+Роутер для отслеживания фоновой модерации.
+"""
+from fastapi import APIRouter, Depends, HTTPException, status
+from loguru import logger
+
+from src.frameworks_and_drivers.dependencies import get_moderation_controller
+from src.frameworks_and_drivers.rest_api.schemas import ModerationJobResponse
+from src.interface_adapters.controllers import ModerationController
+
+router = APIRouter(prefix="/moderation-jobs", tags=["moderation"])
+
+
+@router.get("/{job_id}", response_model=ModerationJobResponse)
+async def get_moderation_job(
+    job_id: int,
+    moderation_controller: ModerationController = Depends(get_moderation_controller),
+) -> ModerationJobResponse:
+    """
+    Получает состояние задачи модерации.
+    """
+    logger.info(f"Getting moderation job {job_id}")
+    
+    try:
+        job_dto = await moderation_controller.get_job(job_id)
+        if not job_dto:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Moderation job with ID {job_id} not found",
+            )
+        return ModerationJobResponse.model_validate(job_dto.model_dump())
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting moderation job: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error getting moderation job: {str(e)}",
+        )
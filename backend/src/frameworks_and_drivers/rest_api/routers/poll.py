@@ -1,16 +1,29 @@
 """
 Роутер для работы с опросами.
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+from fastapi.responses import StreamingResponse
 from loguru import logger
 
-from src.frameworks_and_drivers.dependencies import get_poll_controller
+from src.frameworks_and_drivers.dependencies import (
+    get_poll_broadcaster,
+    get_poll_controller,
+    get_poll_results_cache,
+)
+from src.frameworks_and_drivers.rest_api.http_cache import CachedResponse, ResponseCache
+from src.frameworks_and_drivers.rest_api.rendering import JsonRenderer
 from src.frameworks_and_drivers.rest_api.schemas import PollRequest, PollResponse, VoteRequest
+from src.frameworks_and_drivers.workers.poll_broadcaster import PollResultsBroadcaster
 from src.interface_adapters.controllers import PollController
 from src.interface_adapters.dto import PollDTO, PollOptionDTO
 
 router = APIRouter(prefix="/polls", tags=["polls"])
 
+# Сериализатор результатов опроса в JSON для кэша
+POLL_RENDERER = JsonRenderer(PollResponse, PollDTO)
+
 
 @router.post("/", response_model=PollResponse, status_code=status.HTTP_201_CREATED)
 async def post_poll(
@@ -68,6 +81,8 @@ async def vote_in_poll(
                 detail=f"Poll with ID {poll_id} not found",
             )
         return PollResponse.model_validate(result_poll.model_dump())
+    except HTTPException:
+        raise
     except ValueError as e:
         # Ошибка валидации (например, неверный ID варианта)
         logger.error(f"Validation error when voting in poll: {str(e)}")
@@ -83,28 +98,92 @@ async def vote_in_poll(
         )
 
 
-@router.get("/{poll_id}/results", response_model=PollResponse)
+@router.get(
+    "/{poll_id}/results",
+    response_model=PollResponse,
+    responses={status.HTTP_304_NOT_MODIFIED: {"description": "Результаты не изменились с версии из If-None-Match"}},
+)
 async def get_poll_results(
     poll_id: int,
+    if_none_match: Optional[str] = Header(default=None),
     poll_controller: PollController = Depends(get_poll_controller),
-) -> PollResponse:
+    results_cache: Optional[ResponseCache] = Depends(get_poll_results_cache),
+) -> Response:
     """
     Получает результаты опроса.
-    """
-    logger.info(f"Getting results for poll {poll_id}")
     
-    # Пытаемся получить результаты
-    try:
-        poll = await poll_controller.get_results(poll_id)
-        if not poll:
+    Сериализованный ответ кэшируется по poll_id до следующего голоса.
+    Клиент, присылающий ETag из прошлого ответа в If-None-Match,
+    получает 304 без обращения к БД, пока результаты не изменились.
+    """
+    cached = results_cache.get(poll_id) if results_cache is not None else None
+    if cached is None:
+        logger.info(f"Getting results for poll {poll_id}")
+        snapshot = results_cache.snapshot() if results_cache is not None else 0
+        
+        # Пытаемся получить результаты
+        try:
+            poll = await poll_controller.get_results(poll_id)
+            if not poll:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Poll with ID {poll_id} not found",
+                )
+            body = POLL_RENDERER.render(poll)
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"Error getting poll results: {str(e)}")
             raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Poll with ID {poll_id} not found",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error getting poll results: {str(e)}",
             )
-        return PollResponse.model_validate(poll.model_dump())
+        
+        cached = CachedResponse.from_body(body)
+        if results_cache is not None:
+            results_cache.set(poll_id, cached, snapshot)
+    
+    # no-cache: клиент может хранить ответ, но перед показом сверяет ETag
+    return cached.to_response(if_none_match, headers={"Cache-Control": "no-cache"})
+
+
+@router.get(
+    "/{poll_id}/stream",
+    response_class=StreamingResponse,
+    responses={status.HTTP_200_OK: {"content": {"text/event-stream": {}}}},
+)
+async def stream_poll_results(
+    poll_id: int,
+    broadcaster: PollResultsBroadcaster = Depends(get_poll_broadcaster),
+) -> StreamingResponse:
+    """
+    Поток результатов опроса (Server-Sent Events).
+    
+    Первое событие results содержит полные результаты, события delta -
+    новые значения изменившихся счетчиков. Все потоки процесса получают
+    обновления от одного рассыльщика, читающего опрос из БД один раз
+    на обновление.
+    """
+    logger.info(f"Streaming results for poll {poll_id}")
+    
+    try:
+        events = await broadcaster.subscribe(poll_id)
     except Exception as e:
-        logger.error(f"Error getting poll results: {str(e)}")
+        logger.error(f"Error subscribing to poll results: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error getting poll results: {str(e)}",
-        ) 
\ No newline at end of file
+            detail=f"Error subscribing to poll results: {str(e)}",
+        )
+    
+    if events is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Poll with ID {poll_id} not found",
+        )
+    
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        # X-Accel-Buffering: nginx не должен копить события в буфере
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
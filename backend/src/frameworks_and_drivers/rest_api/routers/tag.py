@@ -0,0 +1,77 @@
+"""
+Роутер для работы с тегами.
+"""
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from loguru import logger
+
+from src.frameworks_and_drivers.dependencies import get_tag_controller
+from src.frameworks_and_drivers.rest_api.rendering import JsonRenderer
+from src.frameworks_and_drivers.rest_api.routers.confession import NEXT_CURSOR_HEADER, SUMMARY_RENDERER
+from src.frameworks_and_drivers.rest_api.schemas import ConfessionSummaryResponse, TagCountResponse
+from src.interface_adapters.controllers import TagController
+from src.interface_adapters.dto import TagConfessionsQueryDTO, TagCountDTO
+
+router = APIRouter(prefix="/tags", tags=["tags"])
+
+# Сериализатор популярных тегов в JSON
+TAG_COUNT_RENDERER = JsonRenderer(TagCountResponse, TagCountDTO)
+
+
+@router.get("/", response_model=List[TagCountResponse])
+async def list_popular_tags(
+    limit: int = Query(50, ge=1, le=200, description="Количество тегов"),
+    tag_controller: TagController = Depends(get_tag_controller),
+) -> Response:
+    """
+    Получает самые популярные теги с количеством опубликованных признаний.
+
+    Количества берутся из счетчиков, которые обновляются при публикации,
+    поэтому запрос не пересчитывает признания.
+    """
+    logger.info(f"Listing popular tags, limit {limit}")
+
+    try:
+        tags = await tag_controller.list_popular(limit)
+        return TAG_COUNT_RENDERER.response_many(tags)
+    except Exception as e:
+        logger.error(f"Error listing popular tags: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error listing popular tags: {str(e)}",
+        )
+
+
+@router.get("/{name}/confessions", response_model=List[ConfessionSummaryResponse])
+async def list_tag_confessions(
+    name: str,
+    limit: int = Query(50, ge=1, le=200, description="Размер страницы"),
+    cursor: Optional[str] = Query(None, description="Курсор из заголовка X-Next-Cursor предыдущей страницы"),
+    tag_controller: TagController = Depends(get_tag_controller),
+) -> Response:
+    """
+    Получает страницу опубликованных признаний с тегом (новые сверху).
+
+    Курсор следующей страницы возвращается в заголовке X-Next-Cursor.
+    """
+    logger.info(f"Listing confessions with tag {name}, limit {limit}")
+
+    try:
+        page = await tag_controller.list_confessions(TagConfessionsQueryDTO(name=name, limit=limit, cursor=cursor))
+        return SUMMARY_RENDERER.response_many(
+            page.items, headers={NEXT_CURSOR_HEADER: page.next_cursor} if page.next_cursor else None
+        )
+    except ValueError as e:
+        # Ошибка валидации (например, поврежденный курсор)
+        logger.error(f"Validation error when listing confessions with tag {name}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    except Exception as e:
+        logger.error(f"Error listing confessions with tag {name}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error listing confessions with tag {name}: {str(e)}",
+        )
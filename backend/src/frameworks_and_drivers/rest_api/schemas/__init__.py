@@ -5,13 +5,22 @@ Pydantic-схемы для FastAPI.
 from src.frameworks_and_drivers.rest_api.schemas.confession import (
     AttachmentRequest,
     AttachmentResponse,
+    BatchModerationResponse,
+    CommentResponse,
+    ConfessionDetailResponse,
     ConfessionRequest,
     ConfessionResponse,
+    ConfessionSearchHitResponse,
+    ConfessionSummaryResponse,
+    ModerationJobResponse,
+    ModerationLogResponse,
     PollOptionRequest,
     PollOptionResponse,
     PollRequest,
     PollResponse,
+    PublishedRecordResponse,
     StatusUpdateRequest,
+    TagCountResponse,
     TagRequest,
     TagResponse,
     VoteRequest,
@@ -20,14 +29,23 @@ from src.frameworks_and_drivers.rest_api.schemas.confession import (
 __all__ = [
     "ConfessionRequest",
     "ConfessionResponse",
+    "ConfessionDetailResponse",
+    "ConfessionSummaryResponse",
+    "ConfessionSearchHitResponse",
+    "CommentResponse",
     "AttachmentRequest",
     "AttachmentResponse",
+    "BatchModerationResponse",
+    "ModerationJobResponse",
+    "ModerationLogResponse",
     "PollRequest",
     "PollResponse",
     "PollOptionRequest",
     "PollOptionResponse",
+    "PublishedRecordResponse",
     "StatusUpdateRequest",
     "TagRequest",
     "TagResponse",
+    "TagCountResponse",
     "VoteRequest",
 ]
\ No newline at end of file
@@ -6,7 +6,7 @@ from typing import List, Optional
 
 from pydantic import BaseModel, ConfigDict, Field
 
-from src.entities.enums import AttachmentType, ConfessionStatus
+from src.entities.enums import AttachmentType, ConfessionStatus, ModerationJobStatus
 
 
 class TagRequest(BaseModel):
@@ -22,6 +22,13 @@ class TagResponse(BaseModel):
     name: str
 
 
+class TagCountResponse(BaseModel):
+    """Схема ответа для тега с количеством опубликованных признаний."""
+    
+    name: str
+    count: int
+
+
 class AttachmentRequest(BaseModel):
     """Схема запроса для вложения."""
     
@@ -90,6 +97,9 @@ class StatusUpdateRequest(BaseModel):
     """Схема запроса для обновления статуса признания."""
     
     status: ConfessionStatus = Field(..., description="Новый статус признания")
+    expected_status: Optional[ConfessionStatus] = Field(
+        None, description="Статус, который признание должно иметь сейчас (иначе 409)"
+    )
 
 
 class ConfessionRequest(BaseModel):
@@ -101,6 +111,25 @@ class ConfessionRequest(BaseModel):
     poll: Optional[PollRequest] = None
 
 
+class ConfessionSummaryResponse(BaseModel):
+    """Схема краткого ответа с признанием для лент (без вложений и опроса)."""
+    
+    id: int
+    content: str
+    created_at: datetime
+    status: ConfessionStatus
+    tags: List[TagResponse] = Field(default_factory=list)
+    
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ConfessionSearchHitResponse(ConfessionSummaryResponse):
+    """Схема найденного признания: релевантность и фрагмент текста с совпадениями в <mark>."""
+    
+    rank: float
+    snippet: str
+
+
 class ConfessionResponse(BaseModel):
     """Схема ответа с признанием."""
     
@@ -112,4 +141,61 @@ class ConfessionResponse(BaseModel):
     tags: List[TagResponse] = Field(default_factory=list)
     poll: Optional[PollResponse] = None
     
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ModerationLogResponse(BaseModel):
+    """Схема ответа для записи журнала модерации."""
+    
+    id: int
+    decision: ConfessionStatus
+    moderator: str
+    reason: Optional[str] = None
+    timestamp: datetime
+
+
+class PublishedRecordResponse(BaseModel):
+    """Схема ответа для записи о публикации в Telegram."""
+    
+    telegram_message_id: str
+    channel_id: str
+    published_at: datetime
+    discussion_thread_id: Optional[str] = None
+
+
+class CommentResponse(BaseModel):
+    """Схема ответа для комментария."""
+    
+    id: int
+    content: str
+    created_at: datetime
+    reply_to: Optional[int] = None
+
+
+class ConfessionDetailResponse(ConfessionResponse):
+    """Схема ответа с признанием целиком, для админки."""
+    
+    moderation_logs: List[ModerationLogResponse] = Field(default_factory=list)
+    published_record: Optional[PublishedRecordResponse] = None
+    comments: List[CommentResponse] = Field(default_factory=list)
+
+
+class ModerationJobResponse(BaseModel):
+    """Схема ответа с задачей фоновой модерации."""
+    
+    id: int
+    confession_id: int
+    status: ModerationJobStatus
+    attempts: int
+    last_error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+
+class BatchModerationResponse(BaseModel):
+    """Схема ответа с итогами пакетной модерации."""
+    
+    processed: int
+    approved: int
+    rejected: int
+    pending: int
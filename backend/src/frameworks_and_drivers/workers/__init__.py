@@ -0,0 +1,17 @@
+"""
+Фоновые воркеры, работающие в процессе приложения.
+"""
+
+from src.frameworks_and_drivers.workers.moderation_worker import ModerationWorkerPool
+from src.frameworks_and_drivers.workers.poll_broadcaster import PollResultsBroadcaster
+from src.frameworks_and_drivers.workers.publication_scheduler import PublicationScheduler
+from src.frameworks_and_drivers.workers.publication_sender import PublicationSender
+from src.frameworks_and_drivers.workers.vote_buffer import VoteBuffer
+
+__all__ = [
+    "ModerationWorkerPool",
+    "PollResultsBroadcaster",
+    "PublicationScheduler",
+    "PublicationSender",
+    "VoteBuffer",
+]
@@ -0,0 +1,88 @@
+"""
+Базовый пул asyncio-воркеров, опрашивающих очередь в БД.
+"""
+import asyncio
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+from loguru import logger
+
+
+class PollingWorkerPool(ABC):
+    """
+    N параллельных воркеров, в цикле обрабатывающих элементы очереди.
+    
+    Пока очередь не пуста, воркер берет следующий элемент сразу;
+    на пустой очереди засыпает на poll_interval секунд.
+    """
+    
+    # Имя пула в логах и названиях задач asyncio
+    name = "worker"
+    
+    def __init__(self, concurrency: int, poll_interval: float) -> None:
+        """
+        Инициализация пула.
+        
+        Args:
+            concurrency: Количество параллельных воркеров
+            poll_interval: Пауза между опросами пустой очереди, секунды
+        """
+        self._concurrency = concurrency
+        self._poll_interval = poll_interval
+        self._stopping = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+    
+    def start(self) -> None:
+        """Запускает воркеры."""
+        self._stopping.clear()
+        self._tasks = [
+            asyncio.create_task(self._run(number), name=f"{self.name}-{number}")
+            for number in range(self._concurrency)
+        ]
+        logger.info(f"Started {self._concurrency} {self.name} workers")
+    
+    async def stop(self, timeout: Optional[float] = 10.0) -> None:
+        """
+        Останавливает воркеры, давая им закончить текущие задачи.
+        
+        Args:
+            timeout: Сколько секунд ждать завершения, прежде чем отменить воркеры
+        """
+        self._stopping.set()
+        if not self._tasks:
+            return
+        
+        _, pending = await asyncio.wait(self._tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        self._tasks = []
+        logger.info(f"{self.name} workers stopped")
+    
+    @abstractmethod
+    async def run_once(self) -> bool:
+        """
+        Обрабатывает один элемент очереди.
+        
+        Returns:
+            bool: True, если элемент был обработан, False - если очередь пуста
+        """
+    
+    async def _run(self, number: int) -> None:
+        """Цикл одного воркера: обрабатывает элементы, пока очередь не пуста, затем ждет."""
+        while not self._stopping.is_set():
+            try:
+                processed = await self.run_once()
+            except Exception as e:
+                logger.error(f"{self.name} worker {number} error: {str(e)}")
+                processed = False
+            
+            if not processed:
+                await self._sleep(self._poll_interval)
+    
+    async def _sleep(self, seconds: float) -> None:
+        """Ждет указанное время или до остановки пула."""
+        try:
+            await asyncio.wait_for(self._stopping.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
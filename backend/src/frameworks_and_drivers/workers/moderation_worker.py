@@ -0,0 +1,74 @@
+"""
+Пул asyncio-воркеров, разбирающих очередь модерации.
+"""
+from typing import Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.frameworks_and_drivers.config import ModerationWorkerSettings
+from src.frameworks_and_drivers.repositories.sqlalchemy_confession_repository import (
+    SqlAlchemyConfessionRepository,
+)
+from src.frameworks_and_drivers.repositories.sqlalchemy_moderation_job_repository import (
+    SqlAlchemyModerationJobRepository,
+)
+from src.frameworks_and_drivers.workers.base import PollingWorkerPool
+from src.interface_adapters.gateway_protocols import ModerationGatewayProtocol
+from src.use_cases.confession_use_cases import ModerateConfessionUseCase
+from src.use_cases.moderation_use_cases import ProcessModerationJobUseCase
+
+
+class ModerationWorkerPool(PollingWorkerPool):
+    """
+    N параллельных воркеров модерации.
+    
+    Каждый воркер в цикле забирает задачу из таблицы moderation_jobs
+    (SELECT ... FOR UPDATE SKIP LOCKED) и проводит модерацию, поэтому
+    пропускная способность растет с числом воркеров, а HTTP-запросы
+    не ждут ответа внешнего API.
+    """
+    
+    name = "moderation"
+    
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        moderation_gateway: ModerationGatewayProtocol,
+        settings: ModerationWorkerSettings,
+    ) -> None:
+        """
+        Инициализация пула.
+        
+        Args:
+            session_factory: Фабрика сессий SQLAlchemy
+            moderation_gateway: Гейтвей системы модерации (общий на процесс)
+            settings: Настройки воркеров
+        """
+        super().__init__(settings.concurrency, settings.poll_interval)
+        self._session_factory = session_factory
+        self._moderation_gateway = moderation_gateway
+        self._settings = settings
+    
+    async def run_once(self) -> bool:
+        """
+        Обрабатывает одну задачу из очереди.
+        
+        Очередь и признания работают в разных сессиях: ошибка модерации
+        откатывает только транзакцию признания, а статус задачи
+        все равно фиксируется.
+        
+        Returns:
+            bool: True, если задача была обработана, False - если очередь пуста
+        """
+        async with self._session_factory() as job_session, self._session_factory() as confession_session:
+            use_case = ProcessModerationJobUseCase(
+                SqlAlchemyModerationJobRepository(job_session),
+                ModerateConfessionUseCase(
+                    self._moderation_gateway,
+                    SqlAlchemyConfessionRepository(confession_session),
+                ),
+                max_attempts=self._settings.max_attempts,
+                retry_delay=self._settings.retry_delay,
+                lease_seconds=self._settings.lease_seconds,
+            )
+            return await use_case.execute()
@@ -0,0 +1,241 @@
+"""
+Рассылка обновлений результатов опросов подписчикам SSE-потоков.
+"""
+import asyncio
+import json
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Callable, Dict, Optional, Set
+
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.frameworks_and_drivers.gateways.poll_notifier import PostgresPollNotifier
+from src.frameworks_and_drivers.metrics import metrics
+from src.frameworks_and_drivers.repositories.sqlalchemy_poll_repository import SqlAlchemyPollRepository
+from src.frameworks_and_drivers.rest_api.schemas import PollResponse
+from src.frameworks_and_drivers.workers.base import PollingWorkerPool
+from src.interface_adapters.dto import PollDTO
+from src.interface_adapters.repository_protocols import PollUpdatesProtocol, VoteBufferProtocol
+from src.use_cases.poll_use_cases import GetPollResultsUseCase
+
+# Сколько событий может ждать медленный подписчик, прежде чем получит полный снимок вместо них
+SUBSCRIBER_QUEUE_SIZE = 16
+
+results_reads = metrics.counter("poll_stream_reads_total", "Чтения результатов опросов для SSE-подписчиков")
+sent_events = metrics.counter("poll_stream_events_total", "События, разосланные SSE-подписчикам")
+
+
+def format_sse(event: str, data: str) -> str:
+    """Форматирует событие Server-Sent Events."""
+    return f"event: {event}\ndata: {data}\n\n"
+
+
+@dataclass
+class _PollChannel:
+    """Подписчики одного опроса и последние разосланные им результаты."""
+
+    subscribers: Set["asyncio.Queue[str]"] = field(default_factory=set)
+    results: Optional[PollResponse] = None
+    dirty: bool = False
+
+
+class PollResultsBroadcaster(PollingWorkerPool, PollUpdatesProtocol):
+    """
+    Один на процесс рассыльщик результатов опросов.
+
+    Голос только помечает опрос измененным. Раз в interval воркер один
+    раз читает результаты каждого измененного опроса, у которого есть
+    подписчики, и рассылает всем подписчикам изменившиеся счетчики.
+    Поэтому тысячи наблюдателей стоят одного чтения из БД на обновление,
+    а не чтения на каждого клиента.
+
+    С notifier измененные опросы рассылаются другим процессам через
+    PostgreSQL NOTIFY, и их подписчики тоже получают обновления.
+    """
+
+    name = "poll-broadcaster"
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        interval: float,
+        vote_buffer: Optional[VoteBufferProtocol] = None,
+        notifier: Optional[PostgresPollNotifier] = None,
+        settle_delay: float = 0.0,
+        keepalive: float = 15.0,
+    ) -> None:
+        """
+        Инициализация рассыльщика.
+
+        Args:
+            session_factory: Фабрика сессий SQLAlchemy
+            interval: Период рассылки обновлений, секунды
+            vote_buffer: Буфер голосов, еще не записанных в БД
+            notifier: Обмен уведомлениями об изменениях с другими процессами
+            settle_delay: Через сколько секунд перечитать опрос повторно после уведомления
+                из другого процесса (период записи его буфера голосов)
+            keepalive: Период комментариев-пингов в потоке, секунды
+        """
+        super().__init__(concurrency=1, poll_interval=interval)
+        self._session_factory = session_factory
+        self._vote_buffer = vote_buffer
+        self._notifier = notifier
+        self._settle_delay = settle_delay
+        self._keepalive = keepalive
+        self._channels: Dict[int, _PollChannel] = {}
+        # Опросы, измененные голосами в этом процессе, о которых еще не уведомлены другие
+        self._to_notify: Set[int] = set()
+        metrics.gauge(
+            "poll_stream_subscribers",
+            "Открытые SSE-потоки результатов опросов",
+            lambda: sum(len(channel.subscribers) for channel in self._channels.values()),
+        )
+
+    async def start_listening(self) -> None:
+        """Подписывается на уведомления других процессов и запускает рассылку."""
+        if self._notifier is not None:
+            self._notifier.add_callback(self._on_remote_update)
+            try:
+                await self._notifier.listen()
+            except Exception as e:
+                # Соединение будет восстановлено на одной из следующих рассылок
+                logger.warning(f"Failed to listen for poll updates: {str(e)}")
+        self.start()
+
+    async def stop(self, timeout: Optional[float] = 10.0) -> None:
+        """Останавливает рассылку и закрывает соединение для уведомлений."""
+        await super().stop(timeout)
+        if self._notifier is not None:
+            await self._notifier.close()
+
+    def publish(self, poll_id: int) -> None:
+        """
+        Отмечает, что в опросе проголосовали в этом процессе.
+
+        Args:
+            poll_id: ID опроса
+        """
+        self._mark_dirty(poll_id)
+        if self._notifier is not None:
+            self._to_notify.add(poll_id)
+
+    async def subscribe(self, poll_id: int) -> Optional[AsyncIterator[str]]:
+        """
+        Открывает поток событий опроса.
+
+        Первое событие results - полные результаты, дальше события delta
+        с новыми значениями изменившихся счетчиков.
+
+        Args:
+            poll_id: ID опроса
+
+        Returns:
+            Optional[AsyncIterator[str]]: Поток событий SSE или None, если опрос не найден
+        """
+        channel = self._channels.get(poll_id)
+        if channel is None or channel.results is None:
+            results = await self._load(poll_id)
+            if results is None:
+                return None
+            channel = self._channels.setdefault(poll_id, _PollChannel())
+            if channel.results is None:
+                channel.results = results
+                # Голос, пришедший во время чтения, еще не помечал опрос - перечитываем на ближайшей рассылке
+                channel.dirty = True
+
+        queue: "asyncio.Queue[str]" = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        queue.put_nowait(format_sse("results", channel.results.model_dump_json()))
+        channel.subscribers.add(queue)
+        return self._events(poll_id, channel, queue)
+
+    async def run_once(self) -> bool:
+        """
+        Рассылает обновления измененных опросов.
+
+        Returns:
+            bool: Всегда False - следующая рассылка через interval
+        """
+        if self._notifier is not None:
+            poll_ids, self._to_notify = self._to_notify, set()
+            try:
+                await self._notifier.notify(poll_ids)
+            except Exception as e:
+                logger.warning(f"Failed to notify other workers about polls {sorted(poll_ids)}: {str(e)}")
+                self._to_notify |= poll_ids
+
+        for poll_id, channel in list(self._channels.items()):
+            if channel.dirty and channel.subscribers:
+                channel.dirty = False
+                try:
+                    await self._refresh(poll_id, channel)
+                except Exception as e:
+                    logger.error(f"Failed to refresh results of poll {poll_id}: {str(e)}")
+                    channel.dirty = True
+        return False
+
+    async def _events(
+        self,
+        poll_id: int,
+        channel: _PollChannel,
+        queue: "asyncio.Queue[str]",
+    ) -> AsyncIterator[str]:
+        """Отдает события подписчика, пока клиент не отключится."""
+        try:
+            while True:
+                try:
+                    yield await asyncio.wait_for(queue.get(), timeout=self._keepalive)
+                except asyncio.TimeoutError:
+                    # Комментарий не дает прокси закрыть простаивающее соединение
+                    yield ": keepalive\n\n"
+        finally:
+            channel.subscribers.discard(queue)
+            if not channel.subscribers and self._channels.get(poll_id) is channel:
+                del self._channels[poll_id]
+
+    async def _refresh(self, poll_id: int, channel: _PollChannel) -> None:
+        """Читает результаты опроса один раз и рассылает изменения всем подписчикам."""
+        results = await self._load(poll_id)
+        if results is None:
+            return
+
+        previous = {option.id: option.vote_count for option in channel.results.options}
+        changed = [
+            {"id": option.id, "vote_count": option.vote_count}
+            for option in results.options
+            if previous.get(option.id) != option.vote_count
+        ]
+        channel.results = results
+        if not changed:
+            return
+
+        delta = format_sse("delta", json.dumps({"poll_id": poll_id, "options": changed}))
+        for queue in channel.subscribers:
+            if queue.full():
+                # Подписчик не успевает читать: вместо пропущенных изменений он получит полный снимок
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(format_sse("results", results.model_dump_json()))
+            else:
+                queue.put_nowait(delta)
+        sent_events.inc(len(channel.subscribers))
+
+    async def _load(self, poll_id: int) -> Optional[PollResponse]:
+        """Читает текущие результаты опроса."""
+        results_reads.inc()
+        async with self._session_factory() as session:
+            use_case = GetPollResultsUseCase(SqlAlchemyPollRepository(session), self._vote_buffer)
+            poll: Optional[PollDTO] = await use_case.execute(poll_id)
+        return PollResponse.model_validate(poll.model_dump()) if poll else None
+
+    def _on_remote_update(self, poll_id: int) -> None:
+        """Обрабатывает уведомление другого процесса об изменении опроса."""
+        self._mark_dirty(poll_id)
+        if self._settle_delay > 0:
+            # Голоса другого процесса могли еще лежать в его буфере - перечитываем после его сброса
+            asyncio.get_running_loop().call_later(self._settle_delay, self._mark_dirty, poll_id)
+
+    def _mark_dirty(self, poll_id: int) -> None:
+        """Помечает опрос измененным, если у него есть подписчики."""
+        channel = self._channels.get(poll_id)
+        if channel is not None:
+            channel.dirty = True
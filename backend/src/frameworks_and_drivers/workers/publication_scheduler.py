@@ -0,0 +1,105 @@
+"""
+Планировщик публикации одобренных признаний.
+"""
+from datetime import datetime
+from typing import Callable, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.frameworks_and_drivers.config import PublicationSchedulerSettings, PublicationSettings
+from src.frameworks_and_drivers.metrics import metrics
+from src.frameworks_and_drivers.repositories.sqlalchemy_confession_repository import (
+    SqlAlchemyConfessionRepository,
+)
+from src.frameworks_and_drivers.repositories.sqlalchemy_publication_repository import (
+    SqlAlchemyPublicationRepository,
+)
+from src.frameworks_and_drivers.workers.base import PollingWorkerPool
+from src.interface_adapters.dto import PublicationScheduleDTO
+from src.interface_adapters.repository_protocols import FeedCacheProtocol
+from src.use_cases.publication_use_cases import SchedulePublicationsUseCase
+
+scheduled_publications = metrics.counter(
+    "publication_scheduled_total", "Признания, поставленные в очередь планировщиком публикаций"
+)
+
+
+class PublicationScheduler(PollingWorkerPool):
+    """
+    Фоновая задача, раз в interval секунд ставящая одобренные признания в очередь публикации.
+    
+    Заменяет ручной вызов POST /api/confessions/{id}/publish для каждого
+    признания. Размер порции рассчитывается из лимита отправки
+    на канал, поэтому очередь не растет быстрее, чем ее разбирает
+    отправитель. Каждый запуск обновляет метрики очередей.
+    """
+    
+    name = "publication-scheduler"
+    
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        publication_settings: PublicationSettings,
+        settings: PublicationSchedulerSettings,
+        feed_cache: Optional[FeedCacheProtocol] = None,
+    ) -> None:
+        """
+        Инициализация планировщика.
+        
+        Args:
+            session_factory: Фабрика сессий SQLAlchemy
+            publication_settings: Настройки публикации (каналы и лимит отправки)
+            settings: Настройки планировщика
+            feed_cache: Кэш публичной ленты этого процесса
+        """
+        super().__init__(concurrency=1, poll_interval=settings.interval)
+        self._session_factory = session_factory
+        self._publication_settings = publication_settings
+        self._settings = settings
+        self._feed_cache = feed_cache
+        self._last_run: Optional[PublicationScheduleDTO] = None
+        
+        metrics.gauge(
+            "publication_queue_depth",
+            "Неотправленные сообщения исходящей очереди публикаций",
+            lambda: self._last_run.queue_depth if self._last_run else 0,
+        )
+        metrics.gauge(
+            "publication_approved_backlog",
+            "Одобренные признания, ожидающие планировщика публикаций",
+            lambda: self._last_run.approved_backlog if self._last_run else 0,
+        )
+        metrics.gauge(
+            "publication_queue_lag_seconds",
+            "Сколько секунд ждет самое старое неотправленное сообщение",
+            self._queue_lag,
+        )
+    
+    async def run_once(self) -> bool:
+        """
+        Ставит в очередь очередную порцию признаний и обновляет метрики.
+        
+        Returns:
+            bool: Всегда False - следующий запуск через interval секунд
+        """
+        async with self._session_factory() as session:
+            use_case = SchedulePublicationsUseCase(
+                SqlAlchemyConfessionRepository(session),
+                SqlAlchemyPublicationRepository(session),
+                self._publication_settings.channel_ids,
+                channel_capacity=self._publication_settings.rate_per_minute * self._settings.interval / 60,
+                batch_size=self._settings.batch_size,
+                window_start=self._settings.window_start,
+                window_end=self._settings.window_end,
+                feed_cache=self._feed_cache,
+            )
+            self._last_run = await use_case.execute()
+        
+        scheduled_publications.inc(self._last_run.enqueued)
+        return False
+    
+    def _queue_lag(self) -> float:
+        """Возвращает возраст самого старого неотправленного сообщения по данным последнего запуска."""
+        if self._last_run is None or self._last_run.oldest_queued_at is None:
+            return 0.0
+        return max(0.0, (datetime.now() - self._last_run.oldest_queued_at).total_seconds())
@@ -0,0 +1,67 @@
+"""
+Отправитель исходящей очереди публикаций в Telegram.
+"""
+from typing import Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.frameworks_and_drivers.config import PublicationSettings
+from src.frameworks_and_drivers.repositories.sqlalchemy_confession_repository import (
+    SqlAlchemyConfessionRepository,
+)
+from src.frameworks_and_drivers.repositories.sqlalchemy_publication_repository import (
+    SqlAlchemyPublicationRepository,
+)
+from src.frameworks_and_drivers.workers.base import PollingWorkerPool
+from src.interface_adapters.gateway_protocols import TelegramGatewayProtocol
+from src.use_cases.publication_use_cases import DeliverPublicationUseCase
+
+
+class PublicationSender(PollingWorkerPool):
+    """
+    Фоновые задачи, отправляющие публикации из таблицы publication_outbox.
+    
+    Частоту отправки ограничивает гейтвей Telegram (лимит на каждый
+    канал, общий для всех процессов и хранящийся в PostgreSQL), поэтому
+    всплеск публикаций растягивается во времени, а не упирается
+    в лимиты Telegram посреди HTTP-запроса.
+    """
+    
+    name = "publication"
+    
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        telegram_gateway: TelegramGatewayProtocol,
+        settings: PublicationSettings,
+    ) -> None:
+        """
+        Инициализация отправителя.
+        
+        Args:
+            session_factory: Фабрика сессий SQLAlchemy
+            telegram_gateway: Гейтвей Telegram (общий на процесс)
+            settings: Настройки публикации
+        """
+        super().__init__(settings.concurrency, settings.poll_interval)
+        self._session_factory = session_factory
+        self._telegram_gateway = telegram_gateway
+        self._settings = settings
+    
+    async def run_once(self) -> bool:
+        """
+        Отправляет одно сообщение из очереди.
+        
+        Returns:
+            bool: True, если сообщение было обработано, False - если очередь пуста
+        """
+        async with self._session_factory() as outbox_session, self._session_factory() as confession_session:
+            use_case = DeliverPublicationUseCase(
+                SqlAlchemyPublicationRepository(outbox_session),
+                SqlAlchemyConfessionRepository(confession_session),
+                self._telegram_gateway,
+                max_attempts=self._settings.max_attempts,
+                retry_delay=self._settings.retry_delay,
+                lease_seconds=self._settings.lease_seconds,
+            )
+            return await use_case.execute()
@@ -0,0 +1,101 @@
+"""
+Внутрипроцессный буфер голосов с периодической записью в БД.
+"""
+from collections import Counter as VoteCounter
+from typing import Callable, Dict, Optional, Sequence
+
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.frameworks_and_drivers.metrics import metrics
+from src.frameworks_and_drivers.repositories.sqlalchemy_poll_repository import SqlAlchemyPollRepository
+from src.frameworks_and_drivers.workers.base import PollingWorkerPool
+from src.interface_adapters.repository_protocols import VoteBufferProtocol
+
+buffer_flushes = metrics.counter("poll_vote_buffer_flushes_total", "Записи накопленных голосов в БД")
+buffer_flush_errors = metrics.counter("poll_vote_buffer_flush_errors_total", "Неудачные записи накопленных голосов")
+flushed_votes = metrics.counter("poll_votes_flushed_total", "Голоса, записанные из буфера в БД")
+
+
+class VoteBuffer(PollingWorkerPool, VoteBufferProtocol):
+    """
+    Копит голоса в памяти и раз в flush_interval записывает их одной пачкой.
+    
+    Голоса за один вариант складываются, поэтому тысяча голосов
+    за популярный вариант превращается в один UPDATE. Если запись
+    не удалась, голоса возвращаются в буфер и записываются при следующем
+    сбросе; при остановке приложения буфер сбрасывается последний раз.
+    Голоса, накопленные в памяти, теряются только при аварийном
+    завершении процесса - за это отвечает длина интервала.
+    """
+    
+    name = "vote-buffer"
+    
+    def __init__(self, session_factory: Callable[[], AsyncSession], flush_interval: float) -> None:
+        """
+        Инициализация буфера.
+        
+        Args:
+            session_factory: Фабрика сессий SQLAlchemy
+            flush_interval: Период записи накопленных голосов, секунды
+        """
+        super().__init__(concurrency=1, poll_interval=flush_interval)
+        self._session_factory = session_factory
+        self._pending: Dict[int, int] = VoteCounter()
+        metrics.gauge("poll_vote_buffer_pending", "Голоса, ожидающие записи в БД", lambda: sum(self._pending.values()))
+    
+    async def add(self, option_id: int, count: int = 1) -> None:
+        """
+        Добавляет голоса в буфер.
+        
+        Args:
+            option_id: ID варианта ответа
+            count: Количество голосов
+        """
+        self._pending[option_id] += count
+    
+    def pending(self, option_ids: Sequence[int]) -> Dict[int, int]:
+        """
+        Возвращает еще не записанные голоса по указанным вариантам.
+        
+        Args:
+            option_ids: ID вариантов ответа
+            
+        Returns:
+            Dict[int, int]: Количество голосов по ID варианта (варианты без голосов опускаются)
+        """
+        return {option_id: self._pending[option_id] for option_id in option_ids if option_id in self._pending}
+    
+    async def run_once(self) -> bool:
+        """
+        Записывает накопленные голоса.
+        
+        Returns:
+            bool: Всегда False - следующий сброс через flush_interval
+        """
+        await self.flush()
+        return False
+    
+    async def stop(self, timeout: Optional[float] = 10.0) -> None:
+        """Останавливает периодическую запись и записывает оставшиеся голоса."""
+        await super().stop(timeout)
+        await self.flush()
+    
+    async def flush(self) -> None:
+        """Записывает накопленные голоса; при ошибке возвращает их в буфер."""
+        if not self._pending:
+            return
+        
+        # Новые голоса, пришедшие во время записи, попадут в новый словарь
+        increments, self._pending = self._pending, VoteCounter()
+        try:
+            async with self._session_factory() as session:
+                await SqlAlchemyPollRepository(session).add_votes(increments)
+        except Exception as e:
+            logger.error(f"Failed to flush {sum(increments.values())} votes: {str(e)}")
+            buffer_flush_errors.inc()
+            self._pending.update(increments)
+            return
+        
+        buffer_flushes.inc()
+        flushed_votes.inc(sum(increments.values()))
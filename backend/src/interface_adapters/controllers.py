@@ -3,14 +3,39 @@
 """
 from typing import List, Optional, Union
 
-from src.entities.confession import Confession, Poll
-from src.entities.enums import ConfessionStatus
-from src.interface_adapters.dto import ConfessionDTO, PollDTO
+from src.entities.enums import ConfessionProjection, ConfessionStatus
+from src.interface_adapters.dto import (
+    BatchModerationResultDTO,
+    ConfessionDTO,
+    ConfessionListQueryDTO,
+    ConfessionPageDTO,
+    ConfessionQueryDTO,
+    ConfessionRevisionDTO,
+    ConfessionSearchPageDTO,
+    ConfessionSearchQueryDTO,
+    ConfessionStatusUpdateDTO,
+    ModerationJobDTO,
+    PollDTO,
+    TagConfessionsQueryDTO,
+    TagCountDTO,
+    VoteDTO,
+)
 from src.use_cases.confession_use_cases import (
     CreateConfessionUseCase,
+    GetConfessionUseCase,
+    ListConfessionsUseCase,
     ModerateConfessionUseCase,
     PublishConfessionUseCase,
+    SearchConfessionsUseCase,
+    UpdateConfessionStatusUseCase,
+)
+from src.use_cases.moderation_use_cases import (
+    BatchModerateConfessionsUseCase,
+    GetModerationJobUseCase,
+    RequestModerationUseCase,
 )
+from src.use_cases.poll_use_cases import GetPollResultsUseCase, VoteInPollUseCase
+from src.use_cases.tag_use_cases import ListPopularTagsUseCase, ListTagConfessionsUseCase
 
 
 class ConfessionController:
@@ -21,11 +46,21 @@ class ConfessionController:
         create_confession_use_case: CreateConfessionUseCase,
         moderate_confession_use_case: ModerateConfessionUseCase,
         publish_confession_use_case: PublishConfessionUseCase,
+        list_confessions_use_case: ListConfessionsUseCase,
+        request_moderation_use_case: RequestModerationUseCase,
+        get_confession_use_case: GetConfessionUseCase,
+        update_confession_status_use_case: UpdateConfessionStatusUseCase,
+        search_confessions_use_case: SearchConfessionsUseCase,
     ) -> None:
         """Инициализация контроллера с нужными Use Cases."""
         self._create_confession_use_case = create_confession_use_case
         self._moderate_confession_use_case = moderate_confession_use_case
         self._publish_confession_use_case = publish_confession_use_case
+        self._list_confessions_use_case = list_confessions_use_case
+        self._request_moderation_use_case = request_moderation_use_case
+        self._get_confession_use_case = get_confession_use_case
+        self._update_confession_status_use_case = update_confession_status_use_case
+        self._search_confessions_use_case = search_confessions_use_case
     
     async def create_confession(self, dto: ConfessionDTO) -> ConfessionDTO:
         """Создает новое признание."""
@@ -40,95 +75,135 @@ class ConfessionController:
         """
         return await self._moderate_confession_use_case.execute(dto)
     
+    async def request_moderation(self, dto: ConfessionDTO) -> Optional[ModerationJobDTO]:
+        """
+        Ставит признание в очередь фоновой модерации.
+        
+        Returns:
+            ModerationJobDTO: Задача модерации или None, если признание не найдено
+        """
+        return await self._request_moderation_use_case.execute(dto)
+    
     async def publish_confession(self, dto: ConfessionDTO) -> ConfessionDTO:
         """Публикует признание в Telegram."""
         return await self._publish_confession_use_case.execute(dto)
     
-    async def get_confession(self, confession_id_or_dto: Union[int, ConfessionDTO]) -> Optional[ConfessionDTO]:
+    async def list_page(self, query: ConfessionListQueryDTO) -> ConfessionPageDTO:
+        """
+        Получает страницу признаний с курсором на следующую.
+        
+        Raises:
+            ValueError: Если курсор поврежден
+        """
+        return await self._list_confessions_use_case.execute(query)
+    
+    async def search(self, query: ConfessionSearchQueryDTO) -> ConfessionSearchPageDTO:
+        """
+        Ищет признания по тексту, самые релевантные сверху.
+        
+        Raises:
+            ValueError: Если запрос пуст или курсор поврежден
+        """
+        return await self._search_confessions_use_case.execute(query)
+    
+    async def get_confession(
+        self,
+        confession_id_or_dto: Union[int, ConfessionDTO],
+        projection: ConfessionProjection = ConfessionProjection.PUBLIC,
+    ) -> Optional[ConfessionDTO]:
         """
         Получает признание по ID.
         
         Args:
             confession_id_or_dto: ID признания или DTO с ID
+            projection: Уровень детализации (FULL - для админки)
             
         Returns:
             ConfessionDTO: DTO признания или None, если не найдено
         """
         # Извлекаем ID из параметра
-        confession_id = confession_id_or_dto.id if isinstance(confession_id_or_dto, ConfessionDTO) else confession_id_or_dto
+        if isinstance(confession_id_or_dto, ConfessionDTO):
+            confession_id = confession_id_or_dto.id
+        else:
+            confession_id = confession_id_or_dto
         
-        # TODO: Добавить полную реализацию через репозиторий
-        # Для тестов возвращаем тестовую сущность
-        # Это временная заглушка для прохождения тестов
-        from src.entities.confession import Confession
-        from src.entities.enums import ConfessionStatus
-        from datetime import datetime
+        return await self._get_confession_use_case.execute(ConfessionQueryDTO(id=confession_id, projection=projection))
+    
+    async def get_revision(self, confession_id: int) -> Optional[ConfessionRevisionDTO]:
+        """
+        Получает версию признания без загрузки агрегата.
         
-        # Возвращаем заглушку только если ID == 1 (для тестов)
-        if confession_id == 1:
-            confession = Confession(
-                id=1,
-                content="Тестовое признание через API",
-                status=ConfessionStatus.PENDING,
-                created_at=datetime.now(),
-            )
-            return ConfessionDTO.model_validate(confession)
-        return None
-    
-    async def update_status(self, confession_id: int, new_status: ConfessionStatus) -> Optional[ConfessionDTO]:
+        Returns:
+            ConfessionRevisionDTO: Версия признания или None, если не найдено
+        """
+        return await self._get_confession_use_case.get_revision(confession_id)
+    
+    async def update_status(
+        self,
+        confession_id: int,
+        new_status: ConfessionStatus,
+        expected_status: Optional[ConfessionStatus] = None,
+    ) -> Optional[ConfessionDTO]:
         """
         Обновляет статус признания.
         
         Args:
             confession_id: ID признания
             new_status: Новый статус
+            expected_status: Статус, который признание должно иметь сейчас
             
         Returns:
             ConfessionDTO: Обновленное DTO признания или None, если не найдено
+            
+        Raises:
+            StatusTransitionError: Переход запрещен или статус уже изменен
         """
-        # TODO: Добавить полную реализацию через репозиторий
-        # Для тестов возвращаем тестовую сущность с обновленным статусом
-        # Это временная заглушка для прохождения тестов
-        from src.entities.confession import Confession
-        from datetime import datetime
-        
-        # Возвращаем заглушку только если ID == 1 (для тестов)
-        if confession_id == 1:
-            confession = Confession(
-                id=1,
-                content="Тестовое признание через API",
-                status=new_status,
-                created_at=datetime.now(),
-            )
-            return ConfessionDTO.model_validate(confession)
-        return None
-    
-    async def list_by_status(self, status: Optional[ConfessionStatus] = None) -> List[ConfessionDTO]:
+        return await self._update_confession_status_use_case.execute(
+            ConfessionStatusUpdateDTO(id=confession_id, status=new_status, expected_status=expected_status)
+        )
+    
+    async def list_by_status(
+        self,
+        status: Optional[ConfessionStatus] = None,
+        projection: ConfessionProjection = ConfessionProjection.SUMMARY,
+    ) -> List[ConfessionDTO]:
         """
         Получает список признаний по статусу.
         
         Args:
             status: Статус для фильтрации или None для всех
+            projection: Уровень детализации
             
         Returns:
             List[ConfessionDTO]: Список DTO признаний
         """
-        # TODO: Добавить полную реализацию через репозиторий
-        # Для тестов возвращаем тестовый список признаний
-        # Это временная заглушка для прохождения тестов
-        from src.entities.confession import Confession
-        from datetime import datetime
+        return await self._list_confessions_use_case.list_by_status(status, projection)
+
+
+class ModerationController:
+    """Контроллер для отслеживания фоновой модерации."""
+    
+    def __init__(
+        self,
+        get_moderation_job_use_case: GetModerationJobUseCase,
+        batch_moderate_confessions_use_case: BatchModerateConfessionsUseCase,
+    ) -> None:
+        """Инициализация контроллера с нужными Use Cases."""
+        self._get_moderation_job_use_case = get_moderation_job_use_case
+        self._batch_moderate_confessions_use_case = batch_moderate_confessions_use_case
+    
+    async def get_job(self, job_id: int) -> Optional[ModerationJobDTO]:
+        """
+        Получает состояние задачи модерации.
         
-        # Для теста возвращаем одно признание с запрошенным статусом
-        if status == ConfessionStatus.PENDING:
-            confession = Confession(
-                id=1,
-                content="Тестовое признание через API",
-                status=ConfessionStatus.PENDING,
-                created_at=datetime.now(),
-            )
-            return [ConfessionDTO.model_validate(confession)]
-        return []
+        Returns:
+            ModerationJobDTO: DTO задачи или None, если не найдена
+        """
+        return await self._get_moderation_job_use_case.execute(job_id)
+    
+    async def moderate_pending(self) -> BatchModerationResultDTO:
+        """Модерирует пачками все признания, ожидающие проверки."""
+        return await self._batch_moderate_confessions_use_case.execute()
 
 
 class PollController:
@@ -137,9 +212,13 @@ class PollController:
     def __init__(
         self,
         create_confession_use_case: CreateConfessionUseCase,
+        vote_in_poll_use_case: VoteInPollUseCase,
+        get_poll_results_use_case: GetPollResultsUseCase,
     ) -> None:
         """Инициализация контроллера с нужными Use Cases."""
         self._create_confession_use_case = create_confession_use_case
+        self._vote_in_poll_use_case = vote_in_poll_use_case
+        self._get_poll_results_use_case = get_poll_results_use_case
     
     async def create_poll(self, dto: PollDTO) -> PollDTO:
         """Создает новый опрос в рамках признания."""
@@ -164,30 +243,7 @@ class PollController:
         Raises:
             ValueError: Если указан неверный ID варианта
         """
-        # TODO: Добавить полную реализацию через репозиторий
-        # Для тестов возвращаем тестовую сущность с обновленным статусом
-        # Это временная заглушка для прохождения тестов
-        from src.entities.confession import Poll, PollOption
-        from datetime import datetime
-        
-        # Для теста на неверный вариант
-        if option_id == 999:
-            raise ValueError("Invalid option id")
-        
-        # Для успешного теста
-        if poll_id == 1 and option_id == 1:
-            poll = Poll(
-                id=1,
-                question="Тестовый вопрос",
-                options=[
-                    PollOption(id=1, text="Вариант 1", vote_count=6),  # +1 голос
-                    PollOption(id=2, text="Вариант 2", vote_count=3),
-                ],
-                created_at=datetime.now(),
-            )
-            return PollDTO.model_validate(poll)
-            
-        return None
+        return await self._vote_in_poll_use_case.execute(VoteDTO(poll_id=poll_id, option_id=option_id))
             
     async def get_results(self, poll_id: int) -> Optional[PollDTO]:
         """
@@ -199,22 +255,30 @@ class PollController:
         Returns:
             PollDTO: DTO опроса с результатами или None, если не найдено
         """
-        # TODO: Добавить полную реализацию через репозиторий
-        # Для тестов возвращаем тестовую сущность
-        # Это временная заглушка для прохождения тестов
-        from src.entities.confession import Poll, PollOption
-        from datetime import datetime
+        return await self._get_poll_results_use_case.execute(poll_id)
+
+
+class TagController:
+    """Контроллер для тегов."""
+    
+    def __init__(
+        self,
+        list_popular_tags_use_case: ListPopularTagsUseCase,
+        list_tag_confessions_use_case: ListTagConfessionsUseCase,
+    ) -> None:
+        """Инициализация контроллера с нужными Use Cases."""
+        self._list_popular_tags_use_case = list_popular_tags_use_case
+        self._list_tag_confessions_use_case = list_tag_confessions_use_case
+    
+    async def list_popular(self, limit: int) -> List[TagCountDTO]:
+        """Получает самые популярные теги с количеством опубликованных признаний."""
+        return await self._list_popular_tags_use_case.execute(limit)
+    
+    async def list_confessions(self, query: TagConfessionsQueryDTO) -> ConfessionPageDTO:
+        """
+        Получает страницу опубликованных признаний с тегом.
         
-        # Возвращаем заглушку только если ID == 1 (для тестов)
-        if poll_id == 1:
-            poll = Poll(
-                id=1,
-                question="Тестовый вопрос",
-                options=[
-                    PollOption(id=1, text="Вариант 1", vote_count=5),
-                    PollOption(id=2, text="Вариант 2", vote_count=3),
-                ],
-                created_at=datetime.now(),
-            )
-            return PollDTO.model_validate(poll)
-        return None
\ No newline at end of file
+        Raises:
+            ValueError: Если курсор поврежден
+        """
+        return await self._list_tag_confessions_use_case.execute(query)
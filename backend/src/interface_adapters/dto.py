@@ -6,7 +6,7 @@ from typing import List, Optional
 
 from pydantic import BaseModel, Field
 
-from src.entities.enums import AttachmentType, ConfessionStatus
+from src.entities.enums import AttachmentType, ConfessionProjection, ConfessionStatus, ModerationJobStatus
 
 
 class AttachmentDTO(BaseModel):
@@ -49,6 +49,21 @@ class TagDTO(BaseModel):
     name: str
 
 
+class TagCountDTO(BaseModel):
+    """DTO тега с количеством опубликованных признаний."""
+    
+    name: str
+    count: int
+
+
+class TagConfessionsQueryDTO(BaseModel):
+    """DTO запроса страницы опубликованных признаний с тегом."""
+    
+    name: str
+    limit: int = Field(default=50, ge=1, le=200)
+    cursor: Optional[str] = None
+
+
 class ConfessionDTO(BaseModel):
     """DTO для признания."""
     
@@ -61,6 +76,52 @@ class ConfessionDTO(BaseModel):
     poll: Optional[PollDTO] = None
 
 
+class VoteDTO(BaseModel):
+    """DTO голоса в опросе."""
+    
+    poll_id: int
+    option_id: int
+
+
+class ConfessionListQueryDTO(BaseModel):
+    """DTO запроса страницы признаний."""
+    
+    status: Optional[ConfessionStatus] = None
+    limit: int = Field(default=50, ge=1, le=200)
+    cursor: Optional[str] = None
+    projection: ConfessionProjection = ConfessionProjection.SUMMARY
+
+
+class ConfessionPageDTO(BaseModel):
+    """DTO страницы признаний."""
+    
+    items: List[ConfessionDTO] = Field(default_factory=list)
+    next_cursor: Optional[str] = None
+
+
+class ConfessionSearchQueryDTO(BaseModel):
+    """DTO запроса полнотекстового поиска признаний."""
+    
+    query: str = Field(min_length=1, max_length=200)
+    status: Optional[ConfessionStatus] = None
+    limit: int = Field(default=20, ge=1, le=100)
+    cursor: Optional[str] = None
+
+
+class ConfessionSearchHitDTO(ConfessionDTO):
+    """DTO найденного признания с релевантностью и фрагментом текста."""
+    
+    rank: float = 0.0
+    snippet: str = ""
+
+
+class ConfessionSearchPageDTO(BaseModel):
+    """DTO страницы результатов поиска."""
+    
+    items: List[ConfessionSearchHitDTO] = Field(default_factory=list)
+    next_cursor: Optional[str] = None
+
+
 class ModerationLogDTO(BaseModel):
     """DTO для записи о модерации."""
     
@@ -72,6 +133,40 @@ class ModerationLogDTO(BaseModel):
     timestamp: datetime = Field(default_factory=datetime.now)
 
 
+class ModerationJobDTO(BaseModel):
+    """DTO для задачи фоновой модерации."""
+    
+    id: int
+    confession_id: int
+    status: ModerationJobStatus
+    attempts: int = 0
+    last_error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+
+class BatchModerationResultDTO(BaseModel):
+    """DTO с итогами пакетной модерации."""
+    
+    processed: int = 0
+    approved: int = 0
+    rejected: int = 0
+    pending: int = 0
+
+
+class PublicationScheduleDTO(BaseModel):
+    """DTO с итогами одного запуска планировщика публикаций."""
+    
+    # Было ли текущее время внутри окна публикации
+    in_window: bool = True
+    enqueued: int = 0
+    # Одобренные признания, ожидающие планировщика
+    approved_backlog: int = 0
+    # Неотправленные сообщения исходящей очереди
+    queue_depth: int = 0
+    oldest_queued_at: Optional[datetime] = None
+
+
 class PublishedRecordDTO(BaseModel):
     """DTO для информации о публикации."""
     
@@ -90,4 +185,37 @@ class CommentDTO(BaseModel):
     confession_id: int
     content: str
     created_at: datetime = Field(default_factory=datetime.now)
-    reply_to: Optional[int] = None 
\ No newline at end of file
+    reply_to: Optional[int] = None 
+
+
+class ConfessionDetailDTO(ConfessionDTO):
+    """DTO признания со всеми связанными сущностями (проекция FULL)."""
+    
+    moderation_logs: List[ModerationLogDTO] = Field(default_factory=list)
+    published_record: Optional[PublishedRecordDTO] = None
+    comments: List[CommentDTO] = Field(default_factory=list)
+
+
+class ConfessionQueryDTO(BaseModel):
+    """DTO запроса признания по ID."""
+    
+    id: int
+    projection: ConfessionProjection = ConfessionProjection.PUBLIC
+
+
+class ConfessionRevisionDTO(BaseModel):
+    """DTO версии признания для условных запросов."""
+    
+    id: int
+    status: ConfessionStatus
+    version: int = 0
+    updated_at: Optional[datetime] = None
+    poll_votes: Optional[int] = None
+
+
+class ConfessionStatusUpdateDTO(BaseModel):
+    """DTO смены статуса признания."""
+    
+    id: int
+    status: ConfessionStatus
+    expected_status: Optional[ConfessionStatus] = None
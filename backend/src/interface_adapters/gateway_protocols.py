@@ -1,30 +1,82 @@
 """
 Протоколы гейтвеев для работы с внешними системами.
 """
-from typing import Optional, Protocol
+from typing import Awaitable, Callable, List, Optional, Protocol, Sequence
 
-from src.entities.confession import Confession, Poll
-from src.entities.enums import ConfessionStatus
+from src.entities.confession import Confession, ModerationResult, Poll
+
+
+class PublicationRateLimitedError(Exception):
+    """Telegram попросил подождать перед следующей отправкой (сообщение не отправлено)."""
+    
+    def __init__(self, retry_after: float) -> None:
+        """
+        Args:
+            retry_after: Сколько секунд ждать перед повторной отправкой
+        """
+        super().__init__(f"Rate limited, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class PublicationTemporaryError(Exception):
+    """Временная ошибка Telegram, после которой отправку безопасно повторить."""
 
 
 class TelegramGatewayProtocol(Protocol):
     """Интерфейс для отправки сообщений в Telegram."""
     
-    async def send_confession(self, confession: Confession) -> str:
+    async def send_confession(self, confession: Confession, channel_id: Optional[str] = None) -> str:
         """
-        Отправляет признание в Telegram канал.
+        Отправляет признание в Telegram канал (по умолчанию - в основной).
         
         Returns:
             str: ID сообщения в Telegram
+            
+        Raises:
+            PublicationRateLimitedError: Если сработал лимит Telegram
+            PublicationTemporaryError: Если отправку можно безопасно повторить
+        """
+        ...
+    
+    async def send_attachments(
+        self,
+        confession: Confession,
+        channel_id: Optional[str] = None,
+        sent_message_ids: Sequence[str] = (),
+        on_album_sent: Optional[Callable[[List[str]], Awaitable[None]]] = None,
+    ) -> List[str]:
+        """
+        Отправляет вложения признания альбомами (по умолчанию - в основной канал).
+        
+        Каждый файл альбома - отдельное сообщение, поэтому по числу уже
+        отправленных сообщений видно, какие альбомы дошли до канала:
+        при повторной попытке они пропускаются.
+        
+        Args:
+            confession: Доменная сущность признания
+            channel_id: ID канала
+            sent_message_ids: ID сообщений, отправленных прошлыми попытками
+            on_album_sent: Вызывается после каждого альбома со всеми ID, отправленными на этот момент
+        
+        Returns:
+            List[str]: ID всех сообщений с вложениями, включая отправленные раньше
+            
+        Raises:
+            PublicationRateLimitedError: Если сработал лимит Telegram
+            PublicationTemporaryError: Если отправку можно безопасно повторить
         """
         ...
     
-    async def send_poll(self, poll: Poll) -> str:
+    async def send_poll(self, poll: Poll, channel_id: Optional[str] = None) -> str:
         """
-        Отправляет опрос в Telegram канал.
+        Отправляет опрос в Telegram канал (по умолчанию - в основной).
         
         Returns:
             str: ID сообщения с опросом в Telegram
+            
+        Raises:
+            PublicationRateLimitedError: Если сработал лимит Telegram
+            PublicationTemporaryError: Если отправку можно безопасно повторить
         """
         ...
 
@@ -32,20 +84,21 @@ class TelegramGatewayProtocol(Protocol):
 class ModerationGatewayProtocol(Protocol):
     """Интерфейс для работы с системой модерации."""
     
-    async def moderate(self, confession: Confession) -> ConfessionStatus:
+    async def moderate(self, confession: Confession) -> ModerationResult:
         """
         Проводит модерацию признания с помощью LLM или другой системы.
         
         Returns:
-            ConfessionStatus: Статус после модерации (APPROVED/REJECTED)
+            ModerationResult: Статус после модерации (APPROVED/REJECTED),
+                причина отклонения, оценки по категориям и время ответа
         """
         ...
     
-    async def get_moderation_reason(self, confession: Confession) -> Optional[str]:
+    async def moderate_many(self, confessions: List[Confession]) -> List[ModerationResult]:
         """
-        Получает причину отклонения признания при модерации.
+        Проводит модерацию нескольких признаний за один вызов системы модерации.
         
         Returns:
-            Optional[str]: Причина отклонения или None, если признание одобрено
+            List[ModerationResult]: Результаты в том же порядке, что и признания
         """
-        ... 
\ No newline at end of file
+        ...
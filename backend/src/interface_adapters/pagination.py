@@ -0,0 +1,108 @@
+"""
+Курсорная (keyset) пагинация для списков признаний и результатов поиска.
+"""
+import base64
+import binascii
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Generic, List, Optional, TypeVar, Union
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class PageCursor:
+    """
+    Позиция в ленте, упорядоченной по (created_at, id) по убыванию.
+
+    Следующая страница начинается со строк, строго меньших этой пары,
+    поэтому стоимость запроса не зависит от глубины пролистывания.
+    """
+
+    created_at: datetime
+    id: int
+
+    def encode(self) -> str:
+        """
+        Кодирует курсор в непрозрачную строку для клиента.
+
+        Returns:
+            str: URL-безопасный токен курсора
+        """
+        raw = f"{self.created_at.isoformat()}|{self.id}".encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, token: str) -> "PageCursor":
+        """
+        Восстанавливает курсор из строки, полученной от клиента.
+
+        Args:
+            token: Токен, ранее выданный методом encode
+
+        Returns:
+            PageCursor: Курсор
+
+        Raises:
+            ValueError: Если токен поврежден
+        """
+        try:
+            padded = token + "=" * (-len(token) % 4)
+            created_at, id_ = base64.urlsafe_b64decode(padded.encode()).decode().split("|")
+            return cls(created_at=datetime.fromisoformat(created_at), id=int(id_))
+        except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+            raise ValueError(f"Invalid cursor: {token}") from e
+
+
+@dataclass(frozen=True)
+class SearchCursor:
+    """
+    Позиция в результатах поиска, упорядоченных по (rank, id) по убыванию.
+
+    Ранг одного и того же признания для одного и того же запроса
+    не меняется, поэтому следующая страница продолжает выдачу
+    без OFFSET.
+    """
+
+    rank: float
+    id: int
+
+    def encode(self) -> str:
+        """
+        Кодирует курсор в непрозрачную строку для клиента.
+
+        Returns:
+            str: URL-безопасный токен курсора
+        """
+        # repr сохраняет float без потери точности: сравнение с рангом в БД будет точным
+        raw = f"{self.rank!r}|{self.id}".encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, token: str) -> "SearchCursor":
+        """
+        Восстанавливает курсор из строки, полученной от клиента.
+
+        Args:
+            token: Токен, ранее выданный методом encode
+
+        Returns:
+            SearchCursor: Курсор
+
+        Raises:
+            ValueError: Если токен поврежден
+        """
+        try:
+            padded = token + "=" * (-len(token) % 4)
+            rank, id_ = base64.urlsafe_b64decode(padded.encode()).decode().split("|")
+            return cls(rank=float(rank), id=int(id_))
+        except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+            raise ValueError(f"Invalid cursor: {token}") from e
+
+
+@dataclass
+class Page(Generic[T]):
+    """Страница результатов и курсор следующей страницы (None, если это последняя)."""
+
+    items: List[T] = field(default_factory=list)
+    next_cursor: Optional[Union[PageCursor, SearchCursor]] = None
@@ -1,43 +1,248 @@
 """
 Протоколы репозиториев для работы с данными.
 """
-from typing import List, Optional, Protocol
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Mapping, Optional, Protocol, Sequence
 
-from src.entities.confession import Confession, Poll, Tag
-from src.entities.enums import ConfessionStatus
+from src.entities.confession import (
+    Confession,
+    ConfessionRevision,
+    ConfessionSearchHit,
+    ModerationJob,
+    ModerationLog,
+    Poll,
+    Publication,
+    PublicationQueueStats,
+    PublishedRecord,
+    Tag,
+    TagCount,
+)
+from src.entities.enums import ConfessionProjection, ConfessionStatus
+from src.interface_adapters.pagination import Page, PageCursor, SearchCursor
 
 
 class ConfessionRepositoryProtocol(Protocol):
     """Интерфейс для работы с репозиторием признаний."""
 
-    async def save(self, confession: Confession) -> Confession:
-        """Сохраняет признание в репозитории."""
+    async def save(
+        self,
+        confession: Confession,
+        refresh: bool = False,
+        outbox: Sequence[Publication] = (),
+        moderation_job: Optional[ModerationJob] = None,
+    ) -> Confession:
+        """
+        Сохраняет признание и возвращает его с проставленными ID (refresh=True - перечитав из хранилища).
+
+        Сообщения outbox и задача модерации записываются в той же транзакции, что и признание.
+        """
+        ...
+
+    async def get_by_id(
+        self,
+        id: int,
+        projection: ConfessionProjection = ConfessionProjection.FULL,
+    ) -> Optional[Confession]:
+        """Получает признание по ID с указанным уровнем детализации (для save() - только FULL)."""
         ...
 
-    async def get_by_id(self, id: int) -> Optional[Confession]:
-        """Получает признание по ID."""
+    async def get_revision(self, id: int) -> Optional[ConfessionRevision]:
+        """Получает версию признания (статус, номер версии, время изменения, голоса) без загрузки агрегата."""
         ...
 
-    async def list_by_status(self, status: ConfessionStatus) -> List[Confession]:
+    async def list_by_status(
+        self,
+        status: Optional[ConfessionStatus],
+        projection: ConfessionProjection = ConfessionProjection.FULL,
+    ) -> List[Confession]:
         """Получает список признаний по статусу."""
         ...
 
-    async def update_status(self, id: int, status: ConfessionStatus) -> None:
-        """Обновляет статус признания."""
+    async def list_page(
+        self,
+        status: Optional[ConfessionStatus],
+        limit: int,
+        cursor: Optional[PageCursor] = None,
+        projection: ConfessionProjection = ConfessionProjection.FULL,
+    ) -> Page[Confession]:
+        """Получает страницу признаний (новые сверху), начиная после курсора."""
         ...
 
+    async def list_page_by_tag(
+        self,
+        tag_name: str,
+        limit: int,
+        cursor: Optional[PageCursor] = None,
+        projection: ConfessionProjection = ConfessionProjection.SUMMARY,
+    ) -> Page[Confession]:
+        """Получает страницу опубликованных признаний с тегом (новые сверху), начиная после курсора."""
+        ...
 
-class PollRepositoryProtocol(Protocol):
-    """Интерфейс для работы с репозиторием опросов."""
+    def stream_by_status(
+        self,
+        status: Optional[ConfessionStatus],
+        projection: ConfessionProjection = ConfessionProjection.FULL,
+    ) -> AsyncIterator[Confession]:
+        """Потоково отдает признания по мере чтения из серверного курсора."""
+        ...
+
+    async def search(
+        self,
+        query: str,
+        status: Optional[ConfessionStatus] = None,
+        cursor: Optional[SearchCursor] = None,
+        limit: int = 20,
+    ) -> Page[ConfessionSearchHit]:
+        """Ищет признания по тексту (по убыванию релевантности) с фрагментами, где совпадения выделены <mark>."""
+        ...
+
+    async def update_status(
+        self,
+        id: int,
+        status: ConfessionStatus,
+        expected: Optional[ConfessionStatus] = None,
+        log: Optional[ModerationLog] = None,
+    ) -> bool:
+        """
+        Меняет статус признания, если переход разрешен и текущий статус равен expected.
+        
+        Запись о модерации, если передана, сохраняется в той же транзакции.
+        Возвращает False, если признание не найдено; при запрещенном
+        переходе или конкурентной смене статуса - StatusTransitionError.
+        """
+        ...
+
+    async def record_publication(self, record: PublishedRecord, poll_message_id: Optional[str] = None) -> bool:
+        """
+        Фиксирует публикацию признания и ID опроса в Telegram, если она еще не зафиксирована.
+        
+        Возвращает False, если публикацию уже зафиксировал другой канал.
+        """
+        ...
+
+    async def publish_approved(self, limit: int, channel_ids: Sequence[str]) -> List[int]:
+        """Переводит самые старые одобренные признания в PUBLISHED и ставит их в очередь отправки."""
+        ...
+
+    async def count_by_status(self, status: ConfessionStatus) -> int:
+        """Считает признания с указанным статусом."""
+        ...
+
+
+class ModerationJobRepositoryProtocol(Protocol):
+    """Интерфейс для работы с очередью задач фоновой модерации."""
+
+    async def enqueue(self, confession_id: int) -> ModerationJob:
+        """Ставит признание в очередь модерации (или возвращает уже стоящую задачу)."""
+        ...
+
+    async def claim(self, lease_seconds: float) -> Optional[ModerationJob]:
+        """Забирает готовую задачу, не блокируясь на задачах других воркеров."""
+        ...
+
+    async def complete(self, job: ModerationJob) -> bool:
+        """Отмечает задачу выполненной (False - аренда задачи уже перешла к другому воркеру)."""
+        ...
+
+    async def retry(self, job: ModerationJob, error: str, available_at: datetime) -> bool:
+        """Возвращает задачу в очередь для повторной попытки не раньше указанного времени."""
+        ...
+
+    async def fail(self, job: ModerationJob, error: str) -> bool:
+        """Отмечает задачу окончательно проваленной."""
+        ...
+
+    async def get_by_id(self, id: int) -> Optional[ModerationJob]:
+        """Получает задачу по ID."""
+        ...
+
+
+class PublicationRepositoryProtocol(Protocol):
+    """Интерфейс для работы с исходящей очередью публикаций в Telegram."""
+
+    async def claim(self, lease_seconds: float) -> Optional[Publication]:
+        """Забирает готовое к отправке сообщение, не блокируясь на сообщениях других отправителей."""
+        ...
 
-    async def save(self, poll: Poll) -> Poll:
-        """Сохраняет опрос в репозитории."""
+    async def record_progress(
+        self,
+        publication_id: int,
+        telegram_message_id: Optional[str] = None,
+        poll_message_id: Optional[str] = None,
+        media_message_ids: Optional[List[str]] = None,
+    ) -> None:
+        """Запоминает уже отправленные части, чтобы повторная попытка их не дублировала."""
         ...
 
+    async def complete(self, publication_id: int) -> None:
+        """Отмечает сообщение доставленным."""
+        ...
+
+    async def retry(self, publication_id: int, error: str, available_at: datetime) -> None:
+        """Возвращает сообщение в очередь для повторной попытки не раньше указанного времени."""
+        ...
+
+    async def fail(self, publication_id: int, error: str) -> None:
+        """Отмечает сообщение недоставленным."""
+        ...
+
+    async def queue_stats(self) -> PublicationQueueStats:
+        """Возвращает глубину очереди и время готовности самого старого сообщения."""
+        ...
+
+
+class PollRepositoryProtocol(Protocol):
+    """
+    Интерфейс для работы с репозиторием опросов.
+
+    Опрос создается и меняется вместе с признанием (ConfessionRepositoryProtocol.save),
+    здесь - только чтение и голосование.
+    """
+
     async def get_by_id(self, id: int) -> Optional[Poll]:
         """Получает опрос по ID."""
         ...
 
+    async def add_votes(self, increments: Mapping[int, int]) -> None:
+        """Атомарно прибавляет голоса к вариантам ответа (ID варианта -> количество голосов)."""
+        ...
+
+
+class VoteBufferProtocol(Protocol):
+    """Интерфейс буфера, накапливающего голоса перед записью в хранилище."""
+
+    async def add(self, option_id: int, count: int = 1) -> None:
+        """Добавляет голоса в буфер."""
+        ...
+
+    def pending(self, option_ids: Sequence[int]) -> Dict[int, int]:
+        """Возвращает еще не записанные голоса по указанным вариантам."""
+        ...
+
+
+class PollResultsCacheProtocol(Protocol):
+    """Интерфейс кэша результатов опросов."""
+
+    def invalidate(self, poll_id: int) -> None:
+        """Сбрасывает закэшированные результаты опроса после изменения голосов."""
+        ...
+
+
+class FeedCacheProtocol(Protocol):
+    """Интерфейс кэша публичной ленты."""
+
+    def invalidate(self) -> None:
+        """Сбрасывает закэшированные страницы ленты после публикации признаний."""
+        ...
+
+
+class PollUpdatesProtocol(Protocol):
+    """Интерфейс рассылки обновлений результатов опросов наблюдателям."""
+
+    def publish(self, poll_id: int) -> None:
+        """Сообщает, что результаты опроса изменились."""
+        ...
+
 
 class TagRepositoryProtocol(Protocol):
     """Интерфейс для работы с репозиторием тегов."""
@@ -48,4 +253,8 @@ class TagRepositoryProtocol(Protocol):
 
     async def get_by_names(self, names: List[str]) -> List[Tag]:
         """Получает список тегов по их именам."""
+        ...
+
+    async def list_popular(self, limit: int) -> List[TagCount]:
+        """Получает теги с наибольшим числом опубликованных признаний (по счетчикам, без подсчета)."""
         ... 
\ No newline at end of file
@@ -2,26 +2,149 @@
 Основной файл приложения FastAPI.
 """
 import os
-from contextlib import asynccontextmanager
+from contextlib import AsyncExitStack, asynccontextmanager
 from typing import Any, Dict
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from loguru import logger
 
-from src.frameworks_and_drivers.rest_api.routers import confession_router, poll_router
+from src.frameworks_and_drivers.config import (
+    get_feed_cache_settings,
+    get_moderation_cache_settings,
+    get_moderation_gateway_settings,
+    get_moderation_worker_settings,
+    get_poll_results_cache_settings,
+    get_poll_stream_settings,
+    get_poll_vote_settings,
+    get_publication_scheduler_settings,
+    get_publication_settings,
+)
+from src.frameworks_and_drivers.db.database import DATABASE_URL, AsyncSessionLocal, engine
+from src.frameworks_and_drivers.gateways.llm_moderation_gateway import LLMModerationGateway
+from src.frameworks_and_drivers.gateways.moderation_cache import create_moderation_cache
+from src.frameworks_and_drivers.gateways.poll_notifier import PostgresPollNotifier
+from src.frameworks_and_drivers.gateways.rate_limiter import PostgresChannelRateLimiter
+from src.frameworks_and_drivers.gateways.telegram_bot_gateway import TelegramBotGateway
+from src.frameworks_and_drivers.gateways.telegram_file_cache import PostgresTelegramFileStore, TelegramFileCache
+from src.frameworks_and_drivers.metrics import metrics
+from src.frameworks_and_drivers.rest_api.http_cache import ReadThroughCache, ResponseCache
+from src.frameworks_and_drivers.rest_api.routers import (
+    confession_router,
+    moderation_router,
+    poll_router,
+    tag_router,
+)
+from src.frameworks_and_drivers.rest_api.routers.confession import NEXT_CURSOR_HEADER
+from src.frameworks_and_drivers.workers import (
+    ModerationWorkerPool,
+    PollResultsBroadcaster,
+    PublicationScheduler,
+    PublicationSender,
+    VoteBuffer,
+)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Обработчик жизненного цикла приложения."""
+    """
+    Обработчик жизненного цикла приложения.
+    
+    Гейтвеи создаются один раз на процесс и доступны зависимостям
+    через app.state; при остановке закрываются их HTTP-сессии
+    и пул соединений с БД. Здесь же запускаются фоновые воркеры модерации,
+    отправитель и планировщик публикаций в Telegram, буфер голосов
+    и рассылка результатов опросов в SSE-потоки.
+    """
     # Код, выполняемый при запуске приложения
     logger.info("Starting ФАЛТ.конф API")
-    
-    yield  # Здесь приложение работает
-    
-    # Код, выполняемый при остановке приложения
-    logger.info("Shutting down ФАЛТ.конф API")
+    async with AsyncExitStack() as resources:
+        # Каждый ресурс регистрируется сразу после создания: если запуск упадет
+        # на середине, уже созданные ресурсы закроются в обратном порядке
+        resources.push_async_callback(engine.dispose)
+        
+        publication_settings = get_publication_settings()
+        app.state.telegram_gateway = TelegramBotGateway(
+            rate_limiter=PostgresChannelRateLimiter(
+                AsyncSessionLocal, publication_settings.rate_per_minute, publication_settings.burst
+            ),
+            file_cache=TelegramFileCache(store=PostgresTelegramFileStore(AsyncSessionLocal)),
+        )
+        resources.push_async_callback(app.state.telegram_gateway.close)
+        app.state.moderation_gateway = LLMModerationGateway(
+            cache=create_moderation_cache(get_moderation_cache_settings(), AsyncSessionLocal),
+            settings=get_moderation_gateway_settings(),
+        )
+        resources.push_async_callback(app.state.moderation_gateway.close)
+        
+        feed_cache_settings = get_feed_cache_settings()
+        app.state.feed_cache = None
+        if feed_cache_settings.enabled:
+            app.state.feed_cache = ReadThroughCache(
+                "feed",
+                feed_cache_settings.ttl_seconds,
+                feed_cache_settings.stale_seconds,
+                feed_cache_settings.max_entries,
+            )
+        
+        vote_settings = get_poll_vote_settings()
+        app.state.vote_buffer = None
+        if vote_settings.buffer_enabled:
+            app.state.vote_buffer = VoteBuffer(AsyncSessionLocal, vote_settings.flush_interval_ms / 1000)
+            # Последний сброс накопленных голосов - после остановки воркеров, пока пул соединений еще открыт
+            resources.push_async_callback(app.state.vote_buffer.stop)
+            app.state.vote_buffer.start()
+        
+        results_cache_settings = get_poll_results_cache_settings()
+        app.state.poll_results_cache = None
+        if results_cache_settings.enabled:
+            app.state.poll_results_cache = ResponseCache(
+                "poll_results", results_cache_settings.ttl_seconds, results_cache_settings.max_entries
+            )
+        
+        stream_settings = get_poll_stream_settings()
+        notifier = None
+        if stream_settings.notify_enabled:
+            notifier = PostgresPollNotifier(DATABASE_URL, stream_settings.notify_channel)
+            if app.state.poll_results_cache is not None:
+                # Голоса в других воркерах сбрасывают и локальный кэш результатов
+                notifier.add_callback(app.state.poll_results_cache.invalidate)
+        app.state.poll_broadcaster = PollResultsBroadcaster(
+            AsyncSessionLocal,
+            stream_settings.interval_ms / 1000,
+            vote_buffer=app.state.vote_buffer,
+            notifier=notifier,
+            settle_delay=vote_settings.flush_interval_ms / 1000 if vote_settings.buffer_enabled else 0.0,
+            keepalive=stream_settings.keepalive_seconds,
+        )
+        resources.push_async_callback(app.state.poll_broadcaster.stop)
+        await app.state.poll_broadcaster.start_listening()
+        
+        publication_sender = PublicationSender(AsyncSessionLocal, app.state.telegram_gateway, publication_settings)
+        resources.push_async_callback(publication_sender.stop)
+        if publication_settings.enabled:
+            publication_sender.start()
+        
+        worker_settings = get_moderation_worker_settings()
+        moderation_workers = ModerationWorkerPool(AsyncSessionLocal, app.state.moderation_gateway, worker_settings)
+        resources.push_async_callback(moderation_workers.stop)
+        if worker_settings.enabled:
+            moderation_workers.start()
+        
+        scheduler_settings = get_publication_scheduler_settings()
+        publication_scheduler = PublicationScheduler(
+            AsyncSessionLocal, publication_settings, scheduler_settings, feed_cache=app.state.feed_cache
+        )
+        resources.push_async_callback(publication_scheduler.stop)
+        if scheduler_settings.enabled:
+            publication_scheduler.start()
+        
+        try:
+            yield  # Здесь приложение работает
+        finally:
+            # Код, выполняемый при остановке приложения: ресурсы закрывает AsyncExitStack
+            logger.info("Shutting down ФАЛТ.конф API")
 
 
 def create_app() -> FastAPI:
@@ -41,11 +164,20 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
     )
     
     # Регистрируем роутеры
     app.include_router(confession_router, prefix="/api")
     app.include_router(poll_router, prefix="/api")
+    app.include_router(moderation_router, prefix="/api")
+    app.include_router(tag_router, prefix="/api")
+    
+    # Метрики процесса в формате Prometheus
+    @app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+    async def get_metrics() -> str:
+        """Выгрузка метрик процесса."""
+        return metrics.render()
     
     # Добавляем обработчик для проверки работоспособности
     @app.get("/health")
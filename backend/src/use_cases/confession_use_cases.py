@@ -2,40 +2,64 @@
 Use Cases для управления признаниями.
 """
 from datetime import datetime
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional, Sequence
 
 from loguru import logger
 
 from src.entities.confession import (
     Attachment,
     Confession,
+    DirectPublicationError,
+    ModerationJob,
     ModerationLog,
+    ModerationPendingError,
     Poll,
     PollOption,
-    PublishedRecord,
+    Publication,
+    StatusTransitionError,
     Tag,
 )
-from src.entities.enums import ConfessionStatus
-from src.interface_adapters.dto import ConfessionDTO, PollDTO
-from src.interface_adapters.gateway_protocols import (
-    ModerationGatewayProtocol,
-    TelegramGatewayProtocol,
+from src.entities.enums import ConfessionProjection, ConfessionStatus
+from src.interface_adapters.dto import (
+    ConfessionDetailDTO,
+    ConfessionDTO,
+    ConfessionListQueryDTO,
+    ConfessionPageDTO,
+    ConfessionQueryDTO,
+    ConfessionRevisionDTO,
+    ConfessionSearchHitDTO,
+    ConfessionSearchPageDTO,
+    ConfessionSearchQueryDTO,
+    ConfessionStatusUpdateDTO,
+    PollDTO,
+)
+from src.interface_adapters.gateway_protocols import ModerationGatewayProtocol
+from src.interface_adapters.pagination import PageCursor, SearchCursor
+from src.interface_adapters.repository_protocols import (
+    ConfessionRepositoryProtocol,
+    FeedCacheProtocol,
 )
-from src.interface_adapters.repository_protocols import ConfessionRepositoryProtocol
 from src.use_cases.base import AbstractUseCase
 
 
 class CreateConfessionUseCase(AbstractUseCase[ConfessionDTO, ConfessionDTO]):
     """Use Case для создания нового признания."""
     
-    def __init__(self, confession_repository: ConfessionRepositoryProtocol) -> None:
+    def __init__(
+        self,
+        confession_repository: ConfessionRepositoryProtocol,
+        enqueue_moderation: bool = False,
+    ) -> None:
         """
         Инициализация Use Case.
         
         Args:
             confession_repository: Репозиторий для работы с признаниями
+            enqueue_moderation: Ставить новое признание в очередь модерации
+                (в той же транзакции, что и само признание)
         """
         self._confession_repository = confession_repository
+        self._enqueue_moderation = enqueue_moderation
     
     async def execute(self, confession_dto: ConfessionDTO) -> ConfessionDTO:
         """
@@ -81,8 +105,9 @@ class CreateConfessionUseCase(AbstractUseCase[ConfessionDTO, ConfessionDTO]):
                 ],
             )
         
-        # Сохраняем в репозитории
-        saved_confession = await self._confession_repository.save(confession)
+        # Сохраняем в репозитории вместе с задачей фоновой модерации
+        moderation_job = ModerationJob() if self._enqueue_moderation else None
+        saved_confession = await self._confession_repository.save(confession, moderation_job=moderation_job)
         
         # Преобразуем обратно в DTO и возвращаем
         return ConfessionDTO.model_validate(saved_confession, from_attributes=True)
@@ -115,6 +140,9 @@ class ModerateConfessionUseCase(AbstractUseCase[ConfessionDTO, bool]):
             
         Returns:
             bool: True, если признание одобрено, False - если отклонено
+            
+        Raises:
+            ModerationPendingError: Если система модерации не вынесла решения
         """
         logger.info(f"Moderating confession ID {confession_dto.id}")
         
@@ -124,21 +152,23 @@ class ModerateConfessionUseCase(AbstractUseCase[ConfessionDTO, bool]):
             logger.error(f"Confession with ID {confession_dto.id} not found")
             return False
         
-        # Отправляем на модерацию
-        moderation_status = await self._moderation_gateway.moderate(confession)
+        # Отправляем на модерацию: статус и причина приходят одним результатом
+        moderation_result = await self._moderation_gateway.moderate(confession)
+        moderation_status = moderation_result.status
+        
+        # PENDING - не решение: журнал не пишем, задача модерации будет повторена
+        if moderation_status == ConfessionStatus.PENDING:
+            raise ModerationPendingError(confession.id)
         
-        # Получаем причину отклонения, если есть
-        moderation_reason = None
         if moderation_status == ConfessionStatus.REJECTED:
-            moderation_reason = await self._moderation_gateway.get_moderation_reason(confession)
-            logger.info(f"Confession ID {confession_dto.id} rejected: {moderation_reason}")
+            logger.info(f"Confession ID {confession_dto.id} rejected: {moderation_result.reason}")
         
         # Создаем запись о модерации
         moderation_log = ModerationLog(
             confession_id=confession.id,
             decision=moderation_status,
             moderator="LLM",  # В будущем можно передавать имя модератора
-            reason=moderation_reason,
+            reason=moderation_result.reason,
             timestamp=datetime.now(),
         )
         
@@ -146,40 +176,54 @@ class ModerateConfessionUseCase(AbstractUseCase[ConfessionDTO, bool]):
         confession.status = moderation_status
         confession.moderation_logs.append(moderation_log)
         
-        # Сохраняем изменения
-        await self._confession_repository.save(confession)
+        # Сохраняем изменения; пока шла модерация, статус мог сменить модератор или публикация
+        try:
+            await self._confession_repository.save(confession)
+        except StatusTransitionError as e:
+            logger.warning(f"Moderation decision for confession ID {confession.id} discarded: {str(e)}")
+            return False
         
         # Возвращаем результат модерации
         return moderation_status == ConfessionStatus.APPROVED
 
 
 class PublishConfessionUseCase(AbstractUseCase[ConfessionDTO, ConfessionDTO]):
-    """Use Case для публикации признания в Telegram."""
+    """
+    Use Case для публикации признания в Telegram.
+    
+    Сам Telegram здесь не вызывается: сообщение ставится в исходящую
+    очередь в одной транзакции со сменой статуса, а отправляет его
+    фоновый отправитель с учетом лимитов Telegram. После коммита
+    кэш публичной ленты сбрасывается.
+    """
     
     def __init__(
         self,
-        telegram_gateway: TelegramGatewayProtocol,
         confession_repository: ConfessionRepositoryProtocol,
+        channel_ids: Sequence[str] = ("@falt_conf",),
+        feed_cache: Optional[FeedCacheProtocol] = None,
     ) -> None:
         """
         Инициализация Use Case.
         
         Args:
-            telegram_gateway: Гейтвей для работы с Telegram
             confession_repository: Репозиторий для работы с признаниями
+            channel_ids: Каналы, в которые публикуется признание
+            feed_cache: Кэш публичной ленты
         """
-        self._telegram_gateway = telegram_gateway
         self._confession_repository = confession_repository
+        self._channel_ids = list(channel_ids)
+        self._feed_cache = feed_cache
     
     async def execute(self, confession_dto: ConfessionDTO) -> ConfessionDTO:
         """
-        Публикует признание в Telegram.
+        Ставит признание в очередь публикации.
         
         Args:
             confession_dto: DTO с данными признания
             
         Returns:
-            ConfessionDTO: DTO опубликованного признания
+            ConfessionDTO: DTO признания в статусе PUBLISHED
         """
         logger.info(f"Publishing confession ID {confession_dto.id}")
         
@@ -194,29 +238,231 @@ class PublishConfessionUseCase(AbstractUseCase[ConfessionDTO, ConfessionDTO]):
             logger.error(f"Cannot publish confession with status {confession.status}")
             raise ValueError(f"Cannot publish confession with status {confession.status}")
         
-        # Отправляем признание в Telegram
-        message_id = await self._telegram_gateway.send_confession(confession)
+        # Меняем статус и ставим сообщение в очередь одной транзакцией;
+        # запись о публикации заполнит отправитель после доставки
+        confession.status = ConfessionStatus.PUBLISHED
+        updated_confession = await self._confession_repository.save(
+            confession,
+            outbox=[
+                Publication(confession_id=confession.id, channel_id=channel_id) for channel_id in self._channel_ids
+            ],
+        )
+        if self._feed_cache is not None:
+            self._feed_cache.invalidate()
+        
+        # Преобразуем обратно в DTO и возвращаем
+        return ConfessionDTO.model_validate(updated_confession, from_attributes=True) 
+
+
+class ListConfessionsUseCase(AbstractUseCase[ConfessionListQueryDTO, ConfessionPageDTO]):
+    """Use Case для постраничного и потокового получения списка признаний."""
+    
+    def __init__(self, confession_repository: ConfessionRepositoryProtocol) -> None:
+        """
+        Инициализация Use Case.
         
-        # Если есть опрос, отправляем его
-        poll_message_id = None
-        if confession.poll:
-            poll_message_id = await self._telegram_gateway.send_poll(confession.poll)
-            confession.poll.poll_message_id = poll_message_id
+        Args:
+            confession_repository: Репозиторий для работы с признаниями
+        """
+        self._confession_repository = confession_repository
+    
+    async def execute(self, query: ConfessionListQueryDTO) -> ConfessionPageDTO:
+        """
+        Получает страницу признаний.
         
-        # Создаем запись о публикации
-        published_record = PublishedRecord(
-            confession_id=confession.id,
-            telegram_message_id=message_id,
-            channel_id="@falt_conf",  # В будущем можно передавать ID канала
-            published_at=datetime.now(),
+        Args:
+            query: DTO с фильтром по статусу, размером страницы и курсором
+            
+        Returns:
+            ConfessionPageDTO: Признания страницы и курсор следующей страницы
+            
+        Raises:
+            ValueError: Если курсор поврежден
+        """
+        cursor = PageCursor.decode(query.cursor) if query.cursor else None
+        
+        page = await self._confession_repository.list_page(query.status, query.limit, cursor, query.projection)
+        
+        return ConfessionPageDTO(
+            items=[ConfessionDTO.model_validate(confession, from_attributes=True) for confession in page.items],
+            next_cursor=page.next_cursor.encode() if page.next_cursor else None,
         )
+    
+    async def stream(
+        self,
+        status: Optional[ConfessionStatus],
+        projection: ConfessionProjection = ConfessionProjection.SUMMARY,
+    ) -> AsyncIterator[ConfessionDTO]:
+        """
+        Потоково отдает все признания со статусом, не загружая их в память целиком.
         
-        # Обновляем статус признания
-        confession.status = ConfessionStatus.PUBLISHED
-        confession.published_record = published_record
+        Args:
+            status: Статус признаний или None для всех
+            projection: Уровень детализации
+            
+        Yields:
+            ConfessionDTO: Очередное признание
+        """
+        async for confession in self._confession_repository.stream_by_status(status, projection):
+            yield ConfessionDTO.model_validate(confession, from_attributes=True)
+    
+    async def list_by_status(
+        self,
+        status: Optional[ConfessionStatus],
+        projection: ConfessionProjection = ConfessionProjection.SUMMARY,
+    ) -> List[ConfessionDTO]:
+        """
+        Получает все признания со статусом одним списком.
         
-        # Сохраняем изменения
-        updated_confession = await self._confession_repository.save(confession)
+        Args:
+            status: Статус признаний или None для всех
+            projection: Уровень детализации
+            
+        Returns:
+            List[ConfessionDTO]: Признания (новые сверху)
+        """
+        confessions = await self._confession_repository.list_by_status(status, projection)
+        return [ConfessionDTO.model_validate(confession, from_attributes=True) for confession in confessions]
+
+
+class SearchConfessionsUseCase(AbstractUseCase[ConfessionSearchQueryDTO, ConfessionSearchPageDTO]):
+    """Use Case для полнотекстового поиска признаний."""
+    
+    def __init__(self, confession_repository: ConfessionRepositoryProtocol) -> None:
+        """
+        Инициализация Use Case.
         
-        # Преобразуем обратно в DTO и возвращаем
-        return ConfessionDTO.model_validate(updated_confession, from_attributes=True) 
\ No newline at end of file
+        Args:
+            confession_repository: Репозиторий для работы с признаниями
+        """
+        self._confession_repository = confession_repository
+    
+    async def execute(self, query: ConfessionSearchQueryDTO) -> ConfessionSearchPageDTO:
+        """
+        Находит страницу признаний по тексту, самые релевантные сверху.
+        
+        Args:
+            query: DTO с поисковым запросом, фильтром по статусу, размером страницы и курсором
+            
+        Returns:
+            ConfessionSearchPageDTO: Найденные признания с фрагментами текста и курсор следующей страницы
+            
+        Raises:
+            ValueError: Если запрос пуст или курсор поврежден
+        """
+        text = query.query.strip()
+        if not text:
+            raise ValueError("Search query must not be empty")
+        cursor = SearchCursor.decode(query.cursor) if query.cursor else None
+        
+        page = await self._confession_repository.search(text, query.status, cursor, query.limit)
+        
+        return ConfessionSearchPageDTO(
+            items=[
+                ConfessionSearchHitDTO.model_validate(
+                    {
+                        **ConfessionDTO.model_validate(hit.confession, from_attributes=True).model_dump(),
+                        "rank": hit.rank,
+                        "snippet": hit.snippet,
+                    }
+                )
+                for hit in page.items
+            ],
+            next_cursor=page.next_cursor.encode() if page.next_cursor else None,
+        )
+
+
+class GetConfessionUseCase(AbstractUseCase[ConfessionQueryDTO, Optional[ConfessionDTO]]):
+    """
+    Use Case для получения признания по ID.
+    
+    Из хранилища читается только то, что нужно выбранному уровню
+    детализации: читателю - без журнала модерации и комментариев,
+    админке (FULL) - агрегат целиком.
+    """
+    
+    def __init__(self, confession_repository: ConfessionRepositoryProtocol) -> None:
+        """
+        Инициализация Use Case.
+        
+        Args:
+            confession_repository: Репозиторий для работы с признаниями
+        """
+        self._confession_repository = confession_repository
+    
+    async def execute(self, query: ConfessionQueryDTO) -> Optional[ConfessionDTO]:
+        """
+        Получает признание.
+        
+        Args:
+            query: ID признания и уровень детализации
+            
+        Returns:
+            Optional[ConfessionDTO]: DTO признания (для FULL - ConfessionDetailDTO) или None, если не найдено
+        """
+        confession = await self._confession_repository.get_by_id(query.id, query.projection)
+        if not confession:
+            return None
+        
+        dto_class = ConfessionDetailDTO if query.projection == ConfessionProjection.FULL else ConfessionDTO
+        return dto_class.model_validate(confession, from_attributes=True)
+    
+    async def get_revision(self, confession_id: int) -> Optional[ConfessionRevisionDTO]:
+        """
+        Получает версию признания без загрузки агрегата.
+        
+        По ней проверяется, изменилось ли признание с копии клиента
+        (If-None-Match / If-Modified-Since).
+        
+        Args:
+            confession_id: ID признания
+            
+        Returns:
+            Optional[ConfessionRevisionDTO]: Версия признания или None, если не найдено
+        """
+        revision = await self._confession_repository.get_revision(confession_id)
+        return ConfessionRevisionDTO.model_validate(revision, from_attributes=True) if revision else None
+
+
+class UpdateConfessionStatusUseCase(AbstractUseCase[ConfessionStatusUpdateDTO, Optional[ConfessionDTO]]):
+    """
+    Use Case для ручной смены статуса признания.
+    
+    Опубликовать признание сменой статуса нельзя: без записей в исходящей
+    очереди сообщение так и не ушло бы в Telegram. Публикация идет только
+    через PublishConfessionUseCase.
+    """
+    
+    def __init__(self, confession_repository: ConfessionRepositoryProtocol) -> None:
+        """
+        Инициализация Use Case.
+        
+        Args:
+            confession_repository: Репозиторий для работы с признаниями
+        """
+        self._confession_repository = confession_repository
+    
+    async def execute(self, update: ConfessionStatusUpdateDTO) -> Optional[ConfessionDTO]:
+        """
+        Меняет статус признания.
+        
+        Args:
+            update: ID признания и новый статус
+            
+        Returns:
+            Optional[ConfessionDTO]: Признание с новым статусом или None, если не найдено
+            
+        Raises:
+            StatusTransitionError: Переход запрещен или статус уже изменен
+            DirectPublicationError: Если запрошен статус PUBLISHED
+        """
+        logger.info(f"Updating status of confession ID {update.id} to {update.status}")
+        
+        if update.status == ConfessionStatus.PUBLISHED:
+            raise DirectPublicationError(update.id)
+        
+        if not await self._confession_repository.update_status(update.id, update.status, update.expected_status):
+            return None
+        
+        confession = await self._confession_repository.get_by_id(update.id, ConfessionProjection.PUBLIC)
+        return ConfessionDTO.model_validate(confession, from_attributes=True) if confession else None
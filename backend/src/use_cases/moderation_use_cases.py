@@ -0,0 +1,278 @@
+"""
+Use Cases для фоновой модерации признаний.
+"""
+import asyncio
+from datetime import datetime, timedelta
+from typing import Optional
+
+from loguru import logger
+
+from src.entities.confession import (
+    Confession,
+    ModerationJob,
+    ModerationLog,
+    ModerationResult,
+    StatusTransitionError,
+)
+from src.entities.enums import ConfessionProjection, ConfessionStatus
+from src.interface_adapters.dto import BatchModerationResultDTO, ConfessionDTO, ModerationJobDTO
+from src.interface_adapters.gateway_protocols import ModerationGatewayProtocol
+from src.interface_adapters.pagination import PageCursor
+from src.interface_adapters.repository_protocols import (
+    ConfessionRepositoryProtocol,
+    ModerationJobRepositoryProtocol,
+)
+from src.use_cases.base import AbstractUseCase
+from src.use_cases.confession_use_cases import ModerateConfessionUseCase
+
+
+class RequestModerationUseCase(AbstractUseCase[ConfessionDTO, Optional[ModerationJobDTO]]):
+    """Use Case для постановки признания в очередь модерации."""
+    
+    def __init__(
+        self,
+        confession_repository: ConfessionRepositoryProtocol,
+        moderation_job_repository: ModerationJobRepositoryProtocol,
+    ) -> None:
+        """
+        Инициализация Use Case.
+        
+        Args:
+            confession_repository: Репозиторий для работы с признаниями
+            moderation_job_repository: Очередь задач модерации
+        """
+        self._confession_repository = confession_repository
+        self._moderation_job_repository = moderation_job_repository
+    
+    async def execute(self, confession_dto: ConfessionDTO) -> Optional[ModerationJobDTO]:
+        """
+        Ставит признание в очередь модерации.
+        
+        Args:
+            confession_dto: DTO с ID признания
+            
+        Returns:
+            Optional[ModerationJobDTO]: Задача модерации или None, если признание не найдено
+        """
+        logger.info(f"Queueing moderation for confession ID {confession_dto.id}")
+        
+        confession = await self._confession_repository.get_by_id(confession_dto.id)
+        if not confession:
+            logger.error(f"Confession with ID {confession_dto.id} not found")
+            return None
+        
+        job = await self._moderation_job_repository.enqueue(confession.id)
+        return ModerationJobDTO.model_validate(job, from_attributes=True)
+
+
+class GetModerationJobUseCase(AbstractUseCase[int, Optional[ModerationJobDTO]]):
+    """Use Case для получения состояния задачи модерации."""
+    
+    def __init__(self, moderation_job_repository: ModerationJobRepositoryProtocol) -> None:
+        """
+        Инициализация Use Case.
+        
+        Args:
+            moderation_job_repository: Очередь задач модерации
+        """
+        self._moderation_job_repository = moderation_job_repository
+    
+    async def execute(self, job_id: int) -> Optional[ModerationJobDTO]:
+        """
+        Получает задачу модерации по ID.
+        
+        Args:
+            job_id: ID задачи
+            
+        Returns:
+            Optional[ModerationJobDTO]: Задача или None, если не найдена
+        """
+        job = await self._moderation_job_repository.get_by_id(job_id)
+        if not job:
+            return None
+        return ModerationJobDTO.model_validate(job, from_attributes=True)
+
+
+class ProcessModerationJobUseCase(AbstractUseCase[None, bool]):
+    """Use Case для обработки одной задачи из очереди модерации."""
+    
+    def __init__(
+        self,
+        moderation_job_repository: ModerationJobRepositoryProtocol,
+        moderate_confession_use_case: ModerateConfessionUseCase,
+        max_attempts: int = 5,
+        retry_delay: float = 30.0,
+        lease_seconds: float = 300.0,
+    ) -> None:
+        """
+        Инициализация Use Case.
+        
+        Args:
+            moderation_job_repository: Очередь задач модерации
+            moderate_confession_use_case: Use Case самой модерации
+            max_attempts: Максимум попыток на задачу
+            retry_delay: Задержка перед первой повторной попыткой, секунды (дальше удваивается)
+            lease_seconds: Сколько секунд задача считается занятой воркером
+        """
+        self._moderation_job_repository = moderation_job_repository
+        self._moderate_confession_use_case = moderate_confession_use_case
+        self._max_attempts = max_attempts
+        self._retry_delay = retry_delay
+        self._lease_seconds = lease_seconds
+    
+    async def execute(self, input_dto: None = None) -> bool:
+        """
+        Забирает из очереди одну задачу и проводит модерацию.
+        
+        Returns:
+            bool: True, если задача была обработана, False - если очередь пуста
+        """
+        job = await self._moderation_job_repository.claim(self._lease_seconds)
+        if not job:
+            return False
+        
+        logger.info(f"Processing moderation job {job.id} for confession ID {job.confession_id}")
+        
+        try:
+            await self._moderate_confession_use_case.execute(ConfessionDTO(id=job.confession_id, content=""))
+        except Exception as e:
+            owned = await self._handle_failure(job, e)
+        else:
+            owned = await self._moderation_job_repository.complete(job)
+        
+        if not owned:
+            logger.warning(f"Moderation job {job.id} lease expired and was taken by another worker, result dropped")
+        
+        return True
+    
+    async def _handle_failure(self, job: ModerationJob, error: Exception) -> bool:
+        """Возвращает задачу в очередь с экспоненциальной задержкой или отмечает ее проваленной."""
+        if job.attempts >= self._max_attempts:
+            logger.error(f"Moderation job {job.id} failed after {job.attempts} attempts: {error}")
+            return await self._moderation_job_repository.fail(job, str(error))
+        
+        delay = self._retry_delay * 2 ** (job.attempts - 1)
+        logger.warning(f"Moderation job {job.id} attempt {job.attempts} failed, retrying in {delay}s: {error}")
+        return await self._moderation_job_repository.retry(job, str(error), datetime.now() + timedelta(seconds=delay))
+
+
+class BatchModerateConfessionsUseCase(AbstractUseCase[None, BatchModerationResultDTO]):
+    """Use Case для пакетной модерации всех признаний, ожидающих проверки."""
+    
+    def __init__(
+        self,
+        moderation_gateway: ModerationGatewayProtocol,
+        confession_repository: ConfessionRepositoryProtocol,
+        batch_size: int = 32,
+        concurrency: int = 4,
+    ) -> None:
+        """
+        Инициализация Use Case.
+        
+        Args:
+            moderation_gateway: Гейтвей для работы с системой модерации
+            confession_repository: Репозиторий для работы с признаниями
+            batch_size: Количество признаний в одном вызове системы модерации
+            concurrency: Количество одновременных вызовов системы модерации
+        """
+        self._moderation_gateway = moderation_gateway
+        self._confession_repository = confession_repository
+        self._batch_size = batch_size
+        self._concurrency = concurrency
+    
+    async def execute(self, input_dto: None = None) -> BatchModerationResultDTO:
+        """
+        Модерирует все признания в статусе PENDING пачками.
+        
+        За один проход из БД читается concurrency * batch_size признаний,
+        пачки отправляются в систему модерации параллельно, затем решения
+        сохраняются. Признания, которые система модерации не смогла
+        проверить, остаются PENDING и в этом запуске повторно не берутся.
+        
+        Решение записывается как compare-and-set относительно PENDING:
+        если модератор успел сменить статус, пока шла модерация, решение
+        LLM отбрасывается и не перезатирает ручное.
+        
+        Returns:
+            BatchModerationResultDTO: Итоги модерации
+        """
+        summary = BatchModerationResultDTO()
+        cursor: Optional[PageCursor] = None
+        
+        while True:
+            # Для модерации нужен только текст: агрегат целиком не читается
+            page = await self._confession_repository.list_page(
+                ConfessionStatus.PENDING,
+                self._batch_size * self._concurrency,
+                cursor,
+                ConfessionProjection.SUMMARY,
+            )
+            if not page.items:
+                break
+            
+            batches = [
+                page.items[start:start + self._batch_size]
+                for start in range(0, len(page.items), self._batch_size)
+            ]
+            logger.info(f"Moderating {len(page.items)} pending confessions in {len(batches)} batches")
+            
+            results = await asyncio.gather(*(self._moderation_gateway.moderate_many(batch) for batch in batches))
+            
+            for batch, batch_results in zip(batches, results):
+                for confession, result in zip(batch, batch_results):
+                    if await self._apply_decision(confession, result):
+                        self._count(summary, result.status)
+            
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+        
+        logger.info(
+            f"Batch moderation finished: {summary.approved} approved, "
+            f"{summary.rejected} rejected, {summary.pending} left pending"
+        )
+        return summary
+    
+    async def _apply_decision(self, confession: Confession, result: ModerationResult) -> bool:
+        """
+        Сохраняет решение модерации вместе с записью в журнале.
+        
+        Returns:
+            bool: False, если статус признания за время модерации сменили и решение отброшено
+        """
+        if result.status == ConfessionStatus.PENDING:
+            # Система модерации не ответила - решения нет, сохранять нечего
+            return True
+        
+        log = ModerationLog(
+            confession_id=confession.id,
+            decision=result.status,
+            moderator="LLM",
+            reason=result.reason,
+            timestamp=datetime.now(),
+        )
+        try:
+            updated = await self._confession_repository.update_status(
+                confession.id, result.status, ConfessionStatus.PENDING, log
+            )
+        except StatusTransitionError as e:
+            logger.warning(f"Moderation decision for confession ID {confession.id} discarded: {str(e)}")
+            return False
+        if not updated:
+            logger.warning(f"Confession ID {confession.id} was deleted during moderation")
+            return False
+        
+        confession.status = result.status
+        confession.moderation_logs.append(log)
+        return True
+    
+    @staticmethod
+    def _count(summary: BatchModerationResultDTO, status: ConfessionStatus) -> None:
+        """Учитывает решение в итогах."""
+        summary.processed += 1
+        if status == ConfessionStatus.APPROVED:
+            summary.approved += 1
+        elif status == ConfessionStatus.REJECTED:
+            summary.rejected += 1
+        else:
+            summary.pending += 1
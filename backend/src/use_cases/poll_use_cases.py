@@ -0,0 +1,127 @@
+"""
+Use Cases для голосования в опросах.
+"""
+from typing import Optional
+
+from loguru import logger
+
+from src.entities.confession import Poll
+from src.interface_adapters.dto import PollDTO, VoteDTO
+from src.interface_adapters.repository_protocols import (
+    PollRepositoryProtocol,
+    PollResultsCacheProtocol,
+    PollUpdatesProtocol,
+    VoteBufferProtocol,
+)
+from src.use_cases.base import AbstractUseCase
+
+
+class VoteInPollUseCase(AbstractUseCase[VoteDTO, Optional[PollDTO]]):
+    """
+    Use Case для голосования в опросе.
+    
+    Голос записывается атомарным приращением счетчика. С буфером голоса
+    сначала копятся в памяти и записываются одной пачкой раз в несколько
+    миллисекунд: популярный опрос получает один UPDATE на вариант
+    вместо UPDATE на каждый голос. После голоса закэшированные
+    результаты опроса сбрасываются, а наблюдатели получают обновление.
+    """
+    
+    def __init__(
+        self,
+        poll_repository: PollRepositoryProtocol,
+        vote_buffer: Optional[VoteBufferProtocol] = None,
+        results_cache: Optional[PollResultsCacheProtocol] = None,
+        poll_updates: Optional[PollUpdatesProtocol] = None,
+    ) -> None:
+        """
+        Инициализация Use Case.
+        
+        Args:
+            poll_repository: Репозиторий для работы с опросами
+            vote_buffer: Буфер голосов (None - каждый голос записывается сразу)
+            results_cache: Кэш результатов опросов
+            poll_updates: Рассылка обновлений наблюдателям результатов
+        """
+        self._poll_repository = poll_repository
+        self._vote_buffer = vote_buffer
+        self._results_cache = results_cache
+        self._poll_updates = poll_updates
+    
+    async def execute(self, vote_dto: VoteDTO) -> Optional[PollDTO]:
+        """
+        Засчитывает голос.
+        
+        Args:
+            vote_dto: DTO голоса
+            
+        Returns:
+            Optional[PollDTO]: Опрос с учетом голоса или None, если опрос не найден
+            
+        Raises:
+            ValueError: Если вариант не принадлежит опросу
+        """
+        poll = await self._poll_repository.get_by_id(vote_dto.poll_id)
+        if not poll:
+            return None
+        
+        option = next((option for option in poll.options if option.id == vote_dto.option_id), None)
+        if option is None:
+            logger.error(f"Option {vote_dto.option_id} does not belong to poll {vote_dto.poll_id}")
+            raise ValueError("Invalid option id")
+        
+        if self._vote_buffer is not None:
+            await self._vote_buffer.add(option.id)
+        else:
+            await self._poll_repository.add_votes({option.id: 1})
+            option.vote_count += 1
+        
+        if self._results_cache is not None:
+            self._results_cache.invalidate(poll.id)
+        if self._poll_updates is not None:
+            self._poll_updates.publish(poll.id)
+        
+        return _to_dto(poll, self._vote_buffer)
+
+
+class GetPollResultsUseCase(AbstractUseCase[int, Optional[PollDTO]]):
+    """Use Case для получения результатов опроса."""
+    
+    def __init__(
+        self,
+        poll_repository: PollRepositoryProtocol,
+        vote_buffer: Optional[VoteBufferProtocol] = None,
+    ) -> None:
+        """
+        Инициализация Use Case.
+        
+        Args:
+            poll_repository: Репозиторий для работы с опросами
+            vote_buffer: Буфер голосов, еще не записанных в хранилище
+        """
+        self._poll_repository = poll_repository
+        self._vote_buffer = vote_buffer
+    
+    async def execute(self, poll_id: int) -> Optional[PollDTO]:
+        """
+        Получает опрос с текущими результатами.
+        
+        Args:
+            poll_id: ID опроса
+            
+        Returns:
+            Optional[PollDTO]: Опрос или None, если не найден
+        """
+        poll = await self._poll_repository.get_by_id(poll_id)
+        if not poll:
+            return None
+        return _to_dto(poll, self._vote_buffer)
+
+
+def _to_dto(poll: Poll, vote_buffer: Optional[VoteBufferProtocol]) -> PollDTO:
+    """Преобразует опрос в DTO, добавляя к счетчикам голоса, еще не записанные из буфера."""
+    if vote_buffer is not None:
+        pending = vote_buffer.pending([option.id for option in poll.options])
+        for option in poll.options:
+            option.vote_count += pending.get(option.id, 0)
+    return PollDTO.model_validate(poll, from_attributes=True)
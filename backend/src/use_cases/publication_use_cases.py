@@ -0,0 +1,249 @@
+"""
+Use Cases для отправки исходящей очереди публикаций в Telegram.
+"""
+import math
+from datetime import datetime, time, timedelta
+from typing import Callable, List, Optional, Sequence
+
+from loguru import logger
+
+from src.entities.confession import Publication, PublishedRecord
+from src.entities.enums import ConfessionProjection, ConfessionStatus
+from src.interface_adapters.dto import PublicationScheduleDTO
+from src.interface_adapters.gateway_protocols import (
+    PublicationRateLimitedError,
+    PublicationTemporaryError,
+    TelegramGatewayProtocol,
+)
+from src.interface_adapters.repository_protocols import (
+    ConfessionRepositoryProtocol,
+    FeedCacheProtocol,
+    PublicationRepositoryProtocol,
+)
+from src.use_cases.base import AbstractUseCase
+
+
+class DeliverPublicationUseCase(AbstractUseCase[None, bool]):
+    """
+    Use Case для отправки одного сообщения из исходящей очереди.
+    
+    Отправленные части (признание, вложения, опрос) запоминаются сразу после
+    отправки, поэтому повторная попытка досылает только недостающее.
+    Ошибка, после которой неизвестно, дошло ли сообщение (обрыв сети),
+    не повторяется: лучше не опубликовать, чем опубликовать дважды.
+    """
+    
+    def __init__(
+        self,
+        publication_repository: PublicationRepositoryProtocol,
+        confession_repository: ConfessionRepositoryProtocol,
+        telegram_gateway: TelegramGatewayProtocol,
+        max_attempts: int = 5,
+        retry_delay: float = 5.0,
+        lease_seconds: float = 120.0,
+    ) -> None:
+        """
+        Инициализация Use Case.
+        
+        Args:
+            publication_repository: Исходящая очередь публикаций
+            confession_repository: Репозиторий для работы с признаниями
+            telegram_gateway: Гейтвей для работы с Telegram
+            max_attempts: Максимум попыток при временных ошибках Telegram
+            retry_delay: Задержка перед первой повторной попыткой, секунды (дальше удваивается)
+            lease_seconds: Сколько секунд сообщение считается занятым отправителем
+        """
+        self._publication_repository = publication_repository
+        self._confession_repository = confession_repository
+        self._telegram_gateway = telegram_gateway
+        self._max_attempts = max_attempts
+        self._retry_delay = retry_delay
+        self._lease_seconds = lease_seconds
+    
+    async def execute(self, input_dto: None = None) -> bool:
+        """
+        Забирает из очереди одно сообщение и отправляет его.
+        
+        Returns:
+            bool: True, если сообщение было обработано, False - если очередь пуста
+        """
+        publication = await self._publication_repository.claim(self._lease_seconds)
+        if not publication:
+            return False
+        
+        logger.info(
+            f"Sending publication {publication.id} of confession ID {publication.confession_id} "
+            f"to {publication.channel_id}"
+        )
+        
+        try:
+            await self._deliver(publication)
+        except PublicationRateLimitedError as e:
+            # Лимит Telegram - не ошибка сообщения, попытка не считается проваленной
+            logger.warning(f"Publication {publication.id} rate limited, retrying in {e.retry_after}s")
+            await self._publication_repository.retry(
+                publication.id, str(e), datetime.now() + timedelta(seconds=e.retry_after)
+            )
+        except PublicationTemporaryError as e:
+            await self._handle_temporary_failure(publication, e)
+        except Exception as e:
+            logger.error(f"Publication {publication.id} failed: {str(e)}")
+            await self._publication_repository.fail(publication.id, str(e))
+        else:
+            await self._publication_repository.complete(publication.id)
+        
+        return True
+    
+    async def _deliver(self, publication: Publication) -> None:
+        """Отправляет недостающие части сообщения и фиксирует публикацию у признания."""
+        confession = await self._confession_repository.get_by_id(
+            publication.confession_id, ConfessionProjection.PUBLIC
+        )
+        if not confession:
+            raise ValueError(f"Confession with ID {publication.confession_id} not found")
+        
+        if publication.telegram_message_id is None:
+            publication.telegram_message_id = await self._telegram_gateway.send_confession(
+                confession, publication.channel_id
+            )
+            await self._publication_repository.record_progress(
+                publication.id, telegram_message_id=publication.telegram_message_id
+            )
+        
+        sent_media = publication.media_message_ids or []
+        if len(sent_media) < len(confession.attachments):
+            async def record_album(message_ids: List[str]) -> None:
+                # Прогресс сохраняется после каждого альбома, повтор не продублирует уже отправленные
+                publication.media_message_ids = message_ids
+                await self._publication_repository.record_progress(publication.id, media_message_ids=message_ids)
+            
+            await self._telegram_gateway.send_attachments(
+                confession, publication.channel_id, sent_media, record_album
+            )
+        
+        if confession.poll and publication.poll_message_id is None:
+            publication.poll_message_id = await self._telegram_gateway.send_poll(
+                confession.poll, publication.channel_id
+            )
+            await self._publication_repository.record_progress(
+                publication.id, poll_message_id=publication.poll_message_id
+            )
+        
+        # Признание уходит в несколько каналов, а запись о публикации одна: ее фиксирует первый доставленный
+        await self._confession_repository.record_publication(
+            PublishedRecord(
+                confession_id=confession.id,
+                telegram_message_id=publication.telegram_message_id,
+                channel_id=publication.channel_id,
+                published_at=datetime.now(),
+            ),
+            publication.poll_message_id,
+        )
+    
+    async def _handle_temporary_failure(self, publication: Publication, error: Exception) -> None:
+        """Возвращает сообщение в очередь с экспоненциальной задержкой или отмечает его проваленным."""
+        if publication.attempts >= self._max_attempts:
+            logger.error(f"Publication {publication.id} failed after {publication.attempts} attempts: {error}")
+            await self._publication_repository.fail(publication.id, str(error))
+            return
+        
+        delay = self._retry_delay * 2 ** (publication.attempts - 1)
+        logger.warning(
+            f"Publication {publication.id} attempt {publication.attempts} failed, retrying in {delay}s: {error}"
+        )
+        await self._publication_repository.retry(
+            publication.id, str(error), datetime.now() + timedelta(seconds=delay)
+        )
+
+
+class SchedulePublicationsUseCase(AbstractUseCase[None, PublicationScheduleDTO]):
+    """
+    Use Case для плановой публикации одобренных признаний.
+    
+    За один запуск в очередь ставится не больше признаний, чем отправитель
+    успеет доставить до следующего запуска с учетом лимита Telegram
+    и уже стоящих в очереди сообщений, поэтому очередь не растет
+    без ограничений, а признания не ждут в ней часами.
+    """
+    
+    def __init__(
+        self,
+        confession_repository: ConfessionRepositoryProtocol,
+        publication_repository: PublicationRepositoryProtocol,
+        channel_ids: Sequence[str],
+        channel_capacity: float,
+        batch_size: int = 10,
+        window_start: Optional[time] = None,
+        window_end: Optional[time] = None,
+        clock: Callable[[], datetime] = datetime.now,
+        feed_cache: Optional[FeedCacheProtocol] = None,
+    ) -> None:
+        """
+        Инициализация Use Case.
+        
+        Args:
+            confession_repository: Репозиторий для работы с признаниями
+            publication_repository: Исходящая очередь публикаций
+            channel_ids: Каналы, в которые публикуется каждое признание
+            channel_capacity: Сколько сообщений отправитель успевает доставить в канал до следующего запуска
+            batch_size: Максимум признаний за один запуск
+            window_start: Начало окна публикации (None - без ограничения)
+            window_end: Конец окна публикации; окно может переходить через полночь
+            clock: Источник текущего времени
+            feed_cache: Кэш публичной ленты (сбрасывается, если признания опубликованы)
+        """
+        self._confession_repository = confession_repository
+        self._publication_repository = publication_repository
+        self._channel_ids = list(channel_ids)
+        self._channel_capacity = channel_capacity
+        self._batch_size = batch_size
+        self._window_start = window_start
+        self._window_end = window_end
+        self._clock = clock
+        self._feed_cache = feed_cache
+    
+    async def execute(self, input_dto: None = None) -> PublicationScheduleDTO:
+        """
+        Ставит в очередь очередную порцию одобренных признаний.
+        
+        Returns:
+            PublicationScheduleDTO: Итоги запуска и состояние очередей
+        """
+        in_window = self._in_window(self._clock().time())
+        stats = await self._publication_repository.queue_stats()
+        
+        enqueued = 0
+        limit = self._limit(stats.depth)
+        if in_window and limit > 0:
+            confession_ids = await self._confession_repository.publish_approved(limit, self._channel_ids)
+            enqueued = len(confession_ids)
+            if enqueued:
+                logger.info(f"Scheduled {enqueued} confessions for publication to {', '.join(self._channel_ids)}")
+                if self._feed_cache is not None:
+                    self._feed_cache.invalidate()
+                stats = await self._publication_repository.queue_stats()
+        
+        return PublicationScheduleDTO(
+            in_window=in_window,
+            enqueued=enqueued,
+            approved_backlog=await self._confession_repository.count_by_status(ConfessionStatus.APPROVED),
+            queue_depth=stats.depth,
+            oldest_queued_at=stats.oldest_available_at,
+        )
+    
+    def _limit(self, queue_depth: int) -> int:
+        """Считает, сколько признаний можно поставить в очередь, не превышая пропускной способности каналов."""
+        if not self._channel_ids:
+            return 0
+        
+        # Каждое признание - одно сообщение в каждый канал
+        backlog_per_channel = queue_depth / len(self._channel_ids)
+        return max(0, min(self._batch_size, math.floor(self._channel_capacity - backlog_per_channel)))
+    
+    def _in_window(self, now: time) -> bool:
+        """Проверяет, попадает ли время в окно публикации."""
+        if self._window_start is None or self._window_end is None:
+            return True
+        if self._window_start <= self._window_end:
+            return self._window_start <= now < self._window_end
+        return now >= self._window_start or now < self._window_end
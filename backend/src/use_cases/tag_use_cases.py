@@ -0,0 +1,70 @@
+"""
+Use Cases для тегов: популярные теги и лента по тегу.
+"""
+from typing import List
+
+from src.interface_adapters.dto import ConfessionDTO, ConfessionPageDTO, TagConfessionsQueryDTO, TagCountDTO
+from src.interface_adapters.pagination import PageCursor
+from src.interface_adapters.repository_protocols import ConfessionRepositoryProtocol, TagRepositoryProtocol
+from src.use_cases.base import AbstractUseCase
+
+
+class ListPopularTagsUseCase(AbstractUseCase[int, List[TagCountDTO]]):
+    """Use Case для получения самых популярных тегов."""
+    
+    def __init__(self, tag_repository: TagRepositoryProtocol) -> None:
+        """
+        Инициализация Use Case.
+        
+        Args:
+            tag_repository: Репозиторий для работы с тегами
+        """
+        self._tag_repository = tag_repository
+    
+    async def execute(self, limit: int) -> List[TagCountDTO]:
+        """
+        Получает теги с наибольшим числом опубликованных признаний.
+        
+        Args:
+            limit: Максимальное количество тегов
+            
+        Returns:
+            List[TagCountDTO]: Теги с количеством признаний, самые популярные сверху
+        """
+        tag_counts = await self._tag_repository.list_popular(limit)
+        return [TagCountDTO(name=tag_count.tag.name, count=tag_count.count) for tag_count in tag_counts]
+
+
+class ListTagConfessionsUseCase(AbstractUseCase[TagConfessionsQueryDTO, ConfessionPageDTO]):
+    """Use Case для постраничного получения опубликованных признаний с тегом."""
+    
+    def __init__(self, confession_repository: ConfessionRepositoryProtocol) -> None:
+        """
+        Инициализация Use Case.
+        
+        Args:
+            confession_repository: Репозиторий для работы с признаниями
+        """
+        self._confession_repository = confession_repository
+    
+    async def execute(self, query: TagConfessionsQueryDTO) -> ConfessionPageDTO:
+        """
+        Получает страницу опубликованных признаний с тегом (новые сверху).
+        
+        Args:
+            query: DTO с именем тега, размером страницы и курсором
+            
+        Returns:
+            ConfessionPageDTO: Признания страницы и курсор следующей страницы
+            
+        Raises:
+            ValueError: Если курсор поврежден
+        """
+        cursor = PageCursor.decode(query.cursor) if query.cursor else None
+        
+        page = await self._confession_repository.list_page_by_tag(query.name, query.limit, cursor)
+        
+        return ConfessionPageDTO(
+            items=[ConfessionDTO.model_validate(confession, from_attributes=True) for confession in page.items],
+            next_cursor=page.next_cursor.encode() if page.next_cursor else None,
+        )
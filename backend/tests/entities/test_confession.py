@@ -108,4 +108,30 @@ def test_confession_with_poll():
     assert confession.poll.question == "Тестовый вопрос"
     assert len(confession.poll.options) == 3
     assert confession.poll.options[0].text == "Вариант 1"
-    assert confession.poll.allows_multiple_answers is True 
\ No newline at end of file
+    assert confession.poll.allows_multiple_answers is True 
+
+@pytest.mark.parametrize(
+    "source, target, allowed",
+    [
+        (ConfessionStatus.PENDING, ConfessionStatus.APPROVED, True),
+        (ConfessionStatus.PENDING, ConfessionStatus.PUBLISHED, False),
+        (ConfessionStatus.APPROVED, ConfessionStatus.PUBLISHED, True),
+        (ConfessionStatus.REJECTED, ConfessionStatus.APPROVED, True),
+        (ConfessionStatus.PUBLISHED, ConfessionStatus.REJECTED, False),
+        (ConfessionStatus.APPROVED, ConfessionStatus.APPROVED, False),
+    ],
+)
+def test_confession_status_transitions(source, target, allowed):
+    """Тест разрешенных переходов статусов признания."""
+    # Act & Assert
+    assert source.can_transition_to(target) is allowed
+
+
+def test_confession_status_sources_of():
+    """Тест: статусы, из которых можно перейти в указанный."""
+    # Act & Assert
+    assert ConfessionStatus.sources_of(ConfessionStatus.PUBLISHED) == {ConfessionStatus.APPROVED}
+    assert ConfessionStatus.sources_of(ConfessionStatus.PENDING) == {
+        ConfessionStatus.APPROVED,
+        ConfessionStatus.REJECTED,
+    }
@@ -0,0 +1,35 @@
+"""
+Тесты для сущности ModerationResult.
+"""
+
+from src.entities.confession import ModerationResult
+from src.entities.enums import ConfessionStatus
+
+
+def test_moderation_result_defaults():
+    """Тест: результат по умолчанию означает отсутствие решения."""
+    # Arrange & Act
+    result = ModerationResult()
+    
+    # Assert
+    assert result.status == ConfessionStatus.PENDING
+    assert result.reason is None
+    assert result.category_scores == {}
+    assert result.latency == 0.0
+
+
+def test_moderation_result_rejected():
+    """Тест создания результата с отклонением."""
+    # Arrange & Act
+    result = ModerationResult(
+        status=ConfessionStatus.REJECTED,
+        reason="Content flagged for: hate",
+        category_scores={"hate": 0.97},
+        latency=0.25,
+    )
+    
+    # Assert
+    assert result.status == ConfessionStatus.REJECTED
+    assert result.reason == "Content flagged for: hate"
+    assert result.category_scores["hate"] == 0.97
+    assert result.latency == 0.25
@@ -0,0 +1,79 @@
+"""
+Тесты для настроек приложения.
+"""
+import pytest
+from unittest.mock import patch
+import os
+
+from src.frameworks_and_drivers.config.settings import DatabaseSettings, PublicationSettings
+
+
+class TestDatabaseSettings:
+    """Тесты для DatabaseSettings."""
+    
+    @patch.dict(os.environ, {}, clear=True)
+    def test_defaults(self):
+        """Тест значений по умолчанию."""
+        # Act
+        settings = DatabaseSettings()
+        
+        # Assert
+        assert settings.url.startswith("postgresql+asyncpg://")
+        assert settings.pool_size == 5
+        assert settings.pool_pre_ping is True
+    
+    @patch.dict(
+        os.environ,
+        {
+            "POSTGRES_URI": "postgresql+asyncpg://user:pass@db:5432/test",
+            "DB_POOL_SIZE": "20",
+            "DB_MAX_OVERFLOW": "0",
+            "DB_POOL_PRE_PING": "false",
+            "DB_STATEMENT_CACHE_SIZE": "0",
+        },
+        clear=True,
+    )
+    def test_from_environment(self):
+        """Тест чтения настроек пула из окружения."""
+        # Act
+        settings = DatabaseSettings()
+        
+        # Assert
+        assert settings.url == "postgresql+asyncpg://user:pass@db:5432/test"
+        assert settings.pool_size == 20
+        assert settings.max_overflow == 0
+        assert settings.pool_pre_ping is False
+        assert settings.statement_cache_size == 0
+    
+    @patch.dict(os.environ, {"DB_POOL_SIZE": "0"}, clear=True)
+    def test_invalid_pool_size(self):
+        """Тест ошибки при недопустимом размере пула."""
+        # Act & Assert
+        with pytest.raises(ValueError):
+            DatabaseSettings()
+
+
+class TestPublicationSettings:
+    """Тесты для PublicationSettings."""
+    
+    @patch.dict(
+        os.environ,
+        {"TELEGRAM_CHANNEL_ID": "@falt_conf", "PUBLICATION_EXTRA_CHANNEL_IDS": "@falt_conf_en, @falt_conf,"},
+        clear=True,
+    )
+    def test_channel_ids(self):
+        """Тест: дополнительные каналы читаются через запятую и не дублируют основной."""
+        # Act
+        settings = PublicationSettings()
+        
+        # Assert
+        assert settings.channel_ids == ["@falt_conf", "@falt_conf_en"]
+    
+    @patch.dict(os.environ, {"TELEGRAM_CHANNEL_ID": ""}, clear=True)
+    def test_empty_channel_uses_default(self):
+        """Тест: пустой TELEGRAM_CHANNEL_ID (как в env.example) не затирает канал по умолчанию."""
+        # Act
+        settings = PublicationSettings()
+        
+        # Assert
+        assert settings.channel_ids == ["@falt_conf"]
@@ -0,0 +1,118 @@
+"""
+Тесты для CircuitBreaker.
+"""
+import pytest
+
+from src.frameworks_and_drivers.gateways.circuit_breaker import CircuitBreaker
+
+
+class FakeClock:
+    """Управляемый источник времени."""
+    
+    def __init__(self) -> None:
+        self.now = 0.0
+    
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    """Создает управляемые часы."""
+    return FakeClock()
+
+
+def test_opens_after_threshold(clock):
+    """Тест: цепь размыкается после заданного числа неудач подряд."""
+    # Arrange
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30, clock=clock)
+    
+    # Act
+    breaker.record_failure()
+    still_closed = breaker.allow()
+    breaker.record_failure()
+    
+    # Assert
+    assert still_closed is True
+    assert breaker.is_open is True
+    assert breaker.allow() is False
+
+
+def test_success_resets_failures(clock):
+    """Тест: успешный вызов обнуляет счетчик неудач."""
+    # Arrange
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30, clock=clock)
+    
+    # Act
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    
+    # Assert
+    assert breaker.is_open is False
+
+
+def test_half_open_allows_single_probe(clock):
+    """Тест: после reset_timeout пропускается ровно один пробный вызов."""
+    # Arrange
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30, clock=clock)
+    breaker.record_failure()
+    
+    # Act
+    clock.now = 31
+    first = breaker.allow()
+    second = breaker.allow()
+    
+    # Assert
+    assert first is True
+    assert second is False
+
+
+def test_failed_probe_reopens(clock):
+    """Тест: неудачный пробный вызов снова размыкает цепь на reset_timeout."""
+    # Arrange
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30, clock=clock)
+    breaker.record_failure()
+    clock.now = 31
+    breaker.allow()
+    
+    # Act
+    breaker.record_failure()
+    
+    # Assert
+    clock.now = 60
+    assert breaker.allow() is False
+    clock.now = 62
+    assert breaker.allow() is True
+
+
+def test_successful_probe_closes(clock):
+    """Тест: успешный пробный вызов замыкает цепь."""
+    # Arrange
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30, clock=clock)
+    breaker.record_failure()
+    clock.now = 31
+    breaker.allow()
+    
+    # Act
+    breaker.record_success()
+    
+    # Assert
+    assert breaker.is_open is False
+    assert breaker.allow() is True
+
+
+def test_released_probe_allows_next_probe(clock):
+    """Тест: снятый без вердикта пробный вызов не блокирует следующий."""
+    # Arrange
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30, clock=clock)
+    breaker.record_failure()
+    clock.now = 31
+    breaker.allow()
+    
+    # Act
+    breaker.release()
+    
+    # Assert
+    assert breaker.is_open is True
+    assert breaker.allow() is True
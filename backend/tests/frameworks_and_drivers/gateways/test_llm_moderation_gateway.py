@@ -1,6 +1,7 @@
 """
 Тесты для LLMModerationGateway.
 """
+import asyncio
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 import os
@@ -9,7 +10,9 @@ from datetime import datetime
 
 from src.entities.confession import Confession
 from src.entities.enums import ConfessionStatus
+from src.frameworks_and_drivers.config import ModerationGatewaySettings
 from src.frameworks_and_drivers.gateways.llm_moderation_gateway import LLMModerationGateway
+from src.frameworks_and_drivers.gateways.moderation_cache import ModerationCache
 
 
 class TestLLMModerationGateway:
@@ -41,10 +44,10 @@ class TestLLMModerationGateway:
         gateway = LLMModerationGateway()
         
         # Act
-        status = await gateway.moderate(confession)
+        result = await gateway.moderate(confession)
         
         # Assert
-        assert status == ConfessionStatus.APPROVED
+        assert result.status == ConfessionStatus.APPROVED
     
     @pytest.mark.asyncio
     @patch.dict(os.environ, {})  # Убираем API ключ из окружения
@@ -54,15 +57,11 @@ class TestLLMModerationGateway:
         gateway = LLMModerationGateway()
         
         # Act
-        status = await gateway.moderate(confession_with_forbidden_word)
+        result = await gateway.moderate(confession_with_forbidden_word)
         
         # Assert
-        assert status == ConfessionStatus.REJECTED
-        
-        # Проверяем причину отклонения
-        reason = await gateway.get_moderation_reason(confession_with_forbidden_word)
-        assert reason is not None
-        assert "bad" in reason
+        assert result.status == ConfessionStatus.REJECTED
+        assert "bad" in result.reason
     
     @pytest.mark.asyncio
     @patch.dict(os.environ, {"MODERATION_API_KEY": "fake_api_key"})
@@ -81,7 +80,12 @@ class TestLLMModerationGateway:
                         "hate": False,
                         "sexual": False,
                         "violence": False,
-                    }
+                    },
+                    "category_scores": {
+                        "hate": 0.01,
+                        "sexual": 0.0,
+                        "violence": 0.02,
+                    },
                 }
             ]
         }
@@ -90,10 +94,13 @@ class TestLLMModerationGateway:
         gateway = LLMModerationGateway()
         
         # Act
-        status = await gateway.moderate(confession)
+        result = await gateway.moderate(confession)
         
         # Assert
-        assert status == ConfessionStatus.APPROVED
+        assert result.status == ConfessionStatus.APPROVED
+        assert result.reason is None
+        assert result.category_scores["violence"] == 0.02
+        assert result.latency >= 0
         mock_post.assert_called_once()
     
     @pytest.mark.asyncio
@@ -122,16 +129,12 @@ class TestLLMModerationGateway:
         gateway = LLMModerationGateway()
         
         # Act
-        status = await gateway.moderate(confession_with_forbidden_word)
+        result = await gateway.moderate(confession_with_forbidden_word)
         
         # Assert
-        assert status == ConfessionStatus.REJECTED
+        assert result.status == ConfessionStatus.REJECTED
         mock_post.assert_called_once()
-        
-        # Проверяем причину отклонения
-        reason = await gateway.get_moderation_reason(confession_with_forbidden_word)
-        assert reason is not None
-        assert "hate" in reason
+        assert "hate" in result.reason
     
     @pytest.mark.asyncio
     @patch.dict(os.environ, {"MODERATION_API_KEY": "fake_api_key"})
@@ -145,9 +148,327 @@ class TestLLMModerationGateway:
         gateway = LLMModerationGateway()
         
         # Act
-        status = await gateway.moderate(confession)
+        result = await gateway.moderate(confession)
         
         # Assert
         # Если ошибка, то должны получить PENDING, чтобы потом проверить вручную
-        assert status == ConfessionStatus.PENDING
-        mock_post.assert_called_once() 
\ No newline at end of file
+        assert result.status == ConfessionStatus.PENDING
+        mock_post.assert_called_once()     
+    @pytest.mark.asyncio
+    @patch.dict(os.environ, {"MODERATION_API_KEY": "fake_api_key"})
+    async def test_moderate_reuses_http_client(self, confession):
+        """Тест: все запросы к API идут через один пул соединений."""
+        # Arrange
+        client = AsyncMock(spec=httpx.AsyncClient)
+        response = MagicMock()
+        response.json.return_value = {"results": [{"flagged": False, "categories": {}}]}
+        client.post.return_value = response
+        gateway = LLMModerationGateway(http_client=client)
+        
+        # Act
+        await gateway.moderate(confession)
+        await gateway.moderate(confession)
+        await gateway.close()
+        
+        # Assert
+        assert client.post.await_count == 2
+        client.aclose.assert_awaited_once()
+    
+    @pytest.mark.asyncio
+    @patch.dict(os.environ, {"MODERATION_API_KEY": "fake_api_key"})
+    async def test_moderate_many_sends_single_request(self, confession, confession_with_forbidden_word):
+        """Тест: пачка признаний модерируется одним запросом с массивом input."""
+        # Arrange
+        client = AsyncMock(spec=httpx.AsyncClient)
+        response = MagicMock()
+        response.json.return_value = {
+            "results": [
+                {"flagged": False, "categories": {"hate": False}},
+                {"flagged": True, "categories": {"hate": True}},
+            ]
+        }
+        client.post.return_value = response
+        gateway = LLMModerationGateway(http_client=client)
+        
+        # Act
+        results = await gateway.moderate_many([confession, confession_with_forbidden_word])
+        
+        # Assert
+        assert [result.status for result in results] == [ConfessionStatus.APPROVED, ConfessionStatus.REJECTED]
+        client.post.assert_awaited_once()
+        assert client.post.call_args.kwargs["json"]["input"] == [
+            confession.content,
+            confession_with_forbidden_word.content,
+        ]
+        assert "hate" in results[1].reason
+    
+    @pytest.mark.asyncio
+    @patch.dict(os.environ, {"MODERATION_API_KEY": "fake_api_key"})
+    async def test_moderate_many_result_count_mismatch(self, confession, confession_with_forbidden_word):
+        """Тест: при неполном ответе API вся пачка остается на ручной модерации."""
+        # Arrange
+        client = AsyncMock(spec=httpx.AsyncClient)
+        response = MagicMock()
+        response.json.return_value = {"results": [{"flagged": False, "categories": {}}]}
+        client.post.return_value = response
+        gateway = LLMModerationGateway(http_client=client)
+        
+        # Act
+        results = await gateway.moderate_many([confession, confession_with_forbidden_word])
+        
+        # Assert
+        assert [result.status for result in results] == [ConfessionStatus.PENDING, ConfessionStatus.PENDING]
+    
+    @pytest.mark.asyncio
+    async def test_moderate_many_empty(self):
+        """Тест: пустая пачка не приводит к запросу."""
+        # Arrange
+        client = AsyncMock(spec=httpx.AsyncClient)
+        gateway = LLMModerationGateway(http_client=client)
+        
+        # Act & Assert
+        assert await gateway.moderate_many([]) == []
+        client.post.assert_not_called()
+    
+    @pytest.mark.asyncio
+    @patch.dict(os.environ, {"MODERATION_API_KEY": "fake_api_key"})
+    async def test_moderate_many_uses_cache(self, confession, confession_with_forbidden_word):
+        """Тест: повторы текста проверяются в API один раз, затем берутся из кэша."""
+        # Arrange
+        client = AsyncMock(spec=httpx.AsyncClient)
+        response = MagicMock()
+        response.json.return_value = {"results": [{"flagged": True, "categories": {"spam": True}}]}
+        client.post.return_value = response
+        gateway = LLMModerationGateway(http_client=client, cache=ModerationCache(ttl_seconds=60, max_entries=100))
+        spam = [
+            Confession(id=10, content="Купите скидки!"),
+            Confession(id=11, content="купите   СКИДКИ"),
+        ]
+        
+        # Act
+        first = await gateway.moderate_many(spam)
+        second = await gateway.moderate(Confession(id=12, content="КУПИТЕ СКИДКИ."))
+        
+        # Assert
+        assert [result.status for result in first] == [ConfessionStatus.REJECTED, ConfessionStatus.REJECTED]
+        assert second.status == ConfessionStatus.REJECTED
+        assert second.reason == "Content flagged for: spam"
+        assert second.latency == 0.0
+        client.post.assert_awaited_once()
+        assert client.post.call_args.kwargs["json"]["input"] == ["Купите скидки!"]
+    
+    @pytest.mark.asyncio
+    @patch.dict(os.environ, {"MODERATION_API_KEY": "fake_api_key"})
+    async def test_moderate_errors_are_not_cached(self, confession):
+        """Тест: ошибка API не кэшируется, следующий вызов снова идет в API."""
+        # Arrange
+        client = AsyncMock(spec=httpx.AsyncClient)
+        client.post.side_effect = httpx.RequestError("Connection error")
+        gateway = LLMModerationGateway(http_client=client, cache=ModerationCache(ttl_seconds=60, max_entries=100))
+        
+        # Act
+        await gateway.moderate(confession)
+        result = await gateway.moderate(confession)
+        
+        # Assert
+        assert result.status == ConfessionStatus.PENDING
+        assert client.post.await_count == 2
+
+
+APPROVED_RESPONSE = {"results": [{"flagged": False, "categories": {}}]}
+
+
+def _gateway(handler, **settings):
+    """Создает гейтвей, чьи запросы обрабатывает локальный MockTransport."""
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    settings = ModerationGatewaySettings(**{"backoff_base": 0.0, **settings})
+    return LLMModerationGateway(http_client=client, settings=settings)
+
+
+@pytest.mark.usefixtures("api_key")
+class TestLLMModerationGatewayResilience:
+    """Тесты повторов, таймаутов, лимита параллельности и выключателя."""
+    
+    @pytest.fixture
+    def api_key(self):
+        """Включает обращение к API вместо заглушки."""
+        with patch.dict(os.environ, {"MODERATION_API_KEY": "fake_api_key"}):
+            yield
+    
+    @pytest.fixture
+    def confession(self):
+        """Тестовое признание."""
+        return Confession(id=1, content="Тестовое признание")
+    
+    @pytest.mark.asyncio
+    async def test_retries_on_429_honouring_retry_after(self, confession):
+        """Тест: после 429 запрос повторяется через Retry-After и завершается успехом."""
+        # Arrange
+        responses = [
+            httpx.Response(429, headers={"Retry-After": "0"}),
+            httpx.Response(503),
+            httpx.Response(200, json=APPROVED_RESPONSE),
+        ]
+        requests = []
+        
+        def handler(request):
+            requests.append(request)
+            return responses[len(requests) - 1]
+        
+        gateway = _gateway(handler, max_retries=3)
+        
+        # Act
+        with patch("asyncio.sleep", new_callable=AsyncMock) as sleep_mock:
+            result = await gateway.moderate(confession)
+        
+        # Assert
+        assert result.status == ConfessionStatus.APPROVED
+        assert len(requests) == 3
+        assert sleep_mock.await_args_list[0].args == (0.0,)
+    
+    @pytest.mark.asyncio
+    async def test_long_retry_after_is_not_waited(self, confession):
+        """Тест: если сервер просит ждать дольше backoff_max, признание сразу остается PENDING."""
+        # Arrange
+        requests = []
+        
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(429, headers={"Retry-After": "120"})
+        
+        gateway = _gateway(handler, max_retries=3, backoff_max=10)
+        
+        # Act
+        result = await gateway.moderate(confession)
+        
+        # Assert
+        assert result.status == ConfessionStatus.PENDING
+        assert len(requests) == 1
+    
+    @pytest.mark.asyncio
+    async def test_exhausted_retries_leave_pending(self, confession):
+        """Тест: после исчерпания повторов признание остается PENDING."""
+        # Arrange
+        requests = []
+        
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(500)
+        
+        gateway = _gateway(handler, max_retries=2)
+        
+        # Act
+        result = await gateway.moderate(confession)
+        
+        # Assert
+        assert result.status == ConfessionStatus.PENDING
+        assert len(requests) == 3
+    
+    @pytest.mark.asyncio
+    async def test_client_errors_are_not_retried(self, confession):
+        """Тест: ответ 400 не повторяется."""
+        # Arrange
+        requests = []
+        
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(400)
+        
+        gateway = _gateway(handler, max_retries=3)
+        
+        # Act
+        result = await gateway.moderate(confession)
+        
+        # Assert
+        assert result.status == ConfessionStatus.PENDING
+        assert len(requests) == 1
+    
+    @pytest.mark.asyncio
+    async def test_call_timeout(self, confession):
+        """Тест: зависший запрос прерывается по таймауту попытки."""
+        # Arrange
+        async def handler(request):
+            await asyncio.sleep(1)
+            return httpx.Response(200, json=APPROVED_RESPONSE)
+        
+        gateway = _gateway(handler, call_timeout=0.01, max_retries=1)
+        
+        # Act
+        result = await gateway.moderate(confession)
+        
+        # Assert
+        assert result.status == ConfessionStatus.PENDING
+        assert result.latency < 1
+    
+    @pytest.mark.asyncio
+    async def test_concurrency_is_capped(self):
+        """Тест: одновременно к API уходит не больше max_concurrency запросов."""
+        # Arrange
+        in_flight = 0
+        peak = 0
+        
+        async def handler(request):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return httpx.Response(200, json=APPROVED_RESPONSE)
+        
+        gateway = _gateway(handler, max_concurrency=2)
+        confessions = [Confession(id=id_, content=f"Признание {id_}") for id_ in range(6)]
+        
+        # Act
+        results = await asyncio.gather(*(gateway.moderate(confession) for confession in confessions))
+        
+        # Assert
+        assert all(result.status == ConfessionStatus.APPROVED for result in results)
+        assert peak == 2
+    
+    @pytest.mark.asyncio
+    async def test_open_circuit_fails_fast(self, confession):
+        """Тест: после размыкания цепи запросы к API не отправляются."""
+        # Arrange
+        requests = []
+        
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(503)
+        
+        gateway = _gateway(handler, max_retries=0, breaker_failure_threshold=2)
+        
+        # Act
+        for _ in range(5):
+            result = await gateway.moderate(confession)
+        
+        # Assert
+        assert result.status == ConfessionStatus.PENDING
+        assert len(requests) == 2
+    
+    @pytest.mark.asyncio
+    async def test_half_open_probe_with_client_error_is_released(self, confession):
+        """Тест: пробный вызов, завершившийся ответом 400, не оставляет цепь заблокированной."""
+        # Arrange
+        responses = [
+            httpx.Response(503),
+            httpx.Response(400),
+            httpx.Response(200, json=APPROVED_RESPONSE),
+        ]
+        requests = []
+        
+        def handler(request):
+            requests.append(request)
+            return responses[len(requests) - 1]
+        
+        gateway = _gateway(handler, max_retries=0, breaker_failure_threshold=1, breaker_reset_timeout=0.01)
+        
+        # Act
+        await gateway.moderate(confession)
+        await asyncio.sleep(0.02)
+        probe = await gateway.moderate(confession)
+        result = await gateway.moderate(confession)
+        
+        # Assert
+        assert probe.status == ConfessionStatus.PENDING
+        assert result.status == ConfessionStatus.APPROVED
+        assert len(requests) == 3
@@ -0,0 +1,159 @@
+"""
+Тесты для кэша решений модерации.
+"""
+import pytest
+from unittest.mock import AsyncMock
+
+from src.entities.confession import ModerationResult
+from src.entities.enums import ConfessionStatus
+from src.frameworks_and_drivers.config import ModerationCacheSettings
+from src.frameworks_and_drivers.gateways.moderation_cache import (
+    ModerationCache,
+    PostgresModerationCacheStore,
+    cache_hits,
+    cache_misses,
+    content_hash,
+    create_moderation_cache,
+    normalize_content,
+)
+
+APPROVED = ModerationResult(status=ConfessionStatus.APPROVED)
+REJECTED = ModerationResult(status=ConfessionStatus.REJECTED, reason="Content flagged for: spam")
+
+
+class FakeClock:
+    """Управляемый источник времени."""
+    
+    def __init__(self) -> None:
+        self.now = 0.0
+    
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_normalized_variants_share_hash():
+    """Тест: регистр, пунктуация и пробелы не меняют ключ кэша."""
+    assert normalize_content("  Купите   СКИДКИ!!! ") == "купите скидки"
+    assert content_hash("Купите скидки") == content_hash("купите,   СКИДКИ!")
+    assert content_hash("Купите скидки") != content_hash("Купите скидку")
+
+
+class TestModerationCache:
+    """Тесты для ModerationCache."""
+    
+    @pytest.mark.asyncio
+    async def test_hit_and_miss_are_counted(self):
+        """Тест: повторный запрос попадает в память, счетчики растут."""
+        # Arrange
+        cache = ModerationCache(ttl_seconds=60, max_entries=10)
+        hits_before, misses_before = cache_hits["memory"].value, cache_misses.value
+        
+        # Act
+        miss = await cache.get("key")
+        await cache.set("key", REJECTED)
+        hit = await cache.get("key")
+        
+        # Assert
+        assert miss is None
+        assert hit == REJECTED
+        assert cache_hits["memory"].value == hits_before + 1
+        assert cache_misses.value == misses_before + 1
+    
+    @pytest.mark.asyncio
+    async def test_expired_entry_is_dropped(self):
+        """Тест: по истечении TTL решение не возвращается."""
+        # Arrange
+        clock = FakeClock()
+        cache = ModerationCache(ttl_seconds=60, max_entries=10, clock=clock)
+        await cache.set("key", APPROVED)
+        
+        # Act
+        clock.now = 61
+        result = await cache.get("key")
+        
+        # Assert
+        assert result is None
+        assert len(cache) == 0
+    
+    @pytest.mark.asyncio
+    async def test_least_recently_used_is_evicted(self):
+        """Тест: при переполнении вытесняется давно не использованная запись."""
+        # Arrange
+        cache = ModerationCache(ttl_seconds=60, max_entries=2)
+        await cache.set("a", APPROVED)
+        await cache.set("b", APPROVED)
+        await cache.get("a")
+        
+        # Act
+        await cache.set("c", APPROVED)
+        
+        # Assert
+        assert len(cache) == 2
+        assert await cache.get("a") == APPROVED
+        assert await cache.get("b") is None
+    
+    @pytest.mark.asyncio
+    async def test_shared_store_hit_fills_memory(self):
+        """Тест: решение из общего хранилища кладется в память процесса."""
+        # Arrange
+        store = AsyncMock(spec=PostgresModerationCacheStore)
+        store.get.return_value = (REJECTED, 60.0)
+        cache = ModerationCache(ttl_seconds=60, max_entries=10, store=store)
+        postgres_hits_before = cache_hits["postgres"].value
+        
+        # Act
+        first = await cache.get("key")
+        second = await cache.get("key")
+        
+        # Assert
+        assert first == second == REJECTED
+        store.get.assert_awaited_once_with("key")
+        assert cache_hits["postgres"].value == postgres_hits_before + 1
+    
+    @pytest.mark.asyncio
+    async def test_shared_store_hit_keeps_remaining_ttl(self):
+        """Тест: решение из общего хранилища живет в памяти только оставшееся у него время."""
+        # Arrange
+        clock = FakeClock()
+        store = AsyncMock(spec=PostgresModerationCacheStore)
+        store.get.return_value = (REJECTED, 5.0)
+        cache = ModerationCache(ttl_seconds=60, max_entries=10, store=store, clock=clock)
+        await cache.get("key")
+        store.get.return_value = None
+        
+        # Act
+        clock.now = 4
+        before_expiry = await cache.get("key")
+        clock.now = 6
+        after_expiry = await cache.get("key")
+        
+        # Assert
+        assert before_expiry == REJECTED
+        assert after_expiry is None
+        assert store.get.await_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_store_errors_do_not_break_moderation(self):
+        """Тест: недоступность общего хранилища считается промахом."""
+        # Arrange
+        store = AsyncMock(spec=PostgresModerationCacheStore)
+        store.get.side_effect = ConnectionError("db down")
+        store.set.side_effect = ConnectionError("db down")
+        cache = ModerationCache(ttl_seconds=60, max_entries=10, store=store)
+        
+        # Act
+        result = await cache.get("key")
+        await cache.set("key", APPROVED)
+        
+        # Assert
+        assert result is None
+        store.set.assert_awaited_once_with("key", APPROVED, 60)
+        assert await cache.get("key") == APPROVED
+
+
+def test_create_moderation_cache():
+    """Тест создания кэша по настройкам."""
+    session_factory = AsyncMock()
+    
+    assert create_moderation_cache(ModerationCacheSettings(enabled=False), session_factory) is None
+    assert isinstance(create_moderation_cache(ModerationCacheSettings(), session_factory), ModerationCache)
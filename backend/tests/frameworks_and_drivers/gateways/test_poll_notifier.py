@@ -0,0 +1,34 @@
+"""
+Тесты для уведомлений об изменении опросов между процессами.
+"""
+from unittest.mock import MagicMock
+
+from src.frameworks_and_drivers.gateways.poll_notifier import PostgresPollNotifier
+
+
+def test_notification_from_other_worker():
+    """Тест: уведомление другого процесса передает обработчикам ID всех опросов."""
+    # Arrange
+    notifier = PostgresPollNotifier("postgresql+asyncpg://localhost/test")
+    callback = MagicMock()
+    notifier.add_callback(callback)
+    
+    # Act
+    notifier._on_notification(MagicMock(), 1, "poll_results", "other-worker:3,7")
+    
+    # Assert
+    assert [call.args for call in callback.call_args_list] == [(3,), (7,)]
+
+
+def test_own_notification_is_ignored():
+    """Тест: собственные уведомления процесса не обрабатываются повторно."""
+    # Arrange
+    notifier = PostgresPollNotifier("postgresql+asyncpg://localhost/test")
+    callback = MagicMock()
+    notifier.add_callback(callback)
+    
+    # Act
+    notifier._on_notification(MagicMock(), 1, "poll_results", f"{notifier._origin}:3")
+    
+    # Assert
+    callback.assert_not_called()
@@ -0,0 +1,184 @@
+"""
+Тесты для ChannelRateLimiter и PostgresChannelRateLimiter.
+"""
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import OperationalError
+
+from src.frameworks_and_drivers.gateways.rate_limiter import ChannelRateLimiter, PostgresChannelRateLimiter
+from src.interface_adapters.gateway_protocols import PublicationTemporaryError
+
+
+class FakeClock:
+    """Управляемый источник времени; ожидание сдвигает время вперед."""
+    
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps = []
+    
+    def __call__(self) -> float:
+        return self.now
+    
+    async def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    """Создает управляемые часы."""
+    return FakeClock()
+
+
+@pytest.mark.asyncio
+async def test_burst_then_steady_rate(clock):
+    """Тест: burst сообщений уходит сразу, следующие - с интервалом 60/rate секунд."""
+    # Arrange
+    limiter = ChannelRateLimiter(rate_per_minute=20, burst=3, clock=clock, sleep=clock.sleep)
+    
+    # Act
+    for _ in range(5):
+        await limiter.acquire("@falt_conf")
+    
+    # Assert
+    assert clock.sleeps == pytest.approx([3.0, 3.0])
+    assert clock.now == pytest.approx(6.0)
+
+
+@pytest.mark.asyncio
+async def test_album_takes_token_per_message(clock):
+    """Тест: альбом расходует по токену на каждый файл."""
+    # Arrange
+    limiter = ChannelRateLimiter(rate_per_minute=20, burst=3, clock=clock, sleep=clock.sleep)
+    
+    # Act
+    await limiter.acquire("@falt_conf", 3)
+    await limiter.acquire("@falt_conf", 2)
+    
+    # Assert
+    assert clock.sleeps == pytest.approx([6.0])
+
+
+@pytest.mark.asyncio
+async def test_channels_are_limited_independently(clock):
+    """Тест: лимит одного канала не задерживает другой."""
+    # Arrange
+    limiter = ChannelRateLimiter(rate_per_minute=60, burst=1, clock=clock, sleep=clock.sleep)
+    await limiter.acquire("@first")
+    
+    # Act
+    await limiter.acquire("@second")
+    
+    # Assert
+    assert clock.sleeps == []
+
+
+@pytest.mark.asyncio
+async def test_pause_delays_channel(clock):
+    """Тест: после RetryAfter отправка в канал ждет окончания паузы."""
+    # Arrange
+    limiter = ChannelRateLimiter(rate_per_minute=60, burst=5, clock=clock, sleep=clock.sleep)
+    await limiter.acquire("@falt_conf")
+    
+    # Act
+    await limiter.pause("@falt_conf", 30)
+    await limiter.acquire("@falt_conf")
+    
+    # Assert
+    assert clock.sleeps == pytest.approx([30.0])
+
+
+def _session_factory(row=None, error=None):
+    """Создает фабрику сессий, возвращающую одну и ту же mock-сессию."""
+    session = AsyncMock()
+    result = MagicMock()
+    result.one.return_value = row
+    session.execute = AsyncMock(return_value=result, side_effect=error)
+    factory = MagicMock()
+    factory.return_value.__aenter__ = AsyncMock(return_value=session)
+    factory.return_value.__aexit__ = AsyncMock(return_value=False)
+    return factory, session
+
+
+@pytest.mark.asyncio
+async def test_postgres_acquire_reserves_slot_atomically():
+    """Тест: место в очереди резервируется одним upsert, ожидание считается по времени БД."""
+    # Arrange
+    now = datetime(2026, 10, 18, 12, 0, 0)
+    # Перед нами уже зарезервировано 4 сообщения с интервалом 3 секунды: 5-е при burst=3 ждет 6 секунд
+    factory, session = _session_factory(row=(now + timedelta(seconds=15), None, now))
+    sleep = AsyncMock()
+    limiter = PostgresChannelRateLimiter(factory, rate_per_minute=20, burst=3, sleep=sleep)
+    
+    # Act
+    await limiter.acquire("@falt_conf")
+    
+    # Assert
+    sql = str(session.execute.call_args[0][0].compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT (channel_id) DO UPDATE" in sql
+    assert "greatest(channel_send_slots.theoretical_at, LOCALTIMESTAMP)" in sql
+    session.commit.assert_awaited_once()
+    sleep.assert_awaited_once_with(pytest.approx(6.0))
+
+
+@pytest.mark.asyncio
+async def test_postgres_acquire_within_burst_does_not_wait():
+    """Тест: в пределах burst отправка не ждет."""
+    # Arrange
+    now = datetime(2026, 10, 18, 12, 0, 0)
+    factory, _ = _session_factory(row=(now + timedelta(seconds=6), None, now))
+    sleep = AsyncMock()
+    limiter = PostgresChannelRateLimiter(factory, rate_per_minute=20, burst=3, sleep=sleep)
+    
+    # Act
+    await limiter.acquire("@falt_conf", 2)
+    
+    # Assert
+    sleep.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_postgres_acquire_waits_for_pause():
+    """Тест: пауза канала, выставленная любым процессом, задерживает отправку."""
+    # Arrange
+    now = datetime(2026, 10, 18, 12, 0, 0)
+    factory, _ = _session_factory(row=(now + timedelta(seconds=3), now + timedelta(seconds=30), now))
+    sleep = AsyncMock()
+    limiter = PostgresChannelRateLimiter(factory, rate_per_minute=20, burst=3, sleep=sleep)
+    
+    # Act
+    await limiter.acquire("@falt_conf")
+    
+    # Assert
+    sleep.assert_awaited_once_with(pytest.approx(30.0))
+
+
+@pytest.mark.asyncio
+async def test_postgres_acquire_storage_error_is_temporary():
+    """Тест: недоступность хранилища лимита - временная ошибка публикации."""
+    # Arrange
+    factory, _ = _session_factory(error=OperationalError("SELECT 1", {}, Exception("down")))
+    limiter = PostgresChannelRateLimiter(factory, rate_per_minute=20, burst=3, sleep=AsyncMock())
+    
+    # Act & Assert
+    with pytest.raises(PublicationTemporaryError):
+        await limiter.acquire("@falt_conf")
+
+
+@pytest.mark.asyncio
+async def test_postgres_pause_extends_shared_pause():
+    """Тест: пауза записывается в общую строку канала и не сокращает уже выставленную."""
+    # Arrange
+    factory, session = _session_factory()
+    limiter = PostgresChannelRateLimiter(factory, rate_per_minute=20, burst=3, sleep=AsyncMock())
+    
+    # Act
+    await limiter.pause("@falt_conf", 30)
+    
+    # Assert
+    sql = str(session.execute.call_args[0][0].compile(dialect=postgresql.dialect()))
+    assert "greatest(channel_send_slots.paused_until" in sql
+    session.commit.assert_awaited_once()
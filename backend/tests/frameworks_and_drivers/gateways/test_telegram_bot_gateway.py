@@ -6,9 +6,16 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import os
 from datetime import datetime
 
-from src.entities.confession import Confession, Poll, PollOption, Tag
-from src.entities.enums import ConfessionStatus
+from aiogram.exceptions import TelegramNetworkError, TelegramRetryAfter, TelegramServerError
+from aiogram.methods import SendMessage
+
+from aiogram.types import InputMediaAudio, InputMediaDocument, InputMediaPhoto, InputMediaVideo
+
+from src.entities.confession import Attachment, Confession, Poll, PollOption, Tag
+from src.entities.enums import AttachmentType, ConfessionStatus
 from src.frameworks_and_drivers.gateways.telegram_bot_gateway import TelegramBotGateway
+from src.frameworks_and_drivers.gateways.telegram_file_cache import TelegramFileCache
+from src.interface_adapters.gateway_protocols import PublicationRateLimitedError, PublicationTemporaryError
 
 
 class TestTelegramBotGateway:
@@ -120,4 +127,209 @@ class TestTelegramBotGateway:
         poll_message_id = await gateway.send_poll(confession_with_poll.poll)
         
         # Assert
-        assert poll_message_id == "mock_poll_id" 
\ No newline at end of file
+        assert poll_message_id == "mock_poll_id"     
+    @pytest.mark.asyncio
+    @patch.dict(os.environ, {"TELEGRAM_BOT_TOKEN": "fake_token"})
+    @patch("src.frameworks_and_drivers.gateways.telegram_bot_gateway.Bot")
+    async def test_close(self, mock_bot_class, mock_bot):
+        """Тест закрытия HTTP-сессии бота."""
+        # Arrange
+        mock_bot_class.return_value = mock_bot
+        gateway = TelegramBotGateway()
+        
+        # Act
+        await gateway.close()
+        
+        # Assert
+        mock_bot.session.close.assert_awaited_once()
+    
+    @pytest.mark.asyncio
+    @patch.dict(os.environ, {"TELEGRAM_BOT_TOKEN": "fake_token"})
+    @patch("src.frameworks_and_drivers.gateways.telegram_bot_gateway.Bot")
+    async def test_send_confession_to_channel_is_throttled(self, mock_bot_class, mock_bot, confession):
+        """Тест: отправка в указанный канал проходит через ограничитель частоты."""
+        # Arrange
+        mock_bot_class.return_value = mock_bot
+        rate_limiter = MagicMock(acquire=AsyncMock())
+        gateway = TelegramBotGateway(rate_limiter=rate_limiter)
+        
+        # Act
+        await gateway.send_confession(confession, "@other_channel")
+        
+        # Assert
+        rate_limiter.acquire.assert_awaited_once_with("@other_channel", 1)
+        assert mock_bot.send_message.call_args[1]["chat_id"] == "@other_channel"
+    
+    @pytest.mark.asyncio
+    @patch.dict(os.environ, {"TELEGRAM_BOT_TOKEN": "fake_token"})
+    @patch("src.frameworks_and_drivers.gateways.telegram_bot_gateway.Bot")
+    async def test_retry_after_pauses_channel(self, mock_bot_class, mock_bot, confession):
+        """Тест: RetryAfter приостанавливает канал и превращается в PublicationRateLimitedError."""
+        # Arrange
+        mock_bot_class.return_value = mock_bot
+        method = SendMessage(chat_id="@falt_conf", text="x")
+        mock_bot.send_message.side_effect = TelegramRetryAfter(method=method, message="Flood", retry_after=7)
+        rate_limiter = MagicMock(acquire=AsyncMock(), pause=AsyncMock())
+        gateway = TelegramBotGateway(rate_limiter=rate_limiter)
+        
+        # Act & Assert
+        with pytest.raises(PublicationRateLimitedError) as error:
+            await gateway.send_confession(confession, "@falt_conf")
+        
+        assert error.value.retry_after == 7
+        rate_limiter.pause.assert_awaited_once_with("@falt_conf", 7)
+    
+    @pytest.mark.asyncio
+    @patch.dict(os.environ, {"TELEGRAM_BOT_TOKEN": "fake_token"})
+    @patch("src.frameworks_and_drivers.gateways.telegram_bot_gateway.Bot")
+    async def test_error_translation(self, mock_bot_class, mock_bot, confession_with_poll):
+        """Тест: ошибка сервера Telegram повторяемая, сетевая ошибка - нет."""
+        # Arrange
+        mock_bot_class.return_value = mock_bot
+        method = SendMessage(chat_id="@falt_conf", text="x")
+        gateway = TelegramBotGateway()
+        
+        # Act & Assert
+        mock_bot.send_poll.side_effect = TelegramServerError(method=method, message="Bad Gateway")
+        with pytest.raises(PublicationTemporaryError):
+            await gateway.send_poll(confession_with_poll.poll)
+        
+        mock_bot.send_poll.side_effect = TelegramNetworkError(method=method, message="Connection reset")
+        with pytest.raises(TelegramNetworkError):
+            await gateway.send_poll(confession_with_poll.poll)
+    
+    @staticmethod
+    def _sent_messages(chat_id, media):
+        """Имитирует ответ send_media_group: по сообщению с file_id на каждый файл."""
+        messages = []
+        for number, item in enumerate(media):
+            message = MagicMock(message_id=100 + number, photo=None, video=None, audio=None, document=None)
+            if isinstance(item, InputMediaPhoto):
+                message.photo = [MagicMock(file_id="small"), MagicMock(file_id=f"photo:{item.media}")]
+            else:
+                message.document = MagicMock(file_id=f"file:{item.media}")
+            messages.append(message)
+        return messages
+    
+    @pytest.mark.asyncio
+    @patch.dict(os.environ, {"TELEGRAM_BOT_TOKEN": "fake_token"})
+    @patch("src.frameworks_and_drivers.gateways.telegram_bot_gateway.Bot")
+    async def test_send_attachments_in_albums(self, mock_bot_class, mock_bot):
+        """Тест: вложения уходят альбомами не больше 10 файлов, аудио и документы - отдельными альбомами."""
+        # Arrange
+        mock_bot_class.return_value = mock_bot
+        mock_bot.send_media_group.side_effect = lambda chat_id, media: self._sent_messages(chat_id, media)
+        attachments = [
+            Attachment(url=f"https://example.com/{number}.jpg", type=AttachmentType.IMAGE) for number in range(11)
+        ]
+        attachments += [
+            Attachment(url="https://example.com/clip.mp4", type=AttachmentType.VIDEO),
+            Attachment(url="https://example.com/a.mp3", type=AttachmentType.AUDIO),
+            Attachment(url="https://example.com/b.mp3", type=AttachmentType.MUSIC),
+            Attachment(url="https://example.com/doc.pdf", type=AttachmentType.DOCUMENT),
+            Attachment(url="https://example.com/raw.bin", type=AttachmentType.OTHER),
+        ]
+        gateway = TelegramBotGateway()
+        
+        # Act
+        message_ids = await gateway.send_attachments(Confession(id=1, attachments=attachments), "@falt_conf")
+        
+        # Assert
+        albums = [call.kwargs["media"] for call in mock_bot.send_media_group.call_args_list]
+        assert [len(album) for album in albums] == [10, 2, 2, 2]
+        assert isinstance(albums[1][1], InputMediaVideo)
+        assert all(isinstance(item, InputMediaAudio) for item in albums[2])
+        assert all(isinstance(item, InputMediaDocument) for item in albums[3])
+        assert len(message_ids) == len(attachments)
+    
+    @pytest.mark.asyncio
+    @patch.dict(os.environ, {"TELEGRAM_BOT_TOKEN": "fake_token"})
+    @patch("src.frameworks_and_drivers.gateways.telegram_bot_gateway.Bot")
+    async def test_send_attachments_resumes_after_sent_albums(self, mock_bot_class, mock_bot):
+        """Тест: повтор пропускает уже отправленные альбомы, прогресс сообщается после каждого альбома."""
+        # Arrange
+        mock_bot_class.return_value = mock_bot
+        mock_bot.send_media_group.side_effect = lambda chat_id, media: self._sent_messages(chat_id, media)
+        attachments = [
+            Attachment(url=f"https://example.com/{number}.jpg", type=AttachmentType.IMAGE) for number in range(12)
+        ]
+        rate_limiter = MagicMock(acquire=AsyncMock())
+        on_album_sent = AsyncMock()
+        gateway = TelegramBotGateway(rate_limiter=rate_limiter)
+        sent = [f"old_{number}" for number in range(10)]
+        
+        # Act
+        message_ids = await gateway.send_attachments(
+            Confession(id=1, attachments=attachments), "@falt_conf", sent, on_album_sent
+        )
+        
+        # Assert
+        mock_bot.send_media_group.assert_awaited_once()
+        assert [item.media for item in mock_bot.send_media_group.call_args.kwargs["media"]] == [
+            "https://example.com/10.jpg",
+            "https://example.com/11.jpg",
+        ]
+        assert message_ids == sent + ["100", "101"]
+        on_album_sent.assert_awaited_once_with(message_ids)
+        rate_limiter.acquire.assert_awaited_once_with("@falt_conf", 2)
+    
+    @pytest.mark.asyncio
+    @patch.dict(os.environ, {"TELEGRAM_BOT_TOKEN": "fake_token"})
+    @patch("src.frameworks_and_drivers.gateways.telegram_bot_gateway.Bot")
+    async def test_send_attachments_reuses_file_ids(self, mock_bot_class, mock_bot):
+        """Тест: при кросс-постинге в другой канал файлы отправляются по file_id, а не загружаются заново."""
+        # Arrange
+        mock_bot_class.return_value = mock_bot
+        mock_bot.send_media_group.side_effect = lambda chat_id, media: self._sent_messages(chat_id, media)
+        confession = Confession(
+            id=1,
+            attachments=[
+                Attachment(url="https://example.com/a.jpg", type=AttachmentType.IMAGE),
+                Attachment(url="https://example.com/b.jpg", type=AttachmentType.IMAGE),
+            ],
+        )
+        gateway = TelegramBotGateway(file_cache=TelegramFileCache())
+        
+        # Act
+        await gateway.send_attachments(confession, "@falt_conf")
+        await gateway.send_attachments(confession, "@falt_conf_en")
+        
+        # Assert
+        first, second = [call.kwargs["media"] for call in mock_bot.send_media_group.call_args_list]
+        assert [item.media for item in first] == ["https://example.com/a.jpg", "https://example.com/b.jpg"]
+        assert [item.media for item in second] == ["photo:https://example.com/a.jpg", "photo:https://example.com/b.jpg"]
+    
+    @pytest.mark.asyncio
+    @patch.dict(os.environ, {"TELEGRAM_BOT_TOKEN": "fake_token"})
+    @patch("src.frameworks_and_drivers.gateways.telegram_bot_gateway.Bot")
+    async def test_single_attachment_is_sent_without_album(self, mock_bot_class, mock_bot):
+        """Тест: одиночное вложение отправляется обычным сообщением - альбом требует минимум два файла."""
+        # Arrange
+        mock_bot_class.return_value = mock_bot
+        mock_bot.send_photo.return_value = MagicMock(message_id=5, photo=[MagicMock(file_id="photo_a")])
+        confession = Confession(
+            id=1,
+            attachments=[Attachment(url="https://example.com/a.jpg", type=AttachmentType.IMAGE, caption="Подпись")],
+        )
+        gateway = TelegramBotGateway()
+        
+        # Act
+        message_ids = await gateway.send_attachments(confession)
+        
+        # Assert
+        mock_bot.send_media_group.assert_not_called()
+        assert mock_bot.send_photo.call_args.kwargs["photo"] == "https://example.com/a.jpg"
+        assert mock_bot.send_photo.call_args.kwargs["caption"] == "Подпись"
+        assert message_ids == ["5"]
+    
+    @pytest.mark.asyncio
+    @patch.dict(os.environ, {})  # Убираем токен из окружения
+    async def test_mock_mode_for_attachments(self):
+        """Тест работы в режиме мока для вложений, когда токен не установлен."""
+        # Arrange
+        gateway = TelegramBotGateway()
+        confession = Confession(id=1, attachments=[Attachment(url="https://example.com/a.jpg")])
+        
+        # Act & Assert
+        assert await gateway.send_attachments(confession) == ["mock_media_id_0"]
+        assert await gateway.send_attachments(Confession(id=2)) == []
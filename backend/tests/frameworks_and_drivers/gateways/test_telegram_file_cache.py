@@ -0,0 +1,84 @@
+"""
+Тесты для кэша file_id вложений Telegram.
+"""
+import pytest
+from unittest.mock import AsyncMock
+
+from src.frameworks_and_drivers.gateways.telegram_file_cache import (
+    TelegramFileCache,
+    file_id_hits,
+    file_id_misses,
+)
+
+
+class TestTelegramFileCache:
+    """Тесты для TelegramFileCache."""
+    
+    @pytest.mark.asyncio
+    async def test_hit_and_miss_are_counted(self):
+        """Тест: после сохранения file_id возвращается из памяти, счетчики растут."""
+        # Arrange
+        cache = TelegramFileCache()
+        hits_before, misses_before = file_id_hits.value, file_id_misses.value
+        
+        # Act
+        miss = await cache.get("https://example.com/a.jpg")
+        await cache.set("https://example.com/a.jpg", "file_a")
+        hit = await cache.get("https://example.com/a.jpg")
+        
+        # Assert
+        assert miss is None
+        assert hit == "file_a"
+        assert file_id_hits.value == hits_before + 1
+        assert file_id_misses.value == misses_before + 1
+    
+    @pytest.mark.asyncio
+    async def test_least_recently_used_is_evicted(self):
+        """Тест: при переполнении вытесняется самая давно использованная запись."""
+        # Arrange
+        cache = TelegramFileCache(max_entries=2)
+        await cache.set("a", "file_a")
+        await cache.set("b", "file_b")
+        await cache.get("a")
+        
+        # Act
+        await cache.set("c", "file_c")
+        
+        # Assert
+        assert await cache.get("a") == "file_a"
+        assert await cache.get("b") is None
+    
+    @pytest.mark.asyncio
+    async def test_shared_store_is_used_and_written_once(self):
+        """Тест: file_id из общего хранилища попадает в память, повторная запись того же file_id пропускается."""
+        # Arrange
+        store = AsyncMock()
+        store.get.return_value = "file_a"
+        cache = TelegramFileCache(store=store)
+        
+        # Act
+        first = await cache.get("a")
+        second = await cache.get("a")
+        await cache.set("a", "file_a")
+        
+        # Assert
+        assert first == second == "file_a"
+        store.get.assert_awaited_once_with("a")
+        store.set.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_store_errors_fall_back_to_upload(self):
+        """Тест: ошибка хранилища не прерывает отправку - файл просто загружается по URL."""
+        # Arrange
+        store = AsyncMock()
+        store.get.side_effect = RuntimeError("db down")
+        store.set.side_effect = RuntimeError("db down")
+        cache = TelegramFileCache(store=store)
+        
+        # Act
+        missing = await cache.get("a")
+        await cache.set("a", "file_a")
+        
+        # Assert
+        assert missing is None
+        assert await cache.get("a") == "file_a"
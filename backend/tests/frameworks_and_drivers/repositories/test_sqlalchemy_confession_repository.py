@@ -5,18 +5,24 @@ import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 from datetime import datetime
 from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Insert, Select
 
 from src.entities.confession import (
     Attachment,
     Confession,
+    ConfessionRevision,
+    ModerationJob,
     ModerationLog,
     Poll,
     PollOption,
+    Publication,
     PublishedRecord,
+    StatusTransitionError,
     Tag,
 )
-from src.entities.enums import AttachmentType, ConfessionStatus
+from src.entities.enums import AttachmentType, ConfessionProjection, ConfessionStatus
 from src.frameworks_and_drivers.models.confession import (
     AttachmentModel,
     ConfessionModel,
@@ -25,10 +31,15 @@ from src.frameworks_and_drivers.models.confession import (
     PollOptionModel,
     PublishedRecordModel,
     TagModel,
+    confession_tag,
 )
 from src.frameworks_and_drivers.repositories.sqlalchemy_confession_repository import (
+    HIGHLIGHT_START,
+    HIGHLIGHT_STOP,
+    STREAM_BATCH_SIZE,
     SqlAlchemyConfessionRepository,
 )
+from src.interface_adapters.pagination import PageCursor, SearchCursor
 
 
 class TestSqlAlchemyConfessionRepository:
@@ -136,6 +147,380 @@ class TestSqlAlchemyConfessionRepository:
             assert result.content == confession.content
             assert result.status == confession.status
     
+    @staticmethod
+    def _assign_ids_on_flush(db_session_mock):
+        """Имитирует flush: проставляет ID всем добавленным в сессию моделям без ID."""
+        next_id = iter(range(1, 1000))
+        
+        async def flush():
+            for call in db_session_mock.add.call_args_list:
+                model = call.args[0]
+                if model.id is None:
+                    model.id = next(next_id)
+        
+        db_session_mock.flush.side_effect = flush
+    
+    @pytest.mark.asyncio
+    async def test_save_new_confession_without_reread(self, confession_repository, db_session_mock, confession):
+        """Тест сохранения признания без повторного чтения из БД."""
+        # Arrange
+        self._assign_ids_on_flush(db_session_mock)
+        confession.moderation_logs.append(ModerationLog(decision=ConfessionStatus.PENDING, moderator="LLM"))
+        
+        with patch.object(confession_repository, '_save_tags', new_callable=AsyncMock) as save_tags_mock, \
+                patch.object(confession_repository, 'get_by_id', new_callable=AsyncMock) as get_by_id_mock:
+            # Act
+            result = await confession_repository.save(confession)
+        
+        # Assert
+        get_by_id_mock.assert_not_called()
+        db_session_mock.execute.assert_not_called()
+        db_session_mock.commit.assert_called_once()
+        save_tags_mock.assert_called_once_with(result.id, confession.tags, replace=False)
+        
+        assert result is confession
+        assert result.id is not None
+        assert result.attachments[0].id is not None
+        assert result.poll.id is not None
+        assert all(option.id is not None for option in result.poll.options)
+        assert result.moderation_logs[0].id is not None
+        assert result.moderation_logs[0].confession_id == result.id
+    
+    @pytest.mark.asyncio
+    async def test_save_with_refresh_rereads(self, confession_repository, db_session_mock):
+        """Тест сохранения признания с перечитыванием из БД по запросу."""
+        # Arrange
+        self._assign_ids_on_flush(db_session_mock)
+        confession = Confession(content="Признание")
+        refreshed = Confession(id=1, content="Признание")
+        
+        with patch.object(confession_repository, 'get_by_id', new_callable=AsyncMock) as get_by_id_mock:
+            get_by_id_mock.return_value = refreshed
+            
+            # Act
+            result = await confession_repository.save(confession, refresh=True)
+        
+        # Assert
+        get_by_id_mock.assert_called_once_with(1)
+        assert result is refreshed
+    
+    @pytest.fixture
+    def stored_confession(self):
+        """Признание в том виде, в каком оно сохранено в БД."""
+        return Confession(
+            id=1,
+            content="Сохраненное признание",
+            status=ConfessionStatus.PENDING,
+            attachments=[
+                Attachment(id=10, url="https://example.com/1.jpg", type=AttachmentType.IMAGE),
+                Attachment(id=11, url="https://example.com/2.jpg", type=AttachmentType.IMAGE),
+            ],
+            tags=[Tag(id=1, name="тест")],
+            poll=Poll(
+                id=5,
+                question="Вопрос",
+                options=[PollOption(id=50, text="Да", vote_count=3), PollOption(id=51, text="Нет", vote_count=1)],
+            ),
+        )
+    
+    @pytest.mark.asyncio
+    async def test_save_moderation_writes_only_status_and_log(
+        self, confession_repository, db_session_mock, stored_confession
+    ):
+        """Тест: модерация сохраняется одним UPDATE статуса и одним INSERT записи о модерации."""
+        # Arrange
+        self._assign_ids_on_flush(db_session_mock)
+        db_session_mock.execute.return_value.scalar_one_or_none = MagicMock(return_value=2)
+        confession_repository._remember(stored_confession)
+        stored_confession.status = ConfessionStatus.APPROVED
+        stored_confession.moderation_logs.append(
+            ModerationLog(confession_id=1, decision=ConfessionStatus.APPROVED, moderator="LLM")
+        )
+        
+        with patch.object(confession_repository, '_save_tags', new_callable=AsyncMock) as save_tags_mock:
+            # Act
+            result = await confession_repository.save(stored_confession)
+        
+        # Assert
+        db_session_mock.execute.assert_called_once()
+        update_stmt = db_session_mock.execute.call_args.args[0]
+        assert update_stmt.table.name == "confessions"
+        # updated_at проставляется автоматически (onupdate) и отдается как Last-Modified
+        assert set(update_stmt.compile().params) == {"status", "version_1", "updated_at", "id_1", "status_1"}
+        assert "RETURNING confessions.version" in str(update_stmt.compile(dialect=postgresql.dialect()))
+        assert result.version == 2
+        
+        db_session_mock.add.assert_called_once()
+        assert isinstance(db_session_mock.add.call_args.args[0], ModerationLogModel)
+        save_tags_mock.assert_not_called()
+        assert result.moderation_logs[0].id is not None
+    
+    @pytest.mark.asyncio
+    async def test_save_with_outbox_enqueues_in_same_transaction(
+        self, confession_repository, db_session_mock, stored_confession
+    ):
+        """Тест: смена статуса и сообщения исходящей очереди фиксируются одним коммитом."""
+        # Arrange
+        db_session_mock.execute.return_value.scalar_one_or_none = MagicMock(return_value=2)
+        stored_confession.status = ConfessionStatus.APPROVED
+        confession_repository._remember(stored_confession)
+        stored_confession.status = ConfessionStatus.PUBLISHED
+        
+        # Act
+        await confession_repository.save(
+            stored_confession,
+            outbox=[Publication(channel_id="@falt_conf"), Publication(channel_id="@falt_conf_en")],
+        )
+        
+        # Assert
+        update_stmt, count_stmt, insert_stmt = [call.args[0] for call in db_session_mock.execute.call_args_list]
+        assert update_stmt.table.name == "confessions"
+        assert count_stmt.table.name == "tag_counts"
+        assert insert_stmt.table.name == "publication_outbox"
+        sql = str(insert_stmt.compile(dialect=postgresql.dialect()))
+        assert "ON CONFLICT (confession_id, channel_id) DO NOTHING" in sql
+        params = insert_stmt.compile(dialect=postgresql.dialect()).params
+        assert params["confession_id_m0"] == 1
+        assert params["channel_id_m1"] == "@falt_conf_en"
+        db_session_mock.commit.assert_awaited_once()
+    
+    @pytest.mark.asyncio
+    async def test_save_with_moderation_job_enqueues_in_same_transaction(
+        self, confession_repository, db_session_mock, confession
+    ):
+        """Тест: новое признание и его задача модерации фиксируются одним коммитом."""
+        # Arrange
+        self._assign_ids_on_flush(db_session_mock)
+        db_session_mock.execute.return_value.scalar_one_or_none = MagicMock(return_value=7)
+        job = ModerationJob()
+        
+        with patch.object(confession_repository, '_save_tags', new_callable=AsyncMock):
+            # Act
+            result = await confession_repository.save(confession, moderation_job=job)
+        
+        # Assert
+        insert_stmt = db_session_mock.execute.call_args.args[0]
+        assert insert_stmt.table.name == "moderation_jobs"
+        sql = str(insert_stmt.compile(dialect=postgresql.dialect()))
+        assert "ON CONFLICT (confession_id) WHERE" in sql
+        assert insert_stmt.compile(dialect=postgresql.dialect()).params["confession_id"] == result.id
+        assert job.id == 7
+        assert job.confession_id == result.id
+        db_session_mock.commit.assert_awaited_once()
+    
+    @pytest.mark.asyncio
+    async def test_save_status_lost_race_rolls_back(self, confession_repository, db_session_mock, stored_confession):
+        """Тест: если статус успел сменить конкурент, изменения откатываются, а снимок забывается."""
+        # Arrange
+        lost_race = MagicMock()
+        lost_race.scalar_one_or_none.return_value = None
+        current = MagicMock()
+        current.scalar_one_or_none.return_value = ConfessionStatus.REJECTED
+        db_session_mock.execute.side_effect = [lost_race, current]
+        confession_repository._remember(stored_confession)
+        stored_confession.status = ConfessionStatus.APPROVED
+        
+        # Act & Assert
+        with pytest.raises(StatusTransitionError) as error:
+            await confession_repository.save(stored_confession)
+        assert error.value.current == ConfessionStatus.REJECTED
+        db_session_mock.rollback.assert_awaited_once()
+        db_session_mock.commit.assert_not_called()
+        assert 1 not in confession_repository._snapshots
+    
+    @pytest.mark.asyncio
+    async def test_save_forbidden_transition(self, confession_repository, db_session_mock, stored_confession):
+        """Тест: запрещенный переход не доходит до БД."""
+        # Arrange
+        stored_confession.status = ConfessionStatus.PUBLISHED
+        confession_repository._remember(stored_confession)
+        stored_confession.status = ConfessionStatus.REJECTED
+        
+        # Act & Assert
+        with pytest.raises(StatusTransitionError):
+            await confession_repository.save(stored_confession)
+        db_session_mock.execute.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_record_publication_first_channel(self, confession_repository, db_session_mock):
+        """Тест: запись о публикации вставляется с ON CONFLICT DO NOTHING, опрос получает ID из того же канала."""
+        # Arrange
+        db_session_mock.execute.return_value.scalar_one_or_none = MagicMock(return_value=9)
+        record = PublishedRecord(confession_id=1, telegram_message_id="100", channel_id="@falt_conf")
+        
+        # Act
+        inserted = await confession_repository.record_publication(record, "200")
+        
+        # Assert
+        insert_stmt, poll_stmt = [call.args[0] for call in db_session_mock.execute.call_args_list]
+        assert "ON CONFLICT (confession_id) DO NOTHING" in str(insert_stmt.compile(dialect=postgresql.dialect()))
+        assert poll_stmt.table.name == "polls"
+        assert "polls.poll_message_id IS NULL" in str(poll_stmt.compile(dialect=postgresql.dialect()))
+        assert inserted is True
+        assert record.id == 9
+        db_session_mock.commit.assert_awaited_once()
+    
+    @pytest.mark.asyncio
+    async def test_record_publication_already_recorded(self, confession_repository, db_session_mock):
+        """Тест: второй канал не перезаписывает запись о публикации и ID опроса."""
+        # Arrange
+        db_session_mock.execute.return_value.scalar_one_or_none = MagicMock(return_value=None)
+        record = PublishedRecord(confession_id=1, telegram_message_id="300", channel_id="@falt_conf_en")
+        
+        # Act
+        inserted = await confession_repository.record_publication(record, "400")
+        
+        # Assert
+        assert inserted is False
+        db_session_mock.execute.assert_awaited_once()
+        db_session_mock.commit.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_publish_approved_in_one_transaction(self, confession_repository, db_session_mock):
+        """Тест: выбор одобренных признаний, смена статуса и постановка в очередь - одна транзакция."""
+        # Arrange
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = [5, 3]
+        db_session_mock.execute.return_value = result
+        
+        # Act
+        confession_ids = await confession_repository.publish_approved(10, ["@falt_conf", "@falt_conf_en"])
+        
+        # Assert
+        assert confession_ids == [3, 5]
+        update_stmt, count_stmt, *inserts = [call.args[0] for call in db_session_mock.execute.call_args_list]
+        sql = str(update_stmt.compile(dialect=postgresql.dialect()))
+        assert sql.startswith("UPDATE confessions")
+        assert "FOR UPDATE SKIP LOCKED" in sql
+        assert "ORDER BY confessions.created_at, confessions.id" in sql
+        # Счетчики тегов всех опубликованных признаний обновляются одним запросом
+        assert count_stmt.table.name == "tag_counts"
+        assert count_stmt.compile(dialect=postgresql.dialect()).params["confession_id_1"] == [3, 5]
+        assert [insert.table.name for insert in inserts] == ["publication_outbox", "publication_outbox"]
+        db_session_mock.commit.assert_awaited_once()
+    
+    @pytest.mark.asyncio
+    async def test_save_unchanged_confession_writes_nothing(
+        self, confession_repository, db_session_mock, stored_confession
+    ):
+        """Тест: сохранение неизмененного признания не порождает запросов на запись."""
+        # Arrange
+        confession_repository._remember(stored_confession)
+        
+        # Act
+        await confession_repository.save(stored_confession)
+        
+        # Assert
+        db_session_mock.execute.assert_not_called()
+        db_session_mock.add.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_save_diffs_children(self, confession_repository, db_session_mock, stored_confession):
+        """Тест точечного сохранения изменений вложений и опроса."""
+        # Arrange
+        self._assign_ids_on_flush(db_session_mock)
+        confession_repository._remember(stored_confession)
+        stored_confession.attachments[0].caption = "Новая подпись"
+        del stored_confession.attachments[1]
+        stored_confession.attachments.append(Attachment(url="https://example.com/3.mp4", type=AttachmentType.VIDEO))
+        stored_confession.poll.options[1].text = "Скорее нет"
+        
+        # Act
+        result = await confession_repository.save(stored_confession)
+        
+        # Assert
+        statements = [call.args[0] for call in db_session_mock.execute.call_args_list]
+        described = sorted((type(stmt).__name__, stmt.table.name) for stmt in statements)
+        assert described == [("Delete", "attachments"), ("Update", "attachments"), ("Update", "poll_options")]
+        
+        option_update = next(stmt for stmt in statements if stmt.table.name == "poll_options")
+        assert set(option_update.compile().params) == {"text", "id_1"}
+        
+        db_session_mock.add.assert_called_once()
+        assert isinstance(db_session_mock.add.call_args.args[0], AttachmentModel)
+        assert result.attachments[-1].id is not None
+    
+    @pytest.mark.asyncio
+    async def test_save_changed_tags(self, confession_repository, db_session_mock, stored_confession):
+        """Тест перезаписи связей с тегами только при изменении набора тегов."""
+        # Arrange
+        confession_repository._remember(stored_confession)
+        stored_confession.tags.append(Tag(name="новый"))
+        
+        with patch.object(confession_repository, '_save_tags', new_callable=AsyncMock) as save_tags_mock:
+            # Act
+            await confession_repository.save(stored_confession)
+        
+        # Assert
+        save_tags_mock.assert_called_once_with(1, stored_confession.tags, replace=True)
+    
+    @pytest.mark.asyncio
+    async def test_save_changed_tags_of_published_confession_recounts(
+        self, confession_repository, db_session_mock, stored_confession
+    ):
+        """Тест: у опубликованного признания счетчики снимаются со старых тегов и добавляются новым."""
+        # Arrange
+        stored_confession.status = ConfessionStatus.PUBLISHED
+        confession_repository._remember(stored_confession)
+        stored_confession.tags = [Tag(name="новый")]
+        calls = []
+        
+        with patch.object(
+            confession_repository, '_count_tags', new_callable=AsyncMock
+        ) as count_tags_mock, patch.object(
+            confession_repository, '_save_tags', new_callable=AsyncMock
+        ) as save_tags_mock:
+            count_tags_mock.side_effect = lambda ids, delta: calls.append(("count", delta))
+            save_tags_mock.side_effect = lambda *args, **kwargs: calls.append(("tags", None))
+            # Act
+            await confession_repository.save(stored_confession)
+        
+        # Assert
+        assert calls == [("count", -1), ("tags", None), ("count", 1)]
+    
+    @pytest.mark.asyncio
+    async def test_save_without_snapshot_is_rejected(self, confession_repository, db_session_mock):
+        """Тест: признание, которое репозиторий не читал целиком, не сохраняется поверх текущей строки."""
+        # Arrange
+        current = MagicMock()
+        current.scalar_one_or_none.return_value = ConfessionStatus.REJECTED
+        db_session_mock.execute.return_value = current
+        
+        # Act & Assert
+        with pytest.raises(ValueError):
+            await confession_repository.save(Confession(id=1, content="Правка", status=ConfessionStatus.APPROVED))
+        db_session_mock.execute.assert_awaited_once()
+        db_session_mock.commit.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_save_after_list_page_compares_with_read_status(
+        self, confession_repository, db_session_mock, stored_confession
+    ):
+        """Тест: если статус сменили между чтением страницы и save(), решение не перезатирает его."""
+        # Arrange
+        page_result = MagicMock()
+        page_result.scalars.return_value.all.return_value = ["model1"]
+        lost_race = MagicMock()
+        lost_race.scalar_one_or_none.return_value = None
+        current = MagicMock()
+        current.scalar_one_or_none.return_value = ConfessionStatus.REJECTED
+        db_session_mock.execute.side_effect = [page_result, lost_race, current]
+        
+        with patch.object(confession_repository, '_map_to_domain', return_value=stored_confession):
+            page = await confession_repository.list_page(ConfessionStatus.PENDING, limit=10)
+        
+        # Модератор отклонил признание, пока шла модерация
+        confession = page.items[0]
+        confession.status = ConfessionStatus.APPROVED
+        
+        # Act & Assert
+        with pytest.raises(StatusTransitionError) as error:
+            await confession_repository.save(confession)
+        update_stmt = db_session_mock.execute.call_args_list[1].args[0]
+        assert update_stmt.compile(dialect=postgresql.dialect()).params["status_1"] == ConfessionStatus.PENDING
+        assert error.value.current == ConfessionStatus.REJECTED
+        db_session_mock.commit.assert_not_called()
+    
     @pytest.mark.asyncio
     async def test_get_by_id(self, confession_repository, db_session_mock):
         """Тест получения признания по ID."""
@@ -170,6 +555,38 @@ class TestSqlAlchemyConfessionRepository:
             assert result.content == test_confession.content
             assert result.status == test_confession.status
     
+    @pytest.mark.asyncio
+    async def test_get_by_id_summary_projection_skips_snapshot(self, confession_repository, db_session_mock):
+        """Тест: неполная проекция не запоминается как снимок для диффа при сохранении."""
+        # Arrange
+        result_mock = MagicMock()
+        result_mock.scalars.return_value.first.return_value = "model_instance"
+        db_session_mock.execute = AsyncMock(return_value=result_mock)
+        
+        with patch.object(confession_repository, '_map_to_domain', return_value=Confession(id=1, content="Кратко")):
+            # Act
+            result = await confession_repository.get_by_id(1, ConfessionProjection.SUMMARY)
+        
+        # Assert
+        assert result.id == 1
+        assert 1 not in confession_repository._snapshots
+    
+    def test_summary_projection_query(self, confession_repository):
+        """Тест: краткая проекция читает только колонки ленты и теги."""
+        # Arrange
+        stmt = select(ConfessionModel)
+        
+        # Act
+        summary = confession_repository._with_relations(stmt, ConfessionProjection.SUMMARY)
+        full = confession_repository._with_relations(stmt, ConfessionProjection.FULL)
+        
+        # Assert
+        summary_relations = {getattr(option.path[0], "key", None) for option in summary._with_options if option.path}
+        full_relations = {getattr(option.path[0], "key", None) for option in full._with_options if option.path}
+        assert "tags" in summary_relations
+        assert not {"attachments", "poll", "moderation_logs", "comments"} & summary_relations
+        assert {"moderation_logs", "comments", "published_record"} <= full_relations
+    
     @pytest.mark.asyncio
     async def test_get_by_id_not_found(self, confession_repository, db_session_mock):
         """Тест получения несуществующего признания по ID."""
@@ -192,6 +609,40 @@ class TestSqlAlchemyConfessionRepository:
         # Проверяем результат
         assert result is None
     
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("votes, poll_votes", [(7, 7), (None, None)])
+    async def test_get_revision(self, confession_repository, db_session_mock, votes, poll_votes):
+        """Тест получения версии признания одним запросом без загрузки связей."""
+        # Arrange
+        updated_at = datetime(2025, 5, 1, 12, 0)
+        result_mock = MagicMock()
+        result_mock.first.return_value = (ConfessionStatus.PUBLISHED, 3, updated_at, votes)
+        db_session_mock.execute = AsyncMock(return_value=result_mock)
+        
+        # Act
+        result = await confession_repository.get_revision(5)
+        
+        # Assert
+        db_session_mock.execute.assert_called_once()
+        sql = str(db_session_mock.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+        assert "sum(coalesce(poll_options.vote_count" in sql
+        assert "polls.confession_id = confessions.id" in sql
+        assert "attachments" not in sql and "tags" not in sql
+        assert result == ConfessionRevision(
+            id=5, status=ConfessionStatus.PUBLISHED, version=3, updated_at=updated_at, poll_votes=poll_votes
+        )
+    
+    @pytest.mark.asyncio
+    async def test_get_revision_not_found(self, confession_repository, db_session_mock):
+        """Тест версии несуществующего признания."""
+        # Arrange
+        result_mock = MagicMock()
+        result_mock.first.return_value = None
+        db_session_mock.execute = AsyncMock(return_value=result_mock)
+        
+        # Act & Assert
+        assert await confession_repository.get_revision(999) is None
+    
     @pytest.mark.asyncio
     async def test_list_by_status(self, confession_repository, db_session_mock):
         """Тест получения списка признаний по статусу."""
@@ -232,46 +683,350 @@ class TestSqlAlchemyConfessionRepository:
             assert result[0].id == 1
             assert result[1].id == 2
     
+    @pytest.mark.asyncio
+    async def test_list_page_has_more(self, confession_repository, db_session_mock):
+        """Тест получения страницы признаний, за которой есть следующая."""
+        # Arrange
+        test_confessions = [
+            Confession(id=3, content="Третье", created_at=datetime(2025, 5, 3)),
+            Confession(id=2, content="Второе", created_at=datetime(2025, 5, 2)),
+        ]
+        
+        # Репозиторий запрашивает limit + 1 строк, чтобы узнать о следующей странице
+        result_mock = MagicMock()
+        result_mock.scalars.return_value.all.return_value = ["model3", "model2", "model1"]
+        db_session_mock.execute = AsyncMock(return_value=result_mock)
+        
+        with patch.object(confession_repository, '_map_to_domain', side_effect=test_confessions):
+            # Act
+            page = await confession_repository.list_page(ConfessionStatus.PUBLISHED, limit=2)
+        
+        # Assert
+        db_session_mock.execute.assert_called_once()
+        assert [confession.id for confession in page.items] == [3, 2]
+        assert page.next_cursor == PageCursor(created_at=datetime(2025, 5, 2), id=2)
+    
+    @pytest.mark.asyncio
+    async def test_list_page_last_page(self, confession_repository, db_session_mock):
+        """Тест получения последней страницы признаний."""
+        # Arrange
+        result_mock = MagicMock()
+        result_mock.scalars.return_value.all.return_value = ["model1"]
+        db_session_mock.execute = AsyncMock(return_value=result_mock)
+        
+        with patch.object(
+            confession_repository,
+            '_map_to_domain',
+            return_value=Confession(id=1, content="Первое", created_at=datetime(2025, 5, 1)),
+        ):
+            # Act
+            page = await confession_repository.list_page(
+                None, limit=2, cursor=PageCursor(created_at=datetime(2025, 5, 2), id=2)
+            )
+        
+        # Assert
+        assert len(page.items) == 1
+        assert page.next_cursor is None
+    
+    @pytest.mark.asyncio
+    async def test_list_page_by_tag_query(self, confession_repository, db_session_mock):
+        """Тест ленты по тегу: только опубликованные признания с тегом, keyset по (created_at, id)."""
+        # Arrange
+        result_mock = MagicMock()
+        result_mock.scalars.return_value.all.return_value = []
+        db_session_mock.execute = AsyncMock(return_value=result_mock)
+        
+        # Act
+        page = await confession_repository.list_page_by_tag(
+            "коты", limit=20, cursor=PageCursor(created_at=datetime(2025, 5, 2), id=2)
+        )
+        
+        # Assert
+        compiled = db_session_mock.execute.call_args.args[0].compile(dialect=postgresql.dialect())
+        sql = str(compiled)
+        assert "JOIN confession_tag ON confession_tag.confession_id = confessions.id" in sql
+        assert "tags.name = %(name_1)s" in sql
+        assert "(confessions.created_at, confessions.id) < (" in sql
+        assert compiled.params["name_1"] == "коты"
+        assert compiled.params["status_1"] == ConfessionStatus.PUBLISHED
+        assert page.items == []
+        assert page.next_cursor is None
+    
+    def test_keyset_query(self, confession_repository):
+        """Тест условия курсора и порядка ленты в запросе."""
+        # Arrange
+        cursor = PageCursor(created_at=datetime(2025, 5, 2), id=2)
+        
+        # Act
+        stmt = confession_repository._keyset(select(ConfessionModel), ConfessionStatus.PUBLISHED, cursor)
+        sql = str(stmt)
+        
+        # Assert
+        assert "(confessions.created_at, confessions.id) < (" in sql
+        assert "ORDER BY confessions.created_at DESC, confessions.id DESC" in sql
+    
+    @pytest.mark.asyncio
+    async def test_search_has_more(self, confession_repository, db_session_mock):
+        """Тест страницы поиска: ранги, фрагменты и курсор следующей страницы."""
+        # Arrange
+        result_mock = MagicMock()
+        result_mock.all.return_value = [
+            ("model3", 0.5, f"кот {HIGHLIGHT_START}спит{HIGHLIGHT_STOP}"),
+            ("model2", 0.25, f"{HIGHLIGHT_START}спал{HIGHLIGHT_STOP} кот"),
+            ("model1", 0.1, "лишняя строка"),
+        ]
+        db_session_mock.execute = AsyncMock(return_value=result_mock)
+        test_confessions = [Confession(id=3, content="кот спит"), Confession(id=2, content="спал кот")]
+        
+        with patch.object(confession_repository, '_map_to_domain', side_effect=test_confessions):
+            # Act
+            page = await confession_repository.search("спать", ConfessionStatus.PUBLISHED, limit=2)
+        
+        # Assert
+        assert [hit.confession.id for hit in page.items] == [3, 2]
+        assert [hit.rank for hit in page.items] == [0.5, 0.25]
+        assert page.items[0].snippet == "кот <mark>спит</mark>"
+        assert page.next_cursor == SearchCursor(rank=0.25, id=2)
+    
+    @pytest.mark.asyncio
+    async def test_search_query(self, confession_repository, db_session_mock):
+        """Тест запроса поиска: GIN-условие, ограничение кандидатов, курсор и подсветка только для страницы."""
+        # Arrange
+        result_mock = MagicMock()
+        result_mock.all.return_value = []
+        db_session_mock.execute = AsyncMock(return_value=result_mock)
+        
+        # Act
+        page = await confession_repository.search(
+            "кот -собака", ConfessionStatus.PUBLISHED, cursor=SearchCursor(rank=0.5, id=7), limit=20
+        )
+        
+        # Assert
+        sql = str(db_session_mock.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+        assert "confessions.search_vector @@ (websearch_to_tsquery('russian'::regconfig" in sql
+        assert "websearch_to_tsquery('english'::regconfig" in sql
+        assert "ts_rank_cd(confessions.search_vector" in sql
+        assert "(candidates.rank, candidates.id) < (" in sql
+        assert sql.count("ts_headline(") == 1
+        assert "confessions.status = " in sql
+        assert page.items == []
+        assert page.next_cursor is None
+    
+    def test_format_snippet_escapes_html(self):
+        """Тест экранирования HTML во фрагменте и замены маркеров совпадений на <mark>."""
+        # Act
+        snippet = SqlAlchemyConfessionRepository._format_snippet(
+            f"<b>{HIGHLIGHT_START}кот{HIGHLIGHT_STOP}</b> & пёс"
+        )
+        
+        # Assert
+        assert snippet == "&lt;b&gt;<mark>кот</mark>&lt;/b&gt; &amp; пёс"
+    
+    @pytest.mark.asyncio
+    async def test_stream_by_status(self, confession_repository, db_session_mock):
+        """Тест потоковой выдачи признаний через серверный курсор."""
+        # Arrange
+        async def rows():
+            for model in ["model1", "model2"]:
+                yield model
+        
+        stream_result = MagicMock()
+        stream_result.scalars.return_value = rows()
+        db_session_mock.stream = AsyncMock(return_value=stream_result)
+        
+        test_confessions = [Confession(id=1, content="Первое"), Confession(id=2, content="Второе")]
+        with patch.object(confession_repository, '_map_to_domain', side_effect=test_confessions):
+            # Act
+            result = [confession async for confession in confession_repository.stream_by_status(None)]
+        
+        # Assert
+        db_session_mock.stream.assert_called_once()
+        stmt = db_session_mock.stream.call_args.args[0]
+        assert stmt.get_execution_options()["yield_per"] == STREAM_BATCH_SIZE
+        assert [confession.id for confession in result] == [1, 2]
+    
+    @staticmethod
+    def _tag_execute_mock(existing, inserted, raced=()):
+        """Мок execute: SELECT находит существующие теги, INSERT возвращает вставленные."""
+        selects = iter([existing, list(raced)])
+        
+        async def execute(stmt, *args, **kwargs):
+            result = MagicMock()
+            if isinstance(stmt, Select):
+                result.all.return_value = [(name, hash(name)) for name in next(selects)]
+            elif isinstance(stmt, Insert) and stmt.table.name == TagModel.__tablename__:
+                result.all.return_value = [(name, hash(name)) for name in inserted]
+            return result
+        
+        return AsyncMock(side_effect=execute)
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("tags_count", [2, 10, 100])
+    async def test_save_tags_round_trips_do_not_grow(self, confession_repository, db_session_mock, tags_count):
+        """Бенчмарк: число обращений к БД при сохранении тегов не зависит от их количества."""
+        # Arrange
+        names = [f"тег{i}" for i in range(tags_count)]
+        tags = [Tag(name=name) for name in names]
+        half = tags_count // 2
+        db_session_mock.execute = self._tag_execute_mock(existing=names[:half], inserted=names[half:])
+        
+        # Act
+        await confession_repository._save_tags(1, tags, replace=False)
+        
+        # Assert
+        # SELECT ... IN, INSERT ... ON CONFLICT DO NOTHING RETURNING, INSERT INTO confession_tag
+        assert db_session_mock.execute.await_count == 3
+        db_session_mock.flush.assert_not_called()
+        assert all(tag.id == hash(tag.name) for tag in tags)
+    
+    @pytest.mark.asyncio
+    async def test_save_tags_replace_and_duplicates(self, confession_repository, db_session_mock):
+        """Тест замены связей и схлопывания повторяющихся тегов."""
+        # Arrange
+        tags = [Tag(name="тест"), Tag(name="тест"), Tag(name="репозиторий")]
+        db_session_mock.execute = self._tag_execute_mock(existing=["тест", "репозиторий"], inserted=[])
+        
+        # Act
+        await confession_repository._save_tags(1, tags, replace=True)
+        
+        # Assert
+        # DELETE старых связей, SELECT ... IN, INSERT INTO confession_tag
+        assert db_session_mock.execute.await_count == 3
+        link_insert = db_session_mock.execute.await_args_list[-1].args[0]
+        assert link_insert.table is confession_tag
+        assert len(link_insert.compile().params) == 4
+    
+    @pytest.mark.asyncio
+    async def test_save_tags_concurrent_insert(self, confession_repository, db_session_mock):
+        """Тест тега, созданного конкурентом между поиском и вставкой."""
+        # Arrange
+        tags = [Tag(name="новый"), Tag(name="гонка")]
+        db_session_mock.execute = self._tag_execute_mock(existing=[], inserted=["новый"], raced=["гонка"])
+        
+        # Act
+        await confession_repository._save_tags(1, tags, replace=False)
+        
+        # Assert
+        assert db_session_mock.execute.await_count == 4
+        assert tags[1].id == hash("гонка")
+    
     @pytest.mark.asyncio
     async def test_update_status(self, confession_repository, db_session_mock):
-        """Тест обновления статуса признания."""
+        """Тест: статус меняется одним UPDATE ... WHERE status IN (...) RETURNING без предварительного SELECT."""
         # Arrange
-        # Мокаем модель
-        model_mock = MagicMock()
+        result_mock = MagicMock()
+        result_mock.scalar_one_or_none.return_value = 3
+        db_session_mock.execute = AsyncMock(return_value=result_mock)
         
-        # Мокаем execute
+        # Act
+        result = await confession_repository.update_status(1, ConfessionStatus.PUBLISHED)
+        
+        # Assert
+        assert result is True
+        update_stmt, count_stmt = [call.args[0] for call in db_session_mock.execute.call_args_list]
+        compiled = update_stmt.compile(dialect=postgresql.dialect())
+        sql = str(compiled)
+        assert sql.startswith("UPDATE confessions SET status=")
+        assert "version=(confessions.version + " in sql
+        assert "RETURNING confessions.version" in sql
+        # В PUBLISHED можно перейти только из APPROVED
+        assert compiled.params["status_1"] == [ConfessionStatus.APPROVED]
+        # Опубликованное признание попадает в счетчики своих тегов в той же транзакции
+        assert count_stmt.table.name == "tag_counts"
+        db_session_mock.commit.assert_awaited_once()
+    
+    @pytest.mark.asyncio
+    async def test_update_status_expected(self, confession_repository, db_session_mock):
+        """Тест: с expected статус сравнивается с ним (compare-and-set)."""
+        # Arrange
         result_mock = MagicMock()
-        scalars_mock = MagicMock()
-        first_mock = MagicMock(return_value=model_mock)
-        scalars_mock.first = first_mock
-        result_mock.scalars = MagicMock(return_value=scalars_mock)
+        result_mock.scalar_one_or_none.return_value = 3
         db_session_mock.execute = AsyncMock(return_value=result_mock)
         
         # Act
-        await confession_repository.update_status(1, ConfessionStatus.APPROVED)
+        await confession_repository.update_status(1, ConfessionStatus.APPROVED, expected=ConfessionStatus.REJECTED)
         
         # Assert
-        # Проверяем, что модель была обновлена
-        assert model_mock.status == ConfessionStatus.APPROVED
-        # Проверяем, что сессия была закоммичена
-        db_session_mock.commit.assert_called_once()
+        compiled = db_session_mock.execute.call_args.args[0].compile(dialect=postgresql.dialect())
+        assert compiled.params["status_1"] == [ConfessionStatus.REJECTED]
+    
+    @pytest.mark.asyncio
+    async def test_update_status_with_log(self, confession_repository, db_session_mock):
+        """Тест: запись о модерации вставляется в той же транзакции, что и смена статуса."""
+        # Arrange
+        result_mock = MagicMock()
+        result_mock.scalar_one_or_none.return_value = 3
+        db_session_mock.execute = AsyncMock(return_value=result_mock)
+        self._assign_ids_on_flush(db_session_mock)
+        log = ModerationLog(decision=ConfessionStatus.APPROVED, moderator="LLM")
+        
+        # Act
+        await confession_repository.update_status(
+            1, ConfessionStatus.APPROVED, expected=ConfessionStatus.PENDING, log=log
+        )
+        
+        # Assert
+        log_model = db_session_mock.add.call_args.args[0]
+        assert isinstance(log_model, ModerationLogModel)
+        assert log_model.confession_id == 1
+        assert log.id is not None
+        db_session_mock.commit.assert_awaited_once()
+    
+    @pytest.mark.asyncio
+    async def test_update_status_forbidden_expected(self, confession_repository, db_session_mock):
+        """Тест: запрещенный переход из expected отклоняется без запроса к БД."""
+        # Act & Assert
+        with pytest.raises(StatusTransitionError):
+            await confession_repository.update_status(
+                1, ConfessionStatus.PENDING, expected=ConfessionStatus.PUBLISHED
+            )
+        db_session_mock.execute.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_update_status_conflict(self, confession_repository, db_session_mock):
+        """Тест: конкурент уже опубликовал признание - отклонение не перезатирает PUBLISHED."""
+        # Arrange
+        not_updated = MagicMock()
+        not_updated.scalar_one_or_none.return_value = None
+        current = MagicMock()
+        current.scalar_one_or_none.return_value = ConfessionStatus.PUBLISHED
+        db_session_mock.execute = AsyncMock(side_effect=[not_updated, current])
+        
+        # Act & Assert
+        with pytest.raises(StatusTransitionError) as error:
+            await confession_repository.update_status(1, ConfessionStatus.REJECTED)
+        assert error.value.current == ConfessionStatus.PUBLISHED
+        db_session_mock.commit.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_update_status_same_status_is_idempotent(self, confession_repository, db_session_mock):
+        """Тест: повторная смена на уже установленный статус не считается конфликтом."""
+        # Arrange
+        not_updated = MagicMock()
+        not_updated.scalar_one_or_none.return_value = None
+        current = MagicMock()
+        current.scalar_one_or_none.return_value = ConfessionStatus.APPROVED
+        db_session_mock.execute = AsyncMock(side_effect=[not_updated, current])
+        
+        # Act
+        result = await confession_repository.update_status(1, ConfessionStatus.APPROVED)
+        
+        # Assert
+        assert result is True
     
     @pytest.mark.asyncio
     async def test_update_status_not_found(self, confession_repository, db_session_mock):
         """Тест обновления статуса несуществующего признания."""
         # Arrange
-        # Мокаем execute
         result_mock = MagicMock()
-        scalars_mock = MagicMock()
-        first_mock = MagicMock(return_value=None)
-        scalars_mock.first = first_mock
-        result_mock.scalars = MagicMock(return_value=scalars_mock)
+        result_mock.scalar_one_or_none.return_value = None
         db_session_mock.execute = AsyncMock(return_value=result_mock)
         
         # Act
-        await confession_repository.update_status(999, ConfessionStatus.APPROVED)
+        result = await confession_repository.update_status(999, ConfessionStatus.APPROVED)
         
         # Assert
+        assert result is False
         # Проверяем, что сессия не была закоммичена
         db_session_mock.commit.assert_not_called()
 
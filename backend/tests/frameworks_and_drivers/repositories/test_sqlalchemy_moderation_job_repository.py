@@ -0,0 +1,155 @@
+"""
+Тесты для SqlAlchemyModerationJobRepository.
+"""
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from datetime import datetime
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.entities.confession import ModerationJob
+from src.entities.enums import ModerationJobStatus
+from src.frameworks_and_drivers.repositories.sqlalchemy_moderation_job_repository import (
+    SqlAlchemyModerationJobRepository,
+)
+
+
+def _job_row(**overrides):
+    """Создает строку результата с колонками moderation_jobs."""
+    now = datetime.now()
+    values = dict(
+        id=7,
+        confession_id=1,
+        status=ModerationJobStatus.QUEUED,
+        attempts=0,
+        last_error=None,
+        available_at=now,
+        locked_at=None,
+        created_at=now,
+        updated_at=now,
+    )
+    values.update(overrides)
+    return MagicMock(**values)
+
+
+def _result(row):
+    """Создает результат execute, возвращающий одну строку (или None)."""
+    result = MagicMock()
+    result.first.return_value = row
+    return result
+
+
+def _sql(statement) -> str:
+    """Компилирует запрос в SQL диалекта PostgreSQL."""
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+class TestSqlAlchemyModerationJobRepository:
+    """Тесты для SqlAlchemyModerationJobRepository."""
+
+    @pytest.fixture
+    def db_session_mock(self):
+        """Создает мок сессии SQLAlchemy."""
+        return AsyncMock(spec=AsyncSession)
+
+    @pytest.fixture
+    def repository(self, db_session_mock):
+        """Создает экземпляр репозитория с мок сессией."""
+        return SqlAlchemyModerationJobRepository(db_session_mock)
+
+    @pytest.mark.asyncio
+    async def test_enqueue_inserts_job(self, repository, db_session_mock):
+        """Тест постановки задачи в очередь одним INSERT ... ON CONFLICT DO NOTHING."""
+        # Arrange
+        db_session_mock.execute.return_value = _result(_job_row())
+
+        # Act
+        job = await repository.enqueue(1)
+
+        # Assert
+        assert job.id == 7
+        assert job.status == ModerationJobStatus.QUEUED
+        assert db_session_mock.execute.await_count == 1
+        assert "ON CONFLICT" in _sql(db_session_mock.execute.call_args.args[0])
+        db_session_mock.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_enqueue_returns_active_job(self, repository, db_session_mock):
+        """Тест: при уже стоящей в очереди задаче возвращается она."""
+        # Arrange
+        db_session_mock.execute.side_effect = [
+            _result(None),
+            _result(_job_row(id=3, status=ModerationJobStatus.RUNNING)),
+        ]
+
+        # Act
+        job = await repository.enqueue(1)
+
+        # Assert
+        assert job.id == 3
+        assert job.status == ModerationJobStatus.RUNNING
+        assert db_session_mock.execute.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_claim_skips_locked_rows(self, repository, db_session_mock):
+        """Тест: задача забирается одним UPDATE с подзапросом FOR UPDATE SKIP LOCKED."""
+        # Arrange
+        db_session_mock.execute.return_value = _result(_job_row(status=ModerationJobStatus.RUNNING, attempts=1))
+
+        # Act
+        job = await repository.claim(lease_seconds=300)
+
+        # Assert
+        sql = _sql(db_session_mock.execute.call_args.args[0])
+        assert sql.startswith("UPDATE moderation_jobs")
+        assert "FOR UPDATE SKIP LOCKED" in sql
+        assert "RETURNING" in sql
+        assert job.status == ModerationJobStatus.RUNNING
+        assert job.attempts == 1
+        db_session_mock.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_claim_empty_queue(self, repository, db_session_mock):
+        """Тест: при пустой очереди возвращается None."""
+        # Arrange
+        db_session_mock.execute.return_value = _result(None)
+
+        # Act & Assert
+        assert await repository.claim(lease_seconds=300) is None
+
+    @pytest.mark.asyncio
+    async def test_fail_sets_status_and_error(self, repository, db_session_mock):
+        """Тест: проваленная задача получает статус FAILED и текст ошибки."""
+        # Arrange
+        locked_at = datetime(2026, 10, 18, 12, 0, 0)
+        db_session_mock.execute.return_value = _result(MagicMock(id=7))
+
+        # Act
+        updated = await repository.fail(ModerationJob(id=7, locked_at=locked_at), "provider down")
+
+        # Assert
+        params = db_session_mock.execute.call_args.args[0].compile().params
+        assert updated is True
+        assert params["status"] == ModerationJobStatus.FAILED
+        assert params["last_error"] == "provider down"
+        db_session_mock.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_complete_requires_lease(self, repository, db_session_mock):
+        """Тест: задачу завершает только воркер, чья аренда еще действует."""
+        # Arrange
+        locked_at = datetime(2026, 10, 18, 12, 0, 0)
+        db_session_mock.execute.return_value = _result(None)
+
+        # Act
+        updated = await repository.complete(ModerationJob(id=7, locked_at=locked_at))
+
+        # Assert
+        statement = db_session_mock.execute.call_args.args[0]
+        sql = _sql(statement)
+        params = statement.compile().params
+        assert "moderation_jobs.status = %(status_1)s" in sql
+        assert "moderation_jobs.locked_at = %(locked_at_1)s" in sql
+        assert params["status_1"] == ModerationJobStatus.RUNNING
+        assert params["locked_at_1"] == locked_at
+        assert updated is False
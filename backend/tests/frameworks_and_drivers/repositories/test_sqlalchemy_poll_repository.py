@@ -0,0 +1,66 @@
+"""
+Тесты для SqlAlchemyPollRepository.
+"""
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.frameworks_and_drivers.models.confession import PollModel, PollOptionModel
+from src.frameworks_and_drivers.repositories.sqlalchemy_poll_repository import SqlAlchemyPollRepository
+
+
+class TestSqlAlchemyPollRepository:
+    """Тесты для SqlAlchemyPollRepository."""
+
+    @pytest.fixture
+    def db_session_mock(self):
+        """Создает мок сессии SQLAlchemy."""
+        return AsyncMock(spec=AsyncSession)
+
+    @pytest.fixture
+    def repository(self, db_session_mock):
+        """Создает экземпляр репозитория с мок сессией."""
+        return SqlAlchemyPollRepository(db_session_mock)
+
+    @pytest.mark.asyncio
+    async def test_add_votes_is_atomic_increment(self, repository, db_session_mock):
+        """Тест: голоса пишутся одним executemany UPDATE с приращением счетчика в порядке ID вариантов."""
+        # Act
+        await repository.add_votes({7: 3, 2: 1, 5: 0})
+
+        # Assert
+        statement, params = db_session_mock.execute.call_args.args
+        sql = str(statement.compile(dialect=postgresql.dialect()))
+        assert "SET vote_count=(poll_options.vote_count + %(increment)s)" in sql
+        assert "WHERE poll_options.id = %(option_id)s" in sql
+        assert params == [{"option_id": 2, "increment": 1}, {"option_id": 7, "increment": 3}]
+        db_session_mock.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_add_votes_nothing_to_write(self, repository, db_session_mock):
+        """Тест: пустые приращения не порождают запросов."""
+        # Act
+        await repository.add_votes({1: 0})
+
+        # Assert
+        db_session_mock.execute.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_get_by_id(self, repository, db_session_mock):
+        """Тест получения опроса с вариантами в порядке ID."""
+        # Arrange
+        poll_model = PollModel(id=1, question="Вопрос?", type="regular", allows_multiple_answers=False)
+        poll_model.options = [
+            PollOptionModel(id=2, poll_id=1, text="Нет", vote_count=None),
+            PollOptionModel(id=1, poll_id=1, text="Да", vote_count=4),
+        ]
+        result = MagicMock()
+        result.scalars.return_value.first.return_value = poll_model
+        db_session_mock.execute.return_value = result
+
+        # Act
+        poll = await repository.get_by_id(1)
+
+        # Assert
+        assert [(option.id, option.vote_count) for option in poll.options] == [(1, 4), (2, 0)]
@@ -0,0 +1,138 @@
+"""
+Тесты для SqlAlchemyPublicationRepository.
+"""
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from datetime import datetime, timedelta
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.entities.enums import PublicationStatus
+from src.frameworks_and_drivers.repositories.sqlalchemy_publication_repository import (
+    SqlAlchemyPublicationRepository,
+    publish_lag,
+)
+
+
+def _publication_row(**overrides):
+    """Создает строку результата с колонками publication_outbox."""
+    now = datetime.now()
+    values = dict(
+        id=11,
+        confession_id=1,
+        channel_id="@falt_conf",
+        status=PublicationStatus.SENDING,
+        attempts=1,
+        last_error=None,
+        telegram_message_id=None,
+        poll_message_id=None,
+        available_at=now,
+        locked_at=now,
+        created_at=now,
+        sent_at=None,
+    )
+    values.update(overrides)
+    return MagicMock(**values)
+
+
+def _result(row):
+    """Создает результат execute, возвращающий одну строку (или None)."""
+    result = MagicMock()
+    result.first.return_value = row
+    return result
+
+
+def _sql(statement) -> str:
+    """Компилирует запрос в SQL диалекта PostgreSQL."""
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+class TestSqlAlchemyPublicationRepository:
+    """Тесты для SqlAlchemyPublicationRepository."""
+
+    @pytest.fixture
+    def db_session_mock(self):
+        """Создает мок сессии SQLAlchemy."""
+        return AsyncMock(spec=AsyncSession)
+
+    @pytest.fixture
+    def repository(self, db_session_mock):
+        """Создает экземпляр репозитория с мок сессией."""
+        return SqlAlchemyPublicationRepository(db_session_mock)
+
+    @pytest.mark.asyncio
+    async def test_claim_skips_locked_rows(self, repository, db_session_mock):
+        """Тест: сообщение забирается одним UPDATE с подзапросом FOR UPDATE SKIP LOCKED."""
+        # Arrange
+        db_session_mock.execute.return_value = _result(_publication_row())
+
+        # Act
+        publication = await repository.claim(lease_seconds=120)
+
+        # Assert
+        sql = _sql(db_session_mock.execute.call_args.args[0])
+        assert sql.startswith("UPDATE publication_outbox")
+        assert "FOR UPDATE SKIP LOCKED" in sql
+        assert "RETURNING" in sql
+        assert publication.id == 11
+        assert publication.status == PublicationStatus.SENDING
+        db_session_mock.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_claim_empty_queue(self, repository, db_session_mock):
+        """Тест: при пустой очереди возвращается None."""
+        # Arrange
+        db_session_mock.execute.return_value = _result(None)
+
+        # Act & Assert
+        assert await repository.claim(lease_seconds=120) is None
+
+    @pytest.mark.asyncio
+    async def test_record_progress_updates_only_sent_parts(self, repository, db_session_mock):
+        """Тест: запоминаются только переданные ID сообщений."""
+        # Act
+        await repository.record_progress(11, poll_message_id="poll_456")
+
+        # Assert
+        params = db_session_mock.execute.call_args.args[0].compile().params
+        assert params["poll_message_id"] == "poll_456"
+        assert "telegram_message_id" not in params
+        db_session_mock.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_complete_sets_sent_and_observes_lag(self, repository, db_session_mock):
+        """Тест: доставленное сообщение получает статус SENT, а время в очереди попадает в метрику."""
+        # Arrange
+        result = MagicMock()
+        result.scalar_one_or_none.return_value = datetime.now() - timedelta(seconds=90)
+        db_session_mock.execute.return_value = result
+        lag_count, lag_sum = publish_lag.count, publish_lag.sum
+
+        # Act
+        await repository.complete(11)
+
+        # Assert
+        params = db_session_mock.execute.call_args.args[0].compile().params
+        assert params["status"] == PublicationStatus.SENT
+        assert params["sent_at"] is not None
+        db_session_mock.commit.assert_awaited_once()
+        assert publish_lag.count == lag_count + 1
+        assert publish_lag.sum - lag_sum >= 90
+
+    @pytest.mark.asyncio
+    async def test_queue_stats(self, repository, db_session_mock):
+        """Тест: глубина очереди считается только по неотправленным сообщениям."""
+        # Arrange
+        oldest = datetime.now()
+        result = MagicMock()
+        result.one.return_value = (3, oldest)
+        db_session_mock.execute.return_value = result
+
+        # Act
+        stats = await repository.queue_stats()
+
+        # Assert
+        assert stats.depth == 3
+        assert stats.oldest_available_at == oldest
+        sql = _sql(db_session_mock.execute.call_args.args[0])
+        assert "publication_outbox.status IN" in sql
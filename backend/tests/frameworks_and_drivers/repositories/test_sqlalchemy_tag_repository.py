@@ -0,0 +1,70 @@
+"""
+Тесты для SqlAlchemyTagRepository.
+"""
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.entities.confession import Tag, TagCount
+from src.frameworks_and_drivers.repositories.sqlalchemy_tag_repository import SqlAlchemyTagRepository
+
+
+class TestSqlAlchemyTagRepository:
+    """Тесты для SqlAlchemyTagRepository."""
+
+    @pytest.fixture
+    def db_session_mock(self):
+        """Создает мок сессии SQLAlchemy."""
+        return AsyncMock(spec=AsyncSession)
+
+    @pytest.fixture
+    def repository(self, db_session_mock):
+        """Создает экземпляр репозитория с мок сессией."""
+        return SqlAlchemyTagRepository(db_session_mock)
+
+    @pytest.mark.asyncio
+    async def test_list_popular_reads_counters(self, repository, db_session_mock):
+        """Тест: популярные теги читаются из счетчиков по индексу, без COUNT(*) по признаниям."""
+        # Arrange
+        result = MagicMock()
+        result.all.return_value = [(3, "коты", 12), (1, "учеба", 5)]
+        db_session_mock.execute.return_value = result
+
+        # Act
+        tags = await repository.list_popular(2)
+
+        # Assert
+        assert tags == [TagCount(tag=Tag(id=3, name="коты"), count=12), TagCount(tag=Tag(id=1, name="учеба"), count=5)]
+        sql = str(db_session_mock.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+        assert "FROM tag_counts JOIN tags ON tags.id = tag_counts.tag_id" in sql
+        assert "ORDER BY tag_counts.published_count DESC, tag_counts.tag_id DESC" in sql
+        assert "count(" not in sql.lower()
+
+    @pytest.mark.asyncio
+    async def test_get_or_create_reads_tag_created_concurrently(self, repository, db_session_mock):
+        """Тест: если тег уже создан другим запросом, вставка пропускается и тег дочитывается."""
+        # Arrange
+        inserted, existing = MagicMock(), MagicMock()
+        inserted.scalar_one_or_none.return_value = None
+        existing.scalar_one.return_value = 7
+        db_session_mock.execute.side_effect = [inserted, existing]
+
+        # Act
+        tag = await repository.get_or_create("коты")
+
+        # Assert
+        assert tag == Tag(id=7, name="коты")
+        insert_sql = str(db_session_mock.execute.call_args_list[0].args[0].compile(dialect=postgresql.dialect()))
+        assert "ON CONFLICT (name) DO NOTHING" in insert_sql
+        db_session_mock.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_get_by_names_empty(self, repository, db_session_mock):
+        """Тест: пустой список имен не порождает запроса."""
+        # Act
+        tags = await repository.get_by_names([])
+
+        # Assert
+        assert tags == []
+        db_session_mock.execute.assert_not_called()
@@ -2,19 +2,44 @@
 Тесты для роутера признаний.
 """
 import pytest
+from contextlib import asynccontextmanager
 from unittest.mock import AsyncMock, MagicMock, patch
 from datetime import datetime
 from fastapi import status
 from fastapi.testclient import TestClient
 
-from src.entities.confession import Confession, Poll, PollOption, Tag
-from src.entities.enums import AttachmentType, ConfessionStatus
+from src.entities.confession import (
+    Confession,
+    DirectPublicationError,
+    ModerationLog,
+    Poll,
+    PollOption,
+    StatusTransitionError,
+    Tag,
+)
+from src.entities.enums import AttachmentType, ConfessionProjection, ConfessionStatus, ModerationJobStatus
 from src.frameworks_and_drivers.rest_api.schemas.confession import (
     ConfessionRequest,
     ConfessionResponse,
 )
+from src.frameworks_and_drivers.dependencies import (
+    get_confession_controller,
+    get_feed_cache,
+    get_moderation_controller,
+)
+from src.frameworks_and_drivers.rest_api.http_cache import ReadThroughCache
 from src.main import app
 from src.interface_adapters.controllers import ConfessionController
+from src.interface_adapters.dto import (
+    BatchModerationResultDTO,
+    ConfessionDetailDTO,
+    ConfessionDTO,
+    ConfessionPageDTO,
+    ConfessionRevisionDTO,
+    ConfessionSearchHitDTO,
+    ConfessionSearchPageDTO,
+    ModerationJobDTO,
+)
 
 
 @pytest.fixture
@@ -132,68 +157,247 @@ def test_create_confession_with_poll(get_controller_mock, client, confession_con
     confession_controller_mock.create_confession.assert_called_once()
 
 
-@pytest.mark.skip("Endpoints are not implemented yet")
-@patch("src.frameworks_and_drivers.dependencies.get_confession_controller")
-def test_get_confession_by_id(get_controller_mock, client, confession_controller_mock, sample_confession):
+@pytest.fixture
+def revision_controller_mock(sample_confession):
+    """Мок контроллера с признанием и его версией."""
+    controller_mock = AsyncMock(spec=ConfessionController)
+    controller_mock.get_revision.return_value = ConfessionRevisionDTO(
+        id=1, status=sample_confession.status, version=2, updated_at=datetime(2025, 5, 1, 12, 0, 0)
+    )
+    controller_mock.get_confession.return_value = ConfessionDTO.model_validate(sample_confession, from_attributes=True)
+    return controller_mock
+
+
+def test_get_confession_by_id(client, sample_confession, revision_controller_mock):
     """Тест получения признания по ID через API."""
     # Arrange
-    get_controller_mock.return_value = confession_controller_mock
-    confession_controller_mock.get_confession.return_value = sample_confession
+    app.dependency_overrides[get_confession_controller] = lambda: revision_controller_mock
     
-    # Act
-    response = client.get("/api/confessions/1")
+    try:
+        # Act
+        response = client.get("/api/confessions/1")
+    finally:
+        app.dependency_overrides.clear()
     
     # Assert
     assert response.status_code == status.HTTP_200_OK
     assert response.json()["id"] == 1
     assert response.json()["content"] == sample_confession.content
+    assert "moderation_logs" not in response.json()
+    assert response.headers["etag"].startswith('"')
+    assert "last-modified" in response.headers
+    # Непубликованное признание не попадает в общие кэши
+    assert response.headers["cache-control"] == "private, no-cache"
     
-    # Проверяем, что контроллер был вызван
-    confession_controller_mock.get_confession.assert_called_once()
+    # Проверяем, что читается публичная проекция
+    revision_controller_mock.get_revision.assert_called_once_with(1)
+    revision_controller_mock.get_confession.assert_called_once()
+    assert len(revision_controller_mock.get_confession.call_args.args) == 1
 
 
-@pytest.mark.skip("Endpoints are not implemented yet")
-@patch("src.frameworks_and_drivers.dependencies.get_confession_controller")
-def test_get_confession_by_id_not_found(get_controller_mock, client, confession_controller_mock):
+@pytest.mark.parametrize("header", ["If-None-Match", "If-Modified-Since"])
+def test_get_confession_not_modified(client, revision_controller_mock, header):
+    """Тест: условный запрос к неизменившемуся признанию получает 304 без загрузки агрегата."""
+    # Arrange
+    app.dependency_overrides[get_confession_controller] = lambda: revision_controller_mock
+    
+    try:
+        first = client.get("/api/confessions/1")
+        validator = first.headers["etag"] if header == "If-None-Match" else first.headers["last-modified"]
+        revision_controller_mock.get_confession.reset_mock()
+        
+        # Act
+        response = client.get("/api/confessions/1", headers={header: validator})
+    finally:
+        app.dependency_overrides.clear()
+    
+    # Assert
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.content == b""
+    assert response.headers["etag"] == first.headers["etag"]
+    revision_controller_mock.get_confession.assert_not_called()
+
+
+def test_get_confession_changed_version(client, revision_controller_mock):
+    """Тест: после смены статуса старый ETag не совпадает и признание отдается целиком."""
+    # Arrange
+    app.dependency_overrides[get_confession_controller] = lambda: revision_controller_mock
+    
+    try:
+        etag = client.get("/api/confessions/1").headers["etag"]
+        revision_controller_mock.get_revision.return_value = ConfessionRevisionDTO(
+            id=1, status=ConfessionStatus.APPROVED, version=3
+        )
+        
+        # Act
+        response = client.get("/api/confessions/1", headers={"If-None-Match": etag})
+    finally:
+        app.dependency_overrides.clear()
+    
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["etag"] != etag
+
+
+@pytest.mark.parametrize(
+    "poll_votes, cache_control, has_last_modified",
+    [
+        (None, "public, max-age=3600, stale-while-revalidate=30", True),
+        (12, "public, max-age=5, stale-while-revalidate=30", False),
+    ],
+)
+def test_get_published_confession_cache_control(
+    client, revision_controller_mock, poll_votes, cache_control, has_last_modified
+):
+    """Тест: опубликованное признание кэшируется публично, с опросом - ненадолго и только по ETag."""
+    # Arrange
+    revision_controller_mock.get_revision.return_value = ConfessionRevisionDTO(
+        id=1,
+        status=ConfessionStatus.PUBLISHED,
+        version=4,
+        updated_at=datetime(2025, 5, 1, 12, 0, 0),
+        poll_votes=poll_votes,
+    )
+    app.dependency_overrides[get_confession_controller] = lambda: revision_controller_mock
+    
+    try:
+        # Act
+        response = client.get("/api/confessions/1")
+    finally:
+        app.dependency_overrides.clear()
+    
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["cache-control"] == cache_control
+    assert ("last-modified" in response.headers) is has_last_modified
+
+
+def test_get_confession_by_id_not_found(client):
     """Тест получения несуществующего признания по ID через API."""
     # Arrange
-    get_controller_mock.return_value = confession_controller_mock
-    confession_controller_mock.get_confession.return_value = None
+    controller_mock = AsyncMock(spec=ConfessionController)
+    controller_mock.get_revision.return_value = None
+    app.dependency_overrides[get_confession_controller] = lambda: controller_mock
     
-    # Act
-    response = client.get("/api/confessions/999")
+    try:
+        # Act
+        response = client.get("/api/confessions/999")
+    finally:
+        app.dependency_overrides.clear()
     
     # Assert
     assert response.status_code == status.HTTP_404_NOT_FOUND
+    controller_mock.get_revision.assert_called_once_with(999)
+    controller_mock.get_confession.assert_not_called()
+
+
+def test_get_confession_details(client, sample_confession):
+    """Тест получения признания целиком для админки."""
+    # Arrange
+    sample_confession.moderation_logs = [
+        ModerationLog(id=3, confession_id=1, decision=ConfessionStatus.REJECTED, moderator="LLM", reason="spam"),
+    ]
+    controller_mock = AsyncMock(spec=ConfessionController)
+    controller_mock.get_confession.return_value = ConfessionDetailDTO.model_validate(
+        sample_confession, from_attributes=True
+    )
+    app.dependency_overrides[get_confession_controller] = lambda: controller_mock
     
-    # Проверяем, что контроллер был вызван
-    confession_controller_mock.get_confession.assert_called_once()
+    try:
+        # Act
+        response = client.get("/api/confessions/1/details")
+    finally:
+        app.dependency_overrides.clear()
+    
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["moderation_logs"][0]["reason"] == "spam"
+    assert response.json()["published_record"] is None
+    controller_mock.get_confession.assert_called_once_with(1, ConfessionProjection.FULL)
 
 
-@pytest.mark.skip("Endpoints are not implemented yet")
-@patch("src.frameworks_and_drivers.dependencies.get_confession_controller")
-def test_update_confession_status(get_controller_mock, client, confession_controller_mock, sample_confession):
+def test_update_confession_status(client, sample_confession):
     """Тест обновления статуса признания через API."""
     # Arrange
-    get_controller_mock.return_value = confession_controller_mock
     sample_confession.status = ConfessionStatus.APPROVED
-    confession_controller_mock.update_status.return_value = sample_confession
+    controller_mock = AsyncMock(spec=ConfessionController)
+    controller_mock.update_status.return_value = ConfessionDTO.model_validate(sample_confession, from_attributes=True)
+    app.dependency_overrides[get_confession_controller] = lambda: controller_mock
     
     # Создаем тестовые данные
     status_data = {
         "status": "APPROVED",
     }
     
-    # Act
-    response = client.patch("/api/confessions/1/status", json=status_data)
+    try:
+        # Act
+        response = client.patch("/api/confessions/1/status", json=status_data)
+    finally:
+        app.dependency_overrides.clear()
     
     # Assert
     assert response.status_code == status.HTTP_200_OK
     assert response.json()["id"] == 1
     assert response.json()["status"] == ConfessionStatus.APPROVED.value
+    controller_mock.update_status.assert_called_once_with(1, ConfessionStatus.APPROVED, None)
+
+
+def test_update_confession_status_conflict(client):
+    """Тест: запрещенный или конкурентный переход статуса возвращает 409."""
+    # Arrange
+    controller_mock = AsyncMock(spec=ConfessionController)
+    controller_mock.update_status.side_effect = StatusTransitionError(
+        1, ConfessionStatus.PUBLISHED, ConfessionStatus.REJECTED
+    )
+    app.dependency_overrides[get_confession_controller] = lambda: controller_mock
     
-    # Проверяем, что контроллер был вызван
-    confession_controller_mock.update_status.assert_called_once()
+    try:
+        # Act
+        response = client.patch(
+            "/api/confessions/1/status",
+            json={"status": "REJECTED", "expected_status": "APPROVED"},
+        )
+    finally:
+        app.dependency_overrides.clear()
+    
+    # Assert
+    assert response.status_code == status.HTTP_409_CONFLICT
+    controller_mock.update_status.assert_called_once_with(1, ConfessionStatus.REJECTED, ConfessionStatus.APPROVED)
+
+
+def test_update_confession_status_rejects_publication(client):
+    """Тест: PATCH со статусом PUBLISHED отклоняется с 422 и указанием на /publish."""
+    # Arrange
+    controller_mock = AsyncMock(spec=ConfessionController)
+    controller_mock.update_status.side_effect = DirectPublicationError(1)
+    app.dependency_overrides[get_confession_controller] = lambda: controller_mock
+    
+    try:
+        # Act
+        response = client.patch("/api/confessions/1/status", json={"status": "PUBLISHED"})
+    finally:
+        app.dependency_overrides.clear()
+    
+    # Assert
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert "POST /api/confessions/1/publish" in response.json()["detail"]
+
+
+def test_update_confession_status_not_found(client):
+    """Тест обновления статуса несуществующего признания."""
+    # Arrange
+    controller_mock = AsyncMock(spec=ConfessionController)
+    controller_mock.update_status.return_value = None
+    app.dependency_overrides[get_confession_controller] = lambda: controller_mock
+    
+    try:
+        # Act
+        response = client.patch("/api/confessions/999/status", json={"status": "APPROVED"})
+    finally:
+        app.dependency_overrides.clear()
+    
+    # Assert
+    assert response.status_code == status.HTTP_404_NOT_FOUND
 
 
 @pytest.mark.skip("Endpoints are not implemented yet")
@@ -214,4 +418,298 @@ def test_get_confessions_by_status(get_controller_mock, client, confession_contr
     assert response.json()[0]["status"] == ConfessionStatus.PENDING.value
     
     # Проверяем, что контроллер был вызван
-    confession_controller_mock.list_by_status.assert_called_once()
\ No newline at end of file
+    confession_controller_mock.list_by_status.assert_called_once()
+
+def test_list_confessions_page_with_next_cursor(client, sample_confession):
+    """Тест постраничного получения признаний с курсором в заголовке."""
+    # Arrange
+    controller_mock = AsyncMock()
+    controller_mock.list_page.return_value = ConfessionPageDTO(
+        items=[ConfessionDTO.model_validate(sample_confession, from_attributes=True)],
+        next_cursor="next-token",
+    )
+    app.dependency_overrides[get_confession_controller] = lambda: controller_mock
+    
+    try:
+        # Act
+        response = client.get("/api/confessions/?status=PENDING&limit=1")
+    finally:
+        app.dependency_overrides.clear()
+    
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["X-Next-Cursor"] == "next-token"
+    assert [item["id"] for item in response.json()] == [1]
+    assert "attachments" not in response.json()[0]
+    query = controller_mock.list_page.call_args.args[0]
+    assert query.status == ConfessionStatus.PENDING
+    assert query.limit == 1
+    assert response.headers["cache-control"] == "private, no-cache"
+
+
+def test_list_confessions_not_modified(client, sample_confession):
+    """Тест: страница с тем же содержимым отвечает 304 на If-None-Match."""
+    # Arrange
+    sample_confession.status = ConfessionStatus.PUBLISHED
+    controller_mock = AsyncMock()
+    controller_mock.list_page.return_value = ConfessionPageDTO(
+        items=[ConfessionDTO.model_validate(sample_confession, from_attributes=True)],
+    )
+    app.dependency_overrides[get_confession_controller] = lambda: controller_mock
+    
+    try:
+        first = client.get("/api/confessions/?status=PUBLISHED&cursor=token")
+        
+        # Act
+        response = client.get(
+            "/api/confessions/?status=PUBLISHED&cursor=token", headers={"If-None-Match": first.headers["etag"]}
+        )
+    finally:
+        app.dependency_overrides.clear()
+    
+    # Assert
+    assert first.headers["cache-control"] == "public, max-age=5, stale-while-revalidate=30"
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.content == b""
+
+
+def test_list_confessions_invalid_cursor(client):
+    """Тест ответа 400 на поврежденный курсор."""
+    # Arrange
+    controller_mock = AsyncMock()
+    controller_mock.list_page.side_effect = ValueError("Invalid cursor: garbage")
+    app.dependency_overrides[get_confession_controller] = lambda: controller_mock
+    
+    try:
+        # Act
+        response = client.get("/api/confessions/?cursor=garbage")
+    finally:
+        app.dependency_overrides.clear()
+    
+    # Assert
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.parametrize("query", ["limit=10", "cursor=token", "limit=10&cursor=token"])
+def test_list_confessions_ndjson_rejects_paging(client, query):
+    """Тест: поток NDJSON не разбивается на страницы, поэтому limit и cursor отклоняются с 400."""
+    # Arrange
+    controller_mock = AsyncMock()
+    app.dependency_overrides[get_confession_controller] = lambda: controller_mock
+    
+    try:
+        # Act
+        response = client.get(f"/api/confessions/?{query}", headers={"Accept": "application/x-ndjson"})
+    finally:
+        app.dependency_overrides.clear()
+    
+    # Assert
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "application/x-ndjson" in response.json()["detail"]
+    controller_mock.list_page.assert_not_called()
+
+
+def test_list_published_feed_is_cached(client, sample_confession):
+    """Тест: первая страница публичной ленты читается из БД один раз, повтор отдается из кэша с ETag."""
+    # Arrange
+    sample_confession.status = ConfessionStatus.PUBLISHED
+    use_case_mock = AsyncMock()
+    use_case_mock.execute.return_value = ConfessionPageDTO(
+        items=[ConfessionDTO.model_validate(sample_confession, from_attributes=True)],
+        next_cursor="next-token",
+    )
+    
+    @asynccontextmanager
+    async def streaming_use_case():
+        yield use_case_mock
+    
+    controller_mock = AsyncMock()
+    feed_cache = ReadThroughCache("test_router_feed", ttl_seconds=60, stale_seconds=60, max_entries=10)
+    app.dependency_overrides[get_confession_controller] = lambda: controller_mock
+    app.dependency_overrides[get_feed_cache] = lambda: feed_cache
+    
+    try:
+        with patch(
+            "src.frameworks_and_drivers.rest_api.routers.confession.streaming_list_confessions_use_case",
+            streaming_use_case,
+        ):
+            # Act
+            first = client.get("/api/confessions/?status=PUBLISHED&limit=1")
+            second = client.get("/api/confessions/?status=PUBLISHED&limit=1")
+            not_modified = client.get(
+                "/api/confessions/?status=PUBLISHED&limit=1", headers={"If-None-Match": first.headers["etag"]}
+            )
+    finally:
+        app.dependency_overrides.clear()
+    
+    # Assert
+    assert first.status_code == status.HTTP_200_OK
+    assert [item["id"] for item in first.json()] == [1]
+    assert "attachments" not in first.json()[0]
+    assert first.headers["X-Next-Cursor"] == "next-token"
+    assert second.content == first.content
+    assert first.headers["cache-control"].startswith("public, ")
+    assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
+    use_case_mock.execute.assert_awaited_once()
+    query = use_case_mock.execute.call_args.args[0]
+    assert query.status == ConfessionStatus.PUBLISHED
+    assert query.limit == 1
+    controller_mock.list_page.assert_not_called()
+
+
+def test_search_confessions(client, sample_confession):
+    """Тест поиска: маршрут /search не перехватывается /{confession_id}, курсор в заголовке."""
+    # Arrange
+    controller_mock = AsyncMock()
+    controller_mock.search.return_value = ConfessionSearchPageDTO(
+        items=[
+            ConfessionSearchHitDTO(
+                **ConfessionDTO.model_validate(sample_confession, from_attributes=True).model_dump(),
+                rank=0.3,
+                snippet="<mark>Тестовое</mark> признание через API",
+            )
+        ],
+        next_cursor="next-token",
+    )
+    app.dependency_overrides[get_confession_controller] = lambda: controller_mock
+    
+    try:
+        # Act
+        response = client.get("/api/confessions/search", params={"q": "тест", "status": "PENDING", "limit": 1})
+    finally:
+        app.dependency_overrides.clear()
+    
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["X-Next-Cursor"] == "next-token"
+    assert response.json()[0]["id"] == 1
+    assert response.json()[0]["rank"] == 0.3
+    assert response.json()[0]["snippet"] == "<mark>Тестовое</mark> признание через API"
+    query = controller_mock.search.call_args.args[0]
+    assert query.query == "тест"
+    assert query.status == ConfessionStatus.PENDING
+    assert query.limit == 1
+
+
+@pytest.mark.parametrize("params", [{}, {"q": ""}, {"q": "x" * 201}])
+def test_search_confessions_requires_query(client, params):
+    """Тест ответа 422 без поискового запроса или со слишком длинным запросом."""
+    # Arrange
+    controller_mock = AsyncMock()
+    app.dependency_overrides[get_confession_controller] = lambda: controller_mock
+    
+    try:
+        # Act
+        response = client.get("/api/confessions/search", params=params)
+    finally:
+        app.dependency_overrides.clear()
+    
+    # Assert
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    controller_mock.search.assert_not_called()
+
+
+def test_search_confessions_invalid_cursor(client):
+    """Тест ответа 400 на поврежденный курсор поиска."""
+    # Arrange
+    controller_mock = AsyncMock()
+    controller_mock.search.side_effect = ValueError("Invalid cursor: garbage")
+    app.dependency_overrides[get_confession_controller] = lambda: controller_mock
+    
+    try:
+        # Act
+        response = client.get("/api/confessions/search", params={"q": "тест", "cursor": "garbage"})
+    finally:
+        app.dependency_overrides.clear()
+    
+    # Assert
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_moderate_confession_returns_job(client):
+    """Тест: модерация ставится в очередь и отвечает 202 с задачей."""
+    # Arrange
+    now = datetime.now()
+    controller_mock = AsyncMock()
+    controller_mock.request_moderation.return_value = ModerationJobDTO(
+        id=7,
+        confession_id=1,
+        status=ModerationJobStatus.QUEUED,
+        attempts=0,
+        created_at=now,
+        updated_at=now,
+    )
+    app.dependency_overrides[get_confession_controller] = lambda: controller_mock
+    
+    try:
+        # Act
+        response = client.post("/api/confessions/1/moderate")
+    finally:
+        app.dependency_overrides.clear()
+    
+    # Assert
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    assert response.headers["Location"] == "/api/moderation-jobs/7"
+    assert response.json()["status"] == ModerationJobStatus.QUEUED.value
+    assert controller_mock.request_moderation.call_args.args[0].id == 1
+
+
+def test_moderate_confession_not_found(client):
+    """Тест ответа 404 при постановке в очередь несуществующего признания."""
+    # Arrange
+    controller_mock = AsyncMock()
+    controller_mock.request_moderation.return_value = None
+    app.dependency_overrides[get_confession_controller] = lambda: controller_mock
+    
+    try:
+        # Act
+        response = client.post("/api/confessions/999/moderate")
+    finally:
+        app.dependency_overrides.clear()
+    
+    # Assert
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_publish_confession_is_accepted(client):
+    """Тест: публикация ставится в исходящую очередь и отвечает 202."""
+    # Arrange
+    controller_mock = AsyncMock()
+    controller_mock.publish_confession.return_value = ConfessionDTO(
+        id=1,
+        content="Тестовое признание",
+        status=ConfessionStatus.PUBLISHED,
+        created_at=datetime.now(),
+    )
+    app.dependency_overrides[get_confession_controller] = lambda: controller_mock
+    
+    try:
+        # Act
+        response = client.post("/api/confessions/1/publish")
+    finally:
+        app.dependency_overrides.clear()
+    
+    # Assert
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    assert response.json()["status"] == ConfessionStatus.PUBLISHED.value
+
+
+def test_moderate_pending_confessions_in_batches(client):
+    """Тест пакетной модерации признаний, ожидающих проверки."""
+    # Arrange
+    controller_mock = AsyncMock()
+    controller_mock.moderate_pending.return_value = BatchModerationResultDTO(
+        processed=3, approved=1, rejected=1, pending=1
+    )
+    app.dependency_overrides[get_moderation_controller] = lambda: controller_mock
+    
+    try:
+        # Act
+        response = client.post("/api/confessions/moderate:batch")
+    finally:
+        app.dependency_overrides.clear()
+    
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"processed": 3, "approved": 1, "rejected": 1, "pending": 1}
+    controller_mock.moderate_pending.assert_awaited_once()
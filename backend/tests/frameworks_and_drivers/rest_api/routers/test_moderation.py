@@ -0,0 +1,65 @@
+"""
+Тесты для роутера задач модерации.
+"""
+import pytest
+from unittest.mock import AsyncMock
+from datetime import datetime
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from src.entities.enums import ModerationJobStatus
+from src.frameworks_and_drivers.dependencies import get_moderation_controller
+from src.interface_adapters.dto import ModerationJobDTO
+from src.main import app
+
+
+@pytest.fixture
+def client():
+    """Создает тестовый клиент FastAPI."""
+    return TestClient(app)
+
+
+def test_get_moderation_job(client):
+    """Тест получения состояния задачи модерации."""
+    # Arrange
+    now = datetime.now()
+    controller_mock = AsyncMock()
+    controller_mock.get_job.return_value = ModerationJobDTO(
+        id=7,
+        confession_id=1,
+        status=ModerationJobStatus.FAILED,
+        attempts=5,
+        last_error="timeout",
+        created_at=now,
+        updated_at=now,
+    )
+    app.dependency_overrides[get_moderation_controller] = lambda: controller_mock
+    
+    try:
+        # Act
+        response = client.get("/api/moderation-jobs/7")
+    finally:
+        app.dependency_overrides.clear()
+    
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["status"] == ModerationJobStatus.FAILED.value
+    assert response.json()["last_error"] == "timeout"
+    controller_mock.get_job.assert_awaited_once_with(7)
+
+
+def test_get_moderation_job_not_found(client):
+    """Тест ответа 404 для несуществующей задачи."""
+    # Arrange
+    controller_mock = AsyncMock()
+    controller_mock.get_job.return_value = None
+    app.dependency_overrides[get_moderation_controller] = lambda: controller_mock
+    
+    try:
+        # Act
+        response = client.get("/api/moderation-jobs/404")
+    finally:
+        app.dependency_overrides.clear()
+    
+    # Assert
+    assert response.status_code == status.HTTP_404_NOT_FOUND
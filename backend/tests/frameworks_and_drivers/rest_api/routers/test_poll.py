@@ -2,16 +2,18 @@
 Тесты для роутера опросов.
 """
 import pytest
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock
 from datetime import datetime
 from fastapi import status
 from fastapi.testclient import TestClient
 
 from src.entities.confession import Confession, Poll, PollOption
 from src.entities.enums import ConfessionStatus
-from src.frameworks_and_drivers.rest_api.schemas.confession import PollResponse
+from src.frameworks_and_drivers.dependencies import get_poll_broadcaster, get_poll_controller, get_poll_results_cache
+from src.frameworks_and_drivers.rest_api.http_cache import ResponseCache
 from src.main import app
 from src.interface_adapters.controllers import PollController
+from src.interface_adapters.dto import PollDTO
 
 
 @pytest.fixture
@@ -23,14 +25,15 @@ def client():
 @pytest.fixture
 def poll_controller_mock():
     """Мок контроллера для опросов."""
-    # Определяем все методы, которые будем использовать в тестах
-    methods = [
-        "create_poll",
-        "vote",
-        "get_results",
-    ]
-    controller = AsyncMock(spec=methods)
-    return controller
+    return AsyncMock(spec=PollController)
+
+
+@pytest.fixture
+def results_cache():
+    """Кэш результатов опросов, подставляемый вместо общего для процесса."""
+    cache = ResponseCache("test_poll_results", ttl_seconds=60, max_entries=10)
+    app.dependency_overrides[get_poll_results_cache] = lambda: cache
+    return cache
 
 
 @pytest.fixture
@@ -58,12 +61,9 @@ def confession_with_poll(sample_poll):
     )
 
 
-@pytest.mark.skip("Endpoints are not implemented yet")
-@patch("src.frameworks_and_drivers.dependencies.get_poll_controller")
-def test_vote_in_poll(get_controller_mock, client, poll_controller_mock, sample_poll):
+def test_vote_in_poll(client, poll_controller_mock):
     """Тест голосования в опросе через API."""
     # Arrange
-    get_controller_mock.return_value = poll_controller_mock
     updated_poll = Poll(
         id=1,
         question="Тестовый вопрос",
@@ -72,15 +72,19 @@ def test_vote_in_poll(get_controller_mock, client, poll_controller_mock, sample_
             PollOption(id=2, text="Вариант 2", vote_count=3),
         ],
     )
-    poll_controller_mock.vote.return_value = updated_poll
+    poll_controller_mock.vote.return_value = PollDTO.model_validate(updated_poll, from_attributes=True)
+    app.dependency_overrides[get_poll_controller] = lambda: poll_controller_mock
     
     # Создаем тестовые данные
     vote_data = {
         "option_id": 1,
     }
     
-    # Act
-    response = client.post("/api/polls/1/vote", json=vote_data)
+    try:
+        # Act
+        response = client.post("/api/polls/1/vote", json=vote_data)
+    finally:
+        app.dependency_overrides.clear()
     
     # Assert
     assert response.status_code == status.HTTP_200_OK
@@ -89,24 +93,25 @@ def test_vote_in_poll(get_controller_mock, client, poll_controller_mock, sample_
     assert response.json()["options"][0]["vote_count"] == 6
     
     # Проверяем, что контроллер был вызван
-    poll_controller_mock.vote.assert_called_once()
+    poll_controller_mock.vote.assert_called_once_with(1, 1)
 
 
-@pytest.mark.skip("Endpoints are not implemented yet")
-@patch("src.frameworks_and_drivers.dependencies.get_poll_controller")
-def test_vote_in_poll_invalid_option(get_controller_mock, client, poll_controller_mock):
+def test_vote_in_poll_invalid_option(client, poll_controller_mock):
     """Тест голосования с неверным вариантом опроса через API."""
     # Arrange
-    get_controller_mock.return_value = poll_controller_mock
     poll_controller_mock.vote.side_effect = ValueError("Invalid option id")
+    app.dependency_overrides[get_poll_controller] = lambda: poll_controller_mock
     
     # Создаем тестовые данные
     vote_data = {
         "option_id": 999,  # Несуществующий вариант
     }
     
-    # Act
-    response = client.post("/api/polls/1/vote", json=vote_data)
+    try:
+        # Act
+        response = client.post("/api/polls/1/vote", json=vote_data)
+    finally:
+        app.dependency_overrides.clear()
     
     # Assert
     assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -115,16 +120,33 @@ def test_vote_in_poll_invalid_option(get_controller_mock, client, poll_controlle
     poll_controller_mock.vote.assert_called_once()
 
 
-@pytest.mark.skip("Endpoints are not implemented yet")
-@patch("src.frameworks_and_drivers.dependencies.get_poll_controller")
-def test_get_poll_results(get_controller_mock, client, poll_controller_mock, sample_poll):
+def test_vote_in_poll_not_found(client, poll_controller_mock):
+    """Тест голосования в несуществующем опросе через API."""
+    # Arrange
+    poll_controller_mock.vote.return_value = None
+    app.dependency_overrides[get_poll_controller] = lambda: poll_controller_mock
+    
+    try:
+        # Act
+        response = client.post("/api/polls/999/vote", json={"option_id": 1})
+    finally:
+        app.dependency_overrides.clear()
+    
+    # Assert
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_get_poll_results(client, poll_controller_mock, results_cache, sample_poll):
     """Тест получения результатов опроса через API."""
     # Arrange
-    get_controller_mock.return_value = poll_controller_mock
-    poll_controller_mock.get_results.return_value = sample_poll
+    poll_controller_mock.get_results.return_value = PollDTO.model_validate(sample_poll, from_attributes=True)
+    app.dependency_overrides[get_poll_controller] = lambda: poll_controller_mock
     
-    # Act
-    response = client.get("/api/polls/1/results")
+    try:
+        # Act
+        response = client.get("/api/polls/1/results")
+    finally:
+        app.dependency_overrides.clear()
     
     # Assert
     assert response.status_code == status.HTTP_200_OK
@@ -133,24 +155,119 @@ def test_get_poll_results(get_controller_mock, client, poll_controller_mock, sam
     assert len(response.json()["options"]) == 2
     assert response.json()["options"][0]["vote_count"] == 5
     assert response.json()["options"][1]["vote_count"] == 3
+    assert response.headers["ETag"] == results_cache.get(1).etag
+    assert response.headers["Cache-Control"] == "no-cache"
     
     # Проверяем, что контроллер был вызван
-    poll_controller_mock.get_results.assert_called_once()
+    poll_controller_mock.get_results.assert_called_once_with(1)
 
 
-@pytest.mark.skip("Endpoints are not implemented yet")
-@patch("src.frameworks_and_drivers.dependencies.get_poll_controller")
-def test_get_poll_results_not_found(get_controller_mock, client, poll_controller_mock):
+def test_get_poll_results_from_cache(client, poll_controller_mock, results_cache, sample_poll):
+    """Тест: повторный запрос отдается из кэша, а запрос с актуальным ETag получает 304."""
+    # Arrange
+    poll_controller_mock.get_results.return_value = PollDTO.model_validate(sample_poll, from_attributes=True)
+    app.dependency_overrides[get_poll_controller] = lambda: poll_controller_mock
+    
+    try:
+        # Act
+        first = client.get("/api/polls/1/results")
+        second = client.get("/api/polls/1/results")
+        not_modified = client.get("/api/polls/1/results", headers={"If-None-Match": first.headers["ETag"]})
+        stale = client.get("/api/polls/1/results", headers={"If-None-Match": '"outdated"'})
+    finally:
+        app.dependency_overrides.clear()
+    
+    # Assert
+    assert second.status_code == status.HTTP_200_OK
+    assert second.content == first.content
+    assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
+    assert not_modified.content == b""
+    assert not_modified.headers["ETag"] == first.headers["ETag"]
+    assert stale.status_code == status.HTTP_200_OK
+    
+    # В БД обращались только один раз
+    poll_controller_mock.get_results.assert_called_once_with(1)
+
+
+def test_get_poll_results_after_vote(client, poll_controller_mock, results_cache, sample_poll):
+    """Тест: после сброса кэша голосом клиент со старым ETag получает новые результаты."""
+    # Arrange
+    poll_controller_mock.get_results.return_value = PollDTO.model_validate(sample_poll, from_attributes=True)
+    app.dependency_overrides[get_poll_controller] = lambda: poll_controller_mock
+    
+    try:
+        first = client.get("/api/polls/1/results")
+        sample_poll.options[0].vote_count += 1
+        poll_controller_mock.get_results.return_value = PollDTO.model_validate(sample_poll, from_attributes=True)
+        results_cache.invalidate(1)
+        
+        # Act
+        response = client.get("/api/polls/1/results", headers={"If-None-Match": first.headers["ETag"]})
+    finally:
+        app.dependency_overrides.clear()
+    
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["ETag"] != first.headers["ETag"]
+    assert response.json()["options"][0]["vote_count"] == 6
+
+
+def test_get_poll_results_not_found(client, poll_controller_mock, results_cache):
     """Тест получения результатов несуществующего опроса через API."""
     # Arrange
-    get_controller_mock.return_value = poll_controller_mock
     poll_controller_mock.get_results.return_value = None
+    app.dependency_overrides[get_poll_controller] = lambda: poll_controller_mock
     
-    # Act
-    response = client.get("/api/polls/999/results")
+    try:
+        # Act
+        response = client.get("/api/polls/999/results")
+    finally:
+        app.dependency_overrides.clear()
     
     # Assert
     assert response.status_code == status.HTTP_404_NOT_FOUND
     
     # Проверяем, что контроллер был вызван
-    poll_controller_mock.get_results.assert_called_once()
\ No newline at end of file
+    poll_controller_mock.get_results.assert_called_once()
+
+
+def test_stream_poll_results(client):
+    """Тест SSE-потока результатов опроса."""
+    # Arrange
+    async def events():
+        yield 'event: results\ndata: {"id": 1}\n\n'
+        yield 'event: delta\ndata: {"poll_id": 1, "options": []}\n\n'
+    
+    broadcaster_mock = AsyncMock()
+    broadcaster_mock.subscribe.return_value = events()
+    app.dependency_overrides[get_poll_broadcaster] = lambda: broadcaster_mock
+    
+    try:
+        # Act
+        response = client.get("/api/polls/1/stream")
+    finally:
+        app.dependency_overrides.clear()
+    
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.headers["cache-control"] == "no-cache"
+    assert response.text.startswith("event: results\n")
+    broadcaster_mock.subscribe.assert_awaited_once_with(1)
+
+
+def test_stream_poll_results_not_found(client):
+    """Тест SSE-потока несуществующего опроса."""
+    # Arrange
+    broadcaster_mock = AsyncMock()
+    broadcaster_mock.subscribe.return_value = None
+    app.dependency_overrides[get_poll_broadcaster] = lambda: broadcaster_mock
+    
+    try:
+        # Act
+        response = client.get("/api/polls/999/stream")
+    finally:
+        app.dependency_overrides.clear()
+    
+    # Assert
+    assert response.status_code == status.HTTP_404_NOT_FOUND
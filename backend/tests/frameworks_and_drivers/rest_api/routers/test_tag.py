@@ -0,0 +1,86 @@
+"""
+Тесты для роутера тегов.
+"""
+import pytest
+from unittest.mock import AsyncMock
+from datetime import datetime
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from src.entities.enums import ConfessionStatus
+from src.frameworks_and_drivers.dependencies import get_tag_controller
+from src.main import app
+from src.interface_adapters.controllers import TagController
+from src.interface_adapters.dto import ConfessionDTO, ConfessionPageDTO, TagCountDTO, TagDTO
+
+
+@pytest.fixture
+def client():
+    """Тестовый клиент FastAPI."""
+    return TestClient(app)
+
+
+@pytest.fixture
+def tag_controller_mock():
+    """Мок контроллера тегов, подставленный в зависимости приложения."""
+    controller = AsyncMock(spec=TagController)
+    app.dependency_overrides[get_tag_controller] = lambda: controller
+    yield controller
+    app.dependency_overrides.clear()
+
+
+def test_list_popular_tags(client, tag_controller_mock):
+    """Тест получения популярных тегов с количеством признаний."""
+    # Arrange
+    tag_controller_mock.list_popular.return_value = [
+        TagCountDTO(name="коты", count=12),
+        TagCountDTO(name="учеба", count=5),
+    ]
+
+    # Act
+    response = client.get("/api/tags/?limit=2")
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == [{"name": "коты", "count": 12}, {"name": "учеба", "count": 5}]
+    tag_controller_mock.list_popular.assert_called_once_with(2)
+
+
+def test_list_tag_confessions(client, tag_controller_mock):
+    """Тест ленты признаний по тегу с курсором в заголовке."""
+    # Arrange
+    tag_controller_mock.list_confessions.return_value = ConfessionPageDTO(
+        items=[
+            ConfessionDTO(
+                id=2,
+                content="Про котов",
+                status=ConfessionStatus.PUBLISHED,
+                created_at=datetime(2025, 5, 2),
+                tags=[TagDTO(id=3, name="коты")],
+            )
+        ],
+        next_cursor="next-token",
+    )
+
+    # Act
+    response = client.get("/api/tags/коты/confessions?limit=1")
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["X-Next-Cursor"] == "next-token"
+    assert [item["id"] for item in response.json()] == [2]
+    query = tag_controller_mock.list_confessions.call_args.args[0]
+    assert query.name == "коты"
+    assert query.limit == 1
+
+
+def test_list_tag_confessions_invalid_cursor(client, tag_controller_mock):
+    """Тест ответа 400 на поврежденный курсор."""
+    # Arrange
+    tag_controller_mock.list_confessions.side_effect = ValueError("Invalid cursor: garbage")
+
+    # Act
+    response = client.get("/api/tags/коты/confessions?cursor=garbage")
+
+    # Assert
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
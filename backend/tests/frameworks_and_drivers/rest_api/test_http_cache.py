@@ -0,0 +1,260 @@
+"""
+Тесты для кэша HTTP-ответов и условных запросов.
+"""
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+
+from src.frameworks_and_drivers.rest_api.http_cache import (
+    CachedResponse,
+    ReadThroughCache,
+    ResponseCache,
+    etag_matches,
+    http_date,
+    is_not_modified,
+)
+
+
+class FakeClock:
+    """Управляемый источник времени."""
+    
+    def __init__(self) -> None:
+        self.now = 0.0
+    
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_etag_depends_only_on_body():
+    """Тест: одинаковые тела получают одинаковый ETag, разные - разный."""
+    # Act
+    first = CachedResponse.from_body(b'{"id": 1}')
+    same = CachedResponse.from_body(b'{"id": 1}')
+    other = CachedResponse.from_body(b'{"id": 2}')
+    
+    # Assert
+    assert first.etag == same.etag
+    assert first.etag != other.etag
+    assert first.etag.startswith('"') and first.etag.endswith('"')
+
+
+def test_etag_matches():
+    """Тест разбора заголовка If-None-Match."""
+    etag = '"abc"'
+    
+    assert etag_matches('"abc"', etag)
+    assert etag_matches('W/"abc"', etag)
+    assert etag_matches('"other", "abc"', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"other"', etag)
+    assert not etag_matches(None, etag)
+
+
+def test_http_date():
+    """Тест формата Last-Modified: время в GMT с точностью до секунды."""
+    assert http_date(datetime(2025, 5, 1, 12, 30, 15, 999, tzinfo=timezone.utc)) == "Thu, 01 May 2025 12:30:15 GMT"
+
+
+@pytest.mark.parametrize(
+    "if_none_match, if_modified_since, expected",
+    [
+        ('"abc"', None, True),
+        ('"old"', None, False),
+        # If-None-Match важнее If-Modified-Since
+        ('"old"', "Thu, 01 May 2025 12:30:15 GMT", False),
+        (None, "Thu, 01 May 2025 12:30:15 GMT", True),
+        (None, "Thu, 01 May 2025 12:30:14 GMT", False),
+        (None, "not a date", False),
+        (None, None, False),
+    ],
+)
+def test_is_not_modified(if_none_match, if_modified_since, expected):
+    """Тест проверки условного GET по ETag и времени изменения."""
+    # Arrange
+    last_modified = datetime(2025, 5, 1, 12, 30, 15, 500000, tzinfo=timezone.utc)
+    
+    # Act & Assert
+    assert is_not_modified(if_none_match, if_modified_since, '"abc"', last_modified) is expected
+
+
+def test_is_not_modified_without_last_modified():
+    """Тест: без времени изменения If-Modified-Since не дает 304."""
+    assert not is_not_modified(None, "Thu, 01 May 2025 12:30:15 GMT", '"abc"')
+
+
+def test_to_response_not_modified():
+    """Тест: при совпадении ETag ответ 304 без тела, иначе 200 с телом."""
+    # Arrange
+    cached = CachedResponse.from_body(b"{}")
+    
+    # Act
+    not_modified = cached.to_response(cached.etag, headers={"Cache-Control": "no-cache"})
+    full = cached.to_response('"old"')
+    
+    # Assert
+    assert not_modified.status_code == 304
+    assert not_modified.body == b""
+    assert not_modified.headers["etag"] == cached.etag
+    assert not_modified.headers["cache-control"] == "no-cache"
+    assert full.status_code == 200
+    assert full.body == b"{}"
+
+
+class TestResponseCache:
+    """Тесты для ResponseCache."""
+    
+    def test_ttl_and_eviction(self):
+        """Тест: записи истекают по TTL и вытесняются при переполнении."""
+        # Arrange
+        clock = FakeClock()
+        cache = ResponseCache("test_ttl", ttl_seconds=10, max_entries=2, clock=clock)
+        for key in (1, 2, 3):
+            cache.set(key, CachedResponse.from_body(str(key).encode()), cache.snapshot())
+        
+        # Act & Assert
+        assert cache.get(1) is None
+        assert cache.get(3).body == b"3"
+        clock.now = 11
+        assert cache.get(3) is None
+    
+    def test_invalidate(self):
+        """Тест: invalidate удаляет запись."""
+        # Arrange
+        cache = ResponseCache("test_invalidate", ttl_seconds=10, max_entries=10)
+        cache.set(1, CachedResponse.from_body(b"1"), cache.snapshot())
+        
+        # Act
+        cache.invalidate(1)
+        
+        # Assert
+        assert cache.get(1) is None
+    
+    def test_stale_read_is_not_cached(self):
+        """Тест: ответ, прочитанный до инвалидации, не попадает в кэш после нее."""
+        # Arrange
+        cache = ResponseCache("test_stale", ttl_seconds=10, max_entries=10)
+        snapshot = cache.snapshot()
+        
+        # Act: пока читали БД, пришел голос в опрос 1, но не в опрос 2
+        cache.invalidate(1)
+        cache.set(1, CachedResponse.from_body(b"stale"), snapshot)
+        cache.set(2, CachedResponse.from_body(b"fresh"), snapshot)
+        
+        # Assert
+        assert cache.get(1) is None
+        assert cache.get(2).body == b"fresh"
+
+
+class TestReadThroughCache:
+    """Тесты для ReadThroughCache."""
+    
+    @staticmethod
+    def _loader(body: bytes, release: asyncio.Event = None):
+        """Создает загрузчик, считающий вызовы и при необходимости ждущий события."""
+        calls = []
+        
+        async def load() -> CachedResponse:
+            calls.append(body)
+            if release is not None:
+                await release.wait()
+            return CachedResponse.from_body(body)
+        
+        return load, calls
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_load(self):
+        """Тест single-flight: одновременные промахи ждут одну загрузку."""
+        # Arrange
+        cache = ReadThroughCache("test_single_flight", ttl_seconds=10, stale_seconds=10, max_entries=10)
+        release = asyncio.Event()
+        load, calls = self._loader(b"feed", release)
+        
+        # Act
+        waiting = [asyncio.create_task(cache.get(50, load)) for _ in range(10)]
+        await asyncio.sleep(0)
+        release.set()
+        responses = await asyncio.gather(*waiting)
+        
+        # Assert
+        assert calls == [b"feed"]
+        assert {response.body for response in responses} == {b"feed"}
+        assert (await cache.get(50, load)).body == b"feed"
+        assert len(calls) == 1
+    
+    @pytest.mark.asyncio
+    async def test_stale_entry_served_while_refreshing(self):
+        """Тест stale-while-revalidate: устаревшая запись отдается сразу, а обновляется в фоне один раз."""
+        # Arrange
+        clock = FakeClock()
+        cache = ReadThroughCache("test_stale_refresh", ttl_seconds=5, stale_seconds=30, max_entries=10, clock=clock)
+        await cache.get(50, self._loader(b"old")[0])
+        clock.now = 10
+        release = asyncio.Event()
+        load, calls = self._loader(b"new", release)
+        
+        # Act
+        first = await cache.get(50, load)
+        second = await cache.get(50, load)
+        release.set()
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        refreshed = await cache.get(50, load)
+        
+        # Assert
+        assert first.body == b"old"
+        assert second.body == b"old"
+        assert refreshed.body == b"new"
+        assert calls == [b"new"]
+    
+    @pytest.mark.asyncio
+    async def test_expired_entry_is_reloaded(self):
+        """Тест: запись старше ttl_seconds + stale_seconds не отдается, ответ ждет загрузку."""
+        # Arrange
+        clock = FakeClock()
+        cache = ReadThroughCache("test_expired", ttl_seconds=5, stale_seconds=5, max_entries=10, clock=clock)
+        await cache.get(50, self._loader(b"old")[0])
+        clock.now = 11
+        
+        # Act
+        response = await cache.get(50, self._loader(b"new")[0])
+        
+        # Assert
+        assert response.body == b"new"
+    
+    @pytest.mark.asyncio
+    async def test_invalidate_drops_entries_and_inflight_result(self):
+        """Тест: после invalidate запись удаляется, а начатая до него загрузка не попадает в кэш."""
+        # Arrange
+        cache = ReadThroughCache("test_rt_invalidate", ttl_seconds=10, stale_seconds=10, max_entries=10)
+        await cache.get(20, self._loader(b"cached")[0])
+        release = asyncio.Event()
+        load, _ = self._loader(b"before", release)
+        inflight = asyncio.create_task(cache.get(50, load))
+        await asyncio.sleep(0)
+        
+        # Act
+        cache.invalidate()
+        release.set()
+        before = await inflight
+        after = await cache.get(50, self._loader(b"after")[0])
+        
+        # Assert
+        assert before.body == b"before"
+        assert after.body == b"after"
+        assert (await cache.get(20, self._loader(b"reloaded")[0])).body == b"reloaded"
+    
+    @pytest.mark.asyncio
+    async def test_loader_error_is_not_cached(self):
+        """Тест: ошибка загрузки отдается запросу и не кэшируется."""
+        # Arrange
+        cache = ReadThroughCache("test_rt_error", ttl_seconds=10, stale_seconds=10, max_entries=10)
+        
+        async def failing_load() -> CachedResponse:
+            raise RuntimeError("database is down")
+        
+        # Act & Assert
+        with pytest.raises(RuntimeError):
+            await cache.get(50, failing_load)
+        assert (await cache.get(50, self._loader(b"feed")[0])).body == b"feed"
+        assert len(cache) == 1
@@ -0,0 +1,157 @@
+"""
+Тесты для сериализации ответов в JSON без повторной валидации.
+"""
+import json
+import os
+import time
+from datetime import datetime
+from typing import List
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel, TypeAdapter
+
+from src.entities.enums import AttachmentType, ConfessionStatus
+from src.frameworks_and_drivers.rest_api.rendering import JsonRenderer
+from src.frameworks_and_drivers.rest_api.schemas import ConfessionResponse, ConfessionSummaryResponse
+from src.interface_adapters.dto import (
+    AttachmentDTO,
+    ConfessionDetailDTO,
+    ConfessionDTO,
+    ModerationLogDTO,
+    PollDTO,
+    PollOptionDTO,
+    TagDTO,
+)
+
+# Замеры времени зависят от нагрузки машины, поэтому запускаются только по запросу
+RUN_BENCHMARKS = os.getenv("RUN_BENCHMARKS")
+
+
+def _confession(id: int) -> ConfessionDTO:
+    """Создает DTO опубликованного признания с тегами."""
+    return ConfessionDTO(
+        id=id,
+        content="Признание о том, как кот уснул на клавиатуре во время созвона. " * 3,
+        created_at=datetime(2025, 5, 1, 12, 0, 0, 123456),
+        status=ConfessionStatus.PUBLISHED,
+        tags=[TagDTO(id=1, name="коты"), TagDTO(id=2, name="работа")],
+    )
+
+
+def _validated_json(response_model: type, value: BaseModel) -> bytes:
+    """Прежний путь: схема из model_dump, повторная валидация по response_model, jsonable_encoder и json.dumps."""
+    response = response_model.model_validate(value.model_dump())
+    content = jsonable_encoder(TypeAdapter(response_model).validate_python(response))
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def test_render_matches_response_schema():
+    """Тест: JSON совпадает с ответом по схеме, включая вложенные опрос и вложения."""
+    # Arrange
+    confession = ConfessionDetailDTO(
+        id=1,
+        content="Признание",
+        attachments=[AttachmentDTO(id=2, url="https://example.com/cat.jpg", type=AttachmentType.IMAGE)],
+        tags=[TagDTO(id=3, name="коты")],
+        poll=PollDTO(
+            id=4,
+            question="Кто виноват?",
+            options=[PollOptionDTO(id=5, text="Кот", vote_count=7), PollOptionDTO(id=6, text="Я", vote_count=1)],
+        ),
+        moderation_logs=[
+            ModerationLogDTO(id=8, confession_id=1, decision=ConfessionStatus.APPROVED, moderator="LLM"),
+        ],
+    )
+    renderer = JsonRenderer(ConfessionResponse, ConfessionDetailDTO)
+
+    # Act
+    body = renderer.render(confession)
+
+    # Assert
+    assert json.loads(body) == json.loads(_validated_json(ConfessionResponse, confession))
+    assert "moderation_logs" not in json.loads(body)
+
+
+def test_render_many_keeps_only_schema_fields():
+    """Тест: в элементы списка попадают только поля краткой схемы."""
+    # Arrange
+    confession = _confession(1)
+    confession.attachments = [AttachmentDTO(id=2, url="https://example.com/cat.jpg", type=AttachmentType.IMAGE)]
+    renderer = JsonRenderer(ConfessionSummaryResponse, ConfessionDTO)
+
+    # Act
+    items = json.loads(renderer.render_many([confession]))
+
+    # Assert
+    assert set(items[0]) == {"id", "content", "created_at", "status", "tags"}
+    assert items[0]["tags"] == [{"id": 1, "name": "коты"}, {"id": 2, "name": "работа"}]
+
+
+def test_response_status_and_headers():
+    """Тест: готовый ответ несет код, заголовки и тип содержимого."""
+    # Arrange
+    renderer = JsonRenderer(ConfessionSummaryResponse, ConfessionDTO)
+
+    # Act
+    response = renderer.response(_confession(1), status_code=201, headers={"X-Next-Cursor": "token"})
+
+    # Assert
+    assert response.status_code == 201
+    assert response.media_type == "application/json"
+    assert response.headers["x-next-cursor"] == "token"
+
+
+def test_missing_field_is_rejected():
+    """Тест: DTO без поля схемы ответа отклоняется при создании сериализатора, а не на запросе."""
+    with pytest.raises(TypeError):
+        JsonRenderer(ConfessionResponse, TagDTO)
+
+
+def _validated_many_json(confessions: List[ConfessionDTO]) -> bytes:
+    """Прежний путь для списка: схема на каждый элемент, повторная валидация списка и json.dumps."""
+    responses = [ConfessionSummaryResponse.model_validate(item.model_dump()) for item in confessions]
+    content = jsonable_encoder(TypeAdapter(List[ConfessionSummaryResponse]).validate_python(responses))
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def test_render_many_matches_validation_path():
+    """Тест: лента из 1000 признаний сериализуется в тот же JSON, что и прежним путем."""
+    # Arrange
+    confessions = [_confession(id) for id in range(1, 1001)]
+    renderer = JsonRenderer(ConfessionSummaryResponse, ConfessionDTO)
+
+    # Act
+    body = renderer.render_many(confessions)
+
+    # Assert
+    assert json.loads(body) == json.loads(_validated_many_json(confessions))
+
+
+@pytest.mark.skipif(not RUN_BENCHMARKS, reason="RUN_BENCHMARKS is not set")
+class TestRenderingBenchmark:
+    """Сравнение скорости сериализации ленты из 1000 признаний."""
+
+    @staticmethod
+    def _best_time(render, repeat: int = 5) -> float:
+        """Возвращает лучшее время из нескольких запусков."""
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            render()
+            timings.append(time.perf_counter() - started)
+        return min(timings)
+
+    def test_render_many_is_faster_than_validation_path(self):
+        """Тест: прямая сериализация 1000 признаний заметно быстрее прежнего пути."""
+        # Arrange
+        confessions = [_confession(id) for id in range(1, 1001)]
+        renderer = JsonRenderer(ConfessionSummaryResponse, ConfessionDTO)
+
+        # Act
+        validated_time = self._best_time(lambda: _validated_many_json(confessions))
+        rendered_time = self._best_time(lambda: renderer.render_many(confessions))
+
+        # Assert
+        # На практике разница около 10 раз
+        assert rendered_time * 3 < validated_time
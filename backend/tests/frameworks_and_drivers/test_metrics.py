@@ -0,0 +1,45 @@
+"""
+Тесты для реестра метрик.
+"""
+import pytest
+
+from src.frameworks_and_drivers.metrics import MetricsRegistry
+
+
+class TestMetricsRegistry:
+    """Тесты для MetricsRegistry."""
+    
+    @pytest.fixture
+    def registry(self):
+        """Пустой реестр метрик."""
+        return MetricsRegistry()
+    
+    def test_counter_is_shared_by_name_and_labels(self, registry):
+        """Тест: повторное обращение к счетчику возвращает тот же объект."""
+        # Act
+        registry.counter("hits_total", "Попадания", tier="memory").inc()
+        registry.counter("hits_total", "Попадания", tier="memory").inc(2)
+        registry.counter("hits_total", "Попадания", tier="db").inc()
+        
+        # Assert
+        rendered = registry.render()
+        assert 'hits_total{tier="memory"} 3.0' in rendered
+        assert 'hits_total{tier="db"} 1.0' in rendered
+        assert rendered.count("# TYPE hits_total counter") == 1
+    
+    def test_summary_and_gauge(self, registry):
+        """Тест выгрузки сводки и вычисляемого показателя."""
+        # Arrange
+        summary = registry.summary("wait_seconds", "Ожидание")
+        summary.observe(0.5)
+        summary.observe(1.5)
+        registry.gauge("in_use", "Занято", lambda: 7)
+        
+        # Act
+        rendered = registry.render()
+        
+        # Assert
+        assert "wait_seconds_count 2" in rendered
+        assert "wait_seconds_sum 2.0" in rendered
+        assert "# TYPE in_use gauge" in rendered
+        assert "in_use 7.0" in rendered
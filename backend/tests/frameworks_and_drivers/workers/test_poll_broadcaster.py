@@ -0,0 +1,181 @@
+"""
+Тесты для рассыльщика результатов опросов в SSE-потоки.
+"""
+import json
+from contextlib import asynccontextmanager
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.entities.confession import Poll, PollOption
+from src.frameworks_and_drivers.workers.poll_broadcaster import SUBSCRIBER_QUEUE_SIZE, PollResultsBroadcaster
+
+
+class FakePollRepository:
+    """Репозиторий с одним опросом, считающий чтения."""
+    
+    reads = 0
+    vote_counts = {1: 5, 2: 3}
+    
+    def __init__(self, session) -> None:
+        pass
+    
+    async def get_by_id(self, id):
+        FakePollRepository.reads += 1
+        if id != 1:
+            return None
+        return Poll(
+            id=1,
+            question="Вопрос?",
+            created_at=datetime(2024, 1, 1),
+            options=[
+                PollOption(id=option_id, text="", vote_count=count)
+                for option_id, count in self.vote_counts.items()
+            ],
+        )
+
+
+@asynccontextmanager
+async def session_factory():
+    yield MagicMock()
+
+
+@pytest.fixture
+def repository():
+    """Подменяет репозиторий опросов в рассыльщике."""
+    FakePollRepository.reads = 0
+    FakePollRepository.vote_counts = {1: 5, 2: 3}
+    with patch("src.frameworks_and_drivers.workers.poll_broadcaster.SqlAlchemyPollRepository", FakePollRepository):
+        yield FakePollRepository
+
+
+def _event(raw: str):
+    """Разбирает событие SSE на имя и данные."""
+    name, data = raw.strip().split("\n")
+    return name.removeprefix("event: "), json.loads(data.removeprefix("data: "))
+
+
+class TestPollResultsBroadcaster:
+    """Тесты для PollResultsBroadcaster."""
+    
+    @pytest.mark.asyncio
+    async def test_subscribe_unknown_poll(self, repository):
+        """Тест: подписка на несуществующий опрос возвращает None."""
+        # Arrange
+        broadcaster = PollResultsBroadcaster(session_factory, interval=60)
+        
+        # Act & Assert
+        assert await broadcaster.subscribe(999) is None
+    
+    @pytest.mark.asyncio
+    async def test_one_read_per_update_for_all_subscribers(self, repository):
+        """Тест: тысяча подписчиков стоит одного чтения при подписке и одного на обновление."""
+        # Arrange
+        broadcaster = PollResultsBroadcaster(session_factory, interval=60)
+        streams = [await broadcaster.subscribe(1) for _ in range(1000)]
+        initial = [_event(await stream.__anext__()) for stream in streams]
+        await broadcaster.run_once()  # повторное чтение после первой подписки
+        repository.reads = 0
+        
+        # Act
+        repository.vote_counts = {1: 6, 2: 3}
+        broadcaster.publish(1)
+        broadcaster.publish(1)
+        await broadcaster.run_once()
+        deltas = [_event(await stream.__anext__()) for stream in streams]
+        
+        # Assert
+        assert repository.reads == 1
+        assert initial[0] == ("results", initial[0][1])
+        assert [option["vote_count"] for option in initial[0][1]["options"]] == [5, 3]
+        assert all(delta == ("delta", {"poll_id": 1, "options": [{"id": 1, "vote_count": 6}]}) for delta in deltas)
+        for stream in streams:
+            await stream.aclose()
+    
+    @pytest.mark.asyncio
+    async def test_no_read_without_subscribers(self, repository):
+        """Тест: голоса в опросе без подписчиков не порождают чтений."""
+        # Arrange
+        broadcaster = PollResultsBroadcaster(session_factory, interval=60)
+        
+        # Act
+        broadcaster.publish(1)
+        await broadcaster.run_once()
+        
+        # Assert
+        assert repository.reads == 0
+    
+    @pytest.mark.asyncio
+    async def test_slow_subscriber_gets_snapshot(self, repository):
+        """Тест: подписчик, не успевающий читать, получает полный снимок вместо пропущенных изменений."""
+        # Arrange
+        broadcaster = PollResultsBroadcaster(session_factory, interval=60)
+        stream = await broadcaster.subscribe(1)
+        
+        # Act: очередь заполняется первым снимком и изменениями, последнее изменение в нее не влезает
+        for votes in range(6, 6 + SUBSCRIBER_QUEUE_SIZE):
+            repository.vote_counts = {1: votes, 2: 3}
+            broadcaster.publish(1)
+            await broadcaster.run_once()
+        name, data = _event(await stream.__anext__())
+        
+        # Assert
+        assert name == "results"
+        assert data["options"][0]["vote_count"] == 5 + SUBSCRIBER_QUEUE_SIZE
+        await stream.aclose()
+    
+    @pytest.mark.asyncio
+    async def test_disconnect_removes_subscriber(self, repository):
+        """Тест: после отключения последнего подписчика опрос больше не перечитывается."""
+        # Arrange
+        broadcaster = PollResultsBroadcaster(session_factory, interval=60)
+        stream = await broadcaster.subscribe(1)
+        await stream.__anext__()
+        
+        # Act
+        await stream.aclose()
+        repository.reads = 0
+        broadcaster.publish(1)
+        await broadcaster.run_once()
+        
+        # Assert
+        assert repository.reads == 0
+    
+    @pytest.mark.asyncio
+    async def test_keepalive(self, repository):
+        """Тест: без обновлений поток отдает комментарии-пинги."""
+        # Arrange
+        broadcaster = PollResultsBroadcaster(session_factory, interval=60, keepalive=0.01)
+        stream = await broadcaster.subscribe(1)
+        await stream.__anext__()
+        
+        # Act & Assert
+        assert await stream.__anext__() == ": keepalive\n\n"
+        await stream.aclose()
+    
+    @pytest.mark.asyncio
+    async def test_notifies_other_workers(self, repository):
+        """Тест: локальные голоса уходят другим процессам, а их уведомления обновляют подписчиков."""
+        # Arrange
+        notifier = MagicMock(listen=AsyncMock(), notify=AsyncMock(), close=AsyncMock())
+        broadcaster = PollResultsBroadcaster(session_factory, interval=60, notifier=notifier)
+        await broadcaster.start_listening()
+        remote_update = notifier.add_callback.call_args.args[0]
+        stream = await broadcaster.subscribe(1)
+        await stream.__anext__()
+        await broadcaster.run_once()
+        
+        # Act
+        broadcaster.publish(7)
+        await broadcaster.run_once()
+        repository.vote_counts = {1: 5, 2: 4}
+        remote_update(1)
+        await broadcaster.run_once()
+        
+        # Assert
+        notifier.notify.assert_any_await({7})
+        assert _event(await stream.__anext__()) == ("delta", {"poll_id": 1, "options": [{"id": 2, "vote_count": 4}]})
+        await stream.aclose()
+        await broadcaster.stop(timeout=1)
+        notifier.close.assert_awaited_once()
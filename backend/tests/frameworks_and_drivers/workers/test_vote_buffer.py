@@ -0,0 +1,159 @@
+"""
+Тесты для буфера голосов и нагрузочный тест голосования.
+"""
+import asyncio
+import random
+from collections import Counter
+
+import pytest
+
+from src.entities.confession import Poll, PollOption
+from src.frameworks_and_drivers.workers.vote_buffer import VoteBuffer
+from src.interface_adapters.dto import VoteDTO
+from src.use_cases.poll_use_cases import VoteInPollUseCase
+
+
+class FakePollDatabase:
+    """
+    Таблица poll_options в памяти.
+    
+    Каждый executemany-UPDATE применяет приращения к счетчикам так же,
+    как это делает PostgreSQL; с вероятностью failure_rate запрос падает
+    до применения изменений (транзакция откатывается целиком).
+    В batches записывается число строк каждого отправленного в БД
+    executemany, включая упавшие, - это и есть обращения к БД.
+    """
+    
+    def __init__(self, failure_rate: float = 0.0) -> None:
+        self.vote_counts: Counter = Counter()
+        self.statements = 0
+        self.batches: list = []
+        self.failure_rate = failure_rate
+        self._random = random.Random(42)
+    
+    def session(self) -> "FakePollDatabase._Session":
+        return self._Session(self)
+    
+    class _Session:
+        def __init__(self, database: "FakePollDatabase") -> None:
+            self._database = database
+            self._staged: Counter = Counter()
+        
+        async def __aenter__(self):
+            return self
+        
+        async def __aexit__(self, *exc_info):
+            return False
+        
+        async def execute(self, statement, params):
+            await asyncio.sleep(0)
+            self._database.batches.append(len(params))
+            if self._database._random.random() < self._database.failure_rate:
+                raise ConnectionError("connection reset")
+            for row in params:
+                self._staged[row["option_id"]] += row["increment"]
+        
+        async def commit(self):
+            await asyncio.sleep(0)
+            self._database.vote_counts.update(self._staged)
+            self._database.statements += 1
+            self._staged = Counter()
+
+
+class PollRepositoryStub:
+    """Репозиторий, отдающий опрос с тремя вариантами."""
+    
+    async def get_by_id(self, id):
+        return Poll(id=id, question="?", options=[PollOption(id=option_id, text="") for option_id in (1, 2, 3)])
+    
+    async def add_votes(self, increments):
+        raise AssertionError("С буфером голоса не пишутся напрямую")
+
+
+class TestVoteBuffer:
+    """Тесты для VoteBuffer."""
+    
+    @pytest.mark.asyncio
+    async def test_flush_coalesces_votes(self):
+        """Тест: голоса за один вариант складываются и пишутся одним запросом."""
+        # Arrange
+        database = FakePollDatabase()
+        buffer = VoteBuffer(database.session, flush_interval=60)
+        for option_id in (1, 1, 2, 1):
+            await buffer.add(option_id)
+        
+        # Act
+        pending = buffer.pending([1, 2, 3])
+        await buffer.flush()
+        
+        # Assert
+        assert pending == {1: 3, 2: 1}
+        assert database.vote_counts == {1: 3, 2: 1}
+        assert database.statements == 1
+        assert database.batches == [2]
+        assert buffer.pending([1, 2]) == {}
+    
+    @pytest.mark.asyncio
+    async def test_failed_flush_keeps_votes(self):
+        """Тест: при ошибке записи голоса возвращаются в буфер и пишутся следующим сбросом."""
+        # Arrange
+        database = FakePollDatabase(failure_rate=1.0)
+        buffer = VoteBuffer(database.session, flush_interval=60)
+        await buffer.add(1, 5)
+        
+        # Act
+        await buffer.flush()
+        await buffer.add(1)
+        database.failure_rate = 0.0
+        await buffer.flush()
+        
+        # Assert
+        assert database.vote_counts == {1: 6}
+    
+    @pytest.mark.asyncio
+    async def test_stop_flushes_remaining_votes(self):
+        """Тест: при остановке оставшиеся голоса записываются."""
+        # Arrange
+        database = FakePollDatabase()
+        buffer = VoteBuffer(database.session, flush_interval=60)
+        buffer.start()
+        await buffer.add(2, 4)
+        
+        # Act
+        await buffer.stop(timeout=1)
+        
+        # Assert
+        assert database.vote_counts == {2: 4}
+
+
+class TestVoteLoad:
+    """Нагрузочный тест голосования через буфер."""
+    
+    @pytest.mark.asyncio
+    async def test_no_votes_lost_under_load(self):
+        """Тест: тысячи одновременных голосов при сбоях записи доходят до БД без потерь."""
+        # Arrange
+        votes = 20000
+        database = FakePollDatabase(failure_rate=0.2)
+        buffer = VoteBuffer(database.session, flush_interval=0.005)
+        use_case = VoteInPollUseCase(PollRepositoryStub(), buffer)
+        choices = random.Random(7).choices([1, 2, 3], weights=[6, 3, 1], k=votes)
+        buffer.start()
+        
+        # Act
+        for offset in range(0, votes, 1000):
+            await asyncio.gather(*(
+                use_case.execute(VoteDTO(poll_id=1, option_id=option_id))
+                for option_id in choices[offset:offset + 1000]
+            ))
+        await buffer.stop(timeout=1)
+        while buffer.pending([1, 2, 3]):
+            await buffer.flush()
+        
+        # Assert
+        assert database.vote_counts == Counter(choices)
+        # Голоса складываются по вариантам: каждый сброс - один executemany не длиннее числа вариантов,
+        # а всего обращений к БД (вместе с упавшими) на порядки меньше, чем голосов
+        assert max(database.batches) <= 3
+        assert len(database.batches) < votes / 100
+        assert database.statements < len(database.batches)
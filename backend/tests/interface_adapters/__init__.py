@@ -0,0 +1,3 @@
+"""
+Тесты для интерфейсных адаптеров.
+"""
@@ -0,0 +1,62 @@
+"""
+Тесты для курсорной пагинации.
+"""
+import pytest
+from datetime import datetime
+
+from src.interface_adapters.pagination import Page, PageCursor, SearchCursor
+
+
+class TestPageCursor:
+    """Тесты для PageCursor."""
+
+    def test_encode_decode_roundtrip(self):
+        """Тест восстановления курсора из закодированной строки."""
+        # Arrange
+        cursor = PageCursor(created_at=datetime(2025, 5, 1, 12, 30, 15, 123456), id=42)
+
+        # Act
+        token = cursor.encode()
+        decoded = PageCursor.decode(token)
+
+        # Assert
+        assert decoded == cursor
+        assert "=" not in token
+
+    @pytest.mark.parametrize("token", ["", "not-a-cursor", "MjAyNS0wNS0wMQ"])
+    def test_decode_invalid_token(self, token):
+        """Тест ошибки на поврежденном курсоре."""
+        # Act & Assert
+        with pytest.raises(ValueError):
+            PageCursor.decode(token)
+
+    def test_page_defaults(self):
+        """Тест пустой страницы по умолчанию."""
+        # Act
+        page = Page()
+
+        # Assert
+        assert page.items == []
+        assert page.next_cursor is None
+
+
+class TestSearchCursor:
+    """Тесты для SearchCursor."""
+
+    def test_encode_decode_roundtrip(self):
+        """Тест восстановления курсора поиска без потери точности ранга."""
+        # Arrange
+        cursor = SearchCursor(rank=0.0607927106320858, id=42)
+
+        # Act
+        decoded = SearchCursor.decode(cursor.encode())
+
+        # Assert
+        assert decoded == cursor
+
+    @pytest.mark.parametrize("token", ["", "not-a-cursor", PageCursor(created_at=datetime(2025, 5, 1), id=1).encode()])
+    def test_decode_invalid_token(self, token):
+        """Тест ошибки на поврежденном курсоре и на курсоре ленты."""
+        # Act & Assert
+        with pytest.raises(ValueError):
+            SearchCursor.decode(token)
@@ -0,0 +1,86 @@
+"""
+Тесты для жизненного цикла приложения.
+"""
+import pytest
+from unittest.mock import AsyncMock, patch
+from fastapi.testclient import TestClient
+
+from src.frameworks_and_drivers.gateways.llm_moderation_gateway import LLMModerationGateway
+from src.frameworks_and_drivers.gateways.telegram_bot_gateway import TelegramBotGateway
+from src.frameworks_and_drivers.workers import PollResultsBroadcaster
+from src.main import app
+
+
+@patch("src.main.PublicationScheduler")
+@patch("src.main.PublicationSender")
+@patch("src.main.ModerationWorkerPool")
+@patch("src.main.engine")
+def test_lifespan_creates_and_closes_gateways(engine_mock, worker_pool_mock, sender_mock, scheduler_mock):
+    """Тест: гейтвеи и воркеры создаются один раз при старте и останавливаются при остановке."""
+    # Arrange
+    engine_mock.dispose = AsyncMock()
+    worker_pool_mock.return_value.stop = AsyncMock()
+    sender_mock.return_value.stop = AsyncMock()
+    scheduler_mock.return_value.stop = AsyncMock()
+    
+    with patch.object(LLMModerationGateway, "close", new_callable=AsyncMock) as moderation_close, \
+            patch.object(TelegramBotGateway, "close", new_callable=AsyncMock) as telegram_close:
+        # Act
+        with TestClient(app) as client:
+            response = client.get("/health")
+            moderation_gateway = app.state.moderation_gateway
+            telegram_gateway = app.state.telegram_gateway
+            
+            # Assert
+            assert response.status_code == 200
+            assert isinstance(moderation_gateway, LLMModerationGateway)
+            assert isinstance(telegram_gateway, TelegramBotGateway)
+            assert isinstance(app.state.poll_broadcaster, PollResultsBroadcaster)
+        
+        worker_pool_mock.return_value.start.assert_called_once()
+        worker_pool_mock.return_value.stop.assert_awaited_once()
+        sender_mock.return_value.start.assert_called_once()
+        sender_mock.return_value.stop.assert_awaited_once()
+        # Планировщик по умолчанию выключен: признания публикуются вручную
+        scheduler_mock.return_value.start.assert_not_called()
+        scheduler_mock.return_value.stop.assert_awaited_once()
+        moderation_close.assert_awaited_once()
+        telegram_close.assert_awaited_once()
+        engine_mock.dispose.assert_awaited_once()
+
+
+@patch("src.main.PublicationSender")
+@patch("src.main.engine")
+def test_lifespan_closes_acquired_resources_when_startup_fails(engine_mock, sender_mock):
+    """Тест: если запуск упал на середине, уже созданные гейтвеи и пул соединений закрываются."""
+    # Arrange
+    engine_mock.dispose = AsyncMock()
+    
+    with patch.object(LLMModerationGateway, "close", new_callable=AsyncMock) as moderation_close, \
+            patch.object(TelegramBotGateway, "close", new_callable=AsyncMock) as telegram_close, \
+            patch.object(PollResultsBroadcaster, "stop", new_callable=AsyncMock), \
+            patch.object(PollResultsBroadcaster, "start_listening", side_effect=ConnectionError("db down")):
+        # Act
+        with pytest.raises(ConnectionError):
+            with TestClient(app):
+                pass
+        
+        # Assert
+        sender_mock.assert_not_called()
+        moderation_close.assert_awaited_once()
+        telegram_close.assert_awaited_once()
+        engine_mock.dispose.assert_awaited_once()
+
+
+def test_metrics_endpoint():
+    """Тест выгрузки метрик пула соединений."""
+    # Arrange
+    client = TestClient(app)
+    
+    # Act
+    response = client.get("/metrics")
+    
+    # Assert
+    assert response.status_code == 200
+    assert "db_pool_checked_out" in response.text
+    assert "db_pool_checkout_wait_seconds_count" in response.text
@@ -5,8 +5,8 @@ import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 from datetime import datetime
 
-from src.entities.confession import Confession
-from src.entities.enums import ConfessionStatus
+from src.entities.confession import Confession, ModerationJob
+from src.entities.enums import ConfessionStatus, ModerationJobStatus
 from src.interface_adapters.dto import ConfessionDTO, AttachmentDTO, TagDTO, PollDTO, PollOptionDTO
 from src.use_cases.confession_use_cases import CreateConfessionUseCase
 
@@ -20,7 +20,7 @@ class TestCreateConfessionUseCase:
         repository = AsyncMock()
         
         # Настраиваем метод save
-        async def save_mock(confession):
+        async def save_mock(confession, moderation_job=None):
             # Симулируем сохранение, устанавливая ID
             confession.id = 1
             return confession
@@ -94,4 +94,18 @@ class TestCreateConfessionUseCase:
         assert result.poll is not None
         assert result.poll.question == confession_dto.poll.question
         assert len(result.poll.options) == 2
-        assert result.poll.allows_multiple_answers is True 
\ No newline at end of file
+        assert result.poll.allows_multiple_answers is True     
+    @pytest.mark.asyncio
+    async def test_execute_enqueues_moderation(self, confession_repository_mock, confession_dto):
+        """Тест: задача модерации сохраняется вместе с признанием, одним вызовом save."""
+        # Arrange
+        use_case = CreateConfessionUseCase(confession_repository_mock, enqueue_moderation=True)
+        
+        # Act
+        await use_case.execute(confession_dto)
+        
+        # Assert
+        confession_repository_mock.save.assert_awaited_once()
+        moderation_job = confession_repository_mock.save.call_args.kwargs["moderation_job"]
+        assert isinstance(moderation_job, ModerationJob)
+        assert moderation_job.status == ModerationJobStatus.QUEUED
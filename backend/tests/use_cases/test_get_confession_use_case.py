@@ -0,0 +1,141 @@
+"""
+Тесты для GetConfessionUseCase и UpdateConfessionStatusUseCase.
+"""
+import pytest
+from unittest.mock import AsyncMock
+
+from src.entities.confession import Confession, ConfessionRevision, DirectPublicationError, ModerationLog
+from src.entities.enums import ConfessionProjection, ConfessionStatus
+from src.interface_adapters.dto import (
+    ConfessionDetailDTO,
+    ConfessionQueryDTO,
+    ConfessionStatusUpdateDTO,
+)
+from src.use_cases.confession_use_cases import GetConfessionUseCase, UpdateConfessionStatusUseCase
+
+
+class TestGetConfessionUseCase:
+    """Тесты для GetConfessionUseCase."""
+
+    @pytest.fixture
+    def confession_repository_mock(self):
+        """Создает мок репозитория признаний."""
+        repository = AsyncMock()
+        repository.get_by_id.return_value = Confession(
+            id=1,
+            content="Признание",
+            status=ConfessionStatus.REJECTED,
+            moderation_logs=[ModerationLog(id=5, confession_id=1, decision=ConfessionStatus.REJECTED, moderator="LLM")],
+        )
+        return repository
+
+    @pytest.mark.asyncio
+    async def test_execute_public_projection(self, confession_repository_mock):
+        """Тест: по умолчанию читается публичная проекция без журнала модерации."""
+        # Arrange
+        use_case = GetConfessionUseCase(confession_repository_mock)
+
+        # Act
+        result = await use_case.execute(ConfessionQueryDTO(id=1))
+
+        # Assert
+        confession_repository_mock.get_by_id.assert_called_once_with(1, ConfessionProjection.PUBLIC)
+        assert result.id == 1
+        assert not isinstance(result, ConfessionDetailDTO)
+
+    @pytest.mark.asyncio
+    async def test_execute_full_projection(self, confession_repository_mock):
+        """Тест: полная проекция отдает агрегат с журналом модерации."""
+        # Arrange
+        use_case = GetConfessionUseCase(confession_repository_mock)
+
+        # Act
+        result = await use_case.execute(ConfessionQueryDTO(id=1, projection=ConfessionProjection.FULL))
+
+        # Assert
+        confession_repository_mock.get_by_id.assert_called_once_with(1, ConfessionProjection.FULL)
+        assert isinstance(result, ConfessionDetailDTO)
+        assert [log.id for log in result.moderation_logs] == [5]
+
+    @pytest.mark.asyncio
+    async def test_execute_not_found(self, confession_repository_mock):
+        """Тест: несуществующее признание."""
+        # Arrange
+        confession_repository_mock.get_by_id.return_value = None
+        use_case = GetConfessionUseCase(confession_repository_mock)
+
+        # Act
+        result = await use_case.execute(ConfessionQueryDTO(id=404))
+
+        # Assert
+        assert result is None
+
+    @pytest.mark.asyncio
+    async def test_get_revision(self, confession_repository_mock):
+        """Тест: версия признания читается без загрузки агрегата."""
+        # Arrange
+        confession_repository_mock.get_revision.return_value = ConfessionRevision(
+            id=1, status=ConfessionStatus.PUBLISHED, version=3, poll_votes=7
+        )
+        use_case = GetConfessionUseCase(confession_repository_mock)
+
+        # Act
+        result = await use_case.get_revision(1)
+
+        # Assert
+        confession_repository_mock.get_revision.assert_called_once_with(1)
+        confession_repository_mock.get_by_id.assert_not_called()
+        assert (result.status, result.version, result.poll_votes) == (ConfessionStatus.PUBLISHED, 3, 7)
+
+
+class TestUpdateConfessionStatusUseCase:
+    """Тесты для UpdateConfessionStatusUseCase."""
+
+    @pytest.fixture
+    def confession_repository_mock(self):
+        """Создает мок репозитория признаний."""
+        repository = AsyncMock()
+        repository.update_status.return_value = True
+        repository.get_by_id.return_value = Confession(id=1, content="Признание", status=ConfessionStatus.APPROVED)
+        return repository
+
+    @pytest.mark.asyncio
+    async def test_execute_updates_status(self, confession_repository_mock):
+        """Тест смены статуса."""
+        # Arrange
+        use_case = UpdateConfessionStatusUseCase(confession_repository_mock)
+
+        # Act
+        result = await use_case.execute(ConfessionStatusUpdateDTO(id=1, status=ConfessionStatus.APPROVED))
+
+        # Assert
+        confession_repository_mock.update_status.assert_called_once_with(1, ConfessionStatus.APPROVED, None)
+        confession_repository_mock.get_by_id.assert_called_once_with(1, ConfessionProjection.PUBLIC)
+        assert result.status == ConfessionStatus.APPROVED
+
+    @pytest.mark.asyncio
+    async def test_execute_not_found(self, confession_repository_mock):
+        """Тест: статус несуществующего признания не меняется."""
+        # Arrange
+        confession_repository_mock.update_status.return_value = False
+        use_case = UpdateConfessionStatusUseCase(confession_repository_mock)
+
+        # Act
+        result = await use_case.execute(ConfessionStatusUpdateDTO(id=404, status=ConfessionStatus.APPROVED))
+
+        # Assert
+        assert result is None
+        confession_repository_mock.get_by_id.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_execute_rejects_publication(self, confession_repository_mock):
+        """Тест: опубликовать признание сменой статуса нельзя - только через исходящую очередь."""
+        # Arrange
+        use_case = UpdateConfessionStatusUseCase(confession_repository_mock)
+
+        # Act & Assert
+        with pytest.raises(DirectPublicationError) as error:
+            await use_case.execute(ConfessionStatusUpdateDTO(id=1, status=ConfessionStatus.PUBLISHED))
+        assert error.value.confession_id == 1
+        assert "/api/" not in str(error.value)
+        confession_repository_mock.update_status.assert_not_called()
@@ -0,0 +1,113 @@
+"""
+Тесты для ListConfessionsUseCase.
+"""
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from datetime import datetime
+
+from src.entities.confession import Confession
+from src.entities.enums import ConfessionProjection, ConfessionStatus
+from src.interface_adapters.dto import ConfessionListQueryDTO
+from src.interface_adapters.pagination import Page, PageCursor
+from src.use_cases.confession_use_cases import ListConfessionsUseCase
+
+
+class TestListConfessionsUseCase:
+    """Тесты для ListConfessionsUseCase."""
+
+    @pytest.fixture
+    def confessions(self):
+        """Тестовые признания."""
+        return [
+            Confession(id=2, content="Второе", status=ConfessionStatus.PUBLISHED, created_at=datetime(2025, 5, 2)),
+            Confession(id=1, content="Первое", status=ConfessionStatus.PUBLISHED, created_at=datetime(2025, 5, 1)),
+        ]
+
+    @pytest.fixture
+    def confession_repository_mock(self, confessions):
+        """Создает мок репозитория признаний."""
+        repository = AsyncMock()
+        repository.list_page.return_value = Page(
+            items=confessions,
+            next_cursor=PageCursor(created_at=confessions[-1].created_at, id=confessions[-1].id),
+        )
+
+        async def stream_mock(status, projection):
+            for confession in confessions:
+                yield confession
+
+        repository.stream_by_status = MagicMock(side_effect=stream_mock)
+        return repository
+
+    @pytest.mark.asyncio
+    async def test_execute_returns_page_with_encoded_cursor(self, confession_repository_mock):
+        """Тест получения страницы признаний."""
+        # Arrange
+        use_case = ListConfessionsUseCase(confession_repository_mock)
+        query = ConfessionListQueryDTO(status=ConfessionStatus.PUBLISHED, limit=2)
+
+        # Act
+        result = await use_case.execute(query)
+
+        # Assert
+        confession_repository_mock.list_page.assert_called_once_with(
+            ConfessionStatus.PUBLISHED, 2, None, ConfessionProjection.SUMMARY
+        )
+        assert [item.id for item in result.items] == [2, 1]
+        assert PageCursor.decode(result.next_cursor) == PageCursor(created_at=datetime(2025, 5, 1), id=1)
+
+    @pytest.mark.asyncio
+    async def test_execute_passes_decoded_cursor(self, confession_repository_mock):
+        """Тест передачи декодированного курсора в репозиторий."""
+        # Arrange
+        use_case = ListConfessionsUseCase(confession_repository_mock)
+        cursor = PageCursor(created_at=datetime(2025, 5, 3), id=3)
+        query = ConfessionListQueryDTO(limit=10, cursor=cursor.encode())
+
+        # Act
+        await use_case.execute(query)
+
+        # Assert
+        confession_repository_mock.list_page.assert_called_once_with(None, 10, cursor, ConfessionProjection.SUMMARY)
+
+    @pytest.mark.asyncio
+    async def test_execute_invalid_cursor(self, confession_repository_mock):
+        """Тест ошибки на поврежденном курсоре."""
+        # Arrange
+        use_case = ListConfessionsUseCase(confession_repository_mock)
+
+        # Act & Assert
+        with pytest.raises(ValueError):
+            await use_case.execute(ConfessionListQueryDTO(cursor="garbage"))
+        confession_repository_mock.list_page.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_stream(self, confession_repository_mock):
+        """Тест потоковой выдачи признаний."""
+        # Arrange
+        use_case = ListConfessionsUseCase(confession_repository_mock)
+
+        # Act
+        result = [dto async for dto in use_case.stream(ConfessionStatus.PUBLISHED)]
+
+        # Assert
+        confession_repository_mock.stream_by_status.assert_called_once_with(
+            ConfessionStatus.PUBLISHED, ConfessionProjection.SUMMARY
+        )
+        assert [dto.id for dto in result] == [2, 1]
+
+    @pytest.mark.asyncio
+    async def test_list_by_status(self, confession_repository_mock, confessions):
+        """Тест получения всех признаний со статусом в краткой проекции."""
+        # Arrange
+        confession_repository_mock.list_by_status.return_value = confessions
+        use_case = ListConfessionsUseCase(confession_repository_mock)
+
+        # Act
+        result = await use_case.list_by_status(ConfessionStatus.PUBLISHED)
+
+        # Assert
+        confession_repository_mock.list_by_status.assert_called_once_with(
+            ConfessionStatus.PUBLISHED, ConfessionProjection.SUMMARY
+        )
+        assert [dto.id for dto in result] == [2, 1]
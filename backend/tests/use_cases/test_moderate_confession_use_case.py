@@ -5,7 +5,7 @@ import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 from datetime import datetime
 
-from src.entities.confession import Confession
+from src.entities.confession import Confession, ModerationPendingError, ModerationResult, StatusTransitionError
 from src.entities.enums import ConfessionStatus
 from src.interface_adapters.dto import ConfessionDTO
 from src.use_cases.confession_use_cases import ModerateConfessionUseCase
@@ -38,8 +38,7 @@ class TestModerateConfessionUseCase:
         gateway = AsyncMock()
         
         # Можем указать разные результаты для разных тестов
-        gateway.moderate.return_value = ConfessionStatus.APPROVED
-        gateway.get_moderation_reason.return_value = None
+        gateway.moderate.return_value = ModerationResult(status=ConfessionStatus.APPROVED)
         
         return gateway
     
@@ -76,8 +75,10 @@ class TestModerateConfessionUseCase:
         """Тест отклонения признания."""
         # Arrange
         # Меняем поведение мока для этого теста
-        moderation_gateway_mock.moderate.return_value = ConfessionStatus.REJECTED
-        moderation_gateway_mock.get_moderation_reason.return_value = "Содержание нарушает правила"
+        moderation_gateway_mock.moderate.return_value = ModerationResult(
+            status=ConfessionStatus.REJECTED,
+            reason="Содержание нарушает правила",
+        )
         
         use_case = ModerateConfessionUseCase(
             moderation_gateway=moderation_gateway_mock,
@@ -97,11 +98,10 @@ class TestModerateConfessionUseCase:
         # Проверяем, что метод moderate был вызван
         moderation_gateway_mock.moderate.assert_called_once()
         
-        # Проверяем, что была запрошена причина отклонения
-        moderation_gateway_mock.get_moderation_reason.assert_called_once()
-        
-        # Проверяем, что признание было сохранено
+        # Проверяем, что признание сохранено с причиной из результата модерации
         confession_repository_mock.save.assert_called_once()
+        saved_confession = confession_repository_mock.save.call_args.args[0]
+        assert saved_confession.moderation_logs[-1].reason == "Содержание нарушает правила"
         
         # Проверяем результат
         assert result is False
@@ -133,4 +133,36 @@ class TestModerateConfessionUseCase:
         confession_repository_mock.get_by_id.assert_called_once_with(999)
         
         # Проверяем результат
-        assert result is False 
\ No newline at end of file
+        assert result is False
+    
+    @pytest.mark.asyncio
+    async def test_execute_discards_decision_after_concurrent_change(
+        self, confession_repository_mock, moderation_gateway_mock
+    ):
+        """Тест: решение отбрасывается, если статус признания за время модерации уже сменили."""
+        # Arrange
+        confession_repository_mock.save.side_effect = StatusTransitionError(
+            1, ConfessionStatus.PUBLISHED, ConfessionStatus.APPROVED
+        )
+        use_case = ModerateConfessionUseCase(
+            moderation_gateway=moderation_gateway_mock,
+            confession_repository=confession_repository_mock,
+        )
+        
+        # Act
+        result = await use_case.execute(ConfessionDTO(id=1, content=""))
+        
+        # Assert
+        assert result is False
+    
+    @pytest.mark.asyncio
+    async def test_execute_without_decision_raises(self, confession_repository_mock, moderation_gateway_mock):
+        """Тест: ответ PENDING не пишется в журнал, а поднимает ошибку для повтора."""
+        # Arrange
+        moderation_gateway_mock.moderate.return_value = ModerationResult(status=ConfessionStatus.PENDING)
+        use_case = ModerateConfessionUseCase(moderation_gateway_mock, confession_repository_mock)
+        
+        # Act & Assert
+        with pytest.raises(ModerationPendingError):
+            await use_case.execute(ConfessionDTO(id=1, content=""))
+        confession_repository_mock.save.assert_not_called()
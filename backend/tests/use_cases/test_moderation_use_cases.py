@@ -0,0 +1,346 @@
+"""
+Тесты для Use Cases фоновой модерации.
+"""
+import pytest
+from unittest.mock import AsyncMock
+from datetime import datetime, timedelta
+
+from src.entities.confession import Confession, ModerationJob, ModerationResult, StatusTransitionError
+from src.entities.enums import ConfessionProjection, ConfessionStatus, ModerationJobStatus
+from src.interface_adapters.dto import ConfessionDTO
+from src.interface_adapters.pagination import Page, PageCursor
+from src.use_cases.confession_use_cases import ModerateConfessionUseCase
+from src.use_cases.moderation_use_cases import (
+    BatchModerateConfessionsUseCase,
+    GetModerationJobUseCase,
+    ProcessModerationJobUseCase,
+    RequestModerationUseCase,
+)
+
+
+@pytest.fixture
+def moderation_job():
+    """Создает задачу модерации, взятую воркером."""
+    now = datetime.now()
+    return ModerationJob(
+        id=7,
+        confession_id=1,
+        status=ModerationJobStatus.RUNNING,
+        attempts=1,
+        available_at=now,
+        created_at=now,
+        updated_at=now,
+    )
+
+
+@pytest.fixture
+def moderation_job_repository_mock(moderation_job):
+    """Создает мок очереди задач модерации."""
+    repository = AsyncMock()
+    repository.enqueue.return_value = moderation_job
+    repository.claim.return_value = moderation_job
+    return repository
+
+
+class TestRequestModerationUseCase:
+    """Тесты для RequestModerationUseCase."""
+    
+    @pytest.mark.asyncio
+    async def test_execute_enqueues_job(self, moderation_job_repository_mock):
+        """Тест постановки признания в очередь."""
+        # Arrange
+        confession_repository = AsyncMock()
+        confession_repository.get_by_id.return_value = Confession(id=1, content="Тест")
+        use_case = RequestModerationUseCase(confession_repository, moderation_job_repository_mock)
+        
+        # Act
+        result = await use_case.execute(ConfessionDTO(id=1, content=""))
+        
+        # Assert
+        moderation_job_repository_mock.enqueue.assert_awaited_once_with(1)
+        assert result.id == 7
+        assert result.confession_id == 1
+    
+    @pytest.mark.asyncio
+    async def test_execute_confession_not_found(self, moderation_job_repository_mock):
+        """Тест: для несуществующего признания задача не создается."""
+        # Arrange
+        confession_repository = AsyncMock()
+        confession_repository.get_by_id.return_value = None
+        use_case = RequestModerationUseCase(confession_repository, moderation_job_repository_mock)
+        
+        # Act
+        result = await use_case.execute(ConfessionDTO(id=999, content=""))
+        
+        # Assert
+        assert result is None
+        moderation_job_repository_mock.enqueue.assert_not_called()
+
+
+class TestGetModerationJobUseCase:
+    """Тесты для GetModerationJobUseCase."""
+    
+    @pytest.mark.asyncio
+    async def test_execute_returns_job(self, moderation_job_repository_mock, moderation_job):
+        """Тест получения задачи по ID."""
+        # Arrange
+        moderation_job_repository_mock.get_by_id.return_value = moderation_job
+        use_case = GetModerationJobUseCase(moderation_job_repository_mock)
+        
+        # Act
+        result = await use_case.execute(7)
+        
+        # Assert
+        assert result.id == 7
+        assert result.status == ModerationJobStatus.RUNNING
+    
+    @pytest.mark.asyncio
+    async def test_execute_not_found(self, moderation_job_repository_mock):
+        """Тест получения несуществующей задачи."""
+        # Arrange
+        moderation_job_repository_mock.get_by_id.return_value = None
+        use_case = GetModerationJobUseCase(moderation_job_repository_mock)
+        
+        # Act & Assert
+        assert await use_case.execute(404) is None
+
+
+class TestProcessModerationJobUseCase:
+    """Тесты для ProcessModerationJobUseCase."""
+    
+    @pytest.mark.asyncio
+    async def test_execute_empty_queue(self, moderation_job_repository_mock):
+        """Тест: при пустой очереди модерация не запускается."""
+        # Arrange
+        moderation_job_repository_mock.claim.return_value = None
+        moderate_use_case = AsyncMock()
+        use_case = ProcessModerationJobUseCase(moderation_job_repository_mock, moderate_use_case)
+        
+        # Act
+        processed = await use_case.execute()
+        
+        # Assert
+        assert processed is False
+        moderate_use_case.execute.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_execute_completes_job(self, moderation_job_repository_mock, moderation_job):
+        """Тест успешной обработки задачи."""
+        # Arrange
+        moderate_use_case = AsyncMock()
+        use_case = ProcessModerationJobUseCase(moderation_job_repository_mock, moderate_use_case, lease_seconds=60)
+        
+        # Act
+        processed = await use_case.execute()
+        
+        # Assert
+        assert processed is True
+        moderation_job_repository_mock.claim.assert_awaited_once_with(60)
+        assert moderate_use_case.execute.call_args.args[0].id == 1
+        moderation_job_repository_mock.complete.assert_awaited_once_with(moderation_job)
+    
+    @pytest.mark.asyncio
+    async def test_execute_retries_with_backoff(self, moderation_job_repository_mock, moderation_job):
+        """Тест: после ошибки задача возвращается в очередь с удваивающейся задержкой."""
+        # Arrange
+        moderation_job.attempts = 3
+        moderate_use_case = AsyncMock()
+        moderate_use_case.execute.side_effect = RuntimeError("provider down")
+        use_case = ProcessModerationJobUseCase(
+            moderation_job_repository_mock, moderate_use_case, max_attempts=5, retry_delay=10
+        )
+        started_at = datetime.now()
+        
+        # Act
+        await use_case.execute()
+        
+        # Assert
+        job, error, available_at = moderation_job_repository_mock.retry.call_args.args
+        assert job is moderation_job
+        assert error == "provider down"
+        assert available_at - started_at >= timedelta(seconds=40)
+        moderation_job_repository_mock.complete.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_execute_retries_when_gateway_has_no_decision(self, moderation_job_repository_mock):
+        """Тест: если система модерации вернула PENDING, задача повторяется, а не завершается."""
+        # Arrange
+        confession_repository = AsyncMock()
+        confession_repository.get_by_id.return_value = Confession(id=1, content="Тест")
+        gateway = AsyncMock()
+        gateway.moderate.return_value = ModerationResult(status=ConfessionStatus.PENDING)
+        use_case = ProcessModerationJobUseCase(
+            moderation_job_repository_mock,
+            ModerateConfessionUseCase(gateway, confession_repository),
+        )
+        
+        # Act
+        await use_case.execute()
+        
+        # Assert
+        moderation_job_repository_mock.retry.assert_awaited_once()
+        moderation_job_repository_mock.complete.assert_not_called()
+        confession_repository.save.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_execute_fails_after_max_attempts(self, moderation_job_repository_mock, moderation_job):
+        """Тест: после исчерпания попыток задача отмечается проваленной."""
+        # Arrange
+        moderation_job.attempts = 5
+        moderate_use_case = AsyncMock()
+        moderate_use_case.execute.side_effect = RuntimeError("provider down")
+        use_case = ProcessModerationJobUseCase(moderation_job_repository_mock, moderate_use_case, max_attempts=5)
+        
+        # Act
+        await use_case.execute()
+        
+        # Assert
+        moderation_job_repository_mock.fail.assert_awaited_once_with(moderation_job, "provider down")
+        moderation_job_repository_mock.retry.assert_not_called()
+
+
+    @pytest.mark.asyncio
+    async def test_execute_drops_result_after_lease_lost(self, moderation_job_repository_mock):
+        """Тест: если аренду задачи забрал другой воркер, обработка все равно считается выполненной."""
+        # Arrange
+        moderation_job_repository_mock.complete.return_value = False
+        use_case = ProcessModerationJobUseCase(moderation_job_repository_mock, AsyncMock())
+        
+        # Act
+        processed = await use_case.execute()
+        
+        # Assert
+        assert processed is True
+        moderation_job_repository_mock.complete.assert_awaited_once()
+        moderation_job_repository_mock.retry.assert_not_called()
+
+
+class TestBatchModerateConfessionsUseCase:
+    """Тесты для BatchModerateConfessionsUseCase."""
+    
+    @staticmethod
+    def _pending(ids):
+        """Создает признания, ожидающие модерации."""
+        return [Confession(id=id_, content=f"Признание {id_}", created_at=datetime(2024, 1, 1)) for id_ in ids]
+    
+    @pytest.fixture
+    def moderation_gateway_mock(self):
+        """Создает мок гейтвея, одобряющий все признания, кроме кратных трем."""
+        gateway = AsyncMock()
+        
+        async def moderate_many(confessions):
+            return [
+                ModerationResult(status=ConfessionStatus.REJECTED, reason="Content flagged for: hate")
+                if confession.id % 3 == 0
+                else ModerationResult(status=ConfessionStatus.APPROVED)
+                for confession in confessions
+            ]
+        
+        gateway.moderate_many.side_effect = moderate_many
+        return gateway
+    
+    @pytest.mark.asyncio
+    async def test_execute_moderates_pages_in_batches(self, moderation_gateway_mock):
+        """Тест: признания читаются страницами и отправляются пачками по batch_size."""
+        # Arrange
+        first_page = self._pending(range(1, 6))
+        second_page = self._pending(range(6, 8))
+        confession_repository = AsyncMock()
+        confession_repository.list_page.side_effect = [
+            Page(items=first_page, next_cursor=PageCursor(created_at=datetime(2024, 1, 1), id=5)),
+            Page(items=second_page),
+        ]
+        confession_repository.update_status.return_value = True
+        use_case = BatchModerateConfessionsUseCase(
+            moderation_gateway_mock, confession_repository, batch_size=2, concurrency=3
+        )
+        
+        # Act
+        result = await use_case.execute()
+        
+        # Assert
+        first_call, second_call = confession_repository.list_page.call_args_list
+        assert first_call.args == (ConfessionStatus.PENDING, 6, None, ConfessionProjection.SUMMARY)
+        assert second_call.args[2].id == 5
+        batch_sizes = [len(call.args[0]) for call in moderation_gateway_mock.moderate_many.call_args_list]
+        assert batch_sizes == [2, 2, 1, 2]
+        assert result.processed == 7
+        assert result.approved == 5
+        assert result.rejected == 2
+        assert confession_repository.update_status.await_count == 7
+        confession_repository.save.assert_not_called()
+        
+        rejected = first_page[2]
+        assert rejected.status == ConfessionStatus.REJECTED
+        assert rejected.moderation_logs[-1].reason == "Content flagged for: hate"
+    
+    @pytest.mark.asyncio
+    async def test_execute_leaves_unanswered_pending(self):
+        """Тест: признания без ответа системы модерации остаются PENDING и не сохраняются."""
+        # Arrange
+        confession_repository = AsyncMock()
+        confession_repository.list_page.return_value = Page(items=self._pending([1, 2]))
+        moderation_gateway = AsyncMock()
+        moderation_gateway.moderate_many.return_value = [ModerationResult(), ModerationResult()]
+        use_case = BatchModerateConfessionsUseCase(moderation_gateway, confession_repository)
+        
+        # Act
+        result = await use_case.execute()
+        
+        # Assert
+        assert result.processed == 2
+        assert result.pending == 2
+        confession_repository.update_status.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_execute_skips_concurrently_changed(self, moderation_gateway_mock):
+        """Тест: решение по признанию, статус которого уже сменили, отбрасывается без остановки пачки."""
+        # Arrange
+        confession_repository = AsyncMock()
+        confession_repository.list_page.return_value = Page(items=self._pending([1, 2]))
+        confession_repository.update_status.side_effect = [
+            StatusTransitionError(1, ConfessionStatus.REJECTED, ConfessionStatus.APPROVED),
+            True,
+        ]
+        use_case = BatchModerateConfessionsUseCase(moderation_gateway_mock, confession_repository)
+        
+        # Act
+        result = await use_case.execute()
+        
+        # Assert
+        assert result.processed == 1
+        assert result.approved == 1
+        assert confession_repository.update_status.await_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_execute_does_not_overwrite_manual_decision(self, moderation_gateway_mock):
+        """Тест: решение записывается только поверх PENDING, вместе с записью о модерации."""
+        # Arrange
+        confession_repository = AsyncMock()
+        confession_repository.list_page.return_value = Page(items=self._pending([1]))
+        confession_repository.update_status.return_value = True
+        use_case = BatchModerateConfessionsUseCase(moderation_gateway_mock, confession_repository)
+        
+        # Act
+        await use_case.execute()
+        
+        # Assert
+        id, status, expected, log = confession_repository.update_status.call_args.args
+        assert (id, status, expected) == (1, ConfessionStatus.APPROVED, ConfessionStatus.PENDING)
+        assert (log.decision, log.moderator) == (ConfessionStatus.APPROVED, "LLM")
+        confession_repository.get_by_id.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_execute_nothing_pending(self, moderation_gateway_mock):
+        """Тест: без ожидающих признаний система модерации не вызывается."""
+        # Arrange
+        confession_repository = AsyncMock()
+        confession_repository.list_page.return_value = Page(items=[])
+        use_case = BatchModerateConfessionsUseCase(moderation_gateway_mock, confession_repository)
+        
+        # Act
+        result = await use_case.execute()
+        
+        # Assert
+        assert result.processed == 0
+        moderation_gateway_mock.moderate_many.assert_not_called()
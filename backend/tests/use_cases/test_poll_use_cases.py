@@ -0,0 +1,124 @@
+"""
+Тесты для Use Cases голосования в опросах.
+"""
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from src.entities.confession import Poll, PollOption
+from src.interface_adapters.dto import VoteDTO
+from src.use_cases.poll_use_cases import GetPollResultsUseCase, VoteInPollUseCase
+
+
+@pytest.fixture
+def poll_repository_mock():
+    """Создает мок репозитория опросов с опросом из двух вариантов."""
+    repository = AsyncMock()
+    repository.get_by_id.side_effect = lambda id: Poll(
+        id=id,
+        question="Тестовый вопрос",
+        options=[
+            PollOption(id=1, text="Вариант 1", vote_count=5),
+            PollOption(id=2, text="Вариант 2", vote_count=3),
+        ],
+    ) if id == 1 else None
+    return repository
+
+
+@pytest.fixture
+def vote_buffer_mock():
+    """Создает мок буфера голосов с двумя еще не записанными голосами за первый вариант."""
+    buffer = MagicMock(add=AsyncMock())
+    buffer.pending.return_value = {1: 2}
+    return buffer
+
+
+class TestVoteInPollUseCase:
+    """Тесты для VoteInPollUseCase."""
+    
+    @pytest.mark.asyncio
+    async def test_execute_adds_vote_atomically(self, poll_repository_mock):
+        """Тест: без буфера голос сразу записывается атомарным приращением."""
+        # Arrange
+        use_case = VoteInPollUseCase(poll_repository_mock)
+        
+        # Act
+        result = await use_case.execute(VoteDTO(poll_id=1, option_id=1))
+        
+        # Assert
+        poll_repository_mock.add_votes.assert_awaited_once_with({1: 1})
+        assert [option.vote_count for option in result.options] == [6, 3]
+    
+    @pytest.mark.asyncio
+    async def test_execute_buffers_vote(self, poll_repository_mock, vote_buffer_mock):
+        """Тест: с буфером голос не пишется в БД сразу, но виден в ответе."""
+        # Arrange
+        use_case = VoteInPollUseCase(poll_repository_mock, vote_buffer_mock)
+        
+        # Act
+        result = await use_case.execute(VoteDTO(poll_id=1, option_id=1))
+        
+        # Assert
+        vote_buffer_mock.add.assert_awaited_once_with(1)
+        poll_repository_mock.add_votes.assert_not_called()
+        vote_buffer_mock.pending.assert_called_once_with([1, 2])
+        assert [option.vote_count for option in result.options] == [7, 3]
+    
+    @pytest.mark.asyncio
+    async def test_execute_invalidates_results_cache(self, poll_repository_mock):
+        """Тест: после голоса кэш результатов сбрасывается, а наблюдатели получают обновление."""
+        # Arrange
+        results_cache = MagicMock()
+        poll_updates = MagicMock()
+        use_case = VoteInPollUseCase(poll_repository_mock, results_cache=results_cache, poll_updates=poll_updates)
+        
+        # Act
+        await use_case.execute(VoteDTO(poll_id=1, option_id=2))
+        
+        # Assert
+        results_cache.invalidate.assert_called_once_with(1)
+        poll_updates.publish.assert_called_once_with(1)
+    
+    @pytest.mark.asyncio
+    async def test_execute_invalid_option(self, poll_repository_mock):
+        """Тест: вариант из другого опроса отклоняется."""
+        # Arrange
+        use_case = VoteInPollUseCase(poll_repository_mock)
+        
+        # Act & Assert
+        with pytest.raises(ValueError, match="Invalid option id"):
+            await use_case.execute(VoteDTO(poll_id=1, option_id=999))
+        poll_repository_mock.add_votes.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_execute_poll_not_found(self, poll_repository_mock):
+        """Тест: голос в несуществующем опросе возвращает None."""
+        # Arrange
+        use_case = VoteInPollUseCase(poll_repository_mock)
+        
+        # Act & Assert
+        assert await use_case.execute(VoteDTO(poll_id=999, option_id=1)) is None
+
+
+class TestGetPollResultsUseCase:
+    """Тесты для GetPollResultsUseCase."""
+    
+    @pytest.mark.asyncio
+    async def test_execute_includes_buffered_votes(self, poll_repository_mock, vote_buffer_mock):
+        """Тест: в результатах учтены голоса, еще не записанные из буфера."""
+        # Arrange
+        use_case = GetPollResultsUseCase(poll_repository_mock, vote_buffer_mock)
+        
+        # Act
+        result = await use_case.execute(1)
+        
+        # Assert
+        assert [option.vote_count for option in result.options] == [7, 3]
+    
+    @pytest.mark.asyncio
+    async def test_execute_not_found(self, poll_repository_mock):
+        """Тест: результаты несуществующего опроса - None."""
+        # Arrange
+        use_case = GetPollResultsUseCase(poll_repository_mock)
+        
+        # Act & Assert
+        assert await use_case.execute(999) is None
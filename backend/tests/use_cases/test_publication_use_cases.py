@@ -0,0 +1,389 @@
+"""
+Тесты для Use Cases отправки публикаций в Telegram.
+"""
+import pytest
+from unittest.mock import AsyncMock, Mock, call
+from datetime import datetime, time, timedelta
+
+from src.entities.confession import Attachment, Confession, Poll, PollOption, Publication, PublicationQueueStats
+from src.entities.enums import AttachmentType, ConfessionStatus, PublicationStatus
+from src.interface_adapters.gateway_protocols import PublicationRateLimitedError, PublicationTemporaryError
+from src.use_cases.publication_use_cases import DeliverPublicationUseCase, SchedulePublicationsUseCase
+
+
+@pytest.fixture
+def publication():
+    """Создает сообщение очереди, взятое отправителем."""
+    return Publication(
+        id=11,
+        confession_id=1,
+        channel_id="@test_channel",
+        status=PublicationStatus.SENDING,
+        attempts=1,
+    )
+
+
+@pytest.fixture
+def publication_repository_mock(publication):
+    """Создает мок исходящей очереди."""
+    repository = AsyncMock()
+    repository.claim.return_value = publication
+    return repository
+
+
+@pytest.fixture
+def confession():
+    """Создает опубликованное признание с опросом."""
+    return Confession(
+        id=1,
+        content="Тестовое признание",
+        status=ConfessionStatus.PUBLISHED,
+        poll=Poll(question="Вопрос?", options=[PollOption(text="Да"), PollOption(text="Нет")]),
+    )
+
+
+@pytest.fixture
+def confession_repository_mock(confession):
+    """Создает мок репозитория признаний."""
+    repository = AsyncMock()
+    repository.get_by_id.return_value = confession
+    return repository
+
+
+@pytest.fixture
+def telegram_gateway_mock():
+    """Создает мок гейтвея Telegram."""
+    gateway = AsyncMock()
+    gateway.send_confession.return_value = "message_123"
+    gateway.send_poll.return_value = "poll_456"
+    return gateway
+
+
+@pytest.fixture
+def use_case(publication_repository_mock, confession_repository_mock, telegram_gateway_mock):
+    """Создает Use Case с моками."""
+    return DeliverPublicationUseCase(
+        publication_repository_mock,
+        confession_repository_mock,
+        telegram_gateway_mock,
+        max_attempts=3,
+        retry_delay=10,
+    )
+
+
+class TestDeliverPublicationUseCase:
+    """Тесты для DeliverPublicationUseCase."""
+    
+    @pytest.mark.asyncio
+    async def test_execute_empty_queue(self, use_case, publication_repository_mock, telegram_gateway_mock):
+        """Тест: на пустой очереди ничего не отправляется."""
+        # Arrange
+        publication_repository_mock.claim.return_value = None
+        
+        # Act
+        processed = await use_case.execute()
+        
+        # Assert
+        assert processed is False
+        telegram_gateway_mock.send_confession.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_execute_sends_confession_and_poll(
+        self, use_case, publication_repository_mock, confession_repository_mock, telegram_gateway_mock, confession
+    ):
+        """Тест доставки: признание и опрос отправляются в канал сообщения, прогресс запоминается."""
+        # Act
+        processed = await use_case.execute()
+        
+        # Assert
+        assert processed is True
+        telegram_gateway_mock.send_confession.assert_awaited_once_with(confession, "@test_channel")
+        telegram_gateway_mock.send_poll.assert_awaited_once_with(confession.poll, "@test_channel")
+        assert publication_repository_mock.record_progress.await_args_list == [
+            call(11, telegram_message_id="message_123"),
+            call(11, poll_message_id="poll_456"),
+        ]
+        publication_repository_mock.complete.assert_awaited_once_with(11)
+        
+        record, poll_message_id = confession_repository_mock.record_publication.call_args.args
+        assert (record.confession_id, record.telegram_message_id) == (1, "message_123")
+        assert record.channel_id == "@test_channel"
+        assert poll_message_id == "poll_456"
+        confession_repository_mock.save.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_execute_second_channel_completes_after_record_exists(
+        self, use_case, publication_repository_mock, confession_repository_mock, publication
+    ):
+        """Тест: если публикацию уже зафиксировал другой канал, сообщение все равно завершается без повтора."""
+        # Arrange
+        publication.channel_id = "@falt_conf_en"
+        confession_repository_mock.record_publication.return_value = False
+        
+        # Act
+        await use_case.execute()
+        
+        # Assert
+        publication_repository_mock.complete.assert_awaited_once_with(11)
+        publication_repository_mock.retry.assert_not_called()
+        publication_repository_mock.fail.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_execute_sends_attachments_after_text(
+        self, use_case, publication_repository_mock, telegram_gateway_mock, confession
+    ):
+        """Тест: вложения отправляются альбомами после текста, их ID запоминаются."""
+        # Arrange
+        confession.attachments = [Attachment(url="https://example.com/a.jpg", type=AttachmentType.IMAGE)]
+        
+        async def send_attachments(confession, channel_id, sent_message_ids, on_album_sent):
+            await on_album_sent(["media_1"])
+            return ["media_1"]
+        
+        telegram_gateway_mock.send_attachments.side_effect = send_attachments
+        
+        # Act
+        await use_case.execute()
+        
+        # Assert
+        assert telegram_gateway_mock.send_attachments.call_args.args[:3] == (confession, "@test_channel", [])
+        assert call(11, media_message_ids=["media_1"]) in publication_repository_mock.record_progress.await_args_list
+    
+    @pytest.mark.asyncio
+    async def test_execute_resumes_partially_sent_attachments(
+        self, use_case, publication_repository_mock, telegram_gateway_mock, publication, confession
+    ):
+        """Тест: после сбоя на втором альбоме повтор передает гейтвею ID уже отправленных сообщений."""
+        # Arrange
+        publication.telegram_message_id = "message_123"
+        publication.media_message_ids = ["media_1"]
+        confession.attachments = [
+            Attachment(url="https://example.com/a.mp3", type=AttachmentType.AUDIO),
+            Attachment(url="https://example.com/b.pdf", type=AttachmentType.DOCUMENT),
+        ]
+        
+        # Act
+        await use_case.execute()
+        
+        # Assert
+        assert telegram_gateway_mock.send_attachments.call_args.args[:3] == (confession, "@test_channel", ["media_1"])
+    
+    @pytest.mark.asyncio
+    async def test_execute_does_not_resend_delivered_attachments(
+        self, use_case, telegram_gateway_mock, publication, confession
+    ):
+        """Тест: если все вложения уже отправлены, гейтвей не вызывается."""
+        # Arrange
+        publication.media_message_ids = ["media_1"]
+        confession.attachments = [Attachment(url="https://example.com/a.jpg", type=AttachmentType.IMAGE)]
+        
+        # Act
+        await use_case.execute()
+        
+        # Assert
+        telegram_gateway_mock.send_attachments.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_execute_skips_already_sent_parts(
+        self, use_case, publication_repository_mock, telegram_gateway_mock, publication
+    ):
+        """Тест: повторная попытка досылает только опрос, признание не дублируется."""
+        # Arrange
+        publication.telegram_message_id = "message_123"
+        publication.media_message_ids = []
+        
+        # Act
+        await use_case.execute()
+        
+        # Assert
+        telegram_gateway_mock.send_confession.assert_not_called()
+        telegram_gateway_mock.send_attachments.assert_not_called()
+        telegram_gateway_mock.send_poll.assert_awaited_once()
+        publication_repository_mock.complete.assert_awaited_once_with(11)
+    
+    @pytest.mark.asyncio
+    async def test_execute_rate_limited_is_retried(
+        self, use_case, publication_repository_mock, telegram_gateway_mock, publication
+    ):
+        """Тест: RetryAfter возвращает сообщение в очередь на указанное Telegram время, даже после max_attempts."""
+        # Arrange
+        publication.attempts = 3
+        telegram_gateway_mock.send_confession.side_effect = PublicationRateLimitedError(retry_after=30)
+        started_at = datetime.now()
+        
+        # Act
+        await use_case.execute()
+        
+        # Assert
+        publication_id, _, available_at = publication_repository_mock.retry.call_args.args
+        assert publication_id == 11
+        assert available_at - started_at >= timedelta(seconds=30)
+        publication_repository_mock.fail.assert_not_called()
+        publication_repository_mock.complete.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_execute_temporary_error_retries_with_backoff(
+        self, use_case, publication_repository_mock, telegram_gateway_mock, publication
+    ):
+        """Тест: временная ошибка Telegram повторяется с удваивающейся задержкой."""
+        # Arrange
+        publication.attempts = 2
+        telegram_gateway_mock.send_poll.side_effect = PublicationTemporaryError("Bad Gateway")
+        started_at = datetime.now()
+        
+        # Act
+        await use_case.execute()
+        
+        # Assert
+        publication_id, error, available_at = publication_repository_mock.retry.call_args.args
+        assert publication_id == 11
+        assert error == "Bad Gateway"
+        assert available_at - started_at >= timedelta(seconds=20)
+        # Признание уже отправлено и при повторе не продублируется
+        publication_repository_mock.record_progress.assert_awaited_once_with(11, telegram_message_id="message_123")
+    
+    @pytest.mark.asyncio
+    async def test_execute_temporary_error_fails_after_max_attempts(
+        self, use_case, publication_repository_mock, telegram_gateway_mock, publication
+    ):
+        """Тест: после исчерпания попыток сообщение отмечается проваленным."""
+        # Arrange
+        publication.attempts = 3
+        telegram_gateway_mock.send_confession.side_effect = PublicationTemporaryError("Bad Gateway")
+        
+        # Act
+        await use_case.execute()
+        
+        # Assert
+        publication_repository_mock.fail.assert_awaited_once_with(11, "Bad Gateway")
+        publication_repository_mock.retry.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_execute_ambiguous_error_is_not_retried(
+        self, use_case, publication_repository_mock, telegram_gateway_mock
+    ):
+        """Тест: после ошибки, при которой сообщение могло дойти, повторной отправки нет."""
+        # Arrange
+        telegram_gateway_mock.send_confession.side_effect = ConnectionError("connection reset")
+        
+        # Act
+        processed = await use_case.execute()
+        
+        # Assert
+        assert processed is True
+        publication_repository_mock.fail.assert_awaited_once_with(11, "connection reset")
+        publication_repository_mock.retry.assert_not_called()
+
+
+class TestSchedulePublicationsUseCase:
+    """Тесты для SchedulePublicationsUseCase."""
+    
+    @pytest.fixture
+    def scheduler_repositories(self):
+        """Создает моки репозиториев признаний и очереди."""
+        confession_repository = AsyncMock()
+        confession_repository.publish_approved.side_effect = lambda limit, channel_ids: list(range(1, limit + 1))
+        confession_repository.count_by_status.return_value = 25
+        publication_repository = AsyncMock()
+        publication_repository.queue_stats.return_value = PublicationQueueStats(depth=0)
+        return confession_repository, publication_repository
+    
+    def _use_case(self, repositories, **overrides):
+        """Создает Use Case с параметрами по умолчанию для тестов."""
+        options = dict(channel_ids=["@falt_conf", "@falt_conf_en"], channel_capacity=20, batch_size=10)
+        options.update(overrides)
+        return SchedulePublicationsUseCase(*repositories, **options)
+    
+    @pytest.mark.asyncio
+    async def test_execute_enqueues_batch_to_all_channels(self, scheduler_repositories):
+        """Тест: за запуск в очередь ставится не больше batch_size признаний во все каналы."""
+        # Arrange
+        confession_repository, _ = scheduler_repositories
+        use_case = self._use_case(scheduler_repositories)
+        
+        # Act
+        result = await use_case.execute()
+        
+        # Assert
+        confession_repository.publish_approved.assert_awaited_once_with(10, ["@falt_conf", "@falt_conf_en"])
+        confession_repository.count_by_status.assert_awaited_once_with(ConfessionStatus.APPROVED)
+        assert result.enqueued == 10
+        assert result.approved_backlog == 25
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("depth, invalidated", [(0, True), (60, False)])
+    async def test_execute_invalidates_feed_cache(self, scheduler_repositories, depth, invalidated):
+        """Тест: кэш публичной ленты сбрасывается, только если признания поставлены в очередь."""
+        # Arrange
+        _, publication_repository = scheduler_repositories
+        publication_repository.queue_stats.return_value = PublicationQueueStats(depth=depth)
+        feed_cache = Mock()
+        use_case = self._use_case(scheduler_repositories, feed_cache=feed_cache)
+        
+        # Act
+        await use_case.execute()
+        
+        # Assert
+        assert feed_cache.invalidate.called is invalidated
+    
+    @pytest.mark.asyncio
+    async def test_execute_respects_channel_capacity(self, scheduler_repositories):
+        """Тест: уже стоящие в очереди сообщения уменьшают порцию, чтобы не превысить лимит каналов."""
+        # Arrange
+        confession_repository, publication_repository = scheduler_repositories
+        publication_repository.queue_stats.return_value = PublicationQueueStats(depth=30)
+        use_case = self._use_case(scheduler_repositories)
+        
+        # Act
+        await use_case.execute()
+        
+        # Assert
+        # 30 сообщений на 2 канала - по 15 на канал, до лимита в 20 остается 5
+        confession_repository.publish_approved.assert_awaited_once_with(5, ["@falt_conf", "@falt_conf_en"])
+    
+    @pytest.mark.asyncio
+    async def test_execute_full_queue_enqueues_nothing(self, scheduler_repositories):
+        """Тест: при заполненной очереди новые признания не ставятся, но метрики собираются."""
+        # Arrange
+        confession_repository, publication_repository = scheduler_repositories
+        oldest = datetime.now() - timedelta(minutes=5)
+        publication_repository.queue_stats.return_value = PublicationQueueStats(depth=60, oldest_available_at=oldest)
+        use_case = self._use_case(scheduler_repositories)
+        
+        # Act
+        result = await use_case.execute()
+        
+        # Assert
+        confession_repository.publish_approved.assert_not_called()
+        assert result.enqueued == 0
+        assert result.queue_depth == 60
+        assert result.oldest_queued_at == oldest
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "now, window_start, window_end, in_window",
+        [
+            (time(12, 0), time(9, 0), time(23, 0), True),
+            (time(3, 0), time(9, 0), time(23, 0), False),
+            (time(23, 30), time(22, 0), time(2, 0), True),
+            (time(1, 0), time(22, 0), time(2, 0), True),
+            (time(12, 0), time(22, 0), time(2, 0), False),
+        ],
+    )
+    async def test_execute_time_window(self, scheduler_repositories, now, window_start, window_end, in_window):
+        """Тест: вне окна публикации признания не ставятся в очередь; окно может переходить через полночь."""
+        # Arrange
+        confession_repository, _ = scheduler_repositories
+        use_case = self._use_case(
+            scheduler_repositories,
+            window_start=window_start,
+            window_end=window_end,
+            clock=lambda: datetime.combine(datetime.now().date(), now),
+        )
+        
+        # Act
+        result = await use_case.execute()
+        
+        # Assert
+        assert result.in_window is in_window
+        assert confession_repository.publish_approved.called is in_window
@@ -2,11 +2,10 @@
 Тесты для PublishConfessionUseCase.
 """
 import pytest
-from unittest.mock import AsyncMock, MagicMock, patch
-from datetime import datetime
+from unittest.mock import AsyncMock, Mock
 
 from src.entities.confession import Confession, Poll, PollOption
-from src.entities.enums import ConfessionStatus
+from src.entities.enums import ConfessionStatus, PublicationStatus
 from src.interface_adapters.dto import ConfessionDTO
 from src.use_cases.confession_use_cases import PublishConfessionUseCase
 
@@ -29,28 +28,14 @@ class TestPublishConfessionUseCase:
             )
         
         repository.get_by_id.side_effect = get_by_id_mock
-        repository.save.side_effect = lambda confession: confession
+        repository.save.side_effect = lambda confession, outbox=(): confession
         return repository
     
-    @pytest.fixture
-    def telegram_gateway_mock(self):
-        """Создает мок гейтвея Telegram."""
-        gateway = AsyncMock()
-        
-        # Настраиваем методы
-        gateway.send_confession.return_value = "message_123"
-        gateway.send_poll.return_value = "poll_456"
-        
-        return gateway
-    
     @pytest.mark.asyncio
-    async def test_execute_publishes_confession(self, confession_repository_mock, telegram_gateway_mock):
-        """Тест публикации признания."""
+    async def test_execute_enqueues_publication(self, confession_repository_mock):
+        """Тест: публикация ставит сообщение в очередь в той же транзакции, что и смену статуса."""
         # Arrange
-        use_case = PublishConfessionUseCase(
-            telegram_gateway=telegram_gateway_mock,
-            confession_repository=confession_repository_mock,
-        )
+        use_case = PublishConfessionUseCase(confession_repository_mock, channel_ids=["@test_channel"])
         
         confession_dto = ConfessionDTO(
             id=1,
@@ -62,18 +47,53 @@ class TestPublishConfessionUseCase:
         result = await use_case.execute(confession_dto)
         
         # Assert
-        # Проверяем, что методы были вызваны
         confession_repository_mock.get_by_id.assert_called_once_with(1)
-        telegram_gateway_mock.send_confession.assert_called_once()
         confession_repository_mock.save.assert_called_once()
+        saved, = confession_repository_mock.save.call_args.args
+        outbox = confession_repository_mock.save.call_args.kwargs["outbox"]
+        assert saved.status == ConfessionStatus.PUBLISHED
+        assert len(outbox) == 1
+        assert outbox[0].confession_id == 1
+        assert outbox[0].channel_id == "@test_channel"
+        assert outbox[0].status == PublicationStatus.QUEUED
+        
+        # Запись о публикации появится только после доставки
+        assert saved.published_record is None
         
         # Проверяем результат
         assert result.id == 1
         assert result.status == ConfessionStatus.PUBLISHED
     
     @pytest.mark.asyncio
-    async def test_execute_publishes_confession_with_poll(self, confession_repository_mock, telegram_gateway_mock):
-        """Тест публикации признания с опросом."""
+    async def test_execute_invalidates_feed_cache(self, confession_repository_mock):
+        """Тест: после сохранения публикации кэш публичной ленты сбрасывается."""
+        # Arrange
+        feed_cache = Mock()
+        feed_cache.invalidate.side_effect = lambda: confession_repository_mock.save.assert_called_once()
+        use_case = PublishConfessionUseCase(confession_repository_mock, feed_cache=feed_cache)
+        
+        # Act
+        await use_case.execute(ConfessionDTO(id=1, content=""))
+        
+        # Assert
+        feed_cache.invalidate.assert_called_once_with()
+    
+    @pytest.mark.asyncio
+    async def test_execute_enqueues_one_message_per_channel(self, confession_repository_mock):
+        """Тест: при нескольких каналах в очередь ставится по сообщению на канал."""
+        # Arrange
+        use_case = PublishConfessionUseCase(confession_repository_mock, channel_ids=["@falt_conf", "@falt_conf_en"])
+        
+        # Act
+        await use_case.execute(ConfessionDTO(id=1, content=""))
+        
+        # Assert
+        outbox = confession_repository_mock.save.call_args.kwargs["outbox"]
+        assert [publication.channel_id for publication in outbox] == ["@falt_conf", "@falt_conf_en"]
+    
+    @pytest.mark.asyncio
+    async def test_execute_enqueues_confession_with_poll(self, confession_repository_mock):
+        """Тест публикации признания с опросом: опрос отправляется тем же сообщением очереди."""
         # Arrange
         # Меняем поведение мока - признание с опросом
         async def get_by_id_with_poll(id):
@@ -93,10 +113,7 @@ class TestPublishConfessionUseCase:
         
         confession_repository_mock.get_by_id.side_effect = get_by_id_with_poll
         
-        use_case = PublishConfessionUseCase(
-            telegram_gateway=telegram_gateway_mock,
-            confession_repository=confession_repository_mock,
-        )
+        use_case = PublishConfessionUseCase(confession_repository_mock)
         
         confession_dto = ConfessionDTO(
             id=2,
@@ -108,28 +125,23 @@ class TestPublishConfessionUseCase:
         result = await use_case.execute(confession_dto)
         
         # Assert
-        # Проверяем, что методы были вызваны
         confession_repository_mock.get_by_id.assert_called_once_with(2)
-        telegram_gateway_mock.send_confession.assert_called_once()
-        telegram_gateway_mock.send_poll.assert_called_once()
-        confession_repository_mock.save.assert_called_once()
+        outbox = confession_repository_mock.save.call_args.kwargs["outbox"]
+        assert [publication.channel_id for publication in outbox] == ["@falt_conf"]
         
         # Проверяем результат
         assert result.id == 2
         assert result.status == ConfessionStatus.PUBLISHED
     
     @pytest.mark.asyncio
-    async def test_execute_confession_not_found(self, confession_repository_mock, telegram_gateway_mock):
+    async def test_execute_confession_not_found(self, confession_repository_mock):
         """Тест случая, когда признание не найдено."""
         # Arrange
         # Меняем поведение мока - признание не найдено
         confession_repository_mock.get_by_id.side_effect = None  # Сбрасываем side_effect
         confession_repository_mock.get_by_id.return_value = None
         
-        use_case = PublishConfessionUseCase(
-            telegram_gateway=telegram_gateway_mock,
-            confession_repository=confession_repository_mock,
-        )
+        use_case = PublishConfessionUseCase(confession_repository_mock)
         
         confession_dto = ConfessionDTO(
             id=999,  # Несуществующий ID
@@ -143,10 +155,10 @@ class TestPublishConfessionUseCase:
         
         # Проверяем, что методы были вызваны
         confession_repository_mock.get_by_id.assert_called_once_with(999)
-        telegram_gateway_mock.send_confession.assert_not_called()
+        confession_repository_mock.save.assert_not_called()
         
     @pytest.mark.asyncio
-    async def test_execute_confession_not_approved(self, confession_repository_mock, telegram_gateway_mock):
+    async def test_execute_confession_not_approved(self, confession_repository_mock):
         """Тест случая, когда признание не одобрено."""
         # Arrange
         # Меняем поведение мока - признание в статусе PENDING
@@ -159,10 +171,7 @@ class TestPublishConfessionUseCase:
         
         confession_repository_mock.get_by_id.side_effect = get_by_id_pending
         
-        use_case = PublishConfessionUseCase(
-            telegram_gateway=telegram_gateway_mock,
-            confession_repository=confession_repository_mock,
-        )
+        use_case = PublishConfessionUseCase(confession_repository_mock)
         
         confession_dto = ConfessionDTO(
             id=3,
@@ -176,5 +185,4 @@ class TestPublishConfessionUseCase:
         
         # Проверяем, что методы были вызваны
         confession_repository_mock.get_by_id.assert_called_once_with(3)
-        telegram_gateway_mock.send_confession.assert_not_called()
-        confession_repository_mock.save.assert_not_called() 
\ No newline at end of file
+        confession_repository_mock.save.assert_not_called()
@@ -0,0 +1,81 @@
+"""
+Тесты для SearchConfessionsUseCase.
+"""
+import pytest
+from unittest.mock import AsyncMock
+
+from src.entities.confession import Confession, ConfessionSearchHit, Tag
+from src.entities.enums import ConfessionStatus
+from src.interface_adapters.dto import ConfessionSearchQueryDTO
+from src.interface_adapters.pagination import Page, SearchCursor
+from src.use_cases.confession_use_cases import SearchConfessionsUseCase
+
+
+class TestSearchConfessionsUseCase:
+    """Тесты для SearchConfessionsUseCase."""
+
+    @pytest.fixture
+    def confession_repository_mock(self):
+        """Создает мок репозитория признаний с одной страницей результатов поиска."""
+        repository = AsyncMock()
+        repository.search.return_value = Page(
+            items=[
+                ConfessionSearchHit(
+                    confession=Confession(
+                        id=5,
+                        content="Кот спит на клавиатуре",
+                        status=ConfessionStatus.PUBLISHED,
+                        tags=[Tag(id=1, name="коты")],
+                    ),
+                    rank=0.4,
+                    snippet="Кот <mark>спит</mark> на клавиатуре",
+                ),
+            ],
+            next_cursor=SearchCursor(rank=0.4, id=5),
+        )
+        return repository
+
+    @pytest.mark.asyncio
+    async def test_execute_returns_hits_with_encoded_cursor(self, confession_repository_mock):
+        """Тест страницы поиска: признания с рангом, фрагментом и курсором следующей страницы."""
+        # Arrange
+        use_case = SearchConfessionsUseCase(confession_repository_mock)
+        query = ConfessionSearchQueryDTO(query="  спать  ", status=ConfessionStatus.PUBLISHED, limit=1)
+
+        # Act
+        result = await use_case.execute(query)
+
+        # Assert
+        confession_repository_mock.search.assert_called_once_with("спать", ConfessionStatus.PUBLISHED, None, 1)
+        assert result.items[0].id == 5
+        assert result.items[0].tags[0].name == "коты"
+        assert result.items[0].rank == 0.4
+        assert result.items[0].snippet == "Кот <mark>спит</mark> на клавиатуре"
+        assert SearchCursor.decode(result.next_cursor) == SearchCursor(rank=0.4, id=5)
+
+    @pytest.mark.asyncio
+    async def test_execute_passes_decoded_cursor(self, confession_repository_mock):
+        """Тест передачи декодированного курсора поиска в репозиторий."""
+        # Arrange
+        use_case = SearchConfessionsUseCase(confession_repository_mock)
+        cursor = SearchCursor(rank=0.4, id=5)
+
+        # Act
+        await use_case.execute(ConfessionSearchQueryDTO(query="кот", cursor=cursor.encode()))
+
+        # Assert
+        confession_repository_mock.search.assert_called_once_with("кот", None, cursor, 20)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "query", [ConfessionSearchQueryDTO(query="   "), ConfessionSearchQueryDTO(query="кот", cursor="bad")]
+    )
+    async def test_execute_invalid_query(self, confession_repository_mock, query):
+        """Тест ошибки на пустом запросе и поврежденном курсоре."""
+        # Arrange
+        use_case = SearchConfessionsUseCase(confession_repository_mock)
+
+        # Act & Assert
+        with pytest.raises(ValueError):
+            await use_case.execute(query)
+        confession_repository_mock.search.assert_not_called()
@@ -0,0 +1,78 @@
+"""
+Тесты для Use Cases тегов.
+"""
+import pytest
+from unittest.mock import AsyncMock
+from datetime import datetime
+
+from src.entities.confession import Confession, Tag, TagCount
+from src.entities.enums import ConfessionStatus
+from src.interface_adapters.dto import TagConfessionsQueryDTO
+from src.interface_adapters.pagination import Page, PageCursor
+from src.use_cases.tag_use_cases import ListPopularTagsUseCase, ListTagConfessionsUseCase
+
+
+class TestListPopularTagsUseCase:
+    """Тесты для ListPopularTagsUseCase."""
+
+    @pytest.mark.asyncio
+    async def test_execute_returns_counts(self):
+        """Тест получения популярных тегов с количеством признаний."""
+        # Arrange
+        tag_repository = AsyncMock()
+        tag_repository.list_popular.return_value = [TagCount(tag=Tag(id=3, name="коты"), count=12)]
+        use_case = ListPopularTagsUseCase(tag_repository)
+
+        # Act
+        result = await use_case.execute(10)
+
+        # Assert
+        tag_repository.list_popular.assert_called_once_with(10)
+        assert [(tag.name, tag.count) for tag in result] == [("коты", 12)]
+
+
+class TestListTagConfessionsUseCase:
+    """Тесты для ListTagConfessionsUseCase."""
+
+    @pytest.fixture
+    def confession_repository_mock(self):
+        """Создает мок репозитория признаний со страницей ленты по тегу."""
+        repository = AsyncMock()
+        confession = Confession(
+            id=2,
+            content="Про котов",
+            status=ConfessionStatus.PUBLISHED,
+            created_at=datetime(2025, 5, 2),
+            tags=[Tag(id=3, name="коты")],
+        )
+        repository.list_page_by_tag.return_value = Page(
+            items=[confession],
+            next_cursor=PageCursor(created_at=confession.created_at, id=confession.id),
+        )
+        return repository
+
+    @pytest.mark.asyncio
+    async def test_execute_returns_page_with_encoded_cursor(self, confession_repository_mock):
+        """Тест получения страницы признаний с тегом."""
+        # Arrange
+        use_case = ListTagConfessionsUseCase(confession_repository_mock)
+        cursor = PageCursor(created_at=datetime(2025, 5, 3), id=3)
+
+        # Act
+        result = await use_case.execute(TagConfessionsQueryDTO(name="коты", limit=1, cursor=cursor.encode()))
+
+        # Assert
+        confession_repository_mock.list_page_by_tag.assert_called_once_with("коты", 1, cursor)
+        assert [item.id for item in result.items] == [2]
+        assert PageCursor.decode(result.next_cursor) == PageCursor(created_at=datetime(2025, 5, 2), id=2)
+
+    @pytest.mark.asyncio
+    async def test_execute_invalid_cursor(self, confession_repository_mock):
+        """Тест ошибки на поврежденном курсоре."""
+        # Arrange
+        use_case = ListTagConfessionsUseCase(confession_repository_mock)
+
+        # Act & Assert
+        with pytest.raises(ValueError):
+            await use_case.execute(TagConfessionsQueryDTO(name="коты", cursor="garbage"))
+        confession_repository_mock.list_page_by_tag.assert_not_called()